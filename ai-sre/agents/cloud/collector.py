@@ -3,14 +3,56 @@
 import asyncio
 import logging
 import os
-from typing import Any, Dict, List, Optional, Tuple
+import time
+from datetime import datetime, timezone
+from functools import partial
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Set, Tuple
 import httpx
+from prometheus_client import start_http_server
+
+from observability.metrics import (
+    ai_sre_collector_source_duration_seconds,
+    ai_sre_collector_source_failures_total,
+    ai_sre_collector_source_last_success_timestamp_seconds,
+)
 
 logger = logging.getLogger(__name__)
 
+K8S_CLUSTERS = ("platform", "gpu-inference", "blockchain")
+# Longest a single source (one cluster, AWS or Cloudflare) may take per sync
+DEFAULT_SOURCE_TIMEOUT_SECONDS = float(os.environ.get("COLLECTOR_SOURCE_TIMEOUT_SECONDS", "120"))
+
+
+def match_selector(
+    label_index: Dict[Tuple[str, str, str], Set[int]],
+    namespace: str,
+    selector: Dict[str, str],
+) -> List[int]:
+    """Positions of the pods in ``namespace`` matching every term of ``selector``, in order.
+
+    ``label_index`` maps (namespace, label key, label value) to the
+    positions of the pods carrying that label; matching intersects the
+    sets of the selector's terms, smallest first.
+    """
+    candidates = []
+    for key, value in selector.items():
+        positions = label_index.get((namespace, key, value))
+        if not positions:
+            return []
+        candidates.append(positions)
+    candidates.sort(key=len)
+    return sorted(candidates[0].intersection(*candidates[1:]))
+
 
 class PlatformStateCollector:
-    """Discovers and updates the platform topology graph inside Omniscience."""
+    """Discovers and updates the platform topology graph inside Omniscience.
+
+    Every source (each K8s cluster, AWS, Cloudflare) is collected
+    concurrently under its own timeout, so a slow API server only costs
+    its own part of the graph. Whatever was collected is pushed, with a
+    per-source freshness marker telling Omniscience which sources are
+    current and when the others last succeeded.
+    """
 
     def __init__(
         self,
@@ -18,10 +60,14 @@ class PlatformStateCollector:
         omniscience_token: str = "",
         sync_interval_seconds: int = 300,
         mock_sync: Optional[bool] = None,
+        source_timeout_seconds: float = DEFAULT_SOURCE_TIMEOUT_SECONDS,
     ) -> None:
         self.omniscience_url = omniscience_url
         self.omniscience_token = omniscience_token
         self.sync_interval = sync_interval_seconds
+        self.source_timeout = source_timeout_seconds
+        # Source name -> Unix time of its last successful collection
+        self.last_success: Dict[str, float] = {}
 
         # Auto-detect if we should run mock sync mode
         if mock_sync is None:
@@ -213,10 +259,23 @@ class PlatformStateCollector:
                 "type": "BELONGS_TO"
             })
 
-        # 4. Pods
-        for pod in pods_list.items:
+        # 4. Pods, indexed for the selector and claim matching below:
+        # (namespace, label key, label value) -> positions of matching pods,
+        # and (namespace, claim name) -> names of pods mounting the claim
+        pod_names: List[str] = []
+        label_index: Dict[Tuple[str, str, str], Set[int]] = {}
+        claim_index: Dict[Tuple[str, str], List[str]] = {}
+        for position, pod in enumerate(pods_list.items):
             pod_name = pod.metadata.name
             pod_ns = pod.metadata.namespace
+            pod_names.append(pod_name)
+            for key, value in (pod.metadata.labels or {}).items():
+                label_index.setdefault((pod_ns, key, value), set()).add(position)
+            for vol in pod.spec.volumes or ():
+                if vol.persistent_volume_claim:
+                    claim_index.setdefault(
+                        (pod_ns, vol.persistent_volume_claim.claim_name), []
+                    ).append(pod_name)
             pod_id = f"{cluster_id}/namespace/{pod_ns}/pod/{pod_name}"
             pod_ip = pod.status.pod_ip or "unknown"
             node_name = pod.spec.node_name
@@ -271,15 +330,13 @@ class PlatformStateCollector:
             # Selector matching
             selector = svc.spec.selector
             if selector:
-                for pod in pods_list.items:
-                    if pod.metadata.namespace == svc_ns and pod.metadata.labels:
-                        if all(pod.metadata.labels.get(k) == v for k, v in selector.items()):
-                            pod_id = f"{cluster_id}/namespace/{svc_ns}/pod/{pod.metadata.name}"
-                            edges.append({
-                                "from": svc_id,
-                                "to": pod_id,
-                                "type": "ROUTES_TO"
-                            })
+                for position in match_selector(label_index, svc_ns, selector):
+                    pod_id = f"{cluster_id}/namespace/{svc_ns}/pod/{pod_names[position]}"
+                    edges.append({
+                        "from": svc_id,
+                        "to": pod_id,
+                        "type": "ROUTES_TO"
+                    })
 
         # 6. PVCs
         for pvc in pvcs_list.items:
@@ -306,16 +363,13 @@ class PlatformStateCollector:
             })
 
             # Pod mounting PVCs
-            for pod in pods_list.items:
-                if pod.metadata.namespace == pvc_ns and pod.spec.volumes:
-                    for vol in pod.spec.volumes:
-                        if vol.persistent_volume_claim and vol.persistent_volume_claim.claim_name == pvc_name:
-                            pod_id = f"{cluster_id}/namespace/{pvc_ns}/pod/{pod.metadata.name}"
-                            edges.append({
-                                "from": pod_id,
-                                "to": pvc_id,
-                                "type": "MOUNTS"
-                            })
+            for pod_name in claim_index.get((pvc_ns, pvc_name), ()):
+                pod_id = f"{cluster_id}/namespace/{pvc_ns}/pod/{pod_name}"
+                edges.append({
+                    "from": pod_id,
+                    "to": pvc_id,
+                    "type": "MOUNTS"
+                })
 
             # Check PV specs for actual backing volume block store IDs
             if volume_name:
@@ -1237,54 +1291,127 @@ class PlatformStateCollector:
                 deduped.append(edge)
         return deduped
 
-    async def push_to_omniscience(self, nodes: List[Dict[str, Any]], edges: List[Dict[str, Any]]) -> None:
-        """Push graph nodes and edges to Omniscience API."""
+    async def push_to_omniscience(
+        self,
+        nodes: List[Dict[str, Any]],
+        edges: List[Dict[str, Any]],
+        sources: Optional[Dict[str, Dict[str, Any]]] = None,
+    ) -> None:
+        """Push graph nodes and edges to Omniscience API.
+
+        ``sources`` carries the freshness marker of every source (see
+        ``collect_all``) so a partial push is not mistaken for deletions.
+        """
+        payload: Dict[str, Any] = {"nodes": nodes, "edges": edges}
+        if sources is not None:
+            payload["sources"] = sources
         try:
             response = await self.client.post(
                 "/api/v1/graph/sync",
-                json={"nodes": nodes, "edges": edges},
+                json=payload,
             )
             response.raise_for_status()
             logger.info("Successfully synchronized %d nodes and %d edges with Omniscience", len(nodes), len(edges))
         except Exception as e:
             logger.error("Failed to sync topology graph with Omniscience: %s", e)
 
+    async def _collect_source(
+        self,
+        source: str,
+        collect: Callable[[], Awaitable[Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]]],
+    ) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]], Dict[str, Any]]:
+        """Run one source's collection under the source timeout.
+
+        Returns its nodes and edges (empty on failure) and its freshness
+        marker: status (ok | timeout | error), duration and the time of
+        its last successful collection, if any.
+        """
+        start = time.monotonic()
+        nodes: List[Dict[str, Any]] = []
+        edges: List[Dict[str, Any]] = []
+        try:
+            nodes, edges = await asyncio.wait_for(collect(), timeout=self.source_timeout)
+            status = "ok"
+        except TimeoutError:
+            status = "timeout"
+            logger.warning("Collection from %s timed out after %.0fs", source, self.source_timeout)
+        except Exception as e:
+            status = "error"
+            logger.error("Collection from %s failed: %s", source, e)
+        duration = time.monotonic() - start
+
+        ai_sre_collector_source_duration_seconds.labels(source=source, status=status).observe(
+            duration
+        )
+        if status == "ok":
+            self.last_success[source] = time.time()
+            ai_sre_collector_source_last_success_timestamp_seconds.labels(source=source).set(
+                self.last_success[source]
+            )
+        else:
+            ai_sre_collector_source_failures_total.labels(source=source, status=status).inc()
+
+        last_success = self.last_success.get(source)
+        freshness = {
+            "status": status,
+            "duration_seconds": round(duration, 3),
+            "last_success": (
+                datetime.fromtimestamp(last_success, tz=timezone.utc).isoformat()
+                if last_success is not None else None
+            ),
+        }
+        return nodes, edges, freshness
+
+    async def collect_all(
+        self,
+    ) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]], Dict[str, Dict[str, Any]]]:
+        """Collect every source concurrently.
+
+        Returns all collected nodes and edges, and the freshness marker of
+        each source keyed by name (``k8s/<cluster>``, ``aws``, ``cloudflare``).
+        """
+        collections: Dict[str, Callable[[], Awaitable[Any]]] = {
+            f"k8s/{cluster}": partial(self.collect_k8s_topology, cluster)
+            for cluster in K8S_CLUSTERS
+        }
+        collections["aws"] = self.collect_aws_topology
+        collections["cloudflare"] = self.collect_cloudflare_topology
+
+        results = await asyncio.gather(*(
+            self._collect_source(source, collect) for source, collect in collections.items()
+        ))
+
+        all_nodes: List[Dict[str, Any]] = []
+        all_edges: List[Dict[str, Any]] = []
+        sources: Dict[str, Dict[str, Any]] = {}
+        for source, (nodes, edges, freshness) in zip(collections, results, strict=True):
+            all_nodes.extend(nodes)
+            all_edges.extend(edges)
+            sources[source] = freshness
+        return all_nodes, all_edges, sources
+
+    async def sync_once(self) -> None:
+        """Run one collection round and push the (possibly partial) graph."""
+        # 1. Collect K8s clusters, AWS and Cloudflare concurrently
+        all_nodes, all_edges, sources = await self.collect_all()
+
+        # 2. Correlate cross-layer boundary connections
+        cross_edges = self.build_cross_layer_edges(all_nodes)
+        all_edges.extend(cross_edges)
+
+        # 3. Deduplicate
+        unique_nodes = self.deduplicate_nodes(all_nodes)
+        unique_edges = self.deduplicate_edges(all_edges)
+
+        # 4. Push to graph store
+        await self.push_to_omniscience(unique_nodes, unique_edges, sources)
+
     async def run(self) -> None:
         """Main execution loop for continuous collection."""
         logger.info("Starting Platform State Collector daemon (mock_sync=%s)", self.mock_sync)
         while True:
             try:
-                # 1. Collect K8s resources across clusters
-                clusters = ["platform", "gpu-inference", "blockchain"]
-                all_nodes = []
-                all_edges = []
-
-                for cluster in clusters:
-                    k8s_nodes, k8s_edges = await self.collect_k8s_topology(cluster)
-                    all_nodes.extend(k8s_nodes)
-                    all_edges.extend(k8s_edges)
-
-                # 2. Collect AWS resources
-                aws_nodes, aws_edges = await self.collect_aws_topology()
-                all_nodes.extend(aws_nodes)
-                all_edges.extend(aws_edges)
-
-                # 3. Collect Cloudflare resources
-                cf_nodes, cf_edges = await self.collect_cloudflare_topology()
-                all_nodes.extend(cf_nodes)
-                all_edges.extend(cf_edges)
-
-                # 4. Correlate cross-layer boundary connections
-                cross_edges = self.build_cross_layer_edges(all_nodes)
-                all_edges.extend(cross_edges)
-
-                # 5. Deduplicate
-                unique_nodes = self.deduplicate_nodes(all_nodes)
-                unique_edges = self.deduplicate_edges(all_edges)
-
-                # 6. Push to graph store
-                await self.push_to_omniscience(unique_nodes, unique_edges)
-
+                await self.sync_once()
             except Exception as e:
                 logger.error("Error in collector loop: %s", e)
 
@@ -1312,35 +1439,16 @@ if __name__ == "__main__":
         logger.info("SYNC_INTERVAL_SECONDS <= 0: running a single synchronization cycle")
         async def run_once():
             try:
-                clusters = ["platform", "gpu-inference", "blockchain"]
-                all_nodes = []
-                all_edges = []
-
-                for cluster in clusters:
-                    k8s_nodes, k8s_edges = await collector.collect_k8s_topology(cluster)
-                    all_nodes.extend(k8s_nodes)
-                    all_edges.extend(k8s_edges)
-
-                aws_nodes, aws_edges = await collector.collect_aws_topology()
-                all_nodes.extend(aws_nodes)
-                all_edges.extend(aws_edges)
-
-                cf_nodes, cf_edges = await collector.collect_cloudflare_topology()
-                all_nodes.extend(cf_nodes)
-                all_edges.extend(cf_edges)
-
-                cross_edges = collector.build_cross_layer_edges(all_nodes)
-                all_edges.extend(cross_edges)
-
-                unique_nodes = collector.deduplicate_nodes(all_nodes)
-                unique_edges = collector.deduplicate_edges(all_edges)
-
-                await collector.push_to_omniscience(unique_nodes, unique_edges)
+                await collector.sync_once()
             finally:
                 await collector.client.aclose()
 
         loop.run_until_complete(run_once())
     else:
+        metrics_port = int(os.environ.get("COLLECTOR_METRICS_PORT", "9108"))
+        if metrics_port > 0:
+            start_http_server(metrics_port)
+            logger.info("Serving collector metrics on :%d/metrics", metrics_port)
         try:
             loop.run_until_complete(collector.run())
         except KeyboardInterrupt:
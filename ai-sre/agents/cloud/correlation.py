@@ -9,10 +9,13 @@ This module is the bridge that makes the AWS Cloud Agent's data
 available to all specialist agents.
 """
 
+import asyncio
 import logging
 from dataclasses import dataclass, field
 from typing import Any, Optional
 
+from common.omniscience import OmniscienceClient, omniscience_client
+
 logger = logging.getLogger(__name__)
 
 
@@ -82,6 +85,9 @@ class CrossLayerCorrelator:
 
     Used by specialist agents to enrich their investigations
     with cloud infrastructure context from the AWS Cloud Agent.
+
+    Lookups go through the shared Omniscience client (common.omniscience),
+    which caches them with a TTL and batches concurrent ones.
     """
 
     def __init__(
@@ -89,10 +95,12 @@ class CrossLayerCorrelator:
         omniscience_url: Optional[str] = None,
         omniscience_token: Optional[str] = None,
     ) -> None:
-        self._node_cache: dict[str, AWSNodeContext] = {}
-        self._volume_cache: dict[str, AWSVolumeContext] = {}
         self.omniscience_url = omniscience_url
         self.omniscience_token = omniscience_token
+        self.omniscience: Optional[OmniscienceClient] = (
+            omniscience_client(omniscience_url, omniscience_token)
+            if omniscience_url and omniscience_token else None
+        )
 
     async def enrich_for_node(
         self,
@@ -103,42 +111,27 @@ class CrossLayerCorrelator:
 
         Queries Omniscience Graph to look up the EC2 instance ID and mapping.
         """
-        cache_key = f"{cluster}/{node_name}"
-        cached = self._node_cache.get(cache_key)
-        if cached:
-            return cached
-
-        if not self.omniscience_url or not self.omniscience_token:
+        if self.omniscience is None:
             return None
 
-        import httpx
         try:
-            async with httpx.AsyncClient(timeout=5.0) as client:
-                headers = {"Authorization": f"Bearer {self.omniscience_token}"}
-                response = await client.get(
-                    f"{self.omniscience_url}/api/v1/graph/node-context",
-                    params={"node_name": node_name, "cluster": cluster},
-                    headers=headers,
-                )
-                if response.status_code == 200:
-                    data = response.json()
-                    ctx = AWSNodeContext(
-                        node_name=node_name,
-                        instance_id=data.get("instance_id", "unknown"),
-                        instance_type=data.get("instance_type", "unknown"),
-                        availability_zone=data.get("availability_zone", "unknown"),
-                        lifecycle=data.get("lifecycle", "on-demand"),
-                        instance_status=data.get("instance_status", "ok"),
-                        system_check=data.get("system_check", "ok"),
-                        instance_check=data.get("instance_check", "ok"),
-                        spot_interruption=data.get("spot_interruption", False),
-                    )
-                    self._node_cache[cache_key] = ctx
-                    return ctx
+            data = await self.omniscience.get_node_context(cluster, node_name)
         except Exception as e:
             logger.error("Failed to enrich node context via Omniscience: %s", e)
-
-        return None
+            return None
+        if data is None:
+            return None
+        return AWSNodeContext(
+            node_name=node_name,
+            instance_id=data.get("instance_id", "unknown"),
+            instance_type=data.get("instance_type", "unknown"),
+            availability_zone=data.get("availability_zone", "unknown"),
+            lifecycle=data.get("lifecycle", "on-demand"),
+            instance_status=data.get("instance_status", "ok"),
+            system_check=data.get("system_check", "ok"),
+            instance_check=data.get("instance_check", "ok"),
+            spot_interruption=data.get("spot_interruption", False),
+        )
 
     async def enrich_for_pvc(
         self,
@@ -150,41 +143,26 @@ class CrossLayerCorrelator:
 
         Queries Omniscience Graph to look up the EBS volume mapping.
         """
-        cache_key = f"{cluster}/{namespace}/{pvc_name}"
-        cached = self._volume_cache.get(cache_key)
-        if cached:
-            return cached
-
-        if not self.omniscience_url or not self.omniscience_token:
+        if self.omniscience is None:
             return None
 
-        import httpx
         try:
-            async with httpx.AsyncClient(timeout=5.0) as client:
-                headers = {"Authorization": f"Bearer {self.omniscience_token}"}
-                response = await client.get(
-                    f"{self.omniscience_url}/api/v1/graph/pvc-context",
-                    params={"pvc_name": pvc_name, "namespace": namespace, "cluster": cluster},
-                    headers=headers,
-                )
-                if response.status_code == 200:
-                    data = response.json()
-                    ctx = AWSVolumeContext(
-                        pvc_name=pvc_name,
-                        pvc_namespace=namespace,
-                        volume_id=data.get("volume_id", "unknown"),
-                        volume_type=data.get("volume_type", "unknown"),
-                        volume_status=data.get("volume_status", "ok"),
-                        io_performance=data.get("io_performance", "normal"),
-                        iops=data.get("iops", 0),
-                        queue_length=data.get("queue_length", 0.0),
-                    )
-                    self._volume_cache[cache_key] = ctx
-                    return ctx
+            data = await self.omniscience.get_pvc_context(cluster, namespace, pvc_name)
         except Exception as e:
             logger.error("Failed to enrich volume context via Omniscience: %s", e)
-
-        return None
+            return None
+        if data is None:
+            return None
+        return AWSVolumeContext(
+            pvc_name=pvc_name,
+            pvc_namespace=namespace,
+            volume_id=data.get("volume_id", "unknown"),
+            volume_type=data.get("volume_type", "unknown"),
+            volume_status=data.get("volume_status", "ok"),
+            io_performance=data.get("io_performance", "normal"),
+            iops=data.get("iops", 0),
+            queue_length=data.get("queue_length", 0.0),
+        )
 
     async def enrich_for_security(
         self,
@@ -227,13 +205,22 @@ class CrossLayerCorrelator:
 
         This is the main entry point called by specialist agents.
         Aggregates node, volume, security, and network context.
+        Node and PVC lookups run concurrently, so the Omniscience client
+        resolves them in batched requests.
         """
         enrichment = CrossLayerEnrichment()
+        node_names = node_names or []
+        pvc_names = pvc_names or []
+        contexts = await asyncio.gather(
+            *(self.enrich_for_node(node, cluster) for node in node_names),
+            *(self.enrich_for_pvc(pvc, namespace, cluster) for pvc, namespace in pvc_names),
+        )
+        node_contexts = contexts[:len(node_names)]
+        volume_contexts = contexts[len(node_names):]
 
         # Enrich nodes
         if node_names:
-            for node in node_names:
-                ctx = await self.enrich_for_node(node, cluster)
+            for node, ctx in zip(node_names, node_contexts, strict=True):
                 if ctx:
                     enrichment.node_contexts.append(ctx)
                     # Add correlation notes
@@ -262,8 +249,7 @@ class CrossLayerCorrelator:
 
         # Enrich PVCs
         if pvc_names:
-            for pvc_name, namespace in pvc_names:
-                ctx = await self.enrich_for_pvc(pvc_name, namespace, cluster)
+            for (pvc_name, _), ctx in zip(pvc_names, volume_contexts, strict=True):
                 if ctx:
                     enrichment.volume_contexts.append(ctx)
                     if ctx.volume_status == "impaired":
@@ -6,6 +6,8 @@ from dataclasses import dataclass, field
 from datetime import datetime, timezone
 from typing import Any, Optional
 
+from common.routing import get_router
+
 from .config import (
     AGENT_SYSTEM_PROMPTS,
     AGENT_TOOL_PERMISSIONS,
@@ -139,41 +141,26 @@ class SREOrchestrator:
     def route_alert(self, alert: dict[str, Any]) -> AgentRole:
         """Determine which specialized agent should handle an alert.
 
-        Routing is based on alert labels and name patterns:
+        Uses the routing table shared with the ingestion pipeline
+        (common/routing.yaml), e.g.:
         - gpu_*, dcgm_*          -> GPU Health Agent
         - kube_pod_*, container_* -> Incident Response Agent
         - node_*, kubelet_*      -> Capacity Planning Agent
-        - cilium_*, network_*    -> Incident Response Agent
-        - vllm_*                 -> Predictive Scaling Agent
-        - cost_*                 -> Cost Optimization Agent
-        - ec2_*, ebs_*, spot_*   -> AWS Cloud Agent
-        - guardduty_*, securityhub_* -> AWS Cloud Agent
-        - aws_quota_*            -> AWS Cloud Agent
-        - cloudwatch_*           -> AWS Cloud Agent
+        - ec2_*, guardduty_*, aws_quota_*, cloudwatch_* -> AWS Cloud Agent
         - Other                  -> On-Call Copilot Agent
         """
-        alert_name = alert.get("labels", {}).get("alertname", "").lower()
-
-        routing_rules: list[tuple[list[str], AgentRole]] = [
-            (["gpu_", "dcgm_"], AgentRole.GPU_HEALTH),
-            (["kube_pod_", "container_"], AgentRole.INCIDENT_RESPONSE),
-            (["node_", "kubelet_"], AgentRole.CAPACITY_PLANNING),
-            (["cilium_", "network_"], AgentRole.INCIDENT_RESPONSE),
-            (["vllm_"], AgentRole.PREDICTIVE_SCALING),
-            (["cost_"], AgentRole.COST_OPTIMIZATION),
-            (["ec2_", "ebs_", "spot_"], AgentRole.AWS_CLOUD),
-            (["guardduty_", "securityhub_"], AgentRole.AWS_CLOUD),
-            (["aws_quota_"], AgentRole.AWS_CLOUD),
-            (["cloudwatch_"], AgentRole.AWS_CLOUD),
-        ]
-
-        for prefixes, role in routing_rules:
-            if any(alert_name.startswith(prefix) for prefix in prefixes):
-                logger.info("Routing alert '%s' to %s", alert_name, role.value)
-                return role
-
-        logger.info("No specific route for '%s', using on-call copilot", alert_name)
-        return AgentRole.ONCALL_COPILOT
+        labels = alert.get("labels", {})
+        alert_name = labels.get("alertname", "")
+
+        target = get_router().route(alert_name, labels)
+        try:
+            role = AgentRole(target)
+        except ValueError:
+            logger.warning("Unknown route target '%s' for '%s'", target, alert_name)
+            role = AgentRole.ONCALL_COPILOT
+
+        logger.info("Routing alert '%s' to %s", alert_name, role.value)
+        return role
 
     async def investigate(self, alert: dict[str, Any]) -> InvestigationContext:
         """Start an investigation for an incoming alert.
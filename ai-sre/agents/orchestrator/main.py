@@ -3,12 +3,15 @@
 import logging
 import os
 from contextlib import asynccontextmanager
+from typing import Any
 
 import structlog
 import yaml
-from fastapi import FastAPI
+from fastapi import BackgroundTasks, FastAPI, HTTPException
 from prometheus_client import make_asgi_app
 
+from common.http_clients import http_clients
+
 from .agent import SREOrchestrator
 
 structlog.configure(
@@ -40,10 +43,12 @@ async def lifespan(app: FastAPI):
 
     orchestrator = SREOrchestrator()
     logger.info("orchestrator_initialized", agent_count=len(orchestrator.agents))
+    await http_clients.start()
 
     yield
 
     logger.info("shutting_down")
+    await http_clients.aclose()
     orchestrator = None
 
 
@@ -84,3 +89,24 @@ async def status():
         "active_investigations": len(active),
         "registered_agents": len(orchestrator.agents),
     }
+
+
+@app.post("/api/v1/investigations", status_code=202)
+async def start_investigation(
+    alert: dict[str, Any],
+    background_tasks: BackgroundTasks,
+):
+    """Accept an enriched alert from the ingestion pipeline.
+
+    The investigation runs in the background; poll /api/v1/status for progress.
+    """
+    if orchestrator is None:
+        raise HTTPException(status_code=503, detail="Orchestrator not initialized")
+
+    background_tasks.add_task(orchestrator.investigate, alert)
+    logger.info(
+        "investigation_accepted",
+        alert_id=alert.get("alert_id"),
+        alertname=alert.get("labels", {}).get("alertname"),
+    )
+    return {"status": "accepted", "alert_id": alert.get("alert_id")}
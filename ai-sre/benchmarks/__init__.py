@@ -0,0 +1 @@
+# Performance benchmarks — run individually with `python -m benchmarks.<name>`
@@ -0,0 +1,77 @@
+"""Benchmark AlertDeduplicator per-alert latency at 1M active groups.
+
+Run from the ai-sre directory:
+
+    python -m benchmarks.bench_dedup [--groups 1000000] [--alerts 200000]
+
+Fills the deduplicator with N active groups spread across the expiry
+window, then replays a storm while simulated time advances so groups
+continuously expire. Per-alert latency should stay flat as the active
+group count grows, because eviction only visits the buckets coming due.
+"""
+
+import argparse
+import gc
+import random
+import statistics
+import time
+
+from ingestion.dedup import AlertDeduplicator
+
+
+def _percentile(samples: list[float], pct: float) -> float:
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct / 100))]
+
+
+def run(groups: int, alerts: int, window: int = 300) -> dict[str, float]:
+    clock = [0.0]
+    dedup = AlertDeduplicator(window_seconds=window, clock=lambda: clock[0])
+
+    # Spread group creation over one full expiry period (2x window)
+    step = (window * 2) / groups
+    for i in range(groups):
+        clock[0] += step
+        dedup.should_investigate(f"alert_{i % 500}", f"cluster-{i % 40}", f"ns-{i}")
+
+    # Keep the prefill out of GC generations so pauses reflect the storm only
+    gc.collect()
+    gc.freeze()
+
+    rng = random.Random(42)
+    latencies = []
+    for i in range(alerts):
+        clock[0] += step
+        # Mix of repeats of live groups and brand-new groups
+        ns = f"ns-{rng.randrange(groups)}" if i % 2 else f"new-{i}"
+        start = time.perf_counter_ns()
+        dedup.should_investigate(f"alert_{i % 500}", f"cluster-{i % 40}", ns)
+        latencies.append((time.perf_counter_ns() - start) / 1000)
+
+    gc.unfreeze()
+    return {
+        "active_groups": len(dedup.groups),
+        "p50_us": _percentile(latencies, 50),
+        "p99_us": _percentile(latencies, 99),
+        "max_us": max(latencies),
+        "mean_us": statistics.fmean(latencies),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--groups", type=int, default=1_000_000)
+    parser.add_argument("--alerts", type=int, default=200_000)
+    args = parser.parse_args()
+
+    for groups in sorted({args.groups // 100, args.groups // 10, args.groups}):
+        result = run(groups, args.alerts)
+        print(
+            f"groups={groups:>9,}  active={result['active_groups']:>9,}  "
+            f"p50={result['p50_us']:.1f}us  p99={result['p99_us']:.1f}us  "
+            f"max={result['max_us']:.0f}us  mean={result['mean_us']:.2f}us"
+        )
+
+
+if __name__ == "__main__":
+    main()
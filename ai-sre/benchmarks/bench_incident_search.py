@@ -0,0 +1,82 @@
+"""Benchmark BM25 incident search latency over the in-memory index.
+
+Run from the ai-sre directory:
+
+    python -m benchmarks.bench_incident_search [--incidents 20000] [--queries 2000]
+
+Indexes a synthetic incident history (alertnames, symptoms and root
+causes drawn from a shared vocabulary of a few hundred services and a
+few dozen failure modes, as real incidents repeat), then
+times ``IncidentIndex.search`` for typical symptom queries, with and
+without a cluster filter. Reports index build time and p50/p99 query
+latency.
+"""
+
+import argparse
+import random
+import time
+from datetime import datetime
+
+from memory.incident_index import IncidentIndex
+
+KINDS = ["pod", "node", "gpu", "disk", "ingress", "etcd", "vllm", "dns", "kubelet", "nccl"]
+FAILURES = [
+    "crashlooping", "oom", "pressure", "xid", "latency", "errors", "timeout", "evicted",
+    "throttled", "unreachable", "degraded", "saturated", "flapping", "drift", "leak",
+    "backlog", "stalled", "partitioned", "expired", "rejected",
+]
+CAUSES = [
+    "memory limit too low", "noisy neighbour saturated the node", "expired certificate",
+    "bad deploy rolled out", "faulty hardware", "quota exhausted", "config drift",
+]
+
+
+def _percentile(samples: list[float], pct: float) -> float:
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct / 100))]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--incidents", type=int, default=20_000)
+    parser.add_argument("--queries", type=int, default=2_000)
+    parser.add_argument("--clusters", type=int, default=8)
+    parser.add_argument("--services", type=int, default=300, help="distinct service names")
+    args = parser.parse_args()
+
+    rng = random.Random(42)
+    components = [f"{rng.choice(KINDS)}-svc{i}" for i in range(args.services)]
+    index = IncidentIndex()
+    start = time.perf_counter()
+    for i in range(args.incidents):
+        component, failure = rng.choice(components), rng.choice(FAILURES)
+        index.add(
+            str(i),
+            f"{component} {failure}",
+            f"cluster-{rng.randrange(args.clusters)}",
+            datetime(2026, 1, 1),
+            [f"{component}_{failure}".replace("-", "_")],
+            [f"{failure} on {component}-{rng.randrange(100)}", rng.choice(FAILURES)],
+            f"{rng.choice(CAUSES)} in {rng.choice(components)}",
+        )
+    build = time.perf_counter() - start
+    print(f"index: {args.incidents:,} incidents in {build * 1000:.0f}ms")
+
+    queries = [
+        [f"{rng.choice(components)}_{rng.choice(FAILURES)}".replace("-", "_"), rng.choice(FAILURES)]
+        for _ in range(args.queries)
+    ]
+    for label, cluster in (("all clusters", None), ("one cluster", "cluster-0")):
+        latencies = []
+        for query in queries:
+            start = time.perf_counter_ns()
+            index.search(query, cluster=cluster, limit=5)
+            latencies.append((time.perf_counter_ns() - start) / 1000)
+        print(
+            f"search ({label}): p50={_percentile(latencies, 50):.0f}us "
+            f"p99={_percentile(latencies, 99):.0f}us"
+        )
+
+
+if __name__ == "__main__":
+    main()
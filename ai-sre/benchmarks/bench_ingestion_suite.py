@@ -0,0 +1,57 @@
+"""pytest-benchmark suite: short alert storms through the replay harness.
+
+Run from the ai-sre directory (not collected by the default test run):
+
+    python -m pytest benchmarks/bench_ingestion_suite.py --benchmark-only
+    python -m pytest benchmarks/bench_ingestion_suite.py --benchmark-autosave
+    python -m pytest benchmarks/bench_ingestion_suite.py --benchmark-compare
+
+Each case is one replay (a few seconds of open-loop load); the timing
+pytest-benchmark records is the wall time of the whole storm, and the
+replay report (p50/p99, dedup ratio, upstream concurrency, memory growth)
+is stored in the benchmark's extra_info so saved runs can be compared.
+"""
+
+import asyncio
+import logging
+from dataclasses import asdict
+
+import pytest
+
+pytest.importorskip("pytest_benchmark")
+
+from benchmarks.replay import ReplayConfig, _quiet_logs, run_replay  # noqa: E402
+
+STORMS = {
+    # Few distinct alerts: mostly deduplicated
+    "repetitive": ReplayConfig(alertnames=5, clusters=2, namespaces=3),
+    # Wide storm: mostly new alerts, enrichment-bound
+    "high_cardinality": ReplayConfig(alertnames=500, clusters=8, namespaces=100),
+    # Slow upstreams
+    "slow_upstreams": ReplayConfig(vm_latency=0.2, ch_latency=0.5, jitter=0.1),
+}
+
+
+@pytest.fixture(autouse=True, scope="module")
+def quiet_logs():
+    _quiet_logs(logging.WARNING)
+
+
+@pytest.mark.parametrize("mode", ["sync", "queue"])
+@pytest.mark.parametrize("storm", list(STORMS))
+def test_alert_storm(benchmark, storm, mode):
+    config = ReplayConfig(**{**asdict(STORMS[storm]), "mode": mode, "duration": 3.0})
+
+    report = benchmark.pedantic(
+        lambda: asyncio.run(run_replay(config)), rounds=1, iterations=1
+    )
+
+    benchmark.extra_info.update(
+        p50_ms=report.p50_ms,
+        p99_ms=report.p99_ms,
+        dedup_ratio=report.dedup_ratio,
+        upstream_peak_concurrency=report.upstream_peak_concurrency,
+        memory_growth_mb=report.memory_mb[-1][1] - report.memory_mb[0][1],
+    )
+    assert report.status_codes.keys() <= {200, 202}
+    assert report.alerts == report.webhooks * config.batch_size
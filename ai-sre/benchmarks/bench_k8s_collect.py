@@ -0,0 +1,195 @@
+"""Benchmark K8s topology edge construction on a synthetic cluster.
+
+Run from the ai-sre directory:
+
+    python -m benchmarks.bench_k8s_collect [--pods 100000] [--services 10000] [--pvcs 20000]
+
+Feeds ``PlatformStateCollector._collect_k8s_real`` an in-memory stand-in
+for the CoreV1Api with ``--pods`` pods spread over ``--namespaces``
+namespaces, ``--services`` Services selecting pods by app (plus a tier
+label on some) and ``--pvcs`` claims mounted by StatefulSet-style pods.
+Reports the indexed collection time, and the per-service and per-PVC
+pod scans the collector used to do, timed on a sample and extrapolated
+to the whole cluster (running them in full takes many minutes).
+"""
+
+import argparse
+import asyncio
+import random
+import time
+from types import SimpleNamespace
+
+from agents.cloud.collector import PlatformStateCollector
+
+
+def _percentile(samples: list[float], pct: float) -> float:
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct / 100))]
+
+
+def _items(objects: list) -> SimpleNamespace:
+    return SimpleNamespace(items=objects)
+
+
+def _meta(name: str, namespace: str = "", labels: dict | None = None) -> SimpleNamespace:
+    return SimpleNamespace(name=name, namespace=namespace, labels=labels)
+
+
+class SyntheticCoreV1:
+    """The CoreV1Api calls the collector makes, answered from memory."""
+
+    def __init__(self, args: argparse.Namespace) -> None:
+        rng = random.Random(42)
+        namespaces = [f"ns-{i}" for i in range(args.namespaces)]
+        apps_per_namespace = max(1, args.services // args.namespaces)
+
+        self.nodes = [
+            SimpleNamespace(
+                metadata=_meta(f"node-{i}"),
+                spec=SimpleNamespace(provider_id=f"aws:///us-east-1a/i-{i:017x}"),
+                status=SimpleNamespace(conditions=[SimpleNamespace(type="Ready", status="True")]),
+            )
+            for i in range(max(1, args.pods // 50))
+        ]
+        self.namespaces = [SimpleNamespace(metadata=_meta(ns)) for ns in namespaces]
+
+        self.pods = []
+        claims = []
+        for i in range(args.pods):
+            namespace = rng.choice(namespaces)
+            app = f"app-{rng.randrange(apps_per_namespace)}"
+            volumes = []
+            if len(claims) < args.pvcs and rng.random() < args.pvcs / args.pods * 1.2:
+                claim = f"data-{app}-{i}"
+                claims.append((namespace, claim))
+                volumes.append(SimpleNamespace(
+                    persistent_volume_claim=SimpleNamespace(claim_name=claim)
+                ))
+            volumes.append(SimpleNamespace(persistent_volume_claim=None))
+            self.pods.append(SimpleNamespace(
+                metadata=_meta(f"pod-{i}", namespace, {
+                    "app": app,
+                    "tier": rng.choice(("web", "worker")),
+                    "pod-template-hash": f"{rng.randrange(16 ** 8):08x}",
+                }),
+                spec=SimpleNamespace(node_name=rng.choice(self.nodes).metadata.name,
+                                     volumes=volumes),
+                status=SimpleNamespace(pod_ip=f"10.0.{i // 256 % 256}.{i % 256}",
+                                       phase="Running"),
+            ))
+
+        self.services = []
+        for i in range(args.services):
+            selector = {"app": f"app-{i % apps_per_namespace}"}
+            if i % 3 == 0:
+                selector["tier"] = "web"
+            self.services.append(SimpleNamespace(
+                metadata=_meta(f"svc-{i}", namespaces[i % len(namespaces)]),
+                spec=SimpleNamespace(
+                    type="ClusterIP",
+                    cluster_ip=f"172.20.{i // 256 % 256}.{i % 256}",
+                    selector=selector,
+                ),
+            ))
+        self.pvcs = [
+            SimpleNamespace(
+                metadata=_meta(claim, namespace),
+                spec=SimpleNamespace(volume_name="", storage_class_name="gp3"),
+            )
+            for namespace, claim in claims
+        ]
+
+    def list_node(self, **_: object) -> SimpleNamespace:
+        return _items(self.nodes)
+
+    def list_namespace(self) -> SimpleNamespace:
+        return _items(self.namespaces)
+
+    def list_pod_for_all_namespaces(self) -> SimpleNamespace:
+        return _items(self.pods)
+
+    def list_service_for_all_namespaces(self) -> SimpleNamespace:
+        return _items(self.services)
+
+    def list_persistent_volume_claim_for_all_namespaces(self) -> SimpleNamespace:
+        return _items(self.pvcs)
+
+
+def _scan_selector(pods: list, svc: SimpleNamespace) -> int:
+    """The per-service pod scan the collector used to do."""
+    matched = 0
+    for pod in pods:
+        if (
+            pod.metadata.namespace == svc.metadata.namespace
+            and pod.metadata.labels
+            and all(pod.metadata.labels.get(k) == v for k, v in svc.spec.selector.items())
+        ):
+            matched += 1
+    return matched
+
+
+def _scan_claim(pods: list, pvc: SimpleNamespace) -> int:
+    """The per-PVC pod and volume scan the collector used to do."""
+    matched = 0
+    for pod in pods:
+        if pod.metadata.namespace == pvc.metadata.namespace and pod.spec.volumes:
+            for vol in pod.spec.volumes:
+                if (vol.persistent_volume_claim
+                        and vol.persistent_volume_claim.claim_name == pvc.metadata.name):
+                    matched += 1
+    return matched
+
+
+def _extrapolate(label: str, objects: list, sample: int, run) -> None:
+    picked = objects[:sample]
+    latencies = []
+    for obj in picked:
+        start = time.perf_counter()
+        run(obj)
+        latencies.append(time.perf_counter() - start)
+    total = sum(latencies) / len(latencies) * len(objects)
+    print(
+        f"{label}: p50={_percentile(latencies, 50) * 1000:.1f}ms per object, "
+        f"~{total:.0f}s for all {len(objects):,} (from {len(picked)} sampled)"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--pods", type=int, default=100_000)
+    parser.add_argument("--services", type=int, default=10_000)
+    parser.add_argument("--pvcs", type=int, default=20_000)
+    parser.add_argument("--namespaces", type=int, default=200)
+    parser.add_argument("--sample", type=int, default=50, help="objects timed for the old scans")
+    parser.add_argument("--runs", type=int, default=3)
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    v1 = SyntheticCoreV1(args)
+    print(
+        f"cluster: {len(v1.pods):,} pods, {len(v1.services):,} services, "
+        f"{len(v1.pvcs):,} PVCs, {args.namespaces} namespaces "
+        f"(generated in {time.perf_counter() - start:.1f}s)"
+    )
+
+    collector = PlatformStateCollector(mock_sync=True)
+    timings = []
+    for _ in range(args.runs):
+        start = time.perf_counter()
+        nodes, edges = asyncio.run(collector._collect_k8s_real("bench", v1))
+        timings.append(time.perf_counter() - start)
+    routes = sum(1 for e in edges if e["type"] == "ROUTES_TO")
+    mounts = sum(1 for e in edges if e["type"] == "MOUNTS")
+    print(
+        f"indexed collection: p50={_percentile(timings, 50):.2f}s over {args.runs} runs, "
+        f"{len(nodes):,} nodes, {len(edges):,} edges ({routes:,} ROUTES_TO, {mounts:,} MOUNTS)"
+    )
+
+    _extrapolate("service selector scan (old)", v1.services, args.sample,
+                 lambda svc: _scan_selector(v1.pods, svc))
+    _extrapolate("PVC claim scan (old)", v1.pvcs, args.sample,
+                 lambda pvc: _scan_claim(v1.pods, pvc))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,141 @@
+"""Benchmark topology indexing and transitive blast-radius queries.
+
+Run from the ai-sre directory:
+
+    python -m benchmarks.bench_topology [--clusters 200] [--services 5000] [--edges 3]
+
+Builds a synthetic platform of ``--clusters`` clusters running
+``--services`` critical services, where each cluster and each service
+depends on ``--edges`` others (mostly "lower" ones, so dependency
+chains are long, with some cycles). Reports indexing time, the one-hop
+cluster scan the store used to do, and cold (first) and memoized
+latencies of the transitive cluster and service blast-radius queries.
+"""
+
+import argparse
+import random
+import time
+
+from memory.models.topology import (
+    ClusterTopology,
+    CriticalService,
+    PlatformTopology,
+    ServiceDependency,
+)
+from memory.topology_store import TopologyStore
+
+
+def _percentile(samples: list[float], pct: float) -> float:
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct / 100))]
+
+
+def _upstream(rng: random.Random, index: int, count: int, total: int) -> list[int]:
+    """Mostly lower-numbered picks, plus the odd back edge."""
+    picks = set()
+    for _ in range(count):
+        if index and rng.random() < 0.95:
+            picks.add(rng.randrange(index))
+        else:
+            picks.add(rng.randrange(total))
+    picks.discard(index)
+    return sorted(picks)
+
+
+def _timed(queries: list, run) -> list[float]:
+    latencies = []
+    for query in queries:
+        start = time.perf_counter_ns()
+        run(query)
+        latencies.append((time.perf_counter_ns() - start) / 1000)
+    return latencies
+
+
+def _report(label: str, latencies: list[float]) -> None:
+    print(
+        f"{label}: p50={_percentile(latencies, 50):.1f}us "
+        f"p99={_percentile(latencies, 99):.1f}us"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--clusters", type=int, default=200)
+    parser.add_argument("--services", type=int, default=5_000)
+    parser.add_argument("--edges", type=int, default=3, help="dependencies per node")
+    parser.add_argument("--queries", type=int, default=1_000)
+    args = parser.parse_args()
+
+    rng = random.Random(42)
+    clusters = [f"cluster-{i}" for i in range(args.clusters)]
+    services: dict[str, list[CriticalService]] = {name: [] for name in clusters}
+    placement = []
+    for i in range(args.services):
+        cluster = clusters[rng.randrange(args.clusters)]
+        services[cluster].append(CriticalService(name=f"svc-{i}", namespace=f"ns-{i}"))
+        placement.append(cluster)
+
+    topology = PlatformTopology(
+        clusters=[
+            ClusterTopology(
+                name=name,
+                type="spoke",
+                region="us-east-1",
+                critical_services=services[name],
+                dependencies=[
+                    clusters[j] for j in _upstream(rng, i, args.edges, args.clusters)
+                ],
+            )
+            for i, name in enumerate(clusters)
+        ],
+        cross_cluster_dependencies=[
+            ServiceDependency(
+                source_service=f"svc-{i}",
+                source_namespace=f"ns-{i}",
+                target_service=f"svc-{j}",
+                target_namespace=f"ns-{j}",
+                target_cluster=placement[j],
+            )
+            for i in range(args.services)
+            for j in _upstream(rng, i, args.edges, args.services)
+        ],
+    )
+
+    store = TopologyStore()
+    start = time.perf_counter()
+    store.topology = topology
+    print(
+        f"index: {args.clusters} clusters, {args.services:,} services, "
+        f"{len(topology.cross_cluster_dependencies):,} service edges "
+        f"in {(time.perf_counter() - start) * 1000:.0f}ms"
+    )
+
+    cluster_queries = [rng.choice(clusters) for _ in range(args.queries)]
+    picks = [rng.randrange(args.services) for _ in range(args.queries)]
+    service_queries = [(placement[i], f"svc-{i}") for i in picks]
+
+    def one_hop_scan(name: str) -> list[str]:
+        return [c.name for c in topology.clusters if name in c.dependencies]
+
+    _report("one-hop dependents (linear scan)", _timed(cluster_queries, one_hop_scan))
+    _report("one-hop dependents (index)", _timed(cluster_queries, store.get_dependents))
+
+    for label, run, queries in (
+        ("cluster blast radius", store.get_blast_radius, cluster_queries),
+        ("service blast radius", lambda q: store.get_service_blast_radius(*q), service_queries),
+        (
+            "service blast radius (depth 2)",
+            lambda q: store.get_service_blast_radius(*q, max_depth=2),
+            service_queries,
+        ),
+    ):
+        store.topology = topology  # drop memoized results
+        _report(f"{label}, cold", _timed(list(dict.fromkeys(queries)), run))
+        _report(f"{label}, memoized", _timed(queries, run))
+
+    affected = [len(store.get_service_blast_radius(*q)) for q in service_queries]
+    print(f"services affected per outage: p50={_percentile(affected, 50)} max={max(affected)}")
+
+
+if __name__ == "__main__":
+    main()
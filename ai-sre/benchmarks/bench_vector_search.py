@@ -0,0 +1,78 @@
+"""Benchmark the on-disk IVF vector index used for semantic incident search.
+
+Run from the ai-sre directory (needs the ``vector`` extra):
+
+    python -m benchmarks.bench_vector_search [--incidents 1000000] [--dim 128] [--nprobe 16]
+
+Fills a temporary VectorIndex with synthetic embeddings (unit vectors
+scattered around a few thousand topics, as incidents repeat), then
+reports build time, recall@5 of ``search`` against ``exact_search`` and
+p50/p99 query latency for a range of ``nprobe`` values.
+"""
+
+import argparse
+import tempfile
+import time
+
+import numpy as np
+
+from memory.vector_index import VectorIndex
+
+
+def _percentile(samples: list[float], pct: float) -> float:
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct / 100))]
+
+
+def _unit(vectors: np.ndarray) -> np.ndarray:
+    return (vectors / np.linalg.norm(vectors, axis=1, keepdims=True)).astype(np.float32)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--incidents", type=int, default=1_000_000)
+    parser.add_argument("--dim", type=int, default=128)
+    parser.add_argument("--topics", type=int, default=5_000)
+    parser.add_argument("--noise", type=float, default=0.6, help="spread around each topic")
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--nprobe", type=int, nargs="+", default=[4, 16, 64])
+    parser.add_argument("--batch", type=int, default=50_000)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(42)
+    topics = _unit(rng.standard_normal((args.topics, args.dim)))
+
+    def sample(n: int) -> np.ndarray:
+        noise = rng.standard_normal((n, args.dim)) * args.noise / np.sqrt(args.dim)
+        return _unit(topics[rng.integers(args.topics, size=n)] + noise)
+
+    with tempfile.TemporaryDirectory() as path:
+        index = VectorIndex(path, dim=args.dim)
+        start = time.perf_counter()
+        for offset in range(0, args.incidents, args.batch):
+            n = min(args.batch, args.incidents - offset)
+            index.add_batch([str(offset + i) for i in range(n)], sample(n))
+            if index.needs_training:
+                index.train()
+        build = time.perf_counter() - start
+        nlist = 0 if index.centroids is None else len(index.centroids)
+        print(f"index: {args.incidents:,} x {args.dim} in {build:.1f}s ({nlist} lists)")
+
+        queries = sample(args.queries)
+        exact = [{i for i, _ in index.exact_search(q, k=5)} for q in queries]
+        for nprobe in args.nprobe:
+            latencies, hits = [], 0
+            for query, truth in zip(queries, exact, strict=True):
+                start = time.perf_counter_ns()
+                found = index.search(query, k=5, nprobe=nprobe)
+                latencies.append((time.perf_counter_ns() - start) / 1e6)
+                hits += len(truth & {i for i, _ in found})
+            print(
+                f"nprobe={nprobe}: recall@5={hits / (5 * len(queries)):.3f} "
+                f"p50={_percentile(latencies, 50):.2f}ms p99={_percentile(latencies, 99):.2f}ms"
+            )
+        index.close()
+
+
+if __name__ == "__main__":
+    main()
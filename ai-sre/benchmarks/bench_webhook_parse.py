@@ -0,0 +1,110 @@
+"""Benchmark webhook parsing: streaming parser versus the Pydantic model.
+
+Run from the ai-sre directory:
+
+    python -m benchmarks.bench_webhook_parse [--alerts 10000] [--annotation-bytes 2048]
+
+Builds an Alertmanager payload with N alerts carrying large annotation
+blobs, then parses it (a) with ``AlertmanagerWebhook.model_validate_json``
+on the joined body, as FastAPI did, and (b) with WebhookStreamParser fed
+the 64 KiB chunks directly, as the endpoint now does. Reports CPU time
+and the peak traced allocation for each, plus the retained size of the
+parsed alerts.
+"""
+
+import argparse
+import gc
+import json
+import random
+import time
+import tracemalloc
+
+from ingestion.models import AlertmanagerWebhook
+from ingestion.webhook_parser import WebhookStreamParser
+
+CHUNK_SIZE = 64 * 1024
+
+
+def build_payload(alerts: int, annotation_bytes: int) -> bytes:
+    rng = random.Random(42)
+    blob = "x" * annotation_bytes
+    return json.dumps({
+        "version": "4",
+        "receiver": "ai-sre",
+        "status": "firing",
+        "alerts": [
+            {
+                "status": "firing",
+                "labels": {
+                    "alertname": f"alert_{rng.randrange(200)}",
+                    "cluster": f"cluster-{rng.randrange(8)}",
+                    "namespace": f"ns-{rng.randrange(50)}",
+                    "severity": rng.choice(["critical", "warning", "info"]),
+                    "pod": f"pod-{i}",
+                },
+                "annotations": {"description": blob, "summary": f"alert {i}"},
+                "startsAt": "2026-01-01T00:00:00Z",
+                "fingerprint": f"{i:016x}",
+            }
+            for i in range(alerts)
+        ],
+    }).encode()
+
+
+def parse_pydantic(chunks: list[bytes]) -> list:
+    # FastAPI joins the whole body (request.body()) before validating it
+    return AlertmanagerWebhook.model_validate_json(b"".join(chunks)).alerts
+
+
+def parse_streaming(chunks: list[bytes]) -> list:
+    parser = WebhookStreamParser()
+    alerts = []
+    for chunk in chunks:
+        alerts.extend(parser.feed(chunk))
+    alerts.extend(parser.close())
+    return alerts
+
+
+def measure(fn, chunks: list[bytes], rounds: int) -> dict[str, float]:
+    cpu = []
+    for _ in range(rounds):
+        gc.collect()
+        start = time.process_time()
+        fn(chunks)
+        cpu.append(time.process_time() - start)
+
+    gc.collect()
+    tracemalloc.start()
+    result = fn(chunks)
+    retained, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del result
+    return {
+        "cpu_ms": min(cpu) * 1000,
+        "peak_mb": peak / 2**20,
+        "retained_mb": retained / 2**20,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--alerts", type=int, default=10_000)
+    parser.add_argument("--annotation-bytes", type=int, default=2048)
+    parser.add_argument("--rounds", type=int, default=5)
+    args = parser.parse_args()
+
+    body = build_payload(args.alerts, args.annotation_bytes)
+    # Chunks as received from the ASGI server
+    chunks = [body[i:i + CHUNK_SIZE] for i in range(0, len(body), CHUNK_SIZE)]
+    del body
+    print(f"payload: {args.alerts:,} alerts, {sum(map(len, chunks)) / 2**20:.1f} MiB")
+    for label, fn in (("pydantic", parse_pydantic), ("streaming", parse_streaming)):
+        result = measure(fn, chunks, args.rounds)
+        print(
+            f"{label:<10} cpu={result['cpu_ms']:.0f}ms  "
+            f"peak={result['peak_mb']:.1f}MiB  retained={result['retained_mb']:.1f}MiB"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,338 @@
+"""Replay recorded or synthetic Alertmanager storms against the ingestion app.
+
+Run from the ai-sre directory:
+
+    python -m benchmarks.replay [--rate 20] [--duration 10] [--batch-size 50]
+                                [--alertnames 50 --clusters 4 --namespaces 20]
+                                [--payloads recorded.jsonl] [--mode sync|queue]
+                                [--vm-latency-ms 20] [--ch-latency-ms 50]
+
+Drives ``POST /api/v1/alerts`` in-process (ASGI transport, full app
+lifespan) at a fixed webhook rate, open loop: webhooks are sent on
+schedule whether or not earlier ones have finished, as Alertmanager
+does. VictoriaMetrics and ClickHouse are replaced by local stub servers
+(benchmarks.stubs) with injectable latency.
+
+Payloads are either recorded webhook bodies (a .jsonl file with one
+payload per line, a .json file, or a directory of .json files; replayed
+in a loop) or a synthetic storm whose alertname/cluster/namespace
+cardinality sets how much of it deduplicates.
+
+Reports webhook latency percentiles, the dedup ratio, peak enrichment
+concurrency seen by each upstream stub, and process memory over time.
+"""
+
+import argparse
+import asyncio
+import gc
+import hashlib
+import itertools
+import json
+import logging
+import os
+import random
+import resource
+import statistics
+import tempfile
+import time
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Any, Iterator, Optional
+
+import httpx
+import structlog
+
+from ingestion import api, enrichment
+from ingestion.correlation import AlertCorrelator
+from ingestion.dedup import AlertDeduplicator
+from ingestion.ratelimit import AlertRateLimiter
+
+from .stubs import clickhouse_stub, victoriametrics_stub
+
+SEVERITIES = ["warning"] * 8 + ["critical"] + ["info"]
+
+
+@dataclass
+class ReplayConfig:
+    """Load shape and upstream behaviour for one replay run."""
+
+    rate: float = 20.0
+    duration: float = 10.0
+    batch_size: int = 50
+    alertnames: int = 50
+    clusters: int = 4
+    namespaces: int = 20
+    payloads: Optional[str] = None
+    mode: str = "sync"
+    vm_latency: float = 0.02
+    ch_latency: float = 0.05
+    jitter: float = 0.0
+    rate_limit_per_minute: int = 1_000_000
+    seed: int = 42
+
+
+@dataclass
+class ReplayReport:
+    """Outcome of a replay run."""
+
+    webhooks: int = 0
+    alerts: int = 0
+    elapsed_seconds: float = 0.0
+    p50_ms: float = 0.0
+    p99_ms: float = 0.0
+    max_ms: float = 0.0
+    status_codes: dict[int, int] = field(default_factory=dict)
+    admitted: int = 0
+    deduplicated: int = 0
+    correlated: int = 0
+    rate_limited: int = 0
+    dedup_ratio: float = 0.0
+    peak_webhooks_in_flight: int = 0
+    upstream_requests: dict[str, int] = field(default_factory=dict)
+    upstream_peak_concurrency: dict[str, int] = field(default_factory=dict)
+    # (seconds since start, RSS in MiB)
+    memory_mb: list[tuple[float, float]] = field(default_factory=list)
+
+
+def synthetic_payloads(config: ReplayConfig) -> Iterator[bytes]:
+    """Endless synthetic storm with the configured label cardinality."""
+    rng = random.Random(config.seed)
+    for n in itertools.count():
+        alerts = []
+        for _ in range(config.batch_size):
+            alertname = f"storm_alert_{rng.randrange(config.alertnames)}"
+            cluster = f"cluster-{rng.randrange(config.clusters)}"
+            namespace = f"ns-{rng.randrange(config.namespaces)}"
+            labels = {
+                "alertname": alertname,
+                "cluster": cluster,
+                "namespace": namespace,
+                "severity": rng.choice(SEVERITIES),
+                "pod": f"{namespace}-pod-{rng.randrange(100)}",
+            }
+            alerts.append({
+                "status": "firing",
+                "labels": labels,
+                "annotations": {"summary": f"{alertname} firing on {cluster}/{namespace}"},
+                "startsAt": "2026-01-01T00:00:00Z",
+                "fingerprint": hashlib.blake2b(
+                    f"{alertname}\0{cluster}\0{namespace}".encode(), digest_size=8
+                ).hexdigest(),
+            })
+        yield json.dumps({
+            "version": "4",
+            "groupKey": f"storm-{n}",
+            "status": "firing",
+            "receiver": "ai-sre",
+            "alerts": alerts,
+        }).encode()
+
+
+def recorded_payloads(path: str) -> Iterator[bytes]:
+    """Recorded webhook bodies, replayed in a loop."""
+    source = Path(path)
+    if source.is_dir():
+        bodies = [p.read_bytes() for p in sorted(source.glob("*.json"))]
+    elif source.suffix == ".jsonl":
+        bodies = [line.encode() for line in source.read_text().splitlines() if line.strip()]
+    else:
+        bodies = [source.read_bytes()]
+    if not bodies:
+        raise ValueError(f"No webhook payloads found in {path}")
+    return itertools.cycle(bodies)
+
+
+def _rss_mb() -> float:
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / 2**20
+    except OSError:
+        # Peak rather than current RSS on platforms without /proc
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def _percentile(samples: list[float], pct: float) -> float:
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct / 100))] if ordered else 0.0
+
+
+async def _sample_memory(report: ReplayReport, start: float, interval: float) -> None:
+    while True:
+        report.memory_mb.append((round(time.perf_counter() - start, 2), round(_rss_mb(), 1)))
+        await asyncio.sleep(interval)
+
+
+def _reset_app_state(config: ReplayConfig, spill_dir: str, vm_url: str, ch_url: str) -> dict:
+    """Point the app at the stubs with fresh state; returns what to restore."""
+    overrides: dict[tuple[Any, str], Any] = {
+        (enrichment, "VICTORIAMETRICS_URL"): vm_url,
+        (enrichment, "CLICKHOUSE_URL"): ch_url,
+        (api, "CLICKHOUSE_URL"): ch_url,
+        (api, "ALERT_HISTORY_SPILL_DIR"): spill_dir,
+        (api, "INGESTION_MODE"): config.mode,
+        (api, "deduplicator"): AlertDeduplicator(),
+        (api, "correlator"): AlertCorrelator(),
+        (api, "rate_limiter"): AlertRateLimiter(
+            alerts_per_minute=config.rate_limit_per_minute,
+            critical_per_minute=config.rate_limit_per_minute,
+        ),
+    }
+    saved = {key: getattr(*key) for key in overrides}
+    for (module, name), value in overrides.items():
+        setattr(module, name, value)
+    enrichment.enrichment_cache.invalidate()
+    return saved
+
+
+async def run_replay(config: ReplayConfig, memory_interval: float = 0.5) -> ReplayReport:
+    """Run one replay and return its report."""
+    report = ReplayReport()
+    payloads = recorded_payloads(config.payloads) if config.payloads else synthetic_payloads(config)
+    total = max(1, int(config.rate * config.duration))
+
+    vm = await victoriametrics_stub(config.vm_latency, config.jitter).start()
+    ch = await clickhouse_stub(config.ch_latency, config.jitter).start()
+    latencies: list[float] = []
+    in_flight = 0
+
+    async def send(client: httpx.AsyncClient, body: bytes) -> None:
+        nonlocal in_flight
+        in_flight += 1
+        report.peak_webhooks_in_flight = max(report.peak_webhooks_in_flight, in_flight)
+        sent = time.perf_counter()
+        try:
+            resp = await client.post(
+                "/api/v1/alerts", content=body, headers={"content-type": "application/json"}
+            )
+        finally:
+            in_flight -= 1
+        latencies.append((time.perf_counter() - sent) * 1000)
+        report.status_codes[resp.status_code] = report.status_codes.get(resp.status_code, 0) + 1
+        if resp.status_code < 300:
+            data = resp.json()
+            report.admitted += data.get("processed", data.get("queued", 0))
+            report.deduplicated += data.get("deduplicated", 0)
+            report.correlated += data.get("correlated", 0)
+            report.rate_limited += data.get("rate_limited", 0)
+
+    with tempfile.TemporaryDirectory() as spill_dir:
+        saved = _reset_app_state(config, spill_dir, vm.url, ch.url)
+        gc.collect()
+        start = time.perf_counter()
+        sampler = asyncio.create_task(_sample_memory(report, start, memory_interval))
+        try:
+            async with api.lifespan(api.app):
+                transport = httpx.ASGITransport(app=api.app)
+                async with httpx.AsyncClient(
+                    transport=transport, base_url="http://ingestion", timeout=60
+                ) as client:
+                    loop = asyncio.get_running_loop()
+                    begin = loop.time()
+                    tasks = []
+                    for i in range(total):
+                        delay = begin + i / config.rate - loop.time()
+                        if delay > 0:
+                            await asyncio.sleep(delay)
+                        body = next(payloads)
+                        report.alerts += len(json.loads(body).get("alerts", []))
+                        tasks.append(asyncio.create_task(send(client, body)))
+                    await asyncio.gather(*tasks)
+            # Leaving the lifespan drains the queue and flushes history
+        finally:
+            report.elapsed_seconds = round(time.perf_counter() - start, 2)
+            sampler.cancel()
+            report.memory_mb.append((report.elapsed_seconds, round(_rss_mb(), 1)))
+            for (module, name), value in saved.items():
+                setattr(module, name, value)
+            await vm.stop()
+            await ch.stop()
+
+    report.webhooks = total
+    report.p50_ms = round(_percentile(latencies, 50), 2)
+    report.p99_ms = round(_percentile(latencies, 99), 2)
+    report.max_ms = round(max(latencies, default=0.0), 2)
+    report.dedup_ratio = round(
+        (report.deduplicated + report.correlated) / report.alerts, 4
+    ) if report.alerts else 0.0
+    report.upstream_requests = {s.name: s.requests for s in (vm, ch)}
+    report.upstream_peak_concurrency = {s.name: s.peak_in_flight for s in (vm, ch)}
+    return report
+
+
+def _quiet_logs(level: int) -> None:
+    """Per-alert log lines would dominate a storm run."""
+    logging.basicConfig(level=level)
+    logging.getLogger().setLevel(level)
+    structlog.configure(wrapper_class=structlog.make_filtering_bound_logger(level))
+
+
+def _print_report(report: ReplayReport) -> None:
+    print(
+        f"webhooks={report.webhooks:,}  alerts={report.alerts:,}  "
+        f"elapsed={report.elapsed_seconds}s  status={report.status_codes}"
+    )
+    print(f"latency    p50={report.p50_ms}ms  p99={report.p99_ms}ms  max={report.max_ms}ms")
+    print(
+        f"admission  admitted={report.admitted:,}  deduplicated={report.deduplicated:,}  "
+        f"correlated={report.correlated:,}  rate_limited={report.rate_limited:,}  "
+        f"dedup_ratio={report.dedup_ratio:.1%}"
+    )
+    print(
+        f"fan-out    webhooks_in_flight_peak={report.peak_webhooks_in_flight}  "
+        + "  ".join(
+            f"{name}: requests={report.upstream_requests[name]:,} "
+            f"peak_concurrency={report.upstream_peak_concurrency[name]}"
+            for name in report.upstream_requests
+        )
+    )
+    samples = report.memory_mb
+    step = max(1, len(samples) // 10)
+    timeline = "  ".join(f"{t:>5.1f}s:{mb:.0f}" for t, mb in samples[::step])
+    rss = [mb for _, mb in samples]
+    print(
+        f"memory     start={rss[0]:.0f}MiB  end={rss[-1]:.0f}MiB  peak={max(rss):.0f}MiB  "
+        f"growth={rss[-1] - rss[0]:+.0f}MiB  mean={statistics.fmean(rss):.0f}MiB"
+    )
+    print(f"           {timeline}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rate", type=float, default=20.0, help="webhooks per second")
+    parser.add_argument("--duration", type=float, default=10.0, help="seconds of load")
+    parser.add_argument("--batch-size", type=int, default=50, help="alerts per synthetic webhook")
+    parser.add_argument("--alertnames", type=int, default=50)
+    parser.add_argument("--clusters", type=int, default=4)
+    parser.add_argument("--namespaces", type=int, default=20)
+    parser.add_argument("--payloads", help="recorded payloads (.jsonl, .json or directory)")
+    parser.add_argument("--mode", choices=["sync", "queue"], default="sync")
+    parser.add_argument("--vm-latency-ms", type=float, default=20.0)
+    parser.add_argument("--ch-latency-ms", type=float, default=50.0)
+    parser.add_argument("--jitter-ms", type=float, default=0.0)
+    parser.add_argument("--json", action="store_true", help="print the report as JSON")
+    parser.add_argument("--log-level", default="WARNING")
+    args = parser.parse_args()
+
+    _quiet_logs(getattr(logging, args.log_level.upper()))
+    config = ReplayConfig(
+        rate=args.rate,
+        duration=args.duration,
+        batch_size=args.batch_size,
+        alertnames=args.alertnames,
+        clusters=args.clusters,
+        namespaces=args.namespaces,
+        payloads=args.payloads,
+        mode=args.mode,
+        vm_latency=args.vm_latency_ms / 1000,
+        ch_latency=args.ch_latency_ms / 1000,
+        jitter=args.jitter_ms / 1000,
+    )
+    report = asyncio.run(run_replay(config))
+    if args.json:
+        print(json.dumps(asdict(report), indent=2))
+    else:
+        _print_report(report)
+
+
+if __name__ == "__main__":
+    main()
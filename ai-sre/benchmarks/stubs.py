@@ -0,0 +1,129 @@
+"""Local stub upstreams for load tests: VictoriaMetrics and ClickHouse.
+
+Each stub is a small asyncio HTTP/1.1 server (keep-alive, Content-Length
+bodies) that answers like the real service closely enough for the
+ingestion pipeline, after an injectable latency. Stubs count requests and
+track peak concurrency, which is how the harness observes enrichment
+fan-out.
+"""
+
+import asyncio
+import json
+import random
+from typing import Awaitable, Callable, Optional
+from urllib.parse import parse_qs, urlsplit
+
+# (method, path, query, body) -> (status, JSON-serializable body)
+Handler = Callable[[str, str, dict[str, list[str]], bytes], Awaitable[tuple[int, object]]]
+
+
+class StubServer:
+    """Minimal HTTP/1.1 server around an async handler."""
+
+    def __init__(
+        self,
+        name: str,
+        handler: Handler,
+        latency: float = 0.0,
+        jitter: float = 0.0,
+    ) -> None:
+        self.name = name
+        self.handler = handler
+        self.latency = latency
+        self.jitter = jitter
+        self.requests = 0
+        self.in_flight = 0
+        self.peak_in_flight = 0
+        self._server: Optional[asyncio.AbstractServer] = None
+        self._rng = random.Random(0)
+
+    @property
+    def url(self) -> str:
+        assert self._server is not None
+        host, port = self._server.sockets[0].getsockname()[:2]
+        return f"http://{host}:{port}"
+
+    async def start(self) -> "StubServer":
+        self._server = await asyncio.start_server(self._serve, "127.0.0.1", 0)
+        return self
+
+    async def stop(self) -> None:
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+            self._server = None
+
+    async def _serve(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    break
+                method, target, _ = request_line.decode().split(" ", 2)
+                headers: dict[str, str] = {}
+                while (line := await reader.readline()) not in (b"\r\n", b""):
+                    key, _, value = line.decode().partition(":")
+                    headers[key.strip().lower()] = value.strip()
+                body = await reader.readexactly(int(headers.get("content-length", "0")))
+
+                self.requests += 1
+                self.in_flight += 1
+                self.peak_in_flight = max(self.peak_in_flight, self.in_flight)
+                try:
+                    delay = self.latency + self._rng.uniform(0, self.jitter)
+                    if delay:
+                        await asyncio.sleep(delay)
+                    parts = urlsplit(target)
+                    status, payload = await self.handler(
+                        method, parts.path, parse_qs(parts.query), body
+                    )
+                finally:
+                    self.in_flight -= 1
+
+                data = json.dumps(payload).encode() if payload is not None else b""
+                writer.write(
+                    b"HTTP/1.1 %d OK\r\nContent-Type: application/json\r\n"
+                    b"Content-Length: %d\r\n\r\n%s" % (status, len(data), data)
+                )
+                await writer.drain()
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+
+async def _victoriametrics(method: str, path: str, query: dict, body: bytes) -> tuple[int, object]:
+    return 200, {
+        "status": "success",
+        "data": {"resultType": "vector", "result": [{"metric": {}, "value": [0, "0.42"]}]},
+    }
+
+
+async def _clickhouse(method: str, path: str, query: dict, body: bytes) -> tuple[int, object]:
+    if "query" in query and query["query"][0].startswith("INSERT"):
+        return 200, None
+    # Recent-alert history: one row per requested (alertname, cluster) pair
+    pairs = query.get("param_pairs", ["[]"])[0]
+    rows = []
+    for pair in pairs.strip("[]").split("),("):
+        fields = [f.strip("()'") for f in pair.split("','")]
+        if len(fields) == 2:
+            rows.append({
+                "alert_id": "00000000-0000-0000-0000-000000000000",
+                "timestamp": "2026-01-01 00:00:00.000",
+                "alertname": fields[0],
+                "cluster": fields[1],
+                "status": "resolved",
+                "agent_advisory": "",
+            })
+    return 200, {"data": rows}
+
+
+def victoriametrics_stub(latency: float = 0.0, jitter: float = 0.0) -> StubServer:
+    """Stub answering instant queries with a single sample."""
+    return StubServer("victoriametrics", _victoriametrics, latency, jitter)
+
+
+def clickhouse_stub(latency: float = 0.0, jitter: float = 0.0) -> StubServer:
+    """Stub accepting history INSERTs and answering recent-alert queries."""
+    return StubServer("clickhouse", _clickhouse, latency, jitter)
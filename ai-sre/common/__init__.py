@@ -0,0 +1 @@
+# Shared infrastructure used across AI SRE services
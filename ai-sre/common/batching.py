@@ -0,0 +1,84 @@
+"""Async micro-batching of concurrent per-key lookups into one upstream call."""
+
+import asyncio
+import logging
+from typing import Any, Awaitable, Callable, Hashable, Optional
+
+from .metrics import batcher_batch_size
+
+logger = logging.getLogger(__name__)
+
+
+class AsyncBatcher:
+    """Collects concurrent ``load(key)`` calls into batched ``load_batch(keys)`` calls.
+
+    The first key of a batch starts a short timer (``max_wait`` seconds);
+    every key requested before it fires, or until ``max_batch_size``
+    distinct keys are pending, goes into the same upstream call.
+    Duplicate keys share one slot. ``load_batch`` returns a mapping of
+    key -> value; keys it leaves out resolve to a fresh ``default_factory()``
+    (``None`` without one). If it raises, every caller in the batch gets
+    the exception.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        load_batch: Callable[[list[Hashable]], Awaitable[dict[Hashable, Any]]],
+        max_batch_size: int = 100,
+        max_wait: float = 0.005,
+        default_factory: Optional[Callable[[], Any]] = None,
+    ) -> None:
+        self.name = name
+        self.load_batch = load_batch
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait
+        self.default_factory = default_factory
+        self._pending: dict[Hashable, asyncio.Future[Any]] = {}
+        self._timer: Optional[asyncio.TimerHandle] = None
+        self._tasks: set[asyncio.Task[None]] = set()
+
+    async def load(self, key: Hashable) -> Any:
+        """Return the value for ``key`` from the next batch."""
+        loop = asyncio.get_running_loop()
+        future = self._pending.get(key)
+        if future is None:
+            future = loop.create_future()
+            self._pending[key] = future
+            if len(self._pending) >= self.max_batch_size:
+                self._flush()
+            elif self._timer is None:
+                self._timer = loop.call_later(self.max_wait, self._flush)
+        # A caller that gives up does not cancel the batch for the others
+        return await asyncio.shield(future)
+
+    def _flush(self) -> None:
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        batch, self._pending = self._pending, {}
+        if not batch:
+            return
+        task = asyncio.ensure_future(self._run(batch))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _run(self, batch: dict[Hashable, asyncio.Future[Any]]) -> None:
+        batcher_batch_size.labels(batcher=self.name).observe(len(batch))
+        try:
+            results = await self.load_batch(list(batch))
+        except Exception as e:
+            logger.warning("Batch '%s' of %d keys failed: %s", self.name, len(batch), e)
+            for future in batch.values():
+                if not future.done():
+                    future.set_exception(e)
+                    # Already logged; don't warn again if every caller gave up
+                    future.exception()
+            return
+        for key, future in batch.items():
+            if future.done():
+                continue
+            if key in results:
+                future.set_result(results[key])
+            else:
+                future.set_result(self.default_factory() if self.default_factory else None)
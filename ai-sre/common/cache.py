@@ -0,0 +1,114 @@
+"""Async single-flight TTL cache with a size-bounded LRU."""
+
+import asyncio
+import logging
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Hashable, Optional
+
+from .metrics import (
+    cache_coalesced_total,
+    cache_evictions_total,
+    cache_hits_total,
+    cache_misses_total,
+    cache_stale_served_total,
+)
+
+logger = logging.getLogger(__name__)
+
+
+class AsyncTTLCache:
+    """LRU cache of awaitable results with per-entry TTLs.
+
+    Concurrent ``get_or_load`` calls for the same key share one in-flight
+    load, so a burst of identical lookups reaches the upstream once. The
+    load runs as its own task: a caller that gives up (timeout or
+    cancellation) does not cancel it for the others, and the result still
+    lands in the cache. Failed loads are not cached.
+
+    With ``stale_ttl``, an entry that expired less than ``stale_ttl``
+    seconds ago is still returned by ``get_or_load`` while a reload runs
+    in the background (stale-while-revalidate). If the upstream is down,
+    callers keep getting the last good value until it is that stale.
+    """
+
+    def __init__(
+        self, name: str, maxsize: int = 1024, ttl: float = 30.0, stale_ttl: float = 0.0
+    ) -> None:
+        self.name = name
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.stale_ttl = stale_ttl
+        # key -> (expires_at, value)
+        self._entries: OrderedDict[Hashable, tuple[float, Any]] = OrderedDict()
+        self._inflight: dict[Hashable, asyncio.Future[Any]] = {}
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: Hashable) -> tuple[bool, Any]:
+        """Look up a fresh entry without loading. Returns (found, value)."""
+        entry = self._entries.get(key)
+        if entry is None:
+            return False, None
+        expires_at, value = entry
+        now = time.monotonic()
+        if expires_at <= now:
+            if expires_at + self.stale_ttl <= now:
+                del self._entries[key]
+            return False, None
+        self._entries.move_to_end(key)
+        return True, value
+
+    def put(self, key: Hashable, value: Any, ttl: Optional[float] = None) -> None:
+        """Store a value, evicting least recently used entries past maxsize."""
+        self._entries[key] = (time.monotonic() + (self.ttl if ttl is None else ttl), value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+            cache_evictions_total.labels(cache=self.name).inc()
+
+    def invalidate(self, key: Optional[Hashable] = None) -> None:
+        """Drop one entry, or every entry when no key is given."""
+        if key is None:
+            self._entries.clear()
+        else:
+            self._entries.pop(key, None)
+
+    async def get_or_load(
+        self,
+        key: Hashable,
+        loader: Callable[[], Awaitable[Any]],
+        ttl: Optional[float] = None,
+    ) -> Any:
+        """Return the cached value for ``key``, loading it at most once concurrently."""
+        found, value = self.get(key)
+        if found:
+            cache_hits_total.labels(cache=self.name).inc()
+            return value
+
+        future = self._inflight.get(key)
+        stale = self._entries.get(key)
+        if future is not None:
+            if stale is None:
+                cache_coalesced_total.labels(cache=self.name).inc()
+        else:
+            cache_misses_total.labels(cache=self.name).inc()
+            future = asyncio.ensure_future(loader())
+            self._inflight[key] = future
+            future.add_done_callback(lambda f: self._on_loaded(key, f, ttl))
+        if stale is not None:
+            # Expired, but within stale_ttl (get() dropped it otherwise)
+            cache_stale_served_total.labels(cache=self.name).inc()
+            self._entries.move_to_end(key)
+            return stale[1]
+        return await asyncio.shield(future)
+
+    def _on_loaded(self, key: Hashable, future: asyncio.Future[Any], ttl: Optional[float]) -> None:
+        self._inflight.pop(key, None)
+        if future.cancelled():
+            return
+        if future.exception() is not None:
+            logger.debug("Cache '%s' load failed for %r: %s", self.name, key, future.exception())
+            return
+        self.put(key, future.result(), ttl)
@@ -0,0 +1,100 @@
+"""Polling file watcher for hot-reloading mounted configuration files."""
+
+import asyncio
+import contextlib
+import hashlib
+import logging
+import os
+from typing import Awaitable, Callable, Optional
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_INTERVAL_SECONDS = 10.0
+
+
+class FileWatcher:
+    """Calls ``on_change`` whenever the content of a file changes.
+
+    The file is polled rather than watched with inotify: kubelet updates
+    a ConfigMap mount by swapping the ``..data`` symlink, which an inotify
+    watch on the file path itself never sees. ``os.stat`` follows the
+    symlink, so a swap shows up as a new inode/mtime/size; only then is
+    the file hashed, and ``on_change`` runs only if the content differs,
+    so touching the file or re-mounting identical data reloads nothing.
+
+    A failing ``on_change`` is logged and the new content is still
+    recorded as seen, so a broken file is reported once, not every poll.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        on_change: Callable[[], Awaitable[None]],
+        interval: float = DEFAULT_INTERVAL_SECONDS,
+    ) -> None:
+        self.path = path
+        self.on_change = on_change
+        self.interval = interval
+        self._stat: Optional[tuple[int, int, int]] = None
+        self._digest: Optional[str] = None
+        self._task: Optional[asyncio.Task[None]] = None
+
+    def _read_stat(self) -> Optional[tuple[int, int, int]]:
+        try:
+            st = os.stat(self.path)
+        except OSError:
+            return None
+        return (st.st_ino, st.st_mtime_ns, st.st_size)
+
+    def _read_digest(self) -> Optional[str]:
+        try:
+            with open(self.path, "rb") as f:
+                return hashlib.sha256(f.read()).hexdigest()
+        except OSError:
+            return None
+
+    def snapshot(self) -> None:
+        """Record the current file as seen (e.g. right after the initial load)."""
+        self._stat = self._read_stat()
+        self._digest = self._read_digest()
+
+    async def check(self) -> bool:
+        """Poll once; run ``on_change`` and return True if the content changed."""
+        stat = self._read_stat()
+        if stat is None or stat == self._stat:
+            return False
+        self._stat = stat
+        digest = await asyncio.to_thread(self._read_digest)
+        if digest is None or digest == self._digest:
+            return False
+        self._digest = digest
+        try:
+            await self.on_change()
+        except Exception as e:
+            logger.error("Reload of %s failed: %s", self.path, e)
+        return True
+
+    async def start(self) -> None:
+        """Start polling in the background."""
+        if self._task is not None:
+            return
+        if self._stat is None:
+            self.snapshot()
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """Stop polling."""
+        if self._task is None:
+            return
+        self._task.cancel()
+        with contextlib.suppress(asyncio.CancelledError):
+            await self._task
+        self._task = None
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(self.interval)
+            try:
+                await self.check()
+            except Exception as e:
+                logger.error("Failed to check %s for changes: %s", self.path, e)
@@ -0,0 +1,264 @@
+"""Process-wide pooled HTTP clients, one keep-alive pool per upstream.
+
+Opening a fresh ``httpx.AsyncClient`` per query costs a TCP (and often TLS)
+handshake every time. Callers instead fetch a shared client by upstream
+name:
+
+    client = http_clients.get("victoriametrics")
+    resp = await client.get(f"{VM_URL}/select/0/prometheus/api/v1/query", ...)
+
+Services start and stop the registry from their FastAPI lifespan so pools
+are closed cleanly on shutdown.
+"""
+
+import asyncio
+import logging
+import os
+import time
+from dataclasses import dataclass, replace
+from typing import Any, Optional
+
+import httpx
+
+from .metrics import (
+    http_pool_connections_idle,
+    http_pool_connections_in_use,
+    http_pool_wait_seconds,
+)
+
+logger = logging.getLogger(__name__)
+
+try:
+    import h2  # noqa: F401
+
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
+# Trace events that mark the end of the wait for a pooled connection:
+# either a new connection starts dialing or a reused one starts sending.
+_POOL_ACQUIRED_EVENTS = (
+    "connection.connect_tcp.started",
+    "http11.send_request_headers.started",
+    "http2.send_request_headers.started",
+)
+
+
+@dataclass(frozen=True)
+class UpstreamConfig:
+    """Connection pool and timeout settings for one upstream."""
+
+    name: str
+    timeout: float = 10.0
+    connect_timeout: float = 5.0
+    pool_timeout: float = 5.0
+    max_connections: int = 20
+    max_keepalive_connections: int = 10
+    keepalive_expiry: float = 30.0
+    http2: bool = False
+
+    @classmethod
+    def from_env(cls, name: str, **defaults: Any) -> "UpstreamConfig":
+        """Build a config, letting HTTP_POOL_<NAME>_* env vars override defaults.
+
+        Supported suffixes: TIMEOUT_SECONDS, MAX_CONNECTIONS,
+        MAX_KEEPALIVE_CONNECTIONS, HTTP2.
+        """
+        config = cls(name=name, **defaults)
+        prefix = f"HTTP_POOL_{name.upper()}_"
+        overrides: dict[str, Any] = {}
+        if f"{prefix}TIMEOUT_SECONDS" in os.environ:
+            overrides["timeout"] = float(os.environ[f"{prefix}TIMEOUT_SECONDS"])
+        if f"{prefix}MAX_CONNECTIONS" in os.environ:
+            overrides["max_connections"] = int(os.environ[f"{prefix}MAX_CONNECTIONS"])
+        if f"{prefix}MAX_KEEPALIVE_CONNECTIONS" in os.environ:
+            overrides["max_keepalive_connections"] = int(
+                os.environ[f"{prefix}MAX_KEEPALIVE_CONNECTIONS"]
+            )
+        if f"{prefix}HTTP2" in os.environ:
+            overrides["http2"] = os.environ[f"{prefix}HTTP2"].lower() in ("true", "1", "yes")
+        return replace(config, **overrides) if overrides else config
+
+
+class _PooledTransport(httpx.AsyncBaseTransport):
+    """Wraps the httpx transport to record how long requests wait for a connection."""
+
+    def __init__(self, upstream: str, transport: httpx.AsyncHTTPTransport) -> None:
+        self.upstream = upstream
+        self._transport = transport
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        start = time.monotonic()
+        observed = False
+        parent_trace = request.extensions.get("trace")
+
+        async def trace(event_name: str, info: dict[str, Any]) -> None:
+            nonlocal observed
+            if not observed and event_name in _POOL_ACQUIRED_EVENTS:
+                observed = True
+                http_pool_wait_seconds.labels(upstream=self.upstream).observe(
+                    time.monotonic() - start
+                )
+            if parent_trace is not None:
+                await parent_trace(event_name, info)
+
+        request.extensions = {**request.extensions, "trace": trace}
+        return await self._transport.handle_async_request(request)
+
+    def pool_connections(self) -> list[Any]:
+        """Current connections held by the underlying httpcore pool."""
+        pool = getattr(self._transport, "_pool", None)
+        return list(getattr(pool, "connections", []))
+
+    async def aclose(self) -> None:
+        await self._transport.aclose()
+
+
+class HTTPClientRegistry:
+    """Registry of shared ``httpx.AsyncClient`` instances keyed by upstream name.
+
+    Clients are created lazily on first use, so code running outside a
+    FastAPI lifespan (CLI tools, MCP servers, tests) still gets pooling.
+    A client is bound to the event loop that created it; if a different
+    loop asks for it, a fresh client is built for that loop and the old
+    one is closed.
+    """
+
+    def __init__(self, upstreams: Optional[list[UpstreamConfig]] = None) -> None:
+        self._configs: dict[str, UpstreamConfig] = {}
+        self._clients: dict[str, tuple[httpx.AsyncClient, _PooledTransport, Any]] = {}
+        self._closing: set[asyncio.Task[None]] = set()
+        for config in upstreams or []:
+            self.register(config)
+
+    def register(self, config: UpstreamConfig) -> None:
+        """Register (or replace) the settings for an upstream.
+
+        Takes effect for the next client built for that upstream.
+        """
+        self._configs[config.name] = config
+
+    def get(self, name: str) -> httpx.AsyncClient:
+        """Return the shared client for an upstream, creating it if needed."""
+        try:
+            loop: Any = asyncio.get_running_loop()
+        except RuntimeError:
+            loop = None
+
+        entry = self._clients.get(name)
+        if entry is not None:
+            client, _, owner_loop = entry
+            if owner_loop is loop and not client.is_closed:
+                return client
+            self._discard(client, owner_loop, loop)
+
+        client, transport = self._build(self._configs.get(name) or UpstreamConfig(name=name))
+        self._clients[name] = (client, transport, loop)
+        return client
+
+    def _discard(self, client: httpx.AsyncClient, owner_loop: Any, loop: Any) -> None:
+        """Close a client that is being replaced so its connections are released.
+
+        The close runs on the client's own loop if that loop is still
+        running (in another thread), otherwise on the current one.
+        """
+        if client.is_closed:
+            return
+        if owner_loop is not None and owner_loop is not loop and owner_loop.is_running():
+            asyncio.run_coroutine_threadsafe(self._close(client), owner_loop)
+        elif loop is not None:
+            task = loop.create_task(self._close(client))
+            self._closing.add(task)
+            task.add_done_callback(self._closing.discard)
+        else:
+            asyncio.run(self._close(client))
+
+    @staticmethod
+    async def _close(client: httpx.AsyncClient) -> None:
+        try:
+            await client.aclose()
+        except Exception as e:
+            # Connections opened on a loop that has since closed cannot be
+            # shut down gracefully; their sockets go with the client
+            logger.debug("Failed to close replaced HTTP client: %s", e)
+
+    async def start(self) -> None:
+        """Eagerly create clients for every registered upstream."""
+        for name in self._configs:
+            self.get(name)
+        logger.info(
+            "HTTP client pools started: %s (http2 available: %s)",
+            ", ".join(sorted(self._configs)),
+            HTTP2_AVAILABLE,
+        )
+
+    async def aclose(self) -> None:
+        """Close every pool and drop the clients."""
+        clients = list(self._clients.values())
+        self._clients.clear()
+        for client, _, _ in clients:
+            try:
+                await client.aclose()
+            except Exception as e:
+                logger.warning("Failed to close HTTP client pool: %s", e)
+
+    def pool_stats(self) -> dict[str, dict[str, int]]:
+        """Return in-use and idle connection counts per upstream."""
+        return {name: self._pool_counts(name) for name in self._clients}
+
+    def _pool_counts(self, name: str) -> dict[str, int]:
+        entry = self._clients.get(name)
+        if entry is None:
+            return {"in_use": 0, "idle": 0}
+        connections = entry[1].pool_connections()
+        idle = sum(1 for conn in connections if conn.is_idle())
+        return {"in_use": len(connections) - idle, "idle": idle}
+
+    def _build(
+        self, config: UpstreamConfig
+    ) -> tuple[httpx.AsyncClient, _PooledTransport]:
+        http2 = config.http2 and HTTP2_AVAILABLE
+        if config.http2 and not HTTP2_AVAILABLE:
+            logger.warning(
+                "HTTP/2 requested for upstream '%s' but h2 is not installed; using HTTP/1.1",
+                config.name,
+            )
+
+        transport = _PooledTransport(
+            config.name,
+            httpx.AsyncHTTPTransport(
+                http2=http2,
+                limits=httpx.Limits(
+                    max_connections=config.max_connections,
+                    max_keepalive_connections=config.max_keepalive_connections,
+                    keepalive_expiry=config.keepalive_expiry,
+                ),
+            ),
+        )
+        client = httpx.AsyncClient(
+            transport=transport,
+            timeout=httpx.Timeout(
+                config.timeout,
+                connect=config.connect_timeout,
+                pool=config.pool_timeout,
+            ),
+        )
+
+        http_pool_connections_in_use.labels(upstream=config.name).set_function(
+            lambda: self._pool_counts(config.name)["in_use"]
+        )
+        http_pool_connections_idle.labels(upstream=config.name).set_function(
+            lambda: self._pool_counts(config.name)["idle"]
+        )
+        return client, transport
+
+
+# Process-wide registry with the upstreams used across AI SRE services.
+# HTTP/2 (HTTP_POOL_<NAME>_HTTP2=true) needs the h2 package, which is not a
+# dependency, and is negotiated via ALPN, so it only applies to TLS upstreams.
+http_clients = HTTPClientRegistry([
+    UpstreamConfig.from_env("victoriametrics", timeout=10.0, max_connections=50),
+    UpstreamConfig.from_env("clickhouse", timeout=10.0, max_connections=20),
+    UpstreamConfig.from_env("omniscience", timeout=5.0, max_connections=20),
+    UpstreamConfig.from_env("orchestrator", timeout=5.0, max_connections=10),
+])
@@ -0,0 +1,59 @@
+"""Prometheus metrics for shared AI SRE infrastructure."""
+
+from prometheus_client import Counter, Gauge, Histogram
+
+http_pool_connections_in_use = Gauge(
+    "ai_sre_http_pool_connections_in_use",
+    "HTTP connections currently serving a request, per upstream pool",
+    ["upstream"],
+)
+
+http_pool_connections_idle = Gauge(
+    "ai_sre_http_pool_connections_idle",
+    "Idle keep-alive HTTP connections, per upstream pool",
+    ["upstream"],
+)
+
+http_pool_wait_seconds = Histogram(
+    "ai_sre_http_pool_wait_seconds",
+    "Time a request waited for a pooled connection before sending, per upstream",
+    ["upstream"],
+    buckets=[0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1, 5],
+)
+
+cache_hits_total = Counter(
+    "ai_sre_cache_hits_total",
+    "Cache lookups served from a fresh entry",
+    ["cache"],
+)
+
+cache_misses_total = Counter(
+    "ai_sre_cache_misses_total",
+    "Cache lookups that triggered an upstream load",
+    ["cache"],
+)
+
+cache_coalesced_total = Counter(
+    "ai_sre_cache_coalesced_total",
+    "Cache lookups that joined an in-flight load for the same key",
+    ["cache"],
+)
+
+cache_stale_served_total = Counter(
+    "ai_sre_cache_stale_served_total",
+    "Cache lookups answered with an expired entry while it was reloaded",
+    ["cache"],
+)
+
+cache_evictions_total = Counter(
+    "ai_sre_cache_evictions_total",
+    "Entries evicted from a cache because it reached its size bound",
+    ["cache"],
+)
+
+batcher_batch_size = Histogram(
+    "ai_sre_batcher_batch_size",
+    "Distinct keys per batched upstream call",
+    ["batcher"],
+    buckets=[1, 2, 5, 10, 25, 50, 100, 250, 500],
+)
@@ -0,0 +1,168 @@
+"""Shared Omniscience Graph client with cached, coalesced and batched lookups.
+
+Every lookup goes through one process-wide client per (URL, token), see
+``omniscience_client``:
+
+- Results are kept in a TTL + LRU cache (``AsyncTTLCache``); identical
+  concurrent lookups share one request, and expired entries keep being
+  served for ``stale_ttl`` seconds while they are refetched, so an
+  Omniscience outage does not blank out enrichment.
+- Node and PVC context lookups issued together (e.g. every node of a
+  multi-node investigation) are coalesced by an ``AsyncBatcher`` into one
+  request per cluster to the batch endpoint::
+
+      POST {path}/batch  {"cluster": c, "keys": [{"node_name": n}, ...]}
+      -> {"results": [context or null, ...]}   (same order as "keys")
+
+  If the batch endpoint is not available (404/405/501), the client falls
+  back to concurrent per-key GETs for the rest of the process lifetime.
+"""
+
+import asyncio
+import logging
+import os
+from functools import partial
+from typing import Any, Hashable, Optional
+
+from .batching import AsyncBatcher
+from .cache import AsyncTTLCache
+from .http_clients import http_clients
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_TTL_SECONDS = float(os.environ.get("OMNISCIENCE_CACHE_TTL_SECONDS", "60"))
+DEFAULT_STALE_TTL_SECONDS = float(os.environ.get("OMNISCIENCE_STALE_TTL_SECONDS", "900"))
+DEFAULT_CACHE_SIZE = int(os.environ.get("OMNISCIENCE_CACHE_SIZE", "8192"))
+BATCH_WINDOW_SECONDS = float(os.environ.get("OMNISCIENCE_BATCH_WINDOW_MS", "5")) / 1000
+BATCH_SIZE = int(os.environ.get("OMNISCIENCE_BATCH_SIZE", "100"))
+
+DEPENDENCIES_PATH = "/api/v1/graph/dependencies"
+NODE_CONTEXT_PATH = "/api/v1/graph/node-context"
+PVC_CONTEXT_PATH = "/api/v1/graph/pvc-context"
+
+# Status codes meaning the batch endpoint does not exist on this server
+_BATCH_UNSUPPORTED = frozenset({404, 405, 501})
+
+
+class OmniscienceClient:
+    """Cached, coalescing client for Omniscience Graph lookups."""
+
+    def __init__(
+        self,
+        base_url: str,
+        token: str,
+        ttl: float = DEFAULT_TTL_SECONDS,
+        stale_ttl: float = DEFAULT_STALE_TTL_SECONDS,
+        maxsize: int = DEFAULT_CACHE_SIZE,
+    ) -> None:
+        self.base_url = base_url.rstrip("/")
+        self.token = token
+        self.cache = AsyncTTLCache("omniscience", maxsize=maxsize, ttl=ttl, stale_ttl=stale_ttl)
+        # Paths whose batch endpoint has not been found missing
+        self._batch_paths = {NODE_CONTEXT_PATH, PVC_CONTEXT_PATH}
+        self._node_batcher = AsyncBatcher(
+            "omniscience_nodes",
+            partial(self._load_batch, NODE_CONTEXT_PATH, ("node_name",)),
+            max_batch_size=BATCH_SIZE,
+            max_wait=BATCH_WINDOW_SECONDS,
+        )
+        self._pvc_batcher = AsyncBatcher(
+            "omniscience_pvcs",
+            partial(self._load_batch, PVC_CONTEXT_PATH, ("namespace", "pvc_name")),
+            max_batch_size=BATCH_SIZE,
+            max_wait=BATCH_WINDOW_SECONDS,
+        )
+
+    @property
+    def _headers(self) -> dict[str, str]:
+        return {"Authorization": f"Bearer {self.token}"}
+
+    async def _get(self, path: str, params: dict[str, str]) -> Optional[dict[str, Any]]:
+        """GET a graph resource: its JSON, None if unknown (404). Raises on errors."""
+        client = http_clients.get("omniscience")
+        response = await client.get(
+            f"{self.base_url}{path}", params=params, headers=self._headers
+        )
+        if response.status_code == 404:
+            return None
+        response.raise_for_status()
+        return response.json()
+
+    async def get_dependencies(self, cluster: str) -> Optional[list[str]]:
+        """Upstream dependencies of a cluster, or None if Omniscience does not know it."""
+        data = await self.cache.get_or_load(
+            ("dependencies", cluster),
+            partial(self._get, DEPENDENCIES_PATH, {"cluster": cluster}),
+        )
+        return None if data is None else data.get("dependencies", [])
+
+    async def get_node_context(self, cluster: str, node_name: str) -> Optional[dict[str, Any]]:
+        """EC2 context of a Kubernetes node, or None if unknown."""
+        return await self.cache.get_or_load(
+            ("node", cluster, node_name),
+            partial(self._node_batcher.load, (cluster, node_name)),
+        )
+
+    async def get_pvc_context(
+        self, cluster: str, namespace: str, pvc_name: str
+    ) -> Optional[dict[str, Any]]:
+        """EBS context of a PVC, or None if unknown."""
+        return await self.cache.get_or_load(
+            ("pvc", cluster, namespace, pvc_name),
+            partial(self._pvc_batcher.load, (cluster, namespace, pvc_name)),
+        )
+
+    async def _load_batch(
+        self, path: str, fields: tuple[str, ...], keys: list[Hashable]
+    ) -> dict[Hashable, Any]:
+        """Resolve (cluster, *fields) keys with one request per cluster."""
+        by_cluster: dict[str, list[tuple[str, ...]]] = {}
+        for key in keys:
+            assert isinstance(key, tuple)
+            by_cluster.setdefault(key[0], []).append(key)
+        results: dict[Hashable, Any] = {}
+        for part in await asyncio.gather(*(
+            self._load_cluster(path, fields, cluster, cluster_keys)
+            for cluster, cluster_keys in by_cluster.items()
+        )):
+            results.update(part)
+        return results
+
+    async def _load_cluster(
+        self,
+        path: str,
+        fields: tuple[str, ...],
+        cluster: str,
+        keys: list[tuple[str, ...]],
+    ) -> dict[Hashable, Any]:
+        queries = [dict(zip(fields, key[1:], strict=True)) for key in keys]
+        if path in self._batch_paths:
+            client = http_clients.get("omniscience")
+            response = await client.post(
+                f"{self.base_url}{path}/batch",
+                json={"cluster": cluster, "keys": queries},
+                headers=self._headers,
+            )
+            if response.status_code in _BATCH_UNSUPPORTED:
+                logger.info("Omniscience has no batch endpoint for %s, using single lookups", path)
+                self._batch_paths.discard(path)
+            else:
+                response.raise_for_status()
+                return dict(zip(keys, response.json().get("results", []), strict=True))
+
+        values = await asyncio.gather(*(
+            self._get(path, {**query, "cluster": cluster}) for query in queries
+        ))
+        return dict(zip(keys, values, strict=True))
+
+
+_clients: dict[tuple[str, str], OmniscienceClient] = {}
+
+
+def omniscience_client(base_url: str, token: str) -> OmniscienceClient:
+    """The process-wide client for an Omniscience endpoint and token."""
+    key = (base_url, token)
+    client = _clients.get(key)
+    if client is None:
+        client = _clients[key] = OmniscienceClient(base_url, token)
+    return client
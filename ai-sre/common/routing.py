@@ -0,0 +1,160 @@
+"""Declarative alert routing shared by ingestion and the orchestrator.
+
+The routing table (``routing.yaml`` next to this module, or the file in
+ALERT_ROUTING_TABLE) is compiled once into:
+
+- a prefix trie over alertname prefixes, so the prefix rules matching a
+  name are found in one walk of the name instead of one ``startswith``
+  per prefix per rule;
+- a list of precompiled regexes;
+- a per-alertname memo of candidate rules (both of the above), since a
+  fleet emits a few hundred distinct alertnames at most.
+
+Per call, only the memoized candidates' label matchers are checked.
+"""
+
+import functools
+import logging
+import os
+import re
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Optional
+
+import yaml
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_ROUTING_TABLE = Path(__file__).with_name("routing.yaml")
+
+# Distinct alertnames whose candidate rules are memoized
+DEFAULT_MEMO_SIZE = 8192
+
+
+@dataclass(frozen=True)
+class RoutingRule:
+    """One routing table entry."""
+
+    name: str
+    target: str
+    prefixes: tuple[str, ...] = ()
+    regex: tuple[str, ...] = ()
+    labels: dict[str, str] = field(default_factory=dict)
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any], index: int) -> "RoutingRule":
+        if "target" not in data:
+            raise ValueError(f"Routing rule #{index} has no target")
+        return cls(
+            name=str(data.get("name", f"rule-{index}")),
+            target=str(data["target"]),
+            prefixes=tuple(p.lower() for p in data.get("prefixes", []) or []),
+            regex=tuple(data.get("regex", []) or []),
+            labels={str(k): str(v) for k, v in (data.get("labels") or {}).items()},
+        )
+
+
+class _TrieNode:
+    __slots__ = ("children", "rules")
+
+    def __init__(self) -> None:
+        self.children: dict[str, _TrieNode] = {}
+        self.rules: list[int] = []
+
+
+class AlertRouter:
+    """Compiled routing table. Returns target agent names (e.g. ``gpu-health``)."""
+
+    def __init__(
+        self,
+        rules: list[RoutingRule],
+        default: str,
+        severity_overrides: Optional[dict[str, str]] = None,
+        memo_size: int = DEFAULT_MEMO_SIZE,
+    ) -> None:
+        self.rules = rules
+        self.default = default
+        self.severity_overrides = severity_overrides or {}
+
+        self._trie = _TrieNode()
+        self._regexes: list[tuple[int, re.Pattern[str]]] = []
+        # Rules with no alertname condition are candidates for every name
+        self._unconditional: list[int] = []
+        for index, rule in enumerate(rules):
+            for prefix in rule.prefixes:
+                node = self._trie
+                for char in prefix:
+                    node = node.children.setdefault(char, _TrieNode())
+                node.rules.append(index)
+            for pattern in rule.regex:
+                self._regexes.append((index, re.compile(pattern)))
+            if not rule.prefixes and not rule.regex:
+                self._unconditional.append(index)
+
+        self._candidates = functools.lru_cache(maxsize=memo_size)(self._match_name)
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any], **kwargs: Any) -> "AlertRouter":
+        """Build a router from a parsed routing table."""
+        rules = [
+            RoutingRule.from_dict(rule, index)
+            for index, rule in enumerate(data.get("rules", []) or [])
+        ]
+        return cls(
+            rules,
+            default=str(data.get("default", "oncall-copilot")),
+            severity_overrides={
+                str(k): str(v) for k, v in (data.get("severity_overrides") or {}).items()
+            },
+            **kwargs,
+        )
+
+    @classmethod
+    def from_file(cls, path: str | Path, **kwargs: Any) -> "AlertRouter":
+        """Load and compile a YAML routing table."""
+        with open(path) as f:
+            data = yaml.safe_load(f) or {}
+        router = cls.from_dict(data, **kwargs)
+        logger.info("Loaded routing table from %s: %d rules", path, len(router.rules))
+        return router
+
+    def _match_name(self, name: str) -> tuple[int, ...]:
+        """Indices of rules whose alertname condition matches, in table order."""
+        matched = set(self._unconditional)
+        node = self._trie
+        for char in name:
+            node = node.children.get(char)
+            if node is None:
+                break
+            matched.update(node.rules)
+        for index, pattern in self._regexes:
+            if index not in matched and pattern.match(name):
+                matched.add(index)
+        return tuple(sorted(matched))
+
+    def match(
+        self, alertname: str, labels: Optional[dict[str, str]] = None
+    ) -> Optional[RoutingRule]:
+        """First rule matching the alert, or None."""
+        labels = labels or {}
+        for index in self._candidates(alertname.lower()):
+            rule = self.rules[index]
+            if all(labels.get(k) == v for k, v in rule.labels.items()):
+                return rule
+        return None
+
+    def route(self, alertname: str, labels: Optional[dict[str, str]] = None) -> str:
+        """Target agent for an alert: first matching rule, severity override, or default."""
+        rule = self.match(alertname, labels)
+        if rule is not None:
+            return rule.target
+        severity = (labels or {}).get("severity", "")
+        return self.severity_overrides.get(severity, self.default)
+
+
+@functools.lru_cache(maxsize=1)
+def get_router() -> AlertRouter:
+    """The process-wide router for ALERT_ROUTING_TABLE (or the bundled table)."""
+    return AlertRouter.from_file(
+        os.environ.get("ALERT_ROUTING_TABLE", "") or DEFAULT_ROUTING_TABLE
+    )
@@ -1,31 +1,64 @@
 """Alert ingestion API — receives Alertmanager webhooks and triggers agent investigations."""
 
+import asyncio
 import logging
 import os
 import time
 from contextlib import asynccontextmanager
 from typing import Any
+from uuid import uuid4
 
 import structlog
-from fastapi import FastAPI, HTTPException, Request
+from fastapi import FastAPI, HTTPException, Request, Response
 from fastapi.middleware.trustedhost import TrustedHostMiddleware
 from prometheus_client import make_asgi_app
 
+from common.file_watcher import DEFAULT_INTERVAL_SECONDS, FileWatcher
+from common.http_clients import http_clients
+from memory.burn_rate import DEFAULT_REFRESH_SECONDS, BurnRateEngine
+from memory.slo_store import SLOStore
+from memory.topology_store import TopologyStore
+
+from .correlation import CORRELATION_WINDOW_SECONDS, AlertCorrelator
 from .dedup import AlertDeduplicator
-from .enrichment import enrich_alert
+from .dedup_backend import DedupBackend, InMemoryDedupBackend, create_dedup_backend
+from .enrichment import CLICKHOUSE_URL, enrich_alert
+from .handoff import hand_off_to_orchestrator
+from .history import (
+    DEFAULT_BATCH_SIZE,
+    DEFAULT_FLUSH_INTERVAL_SECONDS,
+    AlertHistoryWriter,
+)
 from .metrics import (
     alert_enrichment_duration_seconds,
+    alert_ttfr_seconds,
+    alerts_correlated_total,
     alerts_deduplicated_total,
     alerts_received_total,
+    alerts_resolved_total,
+    webhook_batch_duration_seconds,
     webhook_requests_total,
 )
 from .models import (
-    AlertmanagerWebhook,
+    AlertRouteTarget,
     AlertSeverity,
     AlertStatus,
     EnrichedAlert,
 )
+from .queue import (
+    DEFAULT_DRAIN_TIMEOUT_SECONDS,
+    DEFAULT_QUEUE_SIZE,
+    DEFAULT_QUEUE_WORKERS,
+    AlertQueue,
+    PendingAlert,
+)
+from .ratelimit import (
+    DEFAULT_ALERTS_PER_MINUTE,
+    DEFAULT_CRITICAL_ALERTS_PER_MINUTE,
+    AlertRateLimiter,
+)
 from .router import route_alert
+from .webhook_parser import WebhookAlert, WebhookParseError, WebhookStreamParser
 
 structlog.configure(
     processors=[
@@ -38,33 +71,144 @@ structlog.configure(
 logger = structlog.get_logger()
 
 # Configuration
-RATE_LIMIT_PER_MINUTE = int(os.environ.get("ALERT_RATE_LIMIT", "100"))
+RATE_LIMIT_PER_MINUTE = int(
+    os.environ.get("ALERT_RATE_LIMIT", str(DEFAULT_ALERTS_PER_MINUTE))
+)
+CRITICAL_RATE_LIMIT_PER_MINUTE = int(
+    os.environ.get("ALERT_RATE_LIMIT_CRITICAL", str(DEFAULT_CRITICAL_ALERTS_PER_MINUTE))
+)
 WEBHOOK_SECRET = os.environ.get("WEBHOOK_SECRET", "")
+ENRICHMENT_CONCURRENCY = int(os.environ.get("ENRICHMENT_CONCURRENCY", "16"))
+INGESTION_MODE = os.environ.get("INGESTION_MODE", "sync")  # sync | queue
+DEDUP_BACKEND = os.environ.get("DEDUP_BACKEND", "memory")  # memory | redis
+DEDUP_REDIS_URL = os.environ.get("DEDUP_REDIS_URL", "")
+CORRELATION_WINDOW = int(
+    os.environ.get("CORRELATION_WINDOW_SECONDS", str(CORRELATION_WINDOW_SECONDS))
+)
+TOPOLOGY_PATH = os.environ.get("TOPOLOGY_PATH", "")
+# Seconds between checks of TOPOLOGY_PATH for edits; 0 disables hot reload
+TOPOLOGY_RELOAD_SECONDS = float(
+    os.environ.get("TOPOLOGY_RELOAD_SECONDS", str(DEFAULT_INTERVAL_SECONDS))
+)
+SLO_PATH = os.environ.get("SLO_PATH", "")
+# Seconds between checks of SLO_PATH for edits; 0 disables hot reload
+SLO_RELOAD_SECONDS = float(os.environ.get("SLO_RELOAD_SECONDS", str(DEFAULT_INTERVAL_SECONDS)))
+# Seconds between SLI refreshes of the burn-rate engine
+SLO_REFRESH_SECONDS = float(
+    os.environ.get("SLO_REFRESH_SECONDS", str(DEFAULT_REFRESH_SECONDS))
+)
+ALERT_HISTORY_ENABLED = os.environ.get("ALERT_HISTORY_ENABLED", "true").lower() == "true"
+ALERT_HISTORY_SPILL_DIR = os.environ.get(
+    "ALERT_HISTORY_SPILL_DIR", "/var/spool/ai-sre/alert-history"
+)
+ALERT_HISTORY_BATCH_SIZE = int(
+    os.environ.get("ALERT_HISTORY_BATCH_SIZE", str(DEFAULT_BATCH_SIZE))
+)
+ALERT_HISTORY_FLUSH_SECONDS = float(
+    os.environ.get("ALERT_HISTORY_FLUSH_SECONDS", str(DEFAULT_FLUSH_INTERVAL_SECONDS))
+)
+ALERT_QUEUE_SIZE = int(os.environ.get("ALERT_QUEUE_SIZE", str(DEFAULT_QUEUE_SIZE)))
+ALERT_QUEUE_WORKERS = int(os.environ.get("ALERT_QUEUE_WORKERS", str(DEFAULT_QUEUE_WORKERS)))
+ALERT_QUEUE_DRAIN_SECONDS = float(
+    os.environ.get("ALERT_QUEUE_DRAIN_SECONDS", str(DEFAULT_DRAIN_TIMEOUT_SECONDS))
+)
 
 # Global state
 deduplicator = AlertDeduplicator()
-_request_timestamps: list[float] = []
+dedup_backend: DedupBackend = InMemoryDedupBackend(deduplicator)
+topology_store = TopologyStore(TOPOLOGY_PATH) if TOPOLOGY_PATH else None
+burn_rate_engine = BurnRateEngine(SLOStore(SLO_PATH)) if SLO_PATH else None
+correlator = AlertCorrelator(
+    window_seconds=CORRELATION_WINDOW,
+    topology=topology_store,
+)
+rate_limiter = AlertRateLimiter(
+    alerts_per_minute=RATE_LIMIT_PER_MINUTE,
+    critical_per_minute=CRITICAL_RATE_LIMIT_PER_MINUTE,
+)
+alert_queue: AlertQueue | None = None
+history_writer: AlertHistoryWriter | None = None
+topology_watcher: FileWatcher | None = None
+slo_watcher: FileWatcher | None = None
+
 
+async def _reload_topology() -> None:
+    """Swap in the edited topology file and re-derive correlation adjacency."""
+    assert topology_store is not None
+    if await topology_store.reload_from_file(TOPOLOGY_PATH) is not None:
+        correlator.load_topology(topology_store)
 
-def check_rate_limit() -> bool:
-    """Simple sliding-window rate limiter."""
-    now = time.time()
-    cutoff = now - 60
-    # Remove old timestamps
-    while _request_timestamps and _request_timestamps[0] < cutoff:
-        _request_timestamps.pop(0)
-    if len(_request_timestamps) >= RATE_LIMIT_PER_MINUTE:
-        return False
-    _request_timestamps.append(now)
-    return True
+
+async def _reload_slos() -> None:
+    """Swap in the edited SLO file; the burn-rate engine follows on its next refresh."""
+    assert burn_rate_engine is not None
+    await burn_rate_engine.store.reload_from_file(SLO_PATH)
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """Application lifespan."""
-    logger.info("alert_ingestion_starting", rate_limit=RATE_LIMIT_PER_MINUTE)
+    global alert_queue, dedup_backend, history_writer, topology_watcher, slo_watcher
+
+    logger.info(
+        "alert_ingestion_starting",
+        mode=INGESTION_MODE,
+        dedup_backend=DEDUP_BACKEND,
+        correlation_window=CORRELATION_WINDOW,
+        rate_limit=RATE_LIMIT_PER_MINUTE,
+        critical_rate_limit=CRITICAL_RATE_LIMIT_PER_MINUTE,
+        enrichment_concurrency=ENRICHMENT_CONCURRENCY,
+        alert_history=ALERT_HISTORY_ENABLED,
+        slo_tracking=burn_rate_engine is not None,
+    )
+    await http_clients.start()
+    dedup_backend = create_dedup_backend(DEDUP_BACKEND, deduplicator, DEDUP_REDIS_URL)
+    if ALERT_HISTORY_ENABLED:
+        history_writer = AlertHistoryWriter(
+            CLICKHOUSE_URL,
+            spill_dir=ALERT_HISTORY_SPILL_DIR,
+            batch_size=ALERT_HISTORY_BATCH_SIZE,
+            flush_interval=ALERT_HISTORY_FLUSH_SECONDS,
+        )
+        await history_writer.start()
+    if INGESTION_MODE == "queue":
+        alert_queue = AlertQueue(
+            _process_queued,
+            maxsize=ALERT_QUEUE_SIZE,
+            workers=ALERT_QUEUE_WORKERS,
+        )
+        await alert_queue.start()
+    if topology_store is not None and TOPOLOGY_RELOAD_SECONDS > 0:
+        topology_watcher = FileWatcher(
+            TOPOLOGY_PATH, _reload_topology, interval=TOPOLOGY_RELOAD_SECONDS
+        )
+        await topology_watcher.start()
+    if burn_rate_engine is not None:
+        await burn_rate_engine.start(SLO_REFRESH_SECONDS)
+        if SLO_RELOAD_SECONDS > 0:
+            slo_watcher = FileWatcher(SLO_PATH, _reload_slos, interval=SLO_RELOAD_SECONDS)
+            await slo_watcher.start()
+
     yield
+
     logger.info("alert_ingestion_stopping")
+    if slo_watcher is not None:
+        await slo_watcher.stop()
+        slo_watcher = None
+    if burn_rate_engine is not None:
+        await burn_rate_engine.stop()
+    if topology_watcher is not None:
+        await topology_watcher.stop()
+        topology_watcher = None
+    if alert_queue is not None:
+        # Drain before closing the pools the workers depend on
+        await alert_queue.drain(timeout=ALERT_QUEUE_DRAIN_SECONDS)
+        alert_queue = None
+    if history_writer is not None:
+        await history_writer.stop()
+        history_writer = None
+    await dedup_backend.close()
+    await http_clients.aclose()
 
 
 app = FastAPI(
@@ -90,34 +234,29 @@ async def readyz():
     return {"status": "ready"}
 
 
-@app.post("/api/v1/alerts")
-async def receive_alerts(
-    webhook: AlertmanagerWebhook,
-    request: Request,
-) -> dict[str, Any]:
-    """Receive alerts from Alertmanager webhook.
-
-    Accepts both VictoriaMetrics VMAlertmanager and Prometheus Alertmanager
-    webhook format. Each alert is:
-    1. Rate-limited (100/min default)
-    2. Deduplicated (5-min window by alertname+cluster+namespace)
-    3. Enriched with context (resource utilization, recent similar alerts)
-    4. Routed to the appropriate specialized agent
+async def _admit_batch(
+    receiver: str,
+    alerts: list[WebhookAlert],
+) -> tuple[list[PendingAlert], int, int, int, int]:
+    """Deduplicate, correlate and rate-limit a webhook batch.
+
+    Returns (alerts to investigate, deduplicated count, correlated count,
+    rate-limited count, resolved count). The whole batch is
+    checked-and-marked against the dedup backend in one call, so later
+    alerts of the same group within this batch are deduplicated exactly as
+    in sequential processing. Alerts that claim a new dedup group but
+    correlate with an open correlation group join it instead of starting
+    an investigation; the dedup claim is kept, since the group is covered.
+    In sync mode, only alerts that would start an investigation consume
+    rate limit budget; claims for rate-limited alerts are released, so the
+    next alert for the group gets another chance. Queue mode skips the
+    rate limiter: the queue's capacity is its only backpressure. Resolved
+    alerts never reach enrichment: they update their dedup group (see
+    _resolve_alerts) once the batch's firing alerts have been claimed.
     """
-    # Rate limiting
-    if not check_rate_limit():
-        webhook_requests_total.labels(status="rate_limited").inc()
-        raise HTTPException(
-            status_code=429,
-            detail="Rate limit exceeded. Max 100 alerts/minute.",
-        )
-
-    webhook_requests_total.labels(status="accepted").inc()
-
-    processed = []
-    deduplicated = 0
-
-    for alert in webhook.alerts:
+    parsed: list[tuple[WebhookAlert, str, str, str | None, AlertSeverity]] = []
+    resolved: list[tuple[WebhookAlert, str, str, str | None, AlertSeverity]] = []
+    for alert in alerts:
         alertname = alert.labels.get("alertname", "unknown")
         cluster = alert.labels.get("cluster", "unknown")
         namespace = alert.labels.get("namespace")
@@ -133,15 +272,29 @@ async def receive_alerts(
         alerts_received_total.labels(
             cluster=cluster, severity=severity.value
         ).inc()
+        entry = (alert, alertname, cluster, namespace, severity)
+        (resolved if alert.status == AlertStatus.RESOLVED.value else parsed).append(entry)
 
-        # Deduplication
-        should_investigate, group_key = deduplicator.should_investigate(
-            alertname, cluster, namespace
-        )
+    # Deduplication
+    claims = await dedup_backend.claim_batch(
+        [(alertname, cluster, namespace) for _, alertname, cluster, namespace, _ in parsed],
+        [alert.fingerprint for alert, *_ in parsed],
+    )
+
+    pending: list[PendingAlert] = []
+    released: list[str] = []
+    deduplicated = 0
+    correlated = 0
 
-        if not should_investigate:
+    for (alert, alertname, cluster, namespace, severity), (claimed, group_key) in zip(
+        parsed, claims, strict=True
+    ):
+        if not claimed:
             alerts_deduplicated_total.inc()
             deduplicated += 1
+            _record_history(
+                alert, alertname, cluster, namespace, severity, group_key, "deduplicated"
+            )
             logger.info(
                 "alert_deduplicated",
                 alertname=alertname,
@@ -151,53 +304,330 @@ async def receive_alerts(
             )
             continue
 
-        # Enrichment
-        enrich_start = time.time()
-        enrichment = await enrich_alert(alertname, cluster, namespace, alert.labels)
-        alert_enrichment_duration_seconds.observe(time.time() - enrich_start)
+        # Correlation
+        group = correlator.correlate(
+            group_key, cluster, namespace, alert.labels, alert.fingerprint
+        )
+        if group is not None:
+            alerts_correlated_total.inc()
+            correlated += 1
+            _record_history(
+                alert,
+                alertname,
+                cluster,
+                namespace,
+                severity,
+                group_key,
+                "correlated",
+                correlation_group=group.group_id,
+            )
+            logger.info(
+                "alert_correlated",
+                alertname=alertname,
+                cluster=cluster,
+                namespace=namespace,
+                group_key=group_key,
+                correlation_group=group.group_id,
+                root_group=group.root_group_key,
+            )
+            continue
+
+        # In queue mode the queue's capacity is the only backpressure
+        if alert_queue is None and not rate_limiter.allow(receiver, cluster, severity):
+            released.append(group_key)
+            logger.warning(
+                "alert_rate_limited",
+                alertname=alertname,
+                cluster=cluster,
+                severity=severity.value,
+                receiver=receiver,
+            )
+            continue
 
-        # Create enriched alert
-        enriched = EnrichedAlert(
+        group = correlator.open_group(
+            group_key, cluster, namespace, alert.labels, alert.fingerprint
+        )
+        pending.append(PendingAlert(
+            alert=alert,
             alertname=alertname,
             cluster=cluster,
             namespace=namespace,
             severity=severity,
-            status=AlertStatus.FIRING,
-            labels=alert.labels,
-            annotations=alert.annotations,
-            fingerprint=alert.fingerprint,
-            enrichment_data=enrichment,
-            dedup_group=group_key,
-        )
+            group_key=group_key,
+            correlation_group=group.group_id,
+        ))
+
+    await dedup_backend.release_batch(released)
+    if resolved:
+        await _resolve_alerts(resolved)
+    return pending, deduplicated, correlated, len(released), len(resolved)
 
-        # Route to agent
-        target = route_alert(alertname, alert.labels)
 
-        # Mark as investigating
-        deduplicator.mark_investigated(group_key)
+async def _resolve_alerts(
+    resolved: list[tuple[WebhookAlert, str, str, str | None, AlertSeverity]],
+) -> None:
+    """Apply resolved alerts to their dedup groups.
 
+    Each alert is an O(1) update of its group; when the last firing alert
+    of a group resolves, the group's queued or in-flight work is cancelled,
+    the correlation group it rooted is closed, and its time to resolution
+    (from the group's first-seen timestamp) is recorded.
+    """
+    results = await dedup_backend.resolve_batch([
+        (alertname, cluster, namespace, alert.fingerprint)
+        for alert, alertname, cluster, namespace, _ in resolved
+    ])
+    for (alert, alertname, cluster, namespace, severity), (group_key, closed, ttfr) in zip(
+        resolved, results, strict=True
+    ):
+        alerts_resolved_total.labels(cluster=cluster).inc()
+        cancelled = 0
+        if closed:
+            if alert_queue is not None:
+                cancelled = alert_queue.cancel_group(group_key)
+            correlator.close_group(group_key)
+            if ttfr is not None:
+                alert_ttfr_seconds.observe(ttfr)
+        _record_history(
+            alert,
+            alertname,
+            cluster,
+            namespace,
+            severity,
+            group_key,
+            "resolved",
+            status=AlertStatus.RESOLVED,
+            ttfr_seconds=ttfr,
+        )
         logger.info(
-            "alert_routed",
-            alert_id=str(enriched.alert_id),
+            "alert_resolved",
             alertname=alertname,
             cluster=cluster,
             namespace=namespace,
-            severity=severity.value,
-            target=target.value,
+            group_key=group_key,
+            group_resolved=closed,
+            ttfr_seconds=ttfr,
+            cancelled=cancelled,
+        )
+
+
+def _record_history(
+    alert: WebhookAlert,
+    alertname: str,
+    cluster: str,
+    namespace: str | None,
+    severity: AlertSeverity,
+    group_key: str,
+    outcome: str,
+    correlation_group: str | None = None,
+    status: AlertStatus = AlertStatus.FIRING,
+    ttfr_seconds: float | None = None,
+) -> None:
+    """Record an alert that will not be enriched in the alert history."""
+    if history_writer is None:
+        return
+    history_writer.record(
+        alert_id=str(uuid4()),
+        alertname=alertname,
+        cluster=cluster,
+        namespace=namespace,
+        severity=severity.value,
+        status=status.value,
+        labels=alert.labels,
+        outcome=outcome,
+        dedup_group=group_key,
+        correlation_group=correlation_group,
+        ttfr_seconds=ttfr_seconds,
+    )
+
+
+async def _enrich(item: PendingAlert) -> dict[str, Any]:
+    """Enrich a pending alert, recording enrichment latency."""
+    enrich_start = time.time()
+    enrichment = await enrich_alert(
+        item.alertname, item.cluster, item.namespace, item.alert.labels
+    )
+    alert_enrichment_duration_seconds.observe(time.time() - enrich_start)
+    return enrichment
+
+
+def _route(
+    item: PendingAlert, enrichment: dict[str, Any]
+) -> tuple[EnrichedAlert, AlertRouteTarget]:
+    """Build the enriched alert and pick its target agent."""
+    # Fields are already validated; skip a second validation and copy
+    enriched = EnrichedAlert.model_construct(
+        alertname=item.alertname,
+        cluster=item.cluster,
+        namespace=item.namespace,
+        severity=item.severity,
+        status=AlertStatus.FIRING,
+        labels=item.alert.labels,
+        annotations=item.alert.annotations,
+        fingerprint=item.alert.fingerprint,
+        enrichment_data=enrichment,
+        dedup_group=item.group_key,
+        correlation_group=item.correlation_group,
+    )
+
+    target = route_alert(item.alertname, item.alert.labels)
+    if history_writer is not None:
+        history_writer.record_enriched(enriched)
+
+    logger.info(
+        "alert_routed",
+        alert_id=str(enriched.alert_id),
+        alertname=item.alertname,
+        cluster=item.cluster,
+        namespace=item.namespace,
+        severity=item.severity.value,
+        target=target.value,
+    )
+    return enriched, target
+
+
+async def _process_queued(item: PendingAlert) -> None:
+    """Queue worker handler: enrich, route and hand off to the orchestrator."""
+    enrichment = await _enrich(item)
+    enriched, target = _route(item, enrichment)
+    await hand_off_to_orchestrator(enriched, target)
+
+
+async def _accept_queued(
+    receiver: str, alerts: list[WebhookAlert], queue: AlertQueue, response: Response
+) -> dict[str, Any]:
+    """Admit a batch whose queue room is already reserved and enqueue it (202)."""
+    batch_start = time.time()
+    pending, deduplicated, correlated, rate_limited, resolved = await _admit_batch(
+        receiver, alerts
+    )
+    webhook_requests_total.labels(status="accepted").inc()
+    for item in pending:
+        queue.enqueue(item)
+    webhook_batch_duration_seconds.observe(time.time() - batch_start)
+    response.status_code = 202
+    return {
+        "status": "accepted",
+        "queued": len(pending),
+        "deduplicated": deduplicated,
+        "correlated": correlated,
+        "rate_limited": rate_limited,
+        "resolved": resolved,
+        "alerts": [
+            {
+                "alertname": item.alertname,
+                "cluster": item.cluster,
+                "dedup_group": item.group_key,
+                "correlation_group": item.correlation_group,
+                "status": "queued",
+            }
+            for item in pending
+        ],
+    }
+
+
+@app.post("/api/v1/alerts")
+async def receive_alerts(
+    request: Request,
+    response: Response,
+) -> dict[str, Any]:
+    """Receive alerts from Alertmanager webhook.
+
+    Accepts both VictoriaMetrics VMAlertmanager and Prometheus Alertmanager
+    webhook format (see AlertmanagerWebhook). The body is streamed through
+    WebhookStreamParser rather than validated into a full model tree, and
+    EnrichedAlert is only built for alerts that survive admission. The
+    batch is:
+    1. Deduplicated (5-min window by alertname+cluster+namespace)
+    2. Correlated (alerts sharing a fingerprint, node/pod/service label or
+       topology-adjacent service with an open group join that group)
+    3. Rate-limited per alert in sync mode (token bucket per
+       receiver+cluster+severity, 100/min default, with a separate 200/min
+       budget for critical alerts)
+    4. Enriched with context (resource utilization, recent similar alerts),
+       concurrently for all surviving alerts up to ENRICHMENT_CONCURRENCY
+    5. Routed to the appropriate specialized agent, in webhook order
+
+    Resolved alerts skip steps 2-5: they close their dedup group once no
+    alert of it is still firing, which cancels the group's queued or
+    in-flight work and records its time to resolution.
+
+    In queue mode (INGESTION_MODE=queue) steps 4-5 and the orchestrator
+    hand-off run on background workers: the batch is acknowledged with
+    202 once deduplicated, and 429 is returned only when the queue is full.
+    In sync mode 429 is returned when every alert that would have started
+    an investigation was rate-limited. A malformed body is rejected with 422.
+    """
+    parser = WebhookStreamParser()
+    try:
+        alerts = [alert async for alert in parser.parse_stream(request.stream())]
+    except WebhookParseError as e:
+        webhook_requests_total.labels(status="invalid").inc()
+        raise HTTPException(status_code=422, detail=str(e)) from e
+    receiver = parser.envelope.get("receiver") or ""
+
+    queue = alert_queue
+    if queue is not None:
+        # Backpressure: reject the whole batch before dedup state changes,
+        # so Alertmanager's retry is deduplicated correctly. The room is
+        # held while admission awaits the dedup backend, so batches
+        # arriving together cannot both claim the last slots.
+        if not queue.reserve(len(alerts)):
+            webhook_requests_total.labels(status="queue_full").inc()
+            raise HTTPException(
+                status_code=429,
+                detail="Alert queue full. Retry later.",
+            )
+        try:
+            return await _accept_queued(str(receiver), alerts, queue, response)
+        finally:
+            queue.release(len(alerts))
+
+    batch_start = time.time()
+    pending, deduplicated, correlated, rate_limited, resolved = await _admit_batch(
+        str(receiver), alerts
+    )
+
+    if rate_limited and not pending:
+        webhook_requests_total.labels(status="rate_limited").inc()
+        raise HTTPException(
+            status_code=429,
+            detail=f"Rate limit exceeded for all {rate_limited} new alerts.",
         )
 
+    webhook_requests_total.labels(status="accepted").inc()
+
+    # Enrich the surviving alerts concurrently
+    semaphore = asyncio.Semaphore(ENRICHMENT_CONCURRENCY)
+
+    async def _bounded_enrich(item: PendingAlert) -> dict[str, Any]:
+        async with semaphore:
+            return await _enrich(item)
+
+    enrichments = await asyncio.gather(*(_bounded_enrich(item) for item in pending))
+
+    # Route in the original webhook order
+    processed = []
+    for item, enrichment in zip(pending, enrichments, strict=True):
+        enriched, target = _route(item, enrichment)
         processed.append({
             "alert_id": str(enriched.alert_id),
-            "alertname": alertname,
-            "cluster": cluster,
+            "alertname": item.alertname,
+            "cluster": item.cluster,
             "target_agent": target.value,
+            "correlation_group": item.correlation_group,
             "status": "investigating",
         })
 
+    webhook_batch_duration_seconds.observe(time.time() - batch_start)
+
     return {
         "status": "ok",
         "processed": len(processed),
         "deduplicated": deduplicated,
+        "correlated": correlated,
+        "rate_limited": rate_limited,
+        "resolved": resolved,
         "alerts": processed,
     }
 
@@ -206,3 +636,23 @@ async def receive_alerts(
 async def get_alert_groups():
     """Get current alert dedup group statistics."""
     return deduplicator.get_group_stats()
+
+
+@app.get("/api/v1/alerts/correlations")
+async def get_alert_correlations():
+    """Get open alert correlation groups."""
+    return correlator.get_group_stats()
+
+
+@app.get("/api/v1/slo/budgets")
+async def get_slo_budgets(cluster: str | None = None):
+    """Get error budgets and multi-window burn rates of the tracked SLOs."""
+    if burn_rate_engine is None:
+        raise HTTPException(status_code=404, detail="SLO tracking is disabled (SLO_PATH unset)")
+    return [status.model_dump() for status in burn_rate_engine.get_error_budgets(cluster)]
+
+
+@app.get("/api/v1/ratelimit")
+async def get_rate_limit_state():
+    """Get alert rate limiter configuration and per-key budget state."""
+    return rate_limiter.snapshot()
@@ -0,0 +1,275 @@
+"""Alert correlation — groups alerts that share a likely root cause.
+
+Runs after deduplication. Dedup groups are keyed by
+alertname + cluster + namespace, so one failure surfacing as several
+alertnames (``kube_pod_crashlooping`` and ``container_oom_killed`` on the
+same node) still yields several dedup groups. The correlator folds those
+into one correlation group, and only the first alert of a correlation
+group starts an investigation.
+
+Alerts are linked when, within the correlation window, they share:
+- the Alertmanager fingerprint
+- a ``node``, ``pod`` (per namespace) or ``service`` label in the same cluster
+- a ``service`` label on a topology-adjacent cluster, or a service that
+  the topology lists as a cross-cluster dependency
+
+Each of these is an index token. An inverted index maps token -> group
+id, so matching an alert costs a handful of dict lookups regardless of
+how many groups are open.
+"""
+
+import itertools
+import logging
+import time
+from dataclasses import dataclass, field
+from typing import Callable, Optional
+
+from memory.topology_store import TopologyStore
+
+logger = logging.getLogger(__name__)
+
+# Correlation window in seconds (5 minutes, matching the dedup window)
+CORRELATION_WINDOW_SECONDS = 300
+
+# Labels that identify shared infrastructure, scoped to the alert's cluster
+CORRELATION_LABELS = ("node", "pod", "service")
+
+# Index token: (kind, scope, value); scope is the cluster, or "" for fingerprints
+Token = tuple[str, str, str]
+
+
+@dataclass(slots=True)
+class CorrelationGroup:
+    """Alerts believed to share a root cause."""
+
+    group_id: str
+    root_group_key: str
+    first_seen: float
+    last_seen: float
+    count: int = 1
+    members: set[str] = field(default_factory=set)
+    tokens: set[Token] = field(default_factory=set)
+
+
+class AlertCorrelator:
+    """Clusters deduplicated alerts by fingerprint, labels and topology.
+
+    A group stays open while it keeps receiving alerts: it closes once
+    idle for ``window_seconds``, or when its root dedup group resolves.
+    Index entries for idle groups are dropped lazily on lookup and by an
+    amortized sweep.
+    """
+
+    def __init__(
+        self,
+        window_seconds: int = CORRELATION_WINDOW_SECONDS,
+        topology: Optional[TopologyStore] = None,
+        clock: Callable[[], float] = time.time,
+    ) -> None:
+        self.window = window_seconds
+        self.groups: dict[str, CorrelationGroup] = {}
+        self._index: dict[Token, str] = {}
+        # root dedup group key -> id of the group it opened
+        self._roots: dict[str, str] = {}
+        self._clock = clock
+        self._ids = itertools.count(1)
+        self._checks = 0
+        self._adjacent_clusters: dict[str, tuple[str, ...]] = {}
+        self._service_edges: dict[tuple[str, str], list[tuple[str, str]]] = {}
+        if topology is not None:
+            self.load_topology(topology)
+
+    def load_topology(self, topology: TopologyStore) -> None:
+        """Precompute cluster and service adjacency from the topology store."""
+        clusters: dict[str, set[str]] = {}
+        for cluster in topology.topology.clusters:
+            for dep in cluster.dependencies:
+                clusters.setdefault(cluster.name, set()).add(dep)
+                clusters.setdefault(dep, set()).add(cluster.name)
+        self._adjacent_clusters = {
+            name: tuple(sorted(peers)) for name, peers in clusters.items()
+        }
+
+        # A dependency's source cluster is the one running the source service
+        service_clusters: dict[tuple[str, str], str] = {
+            (service.name, service.namespace): cluster.name
+            for cluster in topology.topology.clusters
+            for service in cluster.critical_services
+        }
+        edges: dict[tuple[str, str], list[tuple[str, str]]] = {}
+        for dep in topology.topology.cross_cluster_dependencies:
+            source_cluster = service_clusters.get((dep.source_service, dep.source_namespace))
+            if source_cluster is None:
+                continue
+            source = (source_cluster, dep.source_service)
+            target = (dep.target_cluster or source_cluster, dep.target_service)
+            edges.setdefault(source, []).append(target)
+            edges.setdefault(target, []).append(source)
+        self._service_edges = edges
+
+    def _tokens(
+        self,
+        cluster: str,
+        namespace: Optional[str],
+        labels: dict[str, str],
+        fingerprint: str,
+    ) -> list[Token]:
+        """Index tokens an alert contributes to its group."""
+        tokens: list[Token] = []
+        if fingerprint:
+            tokens.append(("fingerprint", "", fingerprint))
+        for name in CORRELATION_LABELS:
+            value = labels.get(name)
+            if not value:
+                continue
+            if name == "pod":
+                # Pod names are only unique within a namespace
+                value = f"{namespace or ''}/{value}"
+            tokens.append((name, cluster, value))
+        return tokens
+
+    def _probe_tokens(self, cluster: str, tokens: list[Token]) -> list[Token]:
+        """Tokens to look up: the alert's own plus topology neighbours."""
+        probes = list(tokens)
+        for kind, _, value in tokens:
+            if kind != "service":
+                continue
+            for peer in self._adjacent_clusters.get(cluster, ()):
+                probes.append(("service", peer, value))
+            for peer_cluster, peer_service in self._service_edges.get((cluster, value), ()):
+                probes.append(("service", peer_cluster, peer_service))
+        return probes
+
+    def _live_group(self, token: Token, now: float) -> Optional[CorrelationGroup]:
+        group_id = self._index.get(token)
+        if group_id is None:
+            return None
+        group = self.groups.get(group_id)
+        if group is None or now - group.last_seen > self.window:
+            del self._index[token]
+            return None
+        return group
+
+    def correlate(
+        self,
+        group_key: str,
+        cluster: str,
+        namespace: Optional[str],
+        labels: dict[str, str],
+        fingerprint: str = "",
+    ) -> Optional[CorrelationGroup]:
+        """Attach an alert to an open correlation group, if one matches.
+
+        Returns the matched group (the alert should not start its own
+        investigation), or None when the alert is unrelated to any open
+        group. When several groups match, the oldest one wins. A window
+        of 0 disables correlation.
+        """
+        if self.window <= 0:
+            return None
+        now = self._clock()
+        self._maybe_sweep(now)
+
+        tokens = self._tokens(cluster, namespace, labels, fingerprint)
+        match: Optional[CorrelationGroup] = None
+        for token in self._probe_tokens(cluster, tokens):
+            group = self._live_group(token, now)
+            if group is not None and (match is None or group.first_seen < match.first_seen):
+                match = group
+        if match is None:
+            return None
+
+        match.count += 1
+        match.last_seen = now
+        match.members.add(group_key)
+        self._add_tokens(match, tokens, now)
+        logger.info(
+            "Correlation: dedup group '%s' joined '%s' (root=%s, count=%d)",
+            group_key,
+            match.group_id,
+            match.root_group_key,
+            match.count,
+        )
+        return match
+
+    def open_group(
+        self,
+        group_key: str,
+        cluster: str,
+        namespace: Optional[str],
+        labels: dict[str, str],
+        fingerprint: str = "",
+    ) -> CorrelationGroup:
+        """Start a correlation group rooted at an alert that will be investigated."""
+        now = self._clock()
+        group = CorrelationGroup(
+            group_id=f"corr-{next(self._ids)}",
+            root_group_key=group_key,
+            first_seen=now,
+            last_seen=now,
+            members={group_key},
+        )
+        self.groups[group.group_id] = group
+        self._roots[group_key] = group.group_id
+        self._add_tokens(group, self._tokens(cluster, namespace, labels, fingerprint), now)
+        return group
+
+    def close_group(self, root_group_key: str) -> Optional[CorrelationGroup]:
+        """Close the group rooted at a resolved dedup group, if it is still open.
+
+        Later alerts no longer join it, so a recurrence starts a fresh
+        investigation. Returns the closed group.
+        """
+        group_id = self._roots.pop(root_group_key, None)
+        group = self.groups.pop(group_id, None) if group_id is not None else None
+        if group is None:
+            return None
+        self._drop_tokens(group)
+        return group
+
+    def _drop_tokens(self, group: CorrelationGroup) -> None:
+        for token in group.tokens:
+            if self._index.get(token) == group.group_id:
+                del self._index[token]
+
+    def _add_tokens(self, group: CorrelationGroup, tokens: list[Token], now: float) -> None:
+        for token in tokens:
+            # An older open group keeps the token; it wins matches anyway
+            if self._live_group(token, now) is None:
+                self._index[token] = group.group_id
+            group.tokens.add(token)
+
+    def get_group_stats(self) -> dict[str, dict]:
+        """Get statistics for all open correlation groups."""
+        now = self._clock()
+        return {
+            group_id: {
+                "root_group": group.root_group_key,
+                "members": sorted(group.members),
+                "count": group.count,
+                "age_seconds": now - group.first_seen,
+            }
+            for group_id, group in self.groups.items()
+            if now - group.last_seen <= self.window
+        }
+
+    def _maybe_sweep(self, now: float) -> None:
+        # Amortized sweep keeps the per-alert cost O(1)
+        self._checks += 1
+        if self._checks % 10000 == 0:
+            self._sweep(now)
+
+    def _sweep(self, now: float) -> None:
+        """Drop closed groups and their index entries."""
+        closed = [
+            group_id
+            for group_id, group in self.groups.items()
+            if now - group.last_seen > self.window
+        ]
+        for group_id in closed:
+            group = self.groups.pop(group_id)
+            if self._roots.get(group.root_group_key) == group_id:
+                del self._roots[group.root_group_key]
+            self._drop_tokens(group)
+        if closed:
+            logger.debug("Closed %d idle correlation groups", len(closed))
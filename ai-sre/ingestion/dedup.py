@@ -2,17 +2,19 @@
 
 import logging
 import time
-from collections import defaultdict
 from dataclasses import dataclass, field
-from typing import Optional
+from typing import Callable, Optional
 
 logger = logging.getLogger(__name__)
 
 # Dedup window in seconds (5 minutes)
 DEDUP_WINDOW_SECONDS = 300
 
+# Width of one expiry bucket in seconds
+EXPIRY_BUCKET_SECONDS = 1.0
 
-@dataclass
+
+@dataclass(slots=True)
 class AlertGroup:
     """A group of deduplicated alerts."""
 
@@ -25,18 +27,39 @@ class AlertGroup:
     count: int = 1
     status: str = "firing"
     investigated: bool = False
+    expiry_bucket: int = 0
+    # Fingerprints of the group's alerts that have fired and not resolved
+    firing: set[str] = field(default_factory=set)
+    resolved_at: Optional[float] = None
 
 
 class AlertDeduplicator:
     """Groups alerts by alertname + cluster + namespace within a time window.
 
     Prevents multiple agent investigations for the same alert storm.
+
+    Groups expire once idle for twice the dedup window. Expiry is tracked
+    in a time-bucketed index (bucket id -> group keys) so eviction only
+    touches the buckets that have come due, not every group. Buckets are
+    updated lazily: refreshing ``last_seen`` does not move a group, and a
+    group found in a due bucket that is still active is re-filed under
+    its current expiry instead.
+
+    Each group tracks the fingerprints of its alerts that are still
+    firing; the group resolves when the last of them resolves, and fires
+    again as a new group (new ``first_seen``) if an alert comes back.
     """
 
-    def __init__(self, window_seconds: int = DEDUP_WINDOW_SECONDS) -> None:
+    def __init__(
+        self,
+        window_seconds: int = DEDUP_WINDOW_SECONDS,
+        clock: Callable[[], float] = time.time,
+    ) -> None:
         self.window = window_seconds
         self.groups: dict[str, AlertGroup] = {}
-        self._cleanup_counter = 0
+        self._clock = clock
+        self._expiry_buckets: dict[int, set[str]] = {}
+        self._next_bucket = self._bucket_for(clock())
 
     def _make_key(
         self, alertname: str, cluster: str, namespace: Optional[str]
@@ -44,11 +67,43 @@ class AlertDeduplicator:
         """Generate dedup group key."""
         return f"{alertname}:{cluster}:{namespace or '_all_'}"
 
+    @staticmethod
+    def _bucket_for(timestamp: float) -> int:
+        return int(timestamp // EXPIRY_BUCKET_SECONDS)
+
+    def _file_expiry(self, group: AlertGroup) -> None:
+        """Index a group under the bucket in which it expires."""
+        bucket = self._bucket_for(group.last_seen + self.window * 2)
+        group.expiry_bucket = bucket
+        self._expiry_buckets.setdefault(bucket, set()).add(group.group_key)
+
+    def _new_group(
+        self,
+        key: str,
+        alertname: str,
+        cluster: str,
+        namespace: Optional[str],
+        now: float,
+    ) -> AlertGroup:
+        group = AlertGroup(
+            group_key=key,
+            alertname=alertname,
+            cluster=cluster,
+            namespace=namespace,
+            first_seen=now,
+            last_seen=now,
+            count=1,
+        )
+        self.groups[key] = group
+        self._file_expiry(group)
+        return group
+
     def should_investigate(
         self,
         alertname: str,
         cluster: str,
         namespace: Optional[str] = None,
+        fingerprint: str = "",
     ) -> tuple[bool, str]:
         """Check if this alert should trigger a new investigation.
 
@@ -56,45 +111,29 @@ class AlertDeduplicator:
         If the alert belongs to an existing group within the dedup window
         that has already been investigated, returns False.
         """
-        now = time.time()
+        now = self._clock()
         key = self._make_key(alertname, cluster, namespace)
 
-        # Periodic cleanup
-        self._cleanup_counter += 1
-        if self._cleanup_counter % 100 == 0:
-            self._cleanup_expired(now)
+        self._cleanup_expired(now)
 
         group = self.groups.get(key)
-        if group is None:
-            # New alert group
-            self.groups[key] = AlertGroup(
-                group_key=key,
-                alertname=alertname,
-                cluster=cluster,
-                namespace=namespace,
-                first_seen=now,
-                last_seen=now,
-                count=1,
-            )
+        if group is None or group.status == "resolved":
+            # New alert group, or a resolved one firing again
+            self._new_group(key, alertname, cluster, namespace, now).firing.add(fingerprint)
             return True, key
 
         # Existing group — check if window expired
         if now - group.first_seen > self.window:
-            # Window expired, start new group
-            self.groups[key] = AlertGroup(
-                group_key=key,
-                alertname=alertname,
-                cluster=cluster,
-                namespace=namespace,
-                first_seen=now,
-                last_seen=now,
-                count=1,
-            )
+            # Window expired, start new group; its alerts are still firing
+            firing = group.firing
+            firing.add(fingerprint)
+            self._new_group(key, alertname, cluster, namespace, now).firing = firing
             return True, key
 
         # Within window — increment count
         group.count += 1
         group.last_seen = now
+        group.firing.add(fingerprint)
 
         if group.investigated:
             logger.info(
@@ -115,15 +154,65 @@ class AlertDeduplicator:
             group.investigated = True
             group.status = "investigating"
 
-    def mark_resolved(self, group_key: str) -> None:
-        """Mark a group as resolved."""
+    def release(self, group_key: str) -> None:
+        """Clear a group's investigation mark so the next alert can claim it."""
         group = self.groups.get(group_key)
         if group:
-            group.status = "resolved"
+            group.investigated = False
+            group.status = "firing"
+
+    def mark_resolved(self, group_key: str) -> Optional[float]:
+        """Mark a group as resolved.
+
+        Returns the group's time to resolution (seconds since first seen),
+        or None if the group is unknown or was already resolved.
+        """
+        group = self.groups.get(group_key)
+        if group is None or group.status == "resolved":
+            return None
+        now = self._clock()
+        group.status = "resolved"
+        group.investigated = False
+        group.firing.clear()
+        group.resolved_at = now
+        group.last_seen = now
+        return now - group.first_seen
+
+    def resolve(
+        self,
+        alertname: str,
+        cluster: str,
+        namespace: Optional[str] = None,
+        fingerprint: str = "",
+    ) -> tuple[str, bool, Optional[float]]:
+        """Record a resolved alert against its group. O(1).
+
+        Returns (group_key, group_resolved, ttfr_seconds). The group is
+        resolved once none of its alerts are still firing. An alert for a
+        group this process has not seen, and repeat notifications for an
+        already resolved group, report ``group_resolved`` False; whether
+        another replica's group is done is for the shared backend to say.
+        """
+        key = self._make_key(alertname, cluster, namespace)
+        group = self.groups.get(key)
+        if group is None or group.status == "resolved":
+            return key, False, None
+        group.firing.discard(fingerprint)
+        if group.firing:
+            logger.debug(
+                "Alert '%s' on %s/%s resolved, %d still firing in group",
+                alertname,
+                cluster,
+                namespace,
+                len(group.firing),
+            )
+            return key, False, None
+        return key, True, self.mark_resolved(key)
 
     def get_group_stats(self) -> dict[str, dict]:
         """Get statistics for all active groups."""
-        now = time.time()
+        now = self._clock()
+        self._cleanup_expired(now)
         stats = {}
         for key, group in self.groups.items():
             if now - group.last_seen < self.window * 2:
@@ -134,17 +223,48 @@ class AlertDeduplicator:
                     "count": group.count,
                     "status": group.status,
                     "age_seconds": now - group.first_seen,
+                    "firing": len(group.firing),
+                    "ttfr_seconds": (
+                        group.resolved_at - group.first_seen
+                        if group.resolved_at is not None
+                        else None
+                    ),
                 }
         return stats
 
     def _cleanup_expired(self, now: float) -> None:
-        """Remove groups older than 2x the dedup window."""
-        expired = [
-            key
-            for key, group in self.groups.items()
-            if now - group.last_seen > self.window * 2
-        ]
-        for key in expired:
-            del self.groups[key]
-        if expired:
-            logger.debug("Cleaned up %d expired alert groups", len(expired))
+        """Remove groups idle for more than 2x the dedup window.
+
+        Only buckets that have come due are visited, so the cost is
+        proportional to the number of groups expiring (plus active groups
+        re-filed once per expiry period), not to the total group count.
+        """
+        current = self._bucket_for(now)
+        if current <= self._next_bucket:
+            return
+
+        if current - self._next_bucket <= len(self._expiry_buckets):
+            due = range(self._next_bucket, current)
+        else:
+            # Long idle gap: walk the populated buckets instead of every id
+            due = sorted(b for b in self._expiry_buckets if b < current)
+        self._next_bucket = current
+
+        removed = 0
+        for bucket in due:
+            keys = self._expiry_buckets.pop(bucket, None)
+            if not keys:
+                continue
+            for key in keys:
+                group = self.groups.get(key)
+                if group is None or group.expiry_bucket != bucket:
+                    # Stale entry: the group was replaced or already re-filed
+                    continue
+                if now - group.last_seen > self.window * 2:
+                    del self.groups[key]
+                    removed += 1
+                else:
+                    self._file_expiry(group)
+
+        if removed:
+            logger.debug("Cleaned up %d expired alert groups", removed)
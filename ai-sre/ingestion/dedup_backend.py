@@ -0,0 +1,415 @@
+"""Pluggable dedup backends — local or shared across ingestion replicas.
+
+Both backends expose one operation per webhook batch: an atomic
+check-and-mark (``claim_batch``) that decides, for every alert, whether
+this caller won the right to start the investigation for its group.
+Resolved alerts go through ``resolve_batch`` instead, which ends the
+groups they close so the next firing alert can claim them again.
+
+- InMemoryDedupBackend: the per-process AlertDeduplicator (single replica).
+- RedisDedupBackend: claims are ``SET NX PX`` keys on a Redis-protocol
+  server shared by all replicas, pipelined into one round trip per batch,
+  with a local near-cache of groups already known to be claimed. Each
+  group's firing fingerprints are a shared set, so any replica can tell
+  when the last of them resolves.
+"""
+
+import asyncio
+import contextlib
+import logging
+import os
+import time
+from abc import ABC, abstractmethod
+from typing import Any, Optional
+from urllib.parse import urlparse
+
+from common.cache import AsyncTTLCache
+
+from .dedup import AlertDeduplicator
+from .metrics import dedup_backend_errors_total, dedup_backend_round_trips_total
+
+logger = logging.getLogger(__name__)
+
+# (alertname, cluster, namespace)
+GroupRef = tuple[str, str, Optional[str]]
+
+# (alertname, cluster, namespace, fingerprint)
+ResolveRef = tuple[str, str, Optional[str], str]
+
+
+class DedupBackend(ABC):
+    """Decides which alerts start an investigation."""
+
+    def __init__(self, deduplicator: AlertDeduplicator) -> None:
+        # Local group state backs /api/v1/alerts/groups for every backend
+        self.deduplicator = deduplicator
+
+    @abstractmethod
+    async def claim_batch(
+        self, refs: list[GroupRef], fingerprints: Optional[list[str]] = None
+    ) -> list[tuple[bool, str]]:
+        """Atomically check and mark each alert's group, in batch order.
+
+        Returns (claimed, group_key) per alert. ``claimed`` is True only for
+        the single caller that should investigate the group in this window;
+        later alerts of the same group, in this batch or elsewhere, get False.
+        ``fingerprints`` (per alert) are tracked so resolve_batch knows when
+        the last firing alert of a group has resolved.
+        """
+
+    @abstractmethod
+    async def release_batch(self, group_keys: list[str]) -> None:
+        """Give up claims taken by claim_batch that will not be investigated."""
+
+    async def resolve_batch(
+        self, refs: list[ResolveRef]
+    ) -> list[tuple[str, bool, Optional[float]]]:
+        """Record resolved alerts, in batch order.
+
+        Returns (group_key, group_resolved, ttfr_seconds) per alert, as
+        AlertDeduplicator.resolve does.
+        """
+        return [
+            self.deduplicator.resolve(alertname, cluster, namespace, fingerprint)
+            for alertname, cluster, namespace, fingerprint in refs
+        ]
+
+    @abstractmethod
+    async def close(self) -> None:
+        """Release any connections held by the backend."""
+
+
+class InMemoryDedupBackend(DedupBackend):
+    """Process-local dedup using AlertDeduplicator. Correct for one replica only."""
+
+    async def claim_batch(
+        self, refs: list[GroupRef], fingerprints: Optional[list[str]] = None
+    ) -> list[tuple[bool, str]]:
+        results = []
+        for (alertname, cluster, namespace), fingerprint in zip(
+            refs, fingerprints or [""] * len(refs), strict=True
+        ):
+            should, key = self.deduplicator.should_investigate(
+                alertname, cluster, namespace, fingerprint
+            )
+            if should:
+                self.deduplicator.mark_investigated(key)
+            results.append((should, key))
+        return results
+
+    async def release_batch(self, group_keys: list[str]) -> None:
+        for key in group_keys:
+            self.deduplicator.release(key)
+
+    async def close(self) -> None:
+        """Nothing to release: state lives in this process."""
+
+
+class RedisError(Exception):
+    """Error reply or protocol failure from a Redis-protocol server."""
+
+
+class RedisConnection:
+    """Minimal pipelined RESP2 client over a single asyncio stream.
+
+    Only what the dedup backend needs; avoids a client-library dependency.
+    Commands from concurrent callers are serialized on one connection, and
+    the connection is re-established after any failure.
+    """
+
+    def __init__(self, url: str, timeout: float = 1.0) -> None:
+        parsed = urlparse(url)
+        self.host = parsed.hostname or "localhost"
+        self.port = parsed.port or 6379
+        self.db = int(parsed.path.lstrip("/") or 0)
+        self.password = parsed.password
+        self.timeout = timeout
+        self._reader: Optional[asyncio.StreamReader] = None
+        self._writer: Optional[asyncio.StreamWriter] = None
+        self._lock = asyncio.Lock()
+
+    async def pipeline(self, commands: list[list[str]]) -> list[Any]:
+        """Send commands in one write and read all replies. Error replies are returned."""
+        async with self._lock:
+            try:
+                return await asyncio.wait_for(self._pipeline(commands), self.timeout)
+            except Exception:
+                await self._disconnect()
+                raise
+
+    async def close(self) -> None:
+        async with self._lock:
+            await self._disconnect()
+
+    async def _pipeline(self, commands: list[list[str]]) -> list[Any]:
+        if self._writer is None:
+            await self._connect()
+        assert self._reader is not None and self._writer is not None
+        self._writer.write(b"".join(self._encode(cmd) for cmd in commands))
+        await self._writer.drain()
+        return [await self._read_reply() for _ in commands]
+
+    async def _connect(self) -> None:
+        self._reader, self._writer = await asyncio.open_connection(self.host, self.port)
+        setup = []
+        if self.password:
+            setup.append(["AUTH", self.password])
+        if self.db:
+            setup.append(["SELECT", str(self.db)])
+        if setup:
+            self._writer.write(b"".join(self._encode(cmd) for cmd in setup))
+            await self._writer.drain()
+            for _ in setup:
+                reply = await self._read_reply()
+                if isinstance(reply, RedisError):
+                    raise reply
+
+    async def _disconnect(self) -> None:
+        if self._writer is not None:
+            self._writer.close()
+            with contextlib.suppress(Exception):
+                await self._writer.wait_closed()
+        self._reader = self._writer = None
+
+    @staticmethod
+    def _encode(command: list[str]) -> bytes:
+        parts = [f"*{len(command)}\r\n".encode()]
+        for arg in command:
+            data = arg.encode()
+            parts.append(b"$%d\r\n%s\r\n" % (len(data), data))
+        return b"".join(parts)
+
+    async def _read_reply(self) -> Any:
+        assert self._reader is not None
+        line = await self._reader.readline()
+        if not line:
+            raise ConnectionError("Redis connection closed")
+        kind, body = line[:1], line[1:-2]
+        if kind == b"+":
+            return body.decode()
+        if kind == b"-":
+            return RedisError(body.decode())
+        if kind == b":":
+            return int(body)
+        if kind == b"$":
+            length = int(body)
+            if length == -1:
+                return None
+            data = await self._reader.readexactly(length + 2)
+            return data[:-2].decode()
+        if kind == b"*":
+            count = int(body)
+            if count == -1:
+                return None
+            return [await self._read_reply() for _ in range(count)]
+        raise RedisError(f"Unexpected RESP reply: {line!r}")
+
+
+class RedisDedupBackend(DedupBackend):
+    """Dedup claims shared across replicas through a Redis-protocol server.
+
+    A claim is ``SET <prefix><group_key> <replica>@<first_seen> NX PX
+    <window_ms>``: the first replica to set it investigates, and the key
+    expiring ends the window just like a local group's ``first_seen +
+    window``. Each batch is one pipelined round trip (SET NX + PTTL per
+    group not already in the near-cache). If the server is unreachable,
+    decisions fall back to the local deduplicator so alerts are never
+    silently dropped.
+
+    Firing fingerprints are added to ``<prefix>firing:<group_key>`` (SADD,
+    in the claim pipeline) and removed when they resolve (SREM + SCARD in
+    one MULTI/EXEC per batch). A group closes only when that shared set
+    empties, whichever replica saw its alerts fire; its claim is then
+    deleted, and the claim's first-seen time gives the TTFR. The set
+    expires after twice the window without new fingerprints, like an idle
+    local group. When the server is unreachable, resolutions only close
+    groups this replica knows are done. Other replicas keep treating a
+    closed group as claimed until their near-cache entry expires (at most
+    the rest of the window), which errs towards fewer investigations.
+    """
+
+    def __init__(
+        self,
+        url: str,
+        deduplicator: AlertDeduplicator,
+        key_prefix: str = "ai-sre:dedup:",
+        replica_id: Optional[str] = None,
+        near_cache_size: int = 100000,
+        timeout: float = 1.0,
+    ) -> None:
+        super().__init__(deduplicator)
+        self.connection = RedisConnection(url, timeout=timeout)
+        self.key_prefix = key_prefix
+        self.replica_id = replica_id or os.environ.get("HOSTNAME", "ingestion")
+        self.window_ms = int(deduplicator.window * 1000)
+        # group_key -> True while a claim (ours or another replica's) is live
+        self.near_cache = AsyncTTLCache("dedup_near", maxsize=near_cache_size)
+        # (group_key, fingerprint) -> True once added to the shared firing set;
+        # re-added once per window so the set outlives alerts still firing
+        self.firing_cache = AsyncTTLCache(
+            "dedup_firing", maxsize=near_cache_size, ttl=float(deduplicator.window)
+        )
+
+    async def claim_batch(
+        self, refs: list[GroupRef], fingerprints: Optional[list[str]] = None
+    ) -> list[tuple[bool, str]]:
+        results: list[tuple[bool, str]] = []
+        remote: list[int] = []
+        firing: list[tuple[str, str]] = []
+        for (alertname, cluster, namespace), fingerprint in zip(
+            refs, fingerprints or [""] * len(refs), strict=True
+        ):
+            # Keep local counts and stats current; the decision is remote
+            _, key = self.deduplicator.should_investigate(
+                alertname, cluster, namespace, fingerprint
+            )
+            found, _ = self.near_cache.get(key)
+            results.append((False, key))
+            if not found:
+                remote.append(len(results) - 1)
+            if fingerprint and not self.firing_cache.get((key, fingerprint))[0]:
+                self.firing_cache.put((key, fingerprint), True)
+                firing.append((key, fingerprint))
+
+        if not remote and not firing:
+            return results
+
+        commands = []
+        claim = f"{self.replica_id}@{time.time():.3f}"
+        for idx in remote:
+            redis_key = self.key_prefix + results[idx][1]
+            commands.append(["SET", redis_key, claim, "NX", "PX", str(self.window_ms)])
+            commands.append(["PTTL", redis_key])
+        for key, fingerprint in firing:
+            firing_key = self._firing_key(key)
+            commands.append(["SADD", firing_key, fingerprint])
+            commands.append(["PEXPIRE", firing_key, str(self.window_ms * 2)])
+
+        try:
+            replies = await self.connection.pipeline(commands)
+            dedup_backend_round_trips_total.labels(backend="redis").inc()
+        except Exception as e:
+            dedup_backend_errors_total.labels(backend="redis").inc()
+            logger.warning("Shared dedup unavailable, using local state: %s", e)
+            replies = [e] * len(commands)
+            for entry in firing:
+                # Not recorded remotely: try again with the next notification
+                self.firing_cache.invalidate(entry)
+
+        for n, idx in enumerate(remote):
+            key = results[idx][1]
+            set_reply, ttl_ms = replies[2 * n], replies[2 * n + 1]
+            if isinstance(set_reply, Exception):
+                if isinstance(set_reply, RedisError):
+                    dedup_backend_errors_total.labels(backend="redis").inc()
+                    logger.warning("Shared dedup claim failed: %s", set_reply)
+                claimed = self._local_claim(key)
+            else:
+                claimed = set_reply == "OK"
+            results[idx] = (claimed, key)
+            self.deduplicator.mark_investigated(key)
+            if isinstance(ttl_ms, int) and ttl_ms > 0:
+                self.near_cache.put(key, True, ttl=ttl_ms / 1000)
+        return results
+
+    async def release_batch(self, group_keys: list[str]) -> None:
+        if not group_keys:
+            return
+        for key in group_keys:
+            self.near_cache.invalidate(key)
+            self.deduplicator.release(key)
+        try:
+            # Claims were taken moments ago in the same request, so the
+            # keys are still ours; a plain DEL avoids server-side scripting
+            await self.connection.pipeline(
+                [["DEL", *[self.key_prefix + key for key in group_keys]]]
+            )
+            dedup_backend_round_trips_total.labels(backend="redis").inc()
+        except Exception as e:
+            dedup_backend_errors_total.labels(backend="redis").inc()
+            logger.warning("Failed to release shared dedup claims: %s", e)
+
+    async def resolve_batch(
+        self, refs: list[ResolveRef]
+    ) -> list[tuple[str, bool, Optional[float]]]:
+        # Local groups give the fallback answer and keep stats current
+        local = await super().resolve_batch(refs)
+        keys = list(dict.fromkeys(key for key, _, _ in local))
+
+        commands: list[list[str]] = [["MULTI"]]
+        for (key, _, _), (*_, fingerprint) in zip(local, refs, strict=True):
+            self.firing_cache.invalidate((key, fingerprint))
+            commands.append(["SREM", self._firing_key(key), fingerprint])
+            commands.append(["SCARD", self._firing_key(key)])
+        commands.append(["EXEC"])
+        commands.extend(["GET", self.key_prefix + key] for key in keys)
+        try:
+            replies = await self.connection.pipeline(commands)
+            dedup_backend_round_trips_total.labels(backend="redis").inc()
+            counts = replies[len(refs) * 2 + 1]
+            if not isinstance(counts, list):
+                raise RedisError(f"Transaction failed: {counts}")
+        except Exception as e:
+            dedup_backend_errors_total.labels(backend="redis").inc()
+            logger.warning("Shared dedup unavailable, resolving from local state: %s", e)
+            return local
+
+        # Atomic per batch, so exactly one caller sees a group's set empty
+        emptied = [
+            removed == 1 and remaining == 0
+            for removed, remaining in zip(counts[::2], counts[1::2], strict=True)
+        ]
+        closed = {key for (key, _, _), done in zip(local, emptied, strict=True) if done}
+        first_seen: dict[str, float] = {}
+        for key, claim in zip(keys, replies[len(refs) * 2 + 2 :], strict=True):
+            if isinstance(claim, str) and "@" in claim:
+                with contextlib.suppress(ValueError):
+                    first_seen[key] = float(claim.rpartition("@")[2])
+
+        if closed:
+            for key in closed:
+                self.near_cache.invalidate(key)
+            try:
+                await self.connection.pipeline(
+                    [["DEL", *[self.key_prefix + key for key in closed]]]
+                )
+                dedup_backend_round_trips_total.labels(backend="redis").inc()
+            except Exception as e:
+                # The claims expire with the window anyway
+                dedup_backend_errors_total.labels(backend="redis").inc()
+                logger.warning("Failed to clear shared dedup claims of resolved groups: %s", e)
+
+        now = time.time()
+        results = []
+        for (key, _, ttfr), done in zip(local, emptied, strict=True):
+            if not done:
+                results.append((key, False, None))
+                continue
+            # The last fingerprint may have fired on another replica
+            ttfr = self.deduplicator.mark_resolved(key) or ttfr
+            if key in first_seen:
+                ttfr = now - first_seen[key]
+            results.append((key, True, ttfr))
+        return results
+
+    async def close(self) -> None:
+        await self.connection.close()
+
+    def _firing_key(self, group_key: str) -> str:
+        return f"{self.key_prefix}firing:{group_key}"
+
+    def _local_claim(self, group_key: str) -> bool:
+        """Decide from local state alone, as InMemoryDedupBackend would."""
+        group = self.deduplicator.groups.get(group_key)
+        return group is None or not group.investigated
+
+
+def create_dedup_backend(
+    kind: str, deduplicator: AlertDeduplicator, redis_url: str = ""
+) -> DedupBackend:
+    """Build the dedup backend selected by DEDUP_BACKEND (memory | redis)."""
+    if kind == "redis":
+        if not redis_url:
+            raise ValueError("DEDUP_BACKEND=redis requires DEDUP_REDIS_URL")
+        return RedisDedupBackend(redis_url, deduplicator)
+    return InMemoryDedupBackend(deduplicator)
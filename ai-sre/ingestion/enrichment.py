@@ -1,9 +1,17 @@
 """Alert enrichment — adds context to raw alerts before agent processing."""
 
+import asyncio
 import logging
-from typing import Any
+import os
+from functools import partial
+from typing import Any, Awaitable, Callable
 
-import httpx
+from common.batching import AsyncBatcher
+from common.cache import AsyncTTLCache
+from common.http_clients import http_clients
+
+from .metrics import enrichment_source_total
+from .models import EnrichmentSourceStatus
 
 logger = logging.getLogger(__name__)
 
@@ -11,57 +19,182 @@ logger = logging.getLogger(__name__)
 VICTORIAMETRICS_URL = "http://vmselect.monitoring.svc.cluster.local:8481"
 CLICKHOUSE_URL = "http://clickhouse.monitoring.svc.cluster.local:8123"
 
+# Per-source deadlines in seconds. A source that misses its deadline is
+# reported as timed out instead of delaying the rest of the enrichment.
+SOURCE_DEADLINES: dict[str, float] = {
+    "cpu_usage": float(os.environ.get("ENRICHMENT_VM_DEADLINE_SECONDS", "2.0")),
+    "memory_usage": float(os.environ.get("ENRICHMENT_VM_DEADLINE_SECONDS", "2.0")),
+    "recent_alerts": float(os.environ.get("ENRICHMENT_CH_DEADLINE_SECONDS", "3.0")),
+}
+
+# Per-source cache TTLs in seconds. During a storm many alertnames in the
+# same cluster/namespace issue identical queries; these collapse into one
+# upstream call per TTL.
+SOURCE_CACHE_TTLS: dict[str, float] = {
+    "cpu_usage": float(os.environ.get("ENRICHMENT_VM_CACHE_TTL_SECONDS", "30")),
+    "memory_usage": float(os.environ.get("ENRICHMENT_VM_CACHE_TTL_SECONDS", "30")),
+    "recent_alerts": float(os.environ.get("ENRICHMENT_CH_CACHE_TTL_SECONDS", "60")),
+}
+
+# Recent-alert lookups issued within this window share one ClickHouse query
+RECENT_ALERTS_BATCH_WINDOW_SECONDS = float(
+    os.environ.get("ENRICHMENT_CH_BATCH_WINDOW_MS", "5")
+) / 1000
+RECENT_ALERTS_BATCH_SIZE = int(os.environ.get("ENRICHMENT_CH_BATCH_SIZE", "200"))
+
+# Values are bound server-side as query parameters, never interpolated
+RECENT_ALERTS_SQL = (
+    "SELECT alert_id, timestamp, alertname, cluster, status, agent_advisory "
+    "FROM ai_sre.alerts "
+    "WHERE (alertname, cluster) IN {pairs:Array(Tuple(String, String))} "
+    "AND outcome = 'investigated' "
+    "AND timestamp > now() - INTERVAL 7 DAY "
+    "ORDER BY timestamp DESC "
+    "LIMIT 5 BY alertname, cluster "
+    "FORMAT JSON"
+)
+
+enrichment_cache = AsyncTTLCache(
+    "enrichment",
+    maxsize=int(os.environ.get("ENRICHMENT_CACHE_SIZE", "4096")),
+)
+
+
+def _utilization_queries(cluster: str, namespace: str | None) -> dict[str, str]:
+    """Build the resource utilization PromQL queries for a namespace."""
+    if not namespace:
+        return {}
+    return {
+        "cpu_usage": (
+            f'sum(rate(container_cpu_usage_seconds_total'
+            f'{{namespace="{namespace}", cluster="{cluster}"}}[5m]))'
+        ),
+        "memory_usage": (
+            f'sum(container_memory_working_set_bytes'
+            f'{{namespace="{namespace}", cluster="{cluster}"}})'
+        ),
+    }
+
+
+async def _query_vm(promql: str) -> dict[str, Any]:
+    """Run an instant query against VictoriaMetrics.
+
+    Raises on transport errors and error responses, so they are neither
+    cached nor reported as a successful source.
+    """
+    client = http_clients.get("victoriametrics")
+    resp = await client.get(
+        f"{VICTORIAMETRICS_URL}/select/0/prometheus/api/v1/query",
+        params={"query": promql},
+    )
+    resp.raise_for_status()
+    return resp.json()
+
+
+def _ch_string(value: str) -> str:
+    """Quote a string in ClickHouse's text format for a query parameter value."""
+    return "'" + value.replace("\\", "\\\\").replace("'", "\\'") + "'"
+
+
+async def _query_recent_alerts_batch(
+    pairs: list[tuple[str, str]],
+) -> dict[tuple[str, str], list[dict[str, Any]]]:
+    """Fetch recent similar alerts for many (alertname, cluster) pairs in one query.
+
+    Returns up to 5 rows per pair, newest first. Raises on transport
+    errors and error responses.
+    """
+    client = http_clients.get("clickhouse")
+    resp = await client.post(
+        CLICKHOUSE_URL,
+        params={
+            "param_pairs": "["
+            + ",".join(f"({_ch_string(a)},{_ch_string(c)})" for a, c in pairs)
+            + "]"
+        },
+        content=RECENT_ALERTS_SQL,
+    )
+    resp.raise_for_status()
+    results: dict[tuple[str, str], list[dict[str, Any]]] = {}
+    for row in resp.json().get("data", []):
+        results.setdefault((row.get("alertname"), row.get("cluster")), []).append(row)
+    return results
+
+
+recent_alerts_batcher = AsyncBatcher(
+    "recent_alerts",
+    _query_recent_alerts_batch,
+    max_batch_size=RECENT_ALERTS_BATCH_SIZE,
+    max_wait=RECENT_ALERTS_BATCH_WINDOW_SECONDS,
+    default_factory=list,
+)
+
+
+async def _query_recent_alerts(alertname: str, cluster: str) -> list[dict[str, Any]]:
+    """Fetch recent similar alerts from ClickHouse. Raises on transport and HTTP errors.
+
+    Concurrent lookups (a webhook batch being enriched) are coalesced into
+    one ``(alertname, cluster) IN ...`` query and demultiplexed per pair.
+    """
+    return await recent_alerts_batcher.load((alertname, cluster))
+
+
+async def _run_source(
+    name: str, key: tuple[str, ...], loader: Callable[[], Awaitable[Any]]
+) -> tuple[EnrichmentSourceStatus, Any]:
+    """Load one enrichment source through the cache under its deadline.
+
+    Classifies the outcome. A load that misses the deadline keeps running
+    and still fills the cache for the next alert that needs it.
+    """
+    try:
+        value = await asyncio.wait_for(
+            enrichment_cache.get_or_load(
+                (name, *key), loader, ttl=SOURCE_CACHE_TTLS.get(name)
+            ),
+            timeout=SOURCE_DEADLINES.get(name, 5.0),
+        )
+        status = EnrichmentSourceStatus.OK if value else EnrichmentSourceStatus.EMPTY
+    except TimeoutError:
+        logger.warning("Enrichment source '%s' missed its deadline", name)
+        value, status = None, EnrichmentSourceStatus.TIMEOUT
+    except Exception as e:
+        logger.warning("Enrichment source '%s' failed: %s", name, e)
+        value, status = None, EnrichmentSourceStatus.ERROR
+
+    enrichment_source_total.labels(source=name, status=status.value).inc()
+    return status, value
+
 
 async def enrich_with_resource_utilization(
     cluster: str, namespace: str | None
 ) -> dict[str, Any]:
-    """Fetch current resource utilization from VictoriaMetrics."""
-    try:
-        async with httpx.AsyncClient(timeout=10) as client:
-            queries = {}
-            if namespace:
-                queries["cpu_usage"] = (
-                    f'sum(rate(container_cpu_usage_seconds_total'
-                    f'{{namespace="{namespace}", cluster="{cluster}"}}[5m]))'
-                )
-                queries["memory_usage"] = (
-                    f'sum(container_memory_working_set_bytes'
-                    f'{{namespace="{namespace}", cluster="{cluster}"}})'
-                )
-            results = {}
-            for name, promql in queries.items():
-                resp = await client.get(
-                    f"{VICTORIAMETRICS_URL}/select/0/prometheus/api/v1/query",
-                    params={"query": promql},
-                )
-                if resp.status_code == 200:
-                    results[name] = resp.json()
-            return results
-    except Exception as e:
-        logger.warning("Failed to enrich resource utilization: %s", e)
-        return {}
+    """Fetch current resource utilization from VictoriaMetrics.
+
+    The CPU and memory queries run concurrently.
+    """
+    queries = _utilization_queries(cluster, namespace)
+    outcomes = await asyncio.gather(*(
+        _run_source(name, (promql,), partial(_query_vm, promql))
+        for name, promql in queries.items()
+    ))
+    return {
+        name: value
+        for name, (status, value) in zip(queries, outcomes, strict=True)
+        if status == EnrichmentSourceStatus.OK
+    }
 
 
 async def enrich_with_recent_alerts(
     alertname: str, cluster: str
 ) -> list[dict[str, Any]]:
     """Fetch recent similar alerts from ClickHouse history."""
-    try:
-        sql = (
-            "SELECT alert_id, timestamp, alertname, status, agent_advisory "
-            "FROM ai_sre.alerts "
-            f"WHERE alertname = '{alertname}' AND cluster = '{cluster}' "
-            "AND timestamp > now() - INTERVAL 7 DAY "
-            "ORDER BY timestamp DESC LIMIT 5 FORMAT JSON"
-        )
-        async with httpx.AsyncClient(timeout=10) as client:
-            resp = await client.post(CLICKHOUSE_URL, content=sql)
-            if resp.status_code == 200:
-                data = resp.json()
-                return data.get("data", [])
-    except Exception as e:
-        logger.warning("Failed to fetch recent alerts: %s", e)
-    return []
+    _, recent = await _run_source(
+        "recent_alerts",
+        (alertname, cluster),
+        partial(_query_recent_alerts, alertname, cluster),
+    )
+    return recent or []
 
 
 async def enrich_alert(
@@ -72,23 +205,55 @@ async def enrich_alert(
 ) -> dict[str, Any]:
     """Enrich an alert with all available context.
 
-    Gathers:
+    Gathers, concurrently and each under its own deadline (through the
+    shared single-flight enrichment cache):
     - Current resource utilization from VictoriaMetrics
     - Recent similar alerts from ClickHouse
     - Affected cluster and namespace metadata
+
+    The result is a partial enrichment: sources that time out or fail are
+    left out, and ``source_status`` reports the outcome of every source.
     """
     enrichment: dict[str, Any] = {
         "cluster": cluster,
         "namespace": namespace,
     }
 
+    calls: dict[str, tuple[tuple[str, ...], Callable[[], Awaitable[Any]]]] = {
+        name: ((promql,), partial(_query_vm, promql))
+        for name, promql in _utilization_queries(cluster, namespace).items()
+    }
+    calls["recent_alerts"] = (
+        (alertname, cluster),
+        partial(_query_recent_alerts, alertname, cluster),
+    )
+
+    outcomes = dict(zip(
+        calls,
+        await asyncio.gather(*(
+            _run_source(name, key, loader) for name, (key, loader) in calls.items()
+        )),
+        strict=True,
+    ))
+
+    source_status = {
+        name: EnrichmentSourceStatus.SKIPPED.value
+        for name in ("cpu_usage", "memory_usage")
+    }
+    source_status.update({name: status.value for name, (status, _) in outcomes.items()})
+    enrichment["source_status"] = source_status
+
     # Resource utilization
-    utilization = await enrich_with_resource_utilization(cluster, namespace)
+    utilization = {
+        name: value
+        for name, (status, value) in outcomes.items()
+        if name != "recent_alerts" and status == EnrichmentSourceStatus.OK
+    }
     if utilization:
         enrichment["resource_utilization"] = utilization
 
     # Recent similar alerts
-    recent = await enrich_with_recent_alerts(alertname, cluster)
+    _, recent = outcomes["recent_alerts"]
     if recent:
         enrichment["recent_similar_alerts"] = recent
         enrichment["recent_similar_count"] = len(recent)
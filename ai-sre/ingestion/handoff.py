@@ -0,0 +1,47 @@
+"""Orchestrator hand-off — forwards routed alerts to the SRE orchestrator."""
+
+import logging
+import os
+
+from common.http_clients import http_clients
+
+from .models import AlertRouteTarget, EnrichedAlert
+
+logger = logging.getLogger(__name__)
+
+ORCHESTRATOR_URL = os.environ.get("ORCHESTRATOR_URL", "")
+
+
+async def hand_off_to_orchestrator(
+    enriched: EnrichedAlert,
+    target: AlertRouteTarget,
+) -> bool:
+    """Submit an enriched alert to the orchestrator for investigation.
+
+    Returns True if the orchestrator accepted the investigation. Failures
+    are logged and never raised, so one unreachable orchestrator replica
+    cannot stall the queue workers.
+    """
+    if not ORCHESTRATOR_URL:
+        logger.debug("ORCHESTRATOR_URL not set, skipping hand-off for %s", enriched.alert_id)
+        return False
+
+    payload = {
+        "alert_id": str(enriched.alert_id),
+        "labels": enriched.labels,
+        "annotations": enriched.annotations,
+        "fingerprint": enriched.fingerprint,
+        "severity": enriched.severity.value,
+        "dedup_group": enriched.dedup_group,
+        "target_agent": target.value,
+        "enrichment": enriched.enrichment_data,
+    }
+
+    try:
+        client = http_clients.get("orchestrator")
+        resp = await client.post(f"{ORCHESTRATOR_URL}/api/v1/investigations", json=payload)
+        resp.raise_for_status()
+        return True
+    except Exception as e:
+        logger.warning("Failed to hand off alert %s to orchestrator: %s", enriched.alert_id, e)
+        return False
@@ -0,0 +1,367 @@
+"""Alert history writer — persists ingested alerts into ClickHouse ai_sre.alerts.
+
+Rows are buffered column by column in memory and flushed as one
+``INSERT ... FORMAT JSONCompactColumns`` request per batch, on size or
+time, from a background task; recording an alert never waits on
+ClickHouse. Batches that cannot be written are appended to a spill file
+on local disk and replayed, oldest first, once ClickHouse accepts
+writes again (with backoff while it does not). Spilled batches are
+delivered at least once: a replay cut short by a crash is merged back
+into the spill file on the next start and sent again from its beginning.
+"""
+
+import asyncio
+import contextlib
+import json
+import logging
+import os
+import shutil
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, BinaryIO, Optional
+
+from common.http_clients import http_clients
+
+from .metrics import (
+    alert_history_buffered_rows,
+    alert_history_flush_failures_total,
+    alert_history_rows_dropped_total,
+    alert_history_rows_spilled_total,
+    alert_history_rows_written_total,
+)
+from .models import EnrichedAlert
+
+logger = logging.getLogger(__name__)
+
+# Columns written for every alert, in insert order
+COLUMNS = (
+    "alert_id",
+    "timestamp",
+    "alertname",
+    "cluster",
+    "namespace",
+    "severity",
+    "status",
+    "labels",
+    "enrichment_data",
+    "dedup_group",
+    "correlation_group",
+    "outcome",
+    "ttfr_seconds",
+)
+
+# Defaults (overridden via environment in api.py)
+DEFAULT_BATCH_SIZE = 1000
+DEFAULT_FLUSH_INTERVAL_SECONDS = 5.0
+DEFAULT_MAX_BUFFERED_ROWS = 100000
+DEFAULT_MAX_SPILL_BYTES = 512 * 1024 * 1024
+# Longest wait between replay attempts while ClickHouse keeps failing
+REPLAY_BACKOFF_MAX_SECONDS = 300.0
+
+SPILL_FILE = "alerts.spill.jsonl"
+
+
+def _timestamp(value: Optional[datetime] = None) -> str:
+    """Format a timestamp for a DateTime64(3) column (UTC)."""
+    value = value or datetime.now(timezone.utc)
+    if value.tzinfo is not None:
+        value = value.astimezone(timezone.utc)
+    return value.strftime("%Y-%m-%d %H:%M:%S.%f")[:-3]
+
+
+class AlertHistoryWriter:
+    """Async, batched, columnar writer for ai_sre.alerts with a disk spill."""
+
+    def __init__(
+        self,
+        clickhouse_url: str,
+        spill_dir: str,
+        table: str = "ai_sre.alerts",
+        batch_size: int = DEFAULT_BATCH_SIZE,
+        flush_interval: float = DEFAULT_FLUSH_INTERVAL_SECONDS,
+        max_buffered_rows: int = DEFAULT_MAX_BUFFERED_ROWS,
+        max_spill_bytes: int = DEFAULT_MAX_SPILL_BYTES,
+    ) -> None:
+        self.clickhouse_url = clickhouse_url
+        self.spill_path = Path(spill_dir) / SPILL_FILE
+        # Spill file moved aside during a replay, and the requeue's temporary file
+        self._replaying_path = self.spill_path.with_suffix(".replaying")
+        self._pending_path = self.spill_path.with_suffix(".pending")
+        self.table = table
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.max_buffered_rows = max_buffered_rows
+        self.max_spill_bytes = max_spill_bytes
+        self._columns: dict[str, list[Any]] = {name: [] for name in COLUMNS}
+        self._rows = 0
+        self._wakeup: Optional[asyncio.Event] = None
+        self._task: Optional[asyncio.Task[None]] = None
+        self._stopping = False
+        try:
+            self._recover()
+        except OSError as e:
+            logger.error("Failed to recover interrupted alert history replay: %s", e)
+        # Whether spilled batches may be waiting, and when to retry them
+        self._spill_pending = self.spill_path.exists() or self._replaying_path.exists()
+        self._replay_backoff = flush_interval
+        self._next_replay = 0.0
+        alert_history_buffered_rows.set_function(lambda: self._rows)
+
+    @property
+    def buffered(self) -> int:
+        """Rows waiting for the next flush."""
+        return self._rows
+
+    async def start(self) -> None:
+        """Start the background flush loop."""
+        self._wakeup = asyncio.Event()
+        self._stopping = False
+        self._task = asyncio.create_task(self._flush_loop())
+        logger.info(
+            "Alert history writer started (batch=%d, interval=%.1fs, spill=%s)",
+            self.batch_size,
+            self.flush_interval,
+            self.spill_path,
+        )
+
+    async def stop(self) -> None:
+        """Stop the flush loop and write (or spill) everything buffered."""
+        if self._task is not None and self._wakeup is not None:
+            # Let the loop finish its in-flight write rather than cancelling it
+            self._stopping = True
+            self._wakeup.set()
+            await self._task
+            self._task = None
+        await self.flush()
+
+    def record(
+        self,
+        *,
+        alert_id: str,
+        alertname: str,
+        cluster: str,
+        namespace: Optional[str],
+        severity: str,
+        status: str,
+        labels: dict[str, str],
+        outcome: str,
+        enrichment_data: Optional[dict[str, Any]] = None,
+        dedup_group: Optional[str] = None,
+        correlation_group: Optional[str] = None,
+        ttfr_seconds: Optional[float] = None,
+        timestamp: Optional[datetime] = None,
+    ) -> None:
+        """Buffer one alert row. Never blocks; drops the row if the buffer is full."""
+        if self._rows >= self.max_buffered_rows:
+            alert_history_rows_dropped_total.inc()
+            return
+        columns = self._columns
+        columns["alert_id"].append(alert_id)
+        columns["timestamp"].append(_timestamp(timestamp))
+        columns["alertname"].append(alertname)
+        columns["cluster"].append(cluster)
+        columns["namespace"].append(namespace or "")
+        columns["severity"].append(severity)
+        columns["status"].append(status)
+        columns["labels"].append(labels)
+        columns["enrichment_data"].append(
+            json.dumps(enrichment_data, default=str) if enrichment_data else ""
+        )
+        columns["dedup_group"].append(dedup_group or "")
+        columns["correlation_group"].append(correlation_group or "")
+        columns["outcome"].append(outcome)
+        columns["ttfr_seconds"].append(ttfr_seconds or 0.0)
+        self._rows += 1
+        if self._rows >= self.batch_size and self._wakeup is not None:
+            self._wakeup.set()
+
+    def record_enriched(self, enriched: EnrichedAlert, outcome: str = "investigated") -> None:
+        """Buffer an enriched alert that was routed for investigation."""
+        self.record(
+            alert_id=str(enriched.alert_id),
+            alertname=enriched.alertname,
+            cluster=enriched.cluster,
+            namespace=enriched.namespace,
+            severity=enriched.severity.value,
+            status=enriched.status.value,
+            labels=enriched.labels,
+            outcome=outcome,
+            enrichment_data=enriched.enrichment_data,
+            dedup_group=enriched.dedup_group,
+            correlation_group=enriched.correlation_group,
+            ttfr_seconds=enriched.ttfr_seconds,
+            timestamp=enriched.timestamp,
+        )
+
+    async def flush(self) -> None:
+        """Write the buffered batch now; spill it if ClickHouse rejects it.
+
+        Spilled batches are replayed right after a batch is written, and
+        otherwise retried with backoff, so an outage does not turn every
+        flush interval into another failing request and a spill file scan.
+        """
+        if not self._rows:
+            if self._spill_pending and time.monotonic() >= self._next_replay:
+                # Nothing new to write: probe ClickHouse with the spill
+                await self._replay()
+            return
+        rows, batch = self._rows, self._columns
+        self._columns = {name: [] for name in COLUMNS}
+        self._rows = 0
+
+        payload = json.dumps([batch[name] for name in COLUMNS])
+        if await self._insert(payload, rows):
+            # ClickHouse is healthy again: catch up on anything spilled
+            if self._spill_pending:
+                await self._replay()
+        else:
+            await asyncio.to_thread(self._spill, payload, rows)
+            self._defer_replay()
+
+    async def _flush_loop(self) -> None:
+        assert self._wakeup is not None
+        while True:
+            with contextlib.suppress(TimeoutError):
+                await asyncio.wait_for(self._wakeup.wait(), timeout=self.flush_interval)
+            self._wakeup.clear()
+            try:
+                await self.flush()
+            except Exception:
+                logger.exception("Alert history flush failed")
+            if self._stopping:
+                return
+
+    async def _insert(self, payload: str, rows: int) -> bool:
+        query = f"INSERT INTO {self.table} ({', '.join(COLUMNS)}) FORMAT JSONCompactColumns"
+        try:
+            client = http_clients.get("clickhouse")
+            resp = await client.post(
+                self.clickhouse_url,
+                params={"query": query},
+                content=payload,
+            )
+            resp.raise_for_status()
+        except Exception as e:
+            alert_history_flush_failures_total.inc()
+            logger.warning("Failed to write %d alerts to %s: %s", rows, self.table, e)
+            return False
+        alert_history_rows_written_total.inc(rows)
+        return True
+
+    def _defer_replay(self) -> None:
+        """Back off the next replay attempt (doubling, up to REPLAY_BACKOFF_MAX_SECONDS)."""
+        self._next_replay = time.monotonic() + self._replay_backoff
+        self._replay_backoff = min(self._replay_backoff * 2, REPLAY_BACKOFF_MAX_SECONDS)
+
+    def _spill(self, payload: str, rows: int) -> None:
+        """Append a failed batch to the spill file, one JSON line per batch.
+
+        Blocking file I/O: called through ``asyncio.to_thread``.
+        """
+        try:
+            self.spill_path.parent.mkdir(parents=True, exist_ok=True)
+            size = self.spill_path.stat().st_size if self.spill_path.exists() else 0
+            if size + len(payload) > self.max_spill_bytes:
+                alert_history_rows_dropped_total.inc(rows)
+                logger.error("Alert history spill file full, dropping %d rows", rows)
+                return
+            with open(self.spill_path, "a") as f:
+                f.write(json.dumps({"rows": rows, "data": payload}) + "\n")
+        except OSError as e:
+            alert_history_rows_dropped_total.inc(rows)
+            logger.error("Failed to spill %d alert history rows: %s", rows, e)
+            return
+        self._spill_pending = True
+        alert_history_rows_spilled_total.inc(rows)
+
+    def _recover(self) -> None:
+        """Put batches left in ``.replaying`` back at the front of the spill file.
+
+        ``.replaying`` outlives a replay only if the process died during it
+        or its remainder could not be requeued; a ``.pending`` file is then a
+        partial copy of it and is discarded. Blocking file I/O.
+        """
+        self._pending_path.unlink(missing_ok=True)
+        if not self._replaying_path.exists():
+            return
+        with open(self._replaying_path, "rb") as replaying:
+            self._requeue(replaying, 0)
+        self._replaying_path.unlink()
+        logger.warning("Recovered alert history batches from an interrupted replay")
+
+    def _take_spill(self) -> Optional[BinaryIO]:
+        """Move the spill file aside for replay and open it; None if there is none."""
+        self._recover()
+        if not self.spill_path.exists():
+            return None
+        # New spills during the replay go to a fresh file
+        os.replace(self.spill_path, self._replaying_path)
+        return open(self._replaying_path, "rb")
+
+    def _requeue(self, spill: BinaryIO, offset: int) -> None:
+        """Put the unreplayed remainder back, ahead of anything spilled meanwhile."""
+        with open(self._pending_path, "wb") as out:
+            spill.seek(offset)
+            shutil.copyfileobj(spill, out)
+            if self.spill_path.exists():
+                with open(self.spill_path, "rb") as newer:
+                    shutil.copyfileobj(newer, out)
+        os.replace(self._pending_path, self.spill_path)
+
+    async def _replay(self) -> None:
+        """Re-send spilled batches in order; keep whatever still fails.
+
+        The spill file is streamed one batch (line) at a time, and all
+        file I/O runs in worker threads, off the event loop. The file being
+        replayed is only deleted once every batch in it was either sent or
+        requeued.
+        """
+        try:
+            spill = await asyncio.to_thread(self._take_spill)
+        except OSError as e:
+            logger.error("Failed to read alert history spill file: %s", e)
+            self._defer_replay()
+            return
+        if spill is None:
+            self._spill_pending = False
+            return
+
+        replayed = 0
+        complete = False
+        # Whether every batch of the replaying file was sent or requeued
+        settled = False
+        try:
+            while True:
+                offset = spill.tell()
+                line = await asyncio.to_thread(spill.readline)
+                if not line:
+                    complete = settled = True
+                    break
+                try:
+                    batch = json.loads(line)
+                except json.JSONDecodeError:
+                    logger.warning("Skipping corrupt alert history spill entry")
+                    continue
+                if not await self._insert(batch["data"], batch["rows"]):
+                    try:
+                        await asyncio.to_thread(self._requeue, spill, offset)
+                        settled = True
+                    except OSError as e:
+                        # Kept in the replaying file, merged back on the next attempt
+                        logger.error("Failed to requeue alert history spill: %s", e)
+                    break
+                replayed += batch["rows"]
+        finally:
+            spill.close()
+        if settled:
+            await asyncio.to_thread(self._replaying_path.unlink, True)
+
+        if complete:
+            self._spill_pending = False
+            self._replay_backoff = self.flush_interval
+            self._next_replay = 0.0
+        else:
+            self._defer_replay()
+        if replayed:
+            logger.info("Replayed %d spilled alert history rows", replayed)
@@ -1,6 +1,6 @@
 """Prometheus metrics for the alert ingestion pipeline."""
 
-from prometheus_client import Counter, Histogram
+from prometheus_client import Counter, Gauge, Histogram
 
 alerts_received_total = Counter(
     "ai_sre_alerts_received_total",
@@ -26,14 +26,109 @@ advisory_generated_total = Counter(
     ["agent"],
 )
 
+alerts_correlated_total = Counter(
+    "ai_sre_alerts_correlated_total",
+    "Total alerts folded into an existing correlation group (not triggering new investigation)",
+)
+
+alerts_resolved_total = Counter(
+    "ai_sre_alerts_resolved_total",
+    "Resolved alert notifications received (never enriched or investigated)",
+    ["cluster"],
+)
+
+alert_ttfr_seconds = Histogram(
+    "ai_sre_alert_ttfr_seconds",
+    "Time from an alert group's first firing alert to its resolution in seconds",
+    buckets=[60, 300, 600, 1800, 3600, 7200, 21600, 86400],
+)
+
 alert_enrichment_duration_seconds = Histogram(
     "ai_sre_alert_enrichment_duration_seconds",
     "Duration of alert enrichment in seconds",
     buckets=[0.1, 0.5, 1, 2, 5, 10],
 )
 
+enrichment_source_total = Counter(
+    "ai_sre_enrichment_source_total",
+    "Enrichment source lookups by outcome (ok, empty, timeout, error)",
+    ["source", "status"],
+)
+
+webhook_batch_duration_seconds = Histogram(
+    "ai_sre_webhook_batch_duration_seconds",
+    "End-to-end duration of processing one Alertmanager webhook batch in seconds",
+    buckets=[0.05, 0.1, 0.5, 1, 2, 5, 10, 30],
+)
+
 webhook_requests_total = Counter(
     "ai_sre_webhook_requests_total",
     "Total webhook requests received",
     ["status"],
 )
+
+alert_queue_depth = Gauge(
+    "ai_sre_alert_queue_depth",
+    "Alerts waiting in the in-process enrichment queue",
+)
+
+alert_queue_wait_seconds = Histogram(
+    "ai_sre_alert_queue_wait_seconds",
+    "Time alerts wait in the enrichment queue before a worker picks them up",
+    buckets=[0.01, 0.05, 0.1, 0.5, 1, 5, 10, 30, 60],
+)
+
+alert_queue_cancelled_total = Counter(
+    "ai_sre_alert_queue_cancelled_total",
+    "Queued or in-flight alerts dropped because their group resolved",
+    ["stage"],
+)
+
+alerts_rate_limited_total = Counter(
+    "ai_sre_alerts_rate_limited_total",
+    "Alerts dropped because their receiver/cluster/severity budget was exhausted",
+    ["cluster", "severity"],
+)
+
+rate_limit_tokens_available = Gauge(
+    "ai_sre_rate_limit_tokens_available",
+    "Alerts remaining in the rate limit budget per receiver/cluster/severity",
+    ["receiver", "cluster", "severity"],
+)
+
+dedup_backend_round_trips_total = Counter(
+    "ai_sre_dedup_backend_round_trips_total",
+    "Round trips to the shared dedup backend (one per webhook batch when uncached)",
+    ["backend"],
+)
+
+dedup_backend_errors_total = Counter(
+    "ai_sre_dedup_backend_errors_total",
+    "Shared dedup backend failures that fell back to local dedup state",
+    ["backend"],
+)
+
+alert_history_rows_written_total = Counter(
+    "ai_sre_alert_history_rows_written_total",
+    "Alert rows written to ClickHouse ai_sre.alerts (including replayed spills)",
+)
+
+alert_history_rows_spilled_total = Counter(
+    "ai_sre_alert_history_rows_spilled_total",
+    "Alert rows spilled to local disk because ClickHouse rejected the write",
+)
+
+alert_history_rows_dropped_total = Counter(
+    "ai_sre_alert_history_rows_dropped_total",
+    "Alert rows dropped because the history buffer or spill file was full",
+)
+
+alert_history_flush_failures_total = Counter(
+    "ai_sre_alert_history_flush_failures_total",
+    "Failed alert history batch inserts",
+)
+
+alert_history_buffered_rows = Gauge(
+    "ai_sre_alert_history_buffered_rows",
+    "Alert rows buffered in memory awaiting the next history flush",
+)
@@ -0,0 +1,7 @@
+-- Columns written by the ingestion alert history writer (ingestion/history.py)
+-- Run against ClickHouse: clickhouse-client --multiquery < 002_add_alert_outcome_columns.sql
+
+ALTER TABLE ai_sre.alerts
+    ADD COLUMN IF NOT EXISTS dedup_group String DEFAULT '' AFTER ttfr_seconds,
+    ADD COLUMN IF NOT EXISTS correlation_group String DEFAULT '' AFTER dedup_group,
+    ADD COLUMN IF NOT EXISTS outcome LowCardinality(String) DEFAULT 'investigated' AFTER correlation_group;
@@ -25,6 +25,16 @@ class AlertSeverity(str, Enum):
     INFO = "info"
 
 
+class EnrichmentSourceStatus(str, Enum):
+    """Outcome of a single enrichment source for an alert."""
+
+    OK = "ok"
+    EMPTY = "empty"
+    TIMEOUT = "timeout"
+    ERROR = "error"
+    SKIPPED = "skipped"
+
+
 class AlertmanagerAlert(BaseModel):
     """Single alert from Alertmanager webhook payload."""
 
@@ -73,6 +83,7 @@ class EnrichedAlert(BaseModel):
     resolution: Optional[str] = None
     ttfr_seconds: Optional[float] = None
     dedup_group: Optional[str] = None
+    correlation_group: Optional[str] = None
 
 
 class AlertRouteTarget(str, Enum):
@@ -84,3 +95,4 @@ class AlertRouteTarget(str, Enum):
     PREDICTIVE_SCALING = "predictive-scaling"
     COST_OPTIMIZATION = "cost-optimization"
     ONCALL_COPILOT = "oncall-copilot"
+    AWS_CLOUD = "aws-cloud"
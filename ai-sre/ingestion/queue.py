@@ -0,0 +1,198 @@
+"""Bounded in-process alert queue — decouples webhook acknowledgement from enrichment."""
+
+import asyncio
+import logging
+import time
+from dataclasses import dataclass, field
+from typing import Awaitable, Callable, Optional
+
+from .metrics import alert_queue_cancelled_total, alert_queue_depth, alert_queue_wait_seconds
+from .models import AlertSeverity
+from .webhook_parser import WebhookAlert
+
+logger = logging.getLogger(__name__)
+
+# Defaults (overridden via environment in api.py)
+DEFAULT_QUEUE_SIZE = 10000
+DEFAULT_QUEUE_WORKERS = 8
+DEFAULT_DRAIN_TIMEOUT_SECONDS = 25.0
+
+
+@dataclass
+class PendingAlert:
+    """A deduplicated alert waiting for enrichment and routing."""
+
+    alert: WebhookAlert
+    alertname: str
+    cluster: str
+    namespace: Optional[str]
+    severity: AlertSeverity
+    group_key: str
+    correlation_group: Optional[str] = None
+    enqueued_at: float = field(default_factory=time.monotonic)
+
+
+class AlertQueue:
+    """Bounded queue drained by a fixed pool of worker tasks.
+
+    The webhook only validates, deduplicates and enqueues; workers run the
+    handler (enrichment, routing, orchestrator hand-off) off the request
+    path. Capacity is the only backpressure signal: a batch reserves room
+    for all its alerts up front and is rejected when it does not fit,
+    never partially accepted.
+
+    ``cancel_group`` drops a dedup group's work when the group resolves:
+    alerts still queued are skipped when a worker dequeues them, and
+    handlers already running for the group are cancelled. Both are
+    tracked per group key, so cancelling never scans the queue.
+    """
+
+    def __init__(
+        self,
+        handler: Callable[[PendingAlert], Awaitable[None]],
+        maxsize: int = DEFAULT_QUEUE_SIZE,
+        workers: int = DEFAULT_QUEUE_WORKERS,
+    ) -> None:
+        self.handler = handler
+        self.maxsize = maxsize
+        self.worker_count = workers
+        self._queue: asyncio.Queue[PendingAlert] = asyncio.Queue(maxsize=maxsize)
+        self._workers: list[asyncio.Task[None]] = []
+        self._accepting = False
+        # Room held for batches still being admitted
+        self._reserved = 0
+        # group_key -> alerts waiting in the queue
+        self._queued: dict[str, int] = {}
+        # group_key -> when it was cancelled; earlier-enqueued alerts are skipped
+        self._cancelled: dict[str, float] = {}
+        # group_key -> handlers running for it
+        self._running: dict[str, set[asyncio.Task[None]]] = {}
+        alert_queue_depth.set_function(self.depth)
+
+    @property
+    def accepting(self) -> bool:
+        """Whether the queue is running and accepting new alerts."""
+        return self._accepting
+
+    def depth(self) -> int:
+        """Number of alerts waiting for a worker."""
+        return self._queue.qsize()
+
+    def has_capacity(self, count: int) -> bool:
+        """Check whether ``count`` more alerts fit next to those already reserved."""
+        return (
+            self._accepting
+            and self.maxsize - self._queue.qsize() - self._reserved >= count
+        )
+
+    def reserve(self, count: int) -> bool:
+        """Hold room for ``count`` alerts until release(); False if they do not fit.
+
+        A webhook reserves before admission (which awaits the dedup
+        backend), so concurrent batches cannot overcommit the queue.
+        """
+        if not self.has_capacity(count):
+            return False
+        self._reserved += count
+        return True
+
+    def release(self, count: int) -> None:
+        """Give back a reservation once its alerts are enqueued or dropped."""
+        self._reserved -= count
+
+    def enqueue(self, item: PendingAlert) -> None:
+        """Add an alert without waiting. Callers reserve() room for it first."""
+        self._queue.put_nowait(item)
+        self._queued[item.group_key] = self._queued.get(item.group_key, 0) + 1
+
+    def cancel_group(self, group_key: str) -> int:
+        """Drop queued and in-flight work for a group. Returns how many alerts."""
+        cancelled = 0
+        if self._queued.get(group_key):
+            self._cancelled[group_key] = time.monotonic()
+            cancelled += self._queued[group_key]
+        for task in self._running.get(group_key, ()):
+            task.cancel()
+            cancelled += 1
+        return cancelled
+
+    async def start(self) -> None:
+        """Start the worker pool."""
+        self._accepting = True
+        self._workers = [
+            asyncio.create_task(self._worker(i)) for i in range(self.worker_count)
+        ]
+        logger.info(
+            "Alert queue started: maxsize=%d workers=%d", self.maxsize, self.worker_count
+        )
+
+    async def drain(self, timeout: float = DEFAULT_DRAIN_TIMEOUT_SECONDS) -> None:
+        """Stop accepting alerts, finish queued work, then stop the workers.
+
+        Alerts still queued after ``timeout`` seconds are dropped and logged.
+        """
+        self._accepting = False
+        try:
+            await asyncio.wait_for(self._queue.join(), timeout=timeout)
+        except TimeoutError:
+            logger.warning(
+                "Alert queue drain timed out after %.1fs, dropping %d queued alerts",
+                timeout,
+                self._queue.qsize(),
+            )
+
+        for task in self._workers:
+            task.cancel()
+        await asyncio.gather(*self._workers, return_exceptions=True)
+        self._workers = []
+        logger.info("Alert queue drained")
+
+    def _dequeued(self, item: PendingAlert) -> bool:
+        """Account for an alert leaving the queue. Returns False if it was cancelled."""
+        key = item.group_key
+        remaining = self._queued[key] - 1
+        cancelled_at = self._cancelled.get(key)
+        if remaining:
+            self._queued[key] = remaining
+        else:
+            del self._queued[key]
+            self._cancelled.pop(key, None)
+        return cancelled_at is None or item.enqueued_at > cancelled_at
+
+    async def _worker(self, worker_id: int) -> None:
+        while True:
+            item = await self._queue.get()
+            alert_queue_wait_seconds.observe(time.monotonic() - item.enqueued_at)
+            if not self._dequeued(item):
+                alert_queue_cancelled_total.labels(stage="queued").inc()
+                self._queue.task_done()
+                continue
+
+            task = asyncio.ensure_future(self.handler(item))
+            running = self._running.setdefault(item.group_key, set())
+            running.add(task)
+            try:
+                await task
+            except asyncio.CancelledError:
+                if asyncio.current_task().cancelling():  # type: ignore[union-attr]
+                    # The worker itself is being stopped
+                    raise
+                alert_queue_cancelled_total.labels(stage="in_flight").inc()
+                logger.info(
+                    "Alert queue worker %d cancelled '%s' (%s): group resolved",
+                    worker_id,
+                    item.alertname,
+                    item.group_key,
+                )
+            except Exception:
+                logger.exception(
+                    "Alert queue worker %d failed on '%s' (%s)",
+                    worker_id,
+                    item.alertname,
+                    item.group_key,
+                )
+            finally:
+                running.discard(task)
+                if not running:
+                    self._running.pop(item.group_key, None)
+                self._queue.task_done()
@@ -0,0 +1,137 @@
+"""Per-key token-bucket rate limiting for incoming alerts.
+
+Budgets are counted in alerts, not webhook calls, and kept per
+(receiver, cluster, severity) so one noisy cluster cannot starve the
+rest. Critical alerts draw from their own, separately sized budget.
+"""
+
+import logging
+import time
+from typing import Optional
+
+from .metrics import alerts_rate_limited_total, rate_limit_tokens_available
+from .models import AlertSeverity
+
+logger = logging.getLogger(__name__)
+
+# Default budgets, in alerts per minute per key
+DEFAULT_ALERTS_PER_MINUTE = 100
+DEFAULT_CRITICAL_ALERTS_PER_MINUTE = 200
+
+# Buckets idle for this long are full again and can be dropped
+IDLE_BUCKET_SECONDS = 600
+
+
+class TokenBucket:
+    """Token bucket refilled continuously at ``rate`` tokens per second. O(1) per take."""
+
+    __slots__ = ("capacity", "rate", "tokens", "updated")
+
+    def __init__(self, capacity: float, rate: float, now: float) -> None:
+        self.capacity = capacity
+        self.rate = rate
+        self.tokens = capacity
+        self.updated = now
+
+    def _refill(self, now: float) -> None:
+        elapsed = now - self.updated
+        if elapsed > 0:
+            self.tokens = min(self.capacity, self.tokens + elapsed * self.rate)
+            self.updated = now
+
+    def try_take(self, now: float, count: float = 1.0) -> bool:
+        """Take ``count`` tokens if available."""
+        self._refill(now)
+        if self.tokens >= count:
+            self.tokens -= count
+            return True
+        return False
+
+    def available(self, now: float) -> float:
+        """Tokens available at ``now``."""
+        self._refill(now)
+        return self.tokens
+
+
+class AlertRateLimiter:
+    """Token buckets keyed by (receiver, cluster, severity).
+
+    Each key allows a burst of one minute's budget and refills at the
+    per-minute rate. Critical alerts use ``critical_per_minute`` so a
+    warning storm never consumes the budget reserved for pages.
+    """
+
+    def __init__(
+        self,
+        alerts_per_minute: int = DEFAULT_ALERTS_PER_MINUTE,
+        critical_per_minute: int = DEFAULT_CRITICAL_ALERTS_PER_MINUTE,
+    ) -> None:
+        self.alerts_per_minute = alerts_per_minute
+        self.critical_per_minute = critical_per_minute
+        self._buckets: dict[tuple[str, str, str], TokenBucket] = {}
+        self._checks = 0
+
+    def allow(
+        self,
+        receiver: str,
+        cluster: str,
+        severity: AlertSeverity,
+        now: Optional[float] = None,
+    ) -> bool:
+        """Consume one alert from the key's budget. Returns False when exhausted."""
+        now = time.monotonic() if now is None else now
+        key = (receiver, cluster, severity.value)
+
+        bucket = self._buckets.get(key)
+        if bucket is None:
+            per_minute = (
+                self.critical_per_minute
+                if severity == AlertSeverity.CRITICAL
+                else self.alerts_per_minute
+            )
+            bucket = TokenBucket(capacity=per_minute, rate=per_minute / 60, now=now)
+            self._buckets[key] = bucket
+
+        allowed = bucket.try_take(now)
+        rate_limit_tokens_available.labels(
+            receiver=receiver, cluster=cluster, severity=severity.value
+        ).set(bucket.tokens)
+        if not allowed:
+            alerts_rate_limited_total.labels(cluster=cluster, severity=severity.value).inc()
+
+        # Amortized pruning keeps the per-call cost O(1)
+        self._checks += 1
+        if self._checks % 10000 == 0:
+            self._prune(now)
+        return allowed
+
+    def snapshot(self, now: Optional[float] = None) -> dict:
+        """Current limiter configuration and per-key budget state."""
+        now = time.monotonic() if now is None else now
+        return {
+            "alerts_per_minute": self.alerts_per_minute,
+            "critical_alerts_per_minute": self.critical_per_minute,
+            "buckets": [
+                {
+                    "receiver": receiver,
+                    "cluster": cluster,
+                    "severity": severity,
+                    "capacity": bucket.capacity,
+                    "tokens_available": round(bucket.available(now), 2),
+                }
+                for (receiver, cluster, severity), bucket in self._buckets.items()
+            ],
+        }
+
+    def _prune(self, now: float) -> None:
+        """Drop buckets that have been idle long enough to be full again."""
+        idle = [
+            key
+            for key, bucket in self._buckets.items()
+            if now - bucket.updated > IDLE_BUCKET_SECONDS
+        ]
+        for key in idle:
+            del self._buckets[key]
+            rate_limit_tokens_available.remove(*key)
+        if idle:
+            logger.debug("Pruned %d idle rate limit buckets", len(idle))
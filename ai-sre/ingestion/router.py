@@ -3,20 +3,12 @@
 import logging
 from typing import Optional
 
+from common.routing import get_router
+
 from .models import AlertRouteTarget
 
 logger = logging.getLogger(__name__)
 
-# Routing rules: prefix patterns to agent targets
-ROUTING_RULES: list[tuple[list[str], AlertRouteTarget]] = [
-    (["gpu_", "dcgm_"], AlertRouteTarget.GPU_HEALTH),
-    (["kube_pod_", "container_"], AlertRouteTarget.INCIDENT_RESPONSE),
-    (["node_", "kubelet_"], AlertRouteTarget.CAPACITY_PLANNING),
-    (["cilium_", "network_"], AlertRouteTarget.INCIDENT_RESPONSE),
-    (["vllm_"], AlertRouteTarget.PREDICTIVE_SCALING),
-    (["cost_"], AlertRouteTarget.COST_OPTIMIZATION),
-]
-
 
 def route_alert(
     alertname: str,
@@ -24,25 +16,20 @@ def route_alert(
 ) -> AlertRouteTarget:
     """Determine which specialized agent should handle an alert.
 
-    Routes based on alert name prefix patterns. Falls back to
-    the On-Call Copilot for unrecognized alert types.
+    Routes through the shared routing table (common/routing.yaml): name
+    prefixes, regexes and label matchers, then severity overrides. Falls
+    back to the On-Call Copilot for unrecognized alert types.
     """
-    lower_name = alertname.lower()
-
-    for prefixes, target in ROUTING_RULES:
-        if any(lower_name.startswith(prefix) for prefix in prefixes):
-            logger.info("Routing '%s' -> %s", alertname, target.value)
-            return target
-
-    # Check severity-based override
-    if labels:
-        severity = labels.get("severity", "")
-        if severity == "critical":
-            logger.info(
-                "Critical alert '%s' with no specific route -> incident-response",
-                alertname,
-            )
-            return AlertRouteTarget.INCIDENT_RESPONSE
-
-    logger.info("No specific route for '%s' -> oncall-copilot", alertname)
-    return AlertRouteTarget.ONCALL_COPILOT
+    rule = get_router().match(alertname, labels)
+    if rule is not None:
+        target = rule.target
+        logger.info("Routing '%s' -> %s (rule %s)", alertname, target, rule.name)
+    else:
+        target = get_router().route(alertname, labels)
+        logger.info("No specific route for '%s' -> %s", alertname, target)
+
+    try:
+        return AlertRouteTarget(target)
+    except ValueError:
+        logger.warning("Unknown route target '%s' for '%s'", target, alertname)
+        return AlertRouteTarget.ONCALL_COPILOT
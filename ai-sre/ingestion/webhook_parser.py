@@ -0,0 +1,286 @@
+"""Streaming Alertmanager webhook parser — the fast path for POST /api/v1/alerts.
+
+Validating a whole webhook into an ``AlertmanagerWebhook`` tree means
+holding the raw body, the decoded JSON and the Pydantic copy at once,
+before any alert can be looked at. This parser consumes the body chunk
+by chunk and yields each alert as soon as its closing brace arrives:
+
+- the top-level object is walked incrementally; each alert (and each
+  other top-level value) is decoded with the C JSON scanner via
+  ``raw_decode``, so only the current, incomplete element is buffered
+  (up to ``MAX_ELEMENT_SIZE`` characters) and input that can no longer
+  become valid JSON is rejected as soon as it arrives;
+- alerts that already have the right shape become a slotted
+  ``WebhookAlert`` directly (no Pydantic model, no second copy);
+  anything else goes through ``AlertmanagerAlert`` validation, which
+  coerces or rejects it;
+- label keys, and the values of labels that repeat across a batch
+  (alertname, cluster, namespace, severity), are interned so thousands
+  of alerts share one string object each.
+"""
+
+import codecs
+import json
+import re
+import sys
+from dataclasses import dataclass, field
+from typing import Any, AsyncIterator, Optional
+
+from pydantic import ValidationError
+
+from .models import AlertmanagerAlert
+
+# Labels whose values repeat across most alerts in a batch
+INTERNED_LABELS = frozenset({"alertname", "cluster", "namespace", "severity", "job", "instance"})
+
+# Largest single alert or envelope value held while waiting for its end
+MAX_ELEMENT_SIZE = 1 << 20
+
+_WHITESPACE = " \t\n\r"
+
+# What a decode error can point at when the value merely stops early:
+# a partial literal, number or \uXXXX escape running up to the end of data
+_TRUNCATED_TOKEN = re.compile(r"[\w.+-]*")
+
+# Parser states
+_START, _KEY, _COLON, _VALUE, _AFTER_VALUE = range(5)
+_ALERTS_START, _ALERT, _AFTER_ALERT, _END = range(5, 9)
+
+
+class WebhookParseError(ValueError):
+    """The webhook body is not a valid Alertmanager payload."""
+
+
+@dataclass(slots=True)
+class WebhookAlert:
+    """One alert from a webhook; same fields as AlertmanagerAlert, without the model."""
+
+    status: str
+    labels: dict[str, str] = field(default_factory=dict)
+    annotations: dict[str, str] = field(default_factory=dict)
+    startsAt: str = ""
+    endsAt: str = ""
+    generatorURL: str = ""
+    fingerprint: str = ""
+
+
+def _is_str_map(value: Any) -> bool:
+    return type(value) is dict and all(type(v) is str for v in value.values())
+
+
+def build_alert(obj: Any) -> WebhookAlert:
+    """Turn one decoded alert object into a WebhookAlert."""
+    if type(obj) is dict:
+        status = obj.get("status")
+        labels = obj.get("labels", {})
+        annotations = obj.get("annotations", {})
+        starts_at = obj.get("startsAt", "")
+        ends_at = obj.get("endsAt", "")
+        generator_url = obj.get("generatorURL", "")
+        fingerprint = obj.get("fingerprint", "")
+        if (
+            type(status) is str
+            and type(starts_at) is str
+            and type(ends_at) is str
+            and type(generator_url) is str
+            and type(fingerprint) is str
+            and _is_str_map(labels)
+            and _is_str_map(annotations)
+        ):
+            intern = sys.intern
+            return WebhookAlert(
+                intern(status),
+                {
+                    intern(k): intern(v) if k in INTERNED_LABELS else v
+                    for k, v in labels.items()
+                },
+                annotations,
+                starts_at,
+                ends_at,
+                generator_url,
+                fingerprint,
+            )
+    # Unusual shape: let Pydantic coerce it or report the problem
+    try:
+        model = AlertmanagerAlert.model_validate(obj)
+    except ValidationError as e:
+        raise WebhookParseError(f"Invalid alert: {e}") from e
+    return WebhookAlert(**model.model_dump())
+
+
+class WebhookStreamParser:
+    """Incremental parser for one webhook body.
+
+    Feed raw body chunks with ``feed`` (or iterate ``parse_stream``);
+    every call returns the alerts completed so far. After ``close``,
+    ``envelope`` holds the top-level fields other than ``alerts``
+    (receiver, status, groupLabels, ...). Malformed input is reported by
+    ``close`` at the latest, as WebhookParseError.
+    """
+
+    def __init__(self, max_element_size: int = MAX_ELEMENT_SIZE) -> None:
+        self.max_element_size = max_element_size
+        self.envelope: dict[str, Any] = {}
+        self.alert_count = 0
+        self._json = json.JSONDecoder()
+        self._utf8 = codecs.getincrementaldecoder("utf-8")()
+        self._buf = ""
+        self._pos = 0
+        self._state = _START
+        self._key: Optional[str] = None
+        # No entry yet in the object or list being parsed
+        self._empty = True
+
+    def feed(self, chunk: bytes) -> list[WebhookAlert]:
+        """Consume a body chunk. Returns the alerts it completed."""
+        try:
+            text = self._utf8.decode(chunk)
+        except UnicodeDecodeError as e:
+            raise WebhookParseError(f"Webhook body is not UTF-8: {e}") from e
+        self._buf = self._buf[self._pos:] + text
+        self._pos = 0
+        return self._parse(final=False)
+
+    def close(self) -> list[WebhookAlert]:
+        """Finish the body. Returns the remaining alerts; raises if it was incomplete."""
+        alerts = self.feed(b"")
+        try:
+            self._buf += self._utf8.decode(b"", final=True)
+        except UnicodeDecodeError as e:
+            raise WebhookParseError(f"Webhook body is not UTF-8: {e}") from e
+        alerts.extend(self._parse(final=True))
+        if self._state != _END:
+            raise WebhookParseError("Truncated or malformed webhook payload")
+        if self._buf[self._pos:].strip(_WHITESPACE):
+            raise WebhookParseError("Unexpected data after webhook payload")
+        return alerts
+
+    async def parse_stream(self, chunks: AsyncIterator[bytes]) -> AsyncIterator[WebhookAlert]:
+        """Yield alerts from an async stream of body chunks, one at a time."""
+        async for chunk in chunks:
+            for alert in self.feed(chunk):
+                yield alert
+        for alert in self.close():
+            yield alert
+
+    def _skip_whitespace(self) -> Optional[str]:
+        """Advance past whitespace. Returns the next character, or None if out of data."""
+        buf, pos = self._buf, self._pos
+        while pos < len(buf) and buf[pos] in _WHITESPACE:
+            pos += 1
+        self._pos = pos
+        return buf[pos] if pos < len(buf) else None
+
+    def _decode(self, final: bool) -> tuple[bool, Any]:
+        """Decode one JSON value at the cursor. Returns (complete, value)."""
+        try:
+            value, end = self._json.raw_decode(self._buf, self._pos)
+        except json.JSONDecodeError as e:
+            if final or not self._truncated(e):
+                raise WebhookParseError(f"Malformed webhook JSON: {e}") from e
+            return self._incomplete()
+        if not final and _TRUNCATED_TOKEN.fullmatch(self._buf, end):
+            # A number (or the value's last token) may continue in the next chunk
+            return self._incomplete()
+        self._pos = end
+        return True, value
+
+    def _truncated(self, e: json.JSONDecodeError) -> bool:
+        """Whether a decode error only means the value continues in a later chunk."""
+        return e.msg.startswith("Unterminated string") or bool(
+            _TRUNCATED_TOKEN.fullmatch(self._buf, e.pos)
+        )
+
+    def _incomplete(self) -> tuple[bool, Any]:
+        if len(self._buf) - self._pos > self.max_element_size:
+            raise WebhookParseError(
+                f"Webhook element at offset {self._pos} exceeds {self.max_element_size} characters"
+            )
+        return False, None
+
+    def _expect(self, char: str, expected: str) -> None:
+        raise WebhookParseError(
+            f"Malformed webhook JSON: expected {expected} at offset {self._pos}, got {char!r}"
+        )
+
+    def _parse(self, final: bool) -> list[WebhookAlert]:
+        alerts: list[WebhookAlert] = []
+        while self._state != _END:
+            char = self._skip_whitespace()
+            if char is None:
+                break
+
+            if self._state == _START:
+                if char != "{":
+                    self._expect(char, "'{'")
+                self._pos += 1
+                self._state = _KEY
+
+            elif self._state == _KEY:
+                if char == "}" and self._empty:
+                    self._pos += 1
+                    self._state = _END
+                    continue
+                if char != '"':
+                    self._expect(char, "a field name")
+                complete, key = self._decode(final)
+                if not complete:
+                    break
+                self._key = key
+                self._empty = False
+                self._state = _COLON
+
+            elif self._state == _COLON:
+                if char != ":":
+                    self._expect(char, "':'")
+                self._pos += 1
+                self._state = _ALERTS_START if self._key == "alerts" else _VALUE
+
+            elif self._state == _VALUE:
+                complete, value = self._decode(final)
+                if not complete:
+                    break
+                self.envelope[self._key] = value
+                self._state = _AFTER_VALUE
+
+            elif self._state == _AFTER_VALUE:
+                if char == ",":
+                    self._state = _KEY
+                    self._empty = False
+                elif char == "}":
+                    self._state = _END
+                else:
+                    self._expect(char, "',' or '}'")
+                self._pos += 1
+
+            elif self._state == _ALERTS_START:
+                if char == "[":
+                    self._pos += 1
+                    self._state = _ALERT
+                    self._empty = True
+                else:
+                    self._expect(char, "an alerts list")
+
+            elif self._state == _ALERT:
+                if char == "]" and self._empty:
+                    self._pos += 1
+                    self._state = _AFTER_VALUE
+                    continue
+                complete, obj = self._decode(final)
+                if not complete:
+                    break
+                self._empty = False
+                alerts.append(build_alert(obj))
+                self.alert_count += 1
+                self._state = _AFTER_ALERT
+
+            elif self._state == _AFTER_ALERT:
+                if char == ",":
+                    self._state = _ALERT
+                elif char == "]":
+                    self._state = _AFTER_VALUE
+                else:
+                    self._expect(char, "',' or ']'")
+                self._pos += 1
+
+        return alerts
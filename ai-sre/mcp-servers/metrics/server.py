@@ -2,15 +2,21 @@
 
 import logging
 import os
+import sys
 from dataclasses import dataclass
 from datetime import datetime, timezone
+from pathlib import Path
 from typing import Any, Optional
 
-import httpx
 from mcp.server import Server
 from mcp.server.stdio import stdio_server
 from mcp.types import Tool, TextContent
 
+# Ensure the ai-sre root is importable when run as a script
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent.parent))
+
+from common.http_clients import http_clients  # noqa: E402
+
 logger = logging.getLogger(__name__)
 
 # Configuration
@@ -118,18 +124,19 @@ async def query_victoriametrics(
     step: str,
 ) -> dict[str, Any]:
     """Execute a PromQL/MetricsQL range query against VictoriaMetrics."""
-    async with httpx.AsyncClient(timeout=QUERY_TIMEOUT) as client:
-        response = await client.get(
-            f"{VM_URL}/select/0/prometheus/api/v1/query_range",
-            params={
-                "query": promql,
-                "start": start,
-                "end": end,
-                "step": step,
-            },
-        )
-        response.raise_for_status()
-        return response.json()
+    client = http_clients.get("victoriametrics")
+    response = await client.get(
+        f"{VM_URL}/select/0/prometheus/api/v1/query_range",
+        params={
+            "query": promql,
+            "start": start,
+            "end": end,
+            "step": step,
+        },
+        timeout=QUERY_TIMEOUT,
+    )
+    response.raise_for_status()
+    return response.json()
 
 
 async def query_clickhouse(sql: str, limit: int = 100) -> dict[str, Any]:
@@ -142,15 +149,16 @@ async def query_clickhouse(sql: str, limit: int = 100) -> dict[str, Any]:
     if "LIMIT" not in sql.upper():
         sql = f"{sql} LIMIT {effective_limit}"
 
-    async with httpx.AsyncClient(timeout=QUERY_TIMEOUT) as client:
-        response = await client.post(
-            CH_URL,
-            params={"database": CH_DATABASE},
-            content=f"{sql} FORMAT JSON",
-            headers={"Content-Type": "text/plain"},
-        )
-        response.raise_for_status()
-        return response.json()
+    client = http_clients.get("clickhouse")
+    response = await client.post(
+        CH_URL,
+        params={"database": CH_DATABASE},
+        content=f"{sql} FORMAT JSON",
+        headers={"Content-Type": "text/plain"},
+        timeout=QUERY_TIMEOUT,
+    )
+    response.raise_for_status()
+    return response.json()
 
 
 # MCP Server definition
@@ -387,8 +395,12 @@ async def call_tool(name: str, arguments: dict[str, Any]) -> list[TextContent]:
 
 async def main():
     """Run the Metrics MCP server."""
-    async with stdio_server() as (read_stream, write_stream):
-        await server.run(read_stream, write_stream)
+    await http_clients.start()
+    try:
+        async with stdio_server() as (read_stream, write_stream):
+            await server.run(read_stream, write_stream)
+    finally:
+        await http_clients.aclose()
 
 
 if __name__ == "__main__":
@@ -0,0 +1,281 @@
+"""Multi-window, multi-burn-rate SLO engine over VictoriaMetrics range data.
+
+``SLOStore.get_error_budgets`` judges the budget from one instant SLI
+value. ``BurnRateEngine`` instead keeps each objective's SLI history,
+sampled every ``step`` seconds, in an in-memory ring buffer covering its
+whole ``window_days``:
+
+- ``refresh()`` pulls only the points newer than the last one held, with
+  one ``query_range`` per group of objectives, so after the first
+  (full-window) load each refresh fetches a handful of points.
+- Running sums per window (5m, 30m, 1h, 6h, 3d and the SLO window) are
+  updated as points enter and leave, so burn rates and the remaining
+  budget cost O(1) per objective to read.
+- ``burn_alert`` follows the multi-window rules of the SRE workbook:
+  page when both the 1h and 5m (or 6h and 30m) burn rates exceed 14.4
+  (or 6); ticket when both the 3d and 6h burn rates exceed 1.
+
+The process that owns the SLOStore runs ``start()`` to refresh in the
+background and reads ``get_error_budgets()`` (the ingestion service
+serves it at ``/api/v1/slo/budgets`` when ``SLO_PATH`` is set).
+"""
+
+import asyncio
+import contextlib
+import logging
+import math
+import time
+from array import array
+from typing import Optional
+
+from common.http_clients import http_clients
+
+from .models.slo import ErrorBudgetStatus, ServiceSLO, SLOObjective
+from .slo_store import BULK_QUERY_OBJECTIVES, SLO_LABEL, VM_URL, SLOStore, sli_expression
+
+logger = logging.getLogger(__name__)
+
+# Resolution of the SLI history (the SLIs are rates over 5m)
+DEFAULT_STEP_SECONDS = 300
+# Seconds between background refreshes
+DEFAULT_REFRESH_SECONDS = 60.0
+
+# Burn-rate windows, in seconds
+WINDOWS = {
+    "5m": 300,
+    "30m": 1800,
+    "1h": 3600,
+    "6h": 6 * 3600,
+    "3d": 3 * 86400,
+}
+
+# (severity, long window, short window, burn-rate threshold)
+BURN_ALERT_RULES = (
+    ("page", "1h", "5m", 14.4),
+    ("page", "6h", "30m", 6.0),
+    ("ticket", "3d", "6h", 1.0),
+)
+
+
+class SLIRing:
+    """SLI samples of one objective on a fixed step grid, with running window sums.
+
+    Slot ``n`` holds the sample at ``n * step`` seconds; slots without a
+    sample are NaN and count towards no window. The ring holds the last
+    ``capacity`` slots, the SLO window.
+    """
+
+    def __init__(self, capacity: int, windows: dict[str, int]) -> None:
+        self.capacity = capacity
+        # Window sizes in slots; "slo" spans the whole ring
+        self.windows = {name: min(slots, capacity) for name, slots in windows.items()}
+        self.windows["slo"] = capacity
+        self.head: Optional[int] = None
+        self._reset(None)
+
+    def _reset(self, head: Optional[int]) -> None:
+        self.values = array("d", [math.nan]) * self.capacity
+        self.sums = dict.fromkeys(self.windows, 0.0)
+        self.counts = dict.fromkeys(self.windows, 0)
+        self.head = head
+
+    def append(self, slot: int, value: float) -> None:
+        """Record the sample of ``slot``; earlier or repeated slots are ignored."""
+        if self.head is None or slot - self.head >= self.capacity:
+            # First sample, or every held sample has aged out
+            self._reset(slot - 1)
+        assert self.head is not None
+        if slot <= self.head:
+            return
+        values, capacity = self.values, self.capacity
+        while self.head < slot:
+            self.head += 1
+            # Samples sliding out of each window (for the whole ring, the
+            # sample this slot is about to overwrite)
+            for name, size in self.windows.items():
+                leaving = values[(self.head - size) % capacity]
+                if leaving == leaving:
+                    self.sums[name] -= leaving
+                    self.counts[name] -= 1
+            entering = value if self.head == slot else math.nan
+            values[self.head % capacity] = entering
+            if entering == entering:
+                for name in self.windows:
+                    self.sums[name] += entering
+                    self.counts[name] += 1
+
+    def mean(self, window: str) -> Optional[float]:
+        """Mean SLI over a window, or None without samples in it."""
+        count = self.counts[window]
+        return self.sums[window] / count if count else None
+
+    def latest(self) -> Optional[float]:
+        """The newest sample, if the newest slot has one."""
+        if self.head is None:
+            return None
+        value = self.values[self.head % self.capacity]
+        return value if value == value else None
+
+
+class BurnRateEngine:
+    """Rolling SLI history and burn rates for every objective of an SLOStore."""
+
+    def __init__(self, store: SLOStore, step: int = DEFAULT_STEP_SECONDS) -> None:
+        self.store = store
+        self.step = step
+        self._window_slots = {name: max(1, seconds // step) for name, seconds in WINDOWS.items()}
+        self._rings: dict[tuple[str, str, str], SLIRing] = {}
+        self._task: Optional[asyncio.Task[None]] = None
+
+    async def start(self, interval: float = DEFAULT_REFRESH_SECONDS) -> None:
+        """Refresh now and then every ``interval`` seconds in the background."""
+        if self._task is not None:
+            return
+        self._task = asyncio.create_task(self._run(interval))
+
+    async def stop(self) -> None:
+        """Stop refreshing."""
+        if self._task is None:
+            return
+        self._task.cancel()
+        with contextlib.suppress(asyncio.CancelledError):
+            await self._task
+        self._task = None
+
+    async def _run(self, interval: float) -> None:
+        while True:
+            try:
+                await self.refresh()
+            except Exception as e:
+                logger.error("SLI refresh failed: %s", e)
+            await asyncio.sleep(interval)
+
+    @staticmethod
+    def _key(slo: ServiceSLO, objective: SLOObjective) -> tuple[str, str, str]:
+        return (slo.service, slo.cluster, objective.name)
+
+    def _ring(self, slo: ServiceSLO, objective: SLOObjective) -> SLIRing:
+        capacity = max(1, objective.window_days * 86400 // self.step)
+        key = self._key(slo, objective)
+        ring = self._rings.get(key)
+        if ring is None or ring.capacity != capacity:
+            ring = self._rings[key] = SLIRing(capacity, self._window_slots)
+        return ring
+
+    async def refresh(self, now: Optional[float] = None) -> int:
+        """Fetch SLI points added since the last refresh. Returns how many."""
+        end = int(now if now is not None else time.time()) // self.step
+        objectives = [
+            (slo, objective) for slo in self.store.list_slos() for objective in slo.objectives
+        ]
+        live = {self._key(slo, objective) for slo, objective in objectives}
+        for key in self._rings.keys() - live:
+            del self._rings[key]
+
+        # Objectives that need the same range share combined queries
+        by_start: dict[int, list[tuple[SLIRing, SLOObjective]]] = {}
+        for slo, objective in objectives:
+            ring = self._ring(slo, objective)
+            start = end - ring.capacity + 1
+            if ring.head is not None:
+                start = max(start, ring.head + 1)
+            if start <= end:
+                by_start.setdefault(start, []).append((ring, objective))
+
+        batches = [
+            (start, group[offset:offset + BULK_QUERY_OBJECTIVES])
+            for start, group in by_start.items()
+            for offset in range(0, len(group), BULK_QUERY_OBJECTIVES)
+        ]
+        counts = await asyncio.gather(
+            *(self._fetch(batch, start, end) for start, batch in batches)
+        )
+        return sum(counts)
+
+    async def _fetch(
+        self, batch: list[tuple[SLIRing, SLOObjective]], start: int, end: int
+    ) -> int:
+        """Fill the rings of ``batch`` with the slots from ``start`` to ``end``."""
+        parts = [
+            f'label_set(min({sli_expression(objective)}), "{SLO_LABEL}", "{index}")'
+            for index, (_, objective) in enumerate(batch)
+        ]
+        try:
+            client = http_clients.get("victoriametrics")
+            resp = await client.post(
+                f"{VM_URL}/select/0/prometheus/api/v1/query_range",
+                data={
+                    "query": f"union({', '.join(parts)})",
+                    "start": str(start * self.step),
+                    "end": str(end * self.step),
+                    "step": f"{self.step}s",
+                },
+            )
+            resp.raise_for_status()
+            results = resp.json().get("data", {}).get("result", [])
+        except Exception as e:
+            logger.warning("Failed to fetch SLI range for %d objectives: %s", len(batch), e)
+            return 0
+
+        points: dict[int, list[tuple[int, float]]] = {}
+        for series in results:
+            index = series.get("metric", {}).get(SLO_LABEL)
+            if index is None:
+                continue
+            points[int(index)] = [
+                (int(float(ts)) // self.step, float(value))
+                for ts, value in series.get("values", [])
+            ]
+
+        count = 0
+        for index, (ring, _) in enumerate(batch):
+            for slot, value in sorted(points.get(index, [])):
+                ring.append(slot, value if math.isfinite(value) else math.nan)
+                count += 1
+            if ring.head is None:
+                # No samples in the whole window: don't fetch it again.
+                # Otherwise trailing empty slots are retried next time, as
+                # the newest point may not have been written yet.
+                ring.append(end, math.nan)
+        return count
+
+    def get_error_budgets(self, cluster: Optional[str] = None) -> list[ErrorBudgetStatus]:
+        """Budget and burn rates of every refreshed objective, from the held history."""
+        results = []
+        for slo in self.store.list_slos(cluster):
+            for objective in slo.objectives:
+                ring = self._rings.get(self._key(slo, objective))
+                if ring is None:
+                    continue
+                burn = {
+                    name: SLOStore._burn_rate(objective.target, ring.mean(name))
+                    for name in ring.windows
+                }
+                window_sli = ring.mean("slo")
+                budget_remaining = (
+                    SLOStore._calculate_budget(objective.target, window_sli)
+                    if window_sli is not None else 100.0
+                )
+                alert = next(
+                    (
+                        severity for severity, long, short, threshold in BURN_ALERT_RULES
+                        if burn[long] > threshold and burn[short] > threshold
+                    ),
+                    "",
+                )
+                results.append(ErrorBudgetStatus(
+                    service=slo.service,
+                    cluster=slo.cluster,
+                    objective_name=objective.name,
+                    target=objective.target,
+                    current_value=ring.latest() or 0.0,
+                    budget_remaining_percent=budget_remaining,
+                    window_days=objective.window_days,
+                    burn_rate_5m=burn["5m"],
+                    burn_rate_1h=burn["1h"],
+                    burn_rate_6h=burn["6h"],
+                    burn_rate_3d=burn["3d"],
+                    burn_alert=alert,
+                    is_budget_exhausted=budget_remaining <= 0,
+                ))
+        return results
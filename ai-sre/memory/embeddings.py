@@ -0,0 +1,63 @@
+"""Text embedders for semantic incident search.
+
+An embedder turns texts into L2-normalized float32 vectors, so that the
+dot product of two vectors is their cosine similarity. Any model can be
+plugged in by implementing ``Embedder``; ``HashingEmbedder`` is the
+deterministic, dependency-free default used offline and in tests.
+
+Requires numpy (the ``vector`` extra).
+"""
+
+import hashlib
+import itertools
+from abc import ABC, abstractmethod
+
+import numpy as np
+
+from .incident_index import tokenize
+
+
+class Embedder(ABC):
+    """Maps texts to unit-length float32 vectors of a fixed dimension."""
+
+    dim: int
+
+    @abstractmethod
+    def embed(self, texts: list[str]) -> np.ndarray:
+        """Embed texts as a (len(texts), dim) float32 array of unit rows."""
+
+
+class HashingEmbedder(Embedder):
+    """Feature-hashing embedder over word unigrams and bigrams.
+
+    Each feature is hashed (blake2b, so vectors are stable across
+    processes) to a dimension and a sign. Texts sharing words land close
+    together; there is no notion of synonyms, which a learned embedder
+    would add.
+    """
+
+    def __init__(self, dim: int = 256) -> None:
+        self.dim = dim
+        self._features: dict[str, tuple[int, float]] = {}
+
+    def _feature(self, feature: str) -> tuple[int, float]:
+        slot = self._features.get(feature)
+        if slot is None:
+            digest = hashlib.blake2b(feature.encode(), digest_size=8).digest()
+            value = int.from_bytes(digest, "little")
+            slot = (value % self.dim, 1.0 if value >> 63 else -1.0)
+            if len(self._features) < 1_000_000:
+                self._features[feature] = slot
+        return slot
+
+    def embed(self, texts: list[str]) -> np.ndarray:
+        vectors = np.zeros((len(texts), self.dim), dtype=np.float32)
+        for row, text in enumerate(texts):
+            tokens = tokenize(text)
+            features = tokens + [f"{a} {b}" for a, b in itertools.pairwise(tokens)]
+            for feature in features:
+                index, sign = self._feature(feature)
+                vectors[row, index] += sign
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        np.divide(vectors, norms, out=vectors, where=norms > 0)
+        return vectors
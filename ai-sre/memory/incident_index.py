@@ -0,0 +1,326 @@
+"""In-memory inverted index over incident history, ranked with BM25.
+
+Backs ``IncidentStore.search_similar``: instead of scanning
+ai_sre.incidents with substring predicates, queries are answered from a
+token -> {incident_id: term frequency} index held in process.
+
+- Documents are the title, symptoms, root cause and alertnames of an
+  incident. Each field's tokens are weighted (BM25F-style) before
+  scoring, so a match in the title or an alertname counts for more than
+  one in free-text root cause.
+- Alertnames are indexed whole as well as split on ``_``, so
+  ``kube_pod_crashlooping`` matches both exactly and by its parts.
+- Scores are normalized by the best score the query could reach, giving
+  a similarity in [0, 1].
+
+The index is updated incrementally; re-adding an incident replaces it.
+"""
+
+import heapq
+import math
+import re
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Iterable, Optional
+
+# BM25 parameters
+K1 = 1.2
+B = 0.75
+
+# Per-field weights applied to term frequencies
+FIELD_WEIGHTS = {
+    "title": 2.0,
+    "alertnames": 2.0,
+    "symptoms": 1.5,
+    "root_cause": 1.0,
+}
+
+STOPWORDS = frozenset({
+    "a", "an", "and", "are", "as", "at", "be", "by", "for", "from", "in", "is",
+    "it", "of", "on", "or", "the", "to", "was", "with",
+})
+
+_TOKEN_RE = re.compile(r"[a-z0-9]+")
+
+
+def tokenize(text: str) -> list[str]:
+    """Lowercase word tokens of ``text``, without stopwords."""
+    return [t for t in _TOKEN_RE.findall(text.lower()) if t not in STOPWORDS]
+
+
+def _alertname_tokens(alertnames: Iterable[str]) -> list[str]:
+    tokens = []
+    for name in alertnames:
+        tokens.append(name.lower())
+        tokens.extend(tokenize(name))
+    return tokens
+
+
+def _scopes(cluster: str) -> Iterable[str]:
+    """Posting scopes an incident is filed under: all incidents, then its cluster.
+
+    An incident without a cluster lives in the "" scope only.
+    """
+    return ("", cluster) if cluster else ("",)
+
+
+@dataclass(slots=True)
+class IndexedIncident:
+    """What the index keeps per incident: its term weights and result fields."""
+
+    incident_id: str
+    title: str
+    cluster: str
+    timestamp: datetime
+    alertnames: list[str]
+    symptoms: list[str]
+    root_cause: Optional[str]
+    resolution_steps: list[str]
+    terms: dict[str, float] = field(default_factory=dict)
+    length: float = 0.0
+
+
+class IncidentIndex:
+    """BM25-ranked inverted index of incidents.
+
+    Postings are kept per scope (scope -> token -> {incident_id: impact}),
+    where the scope is "" for all incidents and the cluster name for that
+    cluster's incidents, so a cluster-filtered search never touches other
+    clusters.
+    Each posting stores its precomputed BM25 term score ("impact"); the
+    impacts are rebuilt when the average document length has drifted by
+    more than ``IMPACT_REBUILD_DRIFT`` since they were computed. Queries
+    are evaluated term at a time with MaxScore pruning: once the current
+    top ``limit`` cannot be beaten by a document matching only the
+    remaining terms, those terms only update documents already scored.
+    """
+
+    IMPACT_REBUILD_DRIFT = 0.1
+
+    def __init__(self) -> None:
+        self.docs: dict[str, IndexedIncident] = {}
+        self._postings: dict[str, dict[str, dict[str, float]]] = {}
+        # Upper bound of any impact in a posting list, per (scope, token)
+        self._max_impact: dict[tuple[str, str], float] = {}
+        self._df: dict[str, int] = {}
+        self._total_length = 0.0
+        # Average document length the stored impacts were computed with
+        self._impact_avg = 0.0
+
+    def __len__(self) -> int:
+        return len(self.docs)
+
+    @staticmethod
+    def _terms(
+        title: str,
+        alertnames: list[str],
+        symptoms: list[str],
+        root_cause: Optional[str],
+    ) -> dict[str, float]:
+        terms: dict[str, float] = {}
+        fields = (
+            ("title", tokenize(title)),
+            ("alertnames", _alertname_tokens(alertnames)),
+            ("symptoms", [t for symptom in symptoms for t in tokenize(symptom)]),
+            ("root_cause", tokenize(root_cause or "")),
+        )
+        for name, tokens in fields:
+            weight = FIELD_WEIGHTS[name]
+            for token in tokens:
+                terms[token] = terms.get(token, 0.0) + weight
+        return terms
+
+    def add(
+        self,
+        incident_id: str,
+        title: str,
+        cluster: str,
+        timestamp: datetime,
+        alertnames: list[str],
+        symptoms: list[str],
+        root_cause: Optional[str] = None,
+        resolution_steps: Optional[list[str]] = None,
+    ) -> None:
+        """Index an incident, replacing any previous version of it."""
+        self.remove(incident_id)
+        doc = IndexedIncident(
+            incident_id=incident_id,
+            title=title,
+            cluster=cluster,
+            timestamp=timestamp,
+            alertnames=list(alertnames),
+            symptoms=list(symptoms),
+            root_cause=root_cause,
+            resolution_steps=list(resolution_steps or []),
+            terms=self._terms(title, alertnames, symptoms, root_cause),
+        )
+        doc.length = sum(doc.terms.values())
+        self.docs[incident_id] = doc
+        self._total_length += doc.length
+        if not self._impact_avg:
+            self._impact_avg = doc.length or 1.0
+        for token, tf in doc.terms.items():
+            impact = _bm25(tf, doc.length, self._impact_avg)
+            for scope in _scopes(cluster):
+                self._postings.setdefault(scope, {}).setdefault(token, {})[incident_id] = impact
+                key = (scope, token)
+                if impact > self._max_impact.get(key, 0.0):
+                    self._max_impact[key] = impact
+            self._df[token] = self._df.get(token, 0) + 1
+        self._maybe_rebuild_impacts()
+
+    def remove(self, incident_id: str) -> None:
+        """Drop an incident from the index, if present."""
+        doc = self.docs.pop(incident_id, None)
+        if doc is None:
+            return
+        self._total_length -= doc.length
+        for scope in _scopes(doc.cluster):
+            scope_postings = self._postings[scope]
+            for token in doc.terms:
+                postings = scope_postings[token]
+                del postings[incident_id]
+                if not postings:
+                    del scope_postings[token]
+                    del self._max_impact[(scope, token)]
+            if not scope_postings:
+                del self._postings[scope]
+        for token in doc.terms:
+            if self._df[token] == 1:
+                del self._df[token]
+            else:
+                self._df[token] -= 1
+        # Max impacts left behind are still valid (looser) upper bounds
+        self._maybe_rebuild_impacts()
+
+    def update_resolution(
+        self, incident_id: str, root_cause: str, resolution_steps: list[str]
+    ) -> bool:
+        """Re-index an incident's root cause after a resolution is captured.
+
+        Returns False if the incident is not indexed.
+        """
+        doc = self.docs.get(incident_id)
+        if doc is None:
+            return False
+        self.add(
+            incident_id,
+            doc.title,
+            doc.cluster,
+            doc.timestamp,
+            doc.alertnames,
+            doc.symptoms,
+            root_cause,
+            resolution_steps,
+        )
+        return True
+
+    def _avg_length(self) -> float:
+        return self._total_length / len(self.docs) if self.docs else 0.0
+
+    def _maybe_rebuild_impacts(self) -> None:
+        avg = self._avg_length()
+        if not avg or abs(avg - self._impact_avg) <= self.IMPACT_REBUILD_DRIFT * self._impact_avg:
+            return
+        self._impact_avg = avg
+        self._max_impact = {}
+        for scope, scope_postings in self._postings.items():
+            for token, postings in scope_postings.items():
+                best = 0.0
+                for incident_id in postings:
+                    doc = self.docs[incident_id]
+                    impact = _bm25(doc.terms[token], doc.length, avg)
+                    postings[incident_id] = impact
+                    best = max(best, impact)
+                self._max_impact[(scope, token)] = best
+
+    def _idf(self, token: str) -> float:
+        n = len(self.docs)
+        df = self._df.get(token, 0)
+        return math.log(1 + (n - df + 0.5) / (df + 0.5))
+
+    def _query_terms(self, query: list[str]) -> dict[str, float]:
+        """Query token -> idf, over the tokens of every query text."""
+        terms: dict[str, float] = {}
+        for text in query:
+            tokens = tokenize(text)
+            if text and not text.strip().count(" "):
+                # A bare identifier may be an alertname, indexed whole too
+                tokens.append(text.strip().lower())
+            for token in tokens:
+                terms[token] = self._idf(token)
+        return terms
+
+    def search(
+        self,
+        query: list[str],
+        cluster: Optional[str] = None,
+        limit: int = 5,
+    ) -> list[tuple[float, IndexedIncident]]:
+        """Best ``limit`` incidents for the query texts, as (similarity, incident)."""
+        idf = self._query_terms(query)
+        if not idf or not self.docs or limit <= 0:
+            return []
+
+        # One posting list per term, highest possible contribution first
+        scope = cluster or ""
+        scope_postings = self._postings.get(scope, {})
+        lists = []
+        for token, weight in idf.items():
+            postings = scope_postings.get(token)
+            if postings:
+                lists.append((weight * self._max_impact[(scope, token)], weight, postings))
+        lists.sort(key=lambda entry: entry[0], reverse=True)
+        remaining = sum(bound for bound, _, _ in lists)
+
+        scores: dict[str, float] = {}
+        for bound, weight, postings in lists:
+            if len(scores) >= limit and heapq.nlargest(limit, scores.values())[-1] >= remaining:
+                # No unscored document can reach the top any more
+                if len(postings) < len(scores):
+                    for incident_id, impact in postings.items():
+                        if incident_id in scores:
+                            scores[incident_id] += weight * impact
+                else:
+                    for incident_id in scores:
+                        impact = postings.get(incident_id)
+                        if impact is not None:
+                            scores[incident_id] += weight * impact
+            elif not scores:
+                scores = {incident_id: weight * impact for incident_id, impact in postings.items()}
+            else:
+                get = scores.get
+                for incident_id, impact in postings.items():
+                    scores[incident_id] = get(incident_id, 0.0) + weight * impact
+            remaining -= bound
+
+        best = heapq.nlargest(limit, scores.items(), key=lambda item: item[1])
+        ceiling = sum(idf.values()) * (K1 + 1)
+        return [(min(1.0, score / ceiling), self.docs[incident_id]) for incident_id, score in best]
+
+    def score(
+        self,
+        query: list[str],
+        title: str,
+        alertnames: list[str],
+        symptoms: list[str],
+        root_cause: Optional[str],
+    ) -> float:
+        """Similarity of an unindexed incident, using this index's statistics."""
+        idf = self._query_terms(query)
+        if not idf:
+            return 0.0
+        terms = self._terms(title, alertnames, symptoms, root_cause)
+        length = sum(terms.values())
+        avg_length = self._avg_length() or length or 1.0
+        total = sum(
+            weight * _bm25(terms[token], length, avg_length)
+            for token, weight in idf.items()
+            if token in terms
+        )
+        return min(1.0, total / (sum(idf.values()) * (K1 + 1)))
+
+
+def _bm25(tf: float, length: float, avg_length: float) -> float:
+    """BM25 term-frequency saturation with length normalization."""
+    return tf * (K1 + 1) / (tf + K1 * (1 - B + B * length / avg_length))
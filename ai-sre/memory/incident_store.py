@@ -1,18 +1,68 @@
 """Incident history store backed by ClickHouse."""
 
+import asyncio
+import contextlib
+import json
 import logging
-from typing import Any, Optional
+from datetime import datetime, timedelta, timezone
+from typing import TYPE_CHECKING, Any, Optional
 
-import httpx
+from common.http_clients import http_clients
 
+from .incident_index import IncidentIndex
 from .models.incident import IncidentRecord, IncidentSearchResult
 
+if TYPE_CHECKING:
+    from .embeddings import Embedder
+    from .vector_index import VectorIndex
+
 logger = logging.getLogger(__name__)
 
 # ClickHouse connection
 CH_URL = "http://clickhouse.monitoring.svc.cluster.local:8123"
 CH_DATABASE = "ai_sre"
 
+# History kept in the in-memory search index; older incidents are cold
+INDEX_WINDOW_DAYS = 90
+
+# Write batching (flushed by the loop started with IncidentStore.start())
+DEFAULT_BATCH_SIZE = 500
+DEFAULT_FLUSH_INTERVAL_SECONDS = 5.0
+DEFAULT_MAX_BUFFERED_ROWS = 50000
+
+# Columns written per incident / per resolution, in insert order
+INCIDENT_COLUMNS = (
+    "incident_id",
+    "timestamp",
+    "title",
+    "cluster",
+    "namespace",
+    "severity",
+    "alertnames",
+    "symptoms",
+    "root_cause",
+    "root_cause_category",
+    "resolution_steps",
+    "resolution_source",
+    "affected_services",
+    "time_to_detect_seconds",
+    "time_to_mitigate_seconds",
+    "time_to_resolve_seconds",
+    "tags",
+)
+RESOLUTION_COLUMNS = (
+    "incident_id",
+    "resolved_at",
+    "root_cause",
+    "resolution_steps",
+    "resolution_source",
+)
+
+# Hybrid search: share of the score from embedding similarity, and how many
+# candidates per requested result each ranker contributes
+VECTOR_WEIGHT = 0.5
+HYBRID_CANDIDATES = 4
+
 
 class IncidentStore:
     """Persistent incident history stored in ClickHouse.
@@ -21,43 +71,196 @@ class IncidentStore:
     - Write: record new incidents from agent investigations or human input
     - Search: find similar past incidents by symptoms/alertnames
     - Learn: capture resolution patterns when humans resolve incidents
+
+    Writes are buffered and sent as columnar batches (one
+    ``INSERT ... FORMAT JSONCompactColumns`` per table) by a background
+    loop; call ``start()``/``stop()`` around it. Without the loop every
+    write is sent immediately. Resolutions are inserted as versioned rows
+    into ai_sre.incident_resolutions rather than mutating ai_sre.incidents,
+    and reads go through the ai_sre.incidents_current view, which applies
+    the latest one (migrations/002). Several resolutions of an incident
+    within one batch coalesce into the latest; a resolution of an
+    incident that is still buffered is folded into its row.
+
+    Searches are answered from an in-memory BM25 index (IncidentIndex) of
+    the last ``index_window_days`` of incidents. Call ``warm()`` at
+    startup to load it; writes through this store keep it current.
+    ClickHouse is only queried for history older than the index, when the
+    index alone cannot fill the requested results, or for everything while
+    the index is cold.
+
+    With an ``embedder`` and an on-disk ``vector_index``, search is hybrid:
+    candidates from BM25 and from embedding similarity are merged and
+    ranked by ``vector_weight * cosine + (1 - vector_weight) * bm25``, so
+    incidents described in different words can still match. The vector
+    index is persistent and may hold history older than the BM25 window.
     """
 
-    def __init__(self, clickhouse_url: str = CH_URL) -> None:
+    def __init__(
+        self,
+        clickhouse_url: str = CH_URL,
+        index_window_days: int = INDEX_WINDOW_DAYS,
+        vector_index: Optional["VectorIndex"] = None,
+        embedder: Optional["Embedder"] = None,
+        vector_weight: float = VECTOR_WEIGHT,
+        batch_size: int = DEFAULT_BATCH_SIZE,
+        flush_interval: float = DEFAULT_FLUSH_INTERVAL_SECONDS,
+        max_buffered_rows: int = DEFAULT_MAX_BUFFERED_ROWS,
+    ) -> None:
+        if (vector_index is None) != (embedder is None):
+            raise ValueError("vector_index and embedder must be given together")
         self.ch_url = clickhouse_url
+        self.index_window_days = index_window_days
+        self.index = IncidentIndex()
+        # Incidents from here on are all indexed; None until warmed
+        self.indexed_since: Optional[datetime] = None
+        self.vector_index = vector_index
+        self.embedder = embedder
+        self.vector_weight = vector_weight
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.max_buffered_rows = max_buffered_rows
+        # Rows waiting for the next flush, by incident_id
+        self._incidents: dict[str, dict[str, Any]] = {}
+        self._resolutions: dict[str, dict[str, Any]] = {}
+        self._wakeup: Optional[asyncio.Event] = None
+        self._task: Optional[asyncio.Task[None]] = None
+        self._stopping = False
+        # Background (re)training of the vector index, at most one at a time
+        self._training: Optional[asyncio.Task[None]] = None
 
-    async def record_incident(self, incident: IncidentRecord) -> str:
-        """Store a new incident record in ClickHouse."""
+    @property
+    def buffered(self) -> int:
+        """Incident and resolution rows waiting for the next flush."""
+        return len(self._incidents) + len(self._resolutions)
+
+    async def start(self) -> None:
+        """Start the background flush loop."""
+        self._wakeup = asyncio.Event()
+        self._stopping = False
+        self._task = asyncio.create_task(self._flush_loop())
+
+    async def stop(self) -> None:
+        """Stop the flush loop and write everything buffered; raises if that write fails."""
+        if self._task is not None and self._wakeup is not None:
+            self._stopping = True
+            self._wakeup.set()
+            await self._task
+            self._task = None
+        if self._training is not None:
+            await self._training
+            self._training = None
+        await self.flush()
+
+    async def warm(self) -> int:
+        """Load recent incidents into the search index. Returns how many."""
+        since = datetime.now(timezone.utc) - timedelta(days=self.index_window_days)
         sql = (
-            f"INSERT INTO {CH_DATABASE}.incidents "
-            "(incident_id, timestamp, title, cluster, namespace, severity, "
-            "alertnames, symptoms, root_cause, root_cause_category, "
-            "resolution_steps, resolution_source, affected_services, "
-            "time_to_detect_seconds, time_to_mitigate_seconds, "
-            "time_to_resolve_seconds, tags) VALUES "
-            f"('{incident.incident_id}', now64(3), "
-            f"'{self._escape(incident.title)}', "
-            f"'{self._escape(incident.cluster)}', "
-            f"'{self._escape(incident.namespace or '')}', "
-            f"'{incident.severity}', "
-            f"{self._array_str(incident.alertnames)}, "
-            f"{self._array_str(incident.symptoms)}, "
-            f"'{self._escape(incident.root_cause or '')}', "
-            f"'{self._escape(incident.root_cause_category or '')}', "
-            f"{self._array_str(incident.resolution_steps)}, "
-            f"'{incident.resolution_source}', "
-            f"{self._array_str(incident.affected_services)}, "
-            f"{incident.time_to_detect_seconds or 0}, "
-            f"{incident.time_to_mitigate_seconds or 0}, "
-            f"{incident.time_to_resolve_seconds or 0}, "
-            f"{self._array_str(incident.tags)})"
+            f"SELECT incident_id, timestamp, title, cluster, alertnames, symptoms, "
+            f"root_cause, resolution_steps "
+            f"FROM {CH_DATABASE}.incidents_current "
+            f"WHERE timestamp >= '{since.strftime('%Y-%m-%d %H:%M:%S')}' "
+            f"FORMAT JSON"
         )
-
-        async with httpx.AsyncClient(timeout=10) as client:
+        try:
+            client = http_clients.get("clickhouse")
             resp = await client.post(self.ch_url, content=sql)
             resp.raise_for_status()
+            rows = resp.json().get("data", [])
+        except Exception as e:
+            logger.error("Failed to warm incident index, searching ClickHouse: %s", e)
+            return 0
+
+        for row in rows:
+            self.index.add(
+                str(row["incident_id"]),
+                row["title"],
+                row["cluster"],
+                _parse_timestamp(row["timestamp"]),
+                row.get("alertnames", []),
+                row.get("symptoms", []),
+                row.get("root_cause") or None,
+                row.get("resolution_steps", []),
+            )
+        self.indexed_since = since
+        logger.info("Indexed %d incidents since %s", len(rows), since.date())
+
+        if self.vector_index is not None:
+            # Embed what the persistent vector index has not seen yet
+            missing = [
+                doc for doc in self.index.docs.values() if doc.incident_id not in self.vector_index
+            ]
+            if missing:
+                self._embed([
+                    (doc.incident_id,
+                     _incident_text(doc.title, doc.alertnames, doc.symptoms, doc.root_cause))
+                    for doc in missing
+                ])
+                logger.info("Embedded %d incidents", len(missing))
+        return len(rows)
 
+    def _embed(self, texts: list[tuple[str, str]]) -> None:
+        """Upsert (incident_id, text) pairs into the vector index.
+
+        Training the index, when it has grown enough, is left to a
+        background task so writes never wait on k-means.
+        """
+        assert self.vector_index is not None and self.embedder is not None
+        self.vector_index.add_batch(
+            [incident_id for incident_id, _ in texts],
+            self.embedder.embed([text for _, text in texts]),
+        )
+        if self.vector_index.needs_training and (
+            self._training is None or self._training.done()
+        ):
+            self._training = asyncio.create_task(self._train_vectors())
+
+    async def _train_vectors(self) -> None:
+        assert self.vector_index is not None
+        try:
+            await self.vector_index.retrain()
+        except Exception:
+            logger.exception("Vector index training failed")
+
+    async def record_incident(self, incident: IncidentRecord) -> str:
+        """Store a new incident record (buffered; see ``start()``)."""
+        incident_id = str(incident.incident_id)
+        self._incidents[incident_id] = {
+            "incident_id": incident_id,
+            "timestamp": _format_timestamp(incident.timestamp),
+            "title": incident.title,
+            "cluster": incident.cluster,
+            "namespace": incident.namespace or "",
+            "severity": incident.severity,
+            "alertnames": incident.alertnames,
+            "symptoms": incident.symptoms,
+            "root_cause": incident.root_cause or "",
+            "root_cause_category": incident.root_cause_category or "",
+            "resolution_steps": incident.resolution_steps,
+            "resolution_source": incident.resolution_source,
+            "affected_services": incident.affected_services,
+            "time_to_detect_seconds": incident.time_to_detect_seconds or 0,
+            "time_to_mitigate_seconds": incident.time_to_mitigate_seconds or 0,
+            "time_to_resolve_seconds": incident.time_to_resolve_seconds or 0,
+            "tags": incident.tags,
+        }
+
+        self.index.add(
+            str(incident.incident_id),
+            incident.title,
+            incident.cluster,
+            incident.timestamp,
+            incident.alertnames,
+            incident.symptoms,
+            incident.root_cause,
+            incident.resolution_steps,
+        )
+        if self.vector_index is not None:
+            self._embed([(str(incident.incident_id), _incident_text(
+                incident.title, incident.alertnames, incident.symptoms, incident.root_cause
+            ))])
         logger.info("Recorded incident %s: %s", incident.incident_id, incident.title)
+        await self._written()
         return str(incident.incident_id)
 
     async def search_similar(
@@ -66,11 +269,146 @@ class IncidentStore:
         cluster: Optional[str] = None,
         limit: int = 5,
     ) -> list[IncidentSearchResult]:
-        """Search for incidents with similar symptoms.
+        """Search for incidents with similar symptoms, best match first.
 
-        Uses keyword matching against symptoms and alertnames.
-        In production, this would use embedding-based semantic search.
+        Ranked by BM25 over title, symptoms, root cause and alertnames
+        (see IncidentIndex), blended with embedding similarity when a vector
+        index is configured; ``similarity_score`` is in [0, 1].
         """
+        if self.indexed_since is None:
+            return await self._search_clickhouse(symptoms, cluster, limit)
+
+        if self.vector_index is not None:
+            results = await self._search_hybrid(symptoms, cluster, limit)
+        else:
+            results = [
+                IncidentSearchResult(
+                    incident_id=doc.incident_id,
+                    title=doc.title,
+                    cluster=doc.cluster,
+                    root_cause=doc.root_cause,
+                    resolution_steps=doc.resolution_steps,
+                    similarity_score=score,
+                    timestamp=doc.timestamp,
+                )
+                for score, doc in self.index.search(symptoms, cluster, limit)
+            ]
+        if len(results) < limit:
+            # Not enough recent matches: look further back
+            seen = {str(r.incident_id) for r in results}
+            older = await self._search_clickhouse(
+                symptoms, cluster, limit - len(results), before=self.indexed_since
+            )
+            results += [r for r in older if str(r.incident_id) not in seen]
+        return results
+
+    async def _search_hybrid(
+        self,
+        symptoms: list[str],
+        cluster: Optional[str],
+        limit: int,
+    ) -> list[IncidentSearchResult]:
+        """Merge BM25 and embedding candidates and rank them by a blended score."""
+        assert self.vector_index is not None and self.embedder is not None
+        query = self.embedder.embed([" ".join(symptoms)])[0]
+        fanout = limit * HYBRID_CANDIDATES
+
+        keyword = {
+            doc.incident_id: score for score, doc in self.index.search(symptoms, cluster, fanout)
+        }
+        # The vector index is not partitioned by cluster: over-fetch, then filter
+        vector = dict(self.vector_index.search(query, fanout if not cluster else fanout * 4))
+        vector.update(self.vector_index.similarity(
+            [incident_id for incident_id in keyword if incident_id not in vector], query
+        ))
+
+        cold = [
+            incident_id for incident_id in vector
+            if incident_id not in self.index.docs and incident_id not in keyword
+        ]
+        rows = {
+            str(row["incident_id"]): row for row in await self._fetch_incidents(cold)
+        }
+
+        candidates: list[tuple[float, IncidentSearchResult]] = []
+        for incident_id in keyword.keys() | vector.keys():
+            doc = self.index.docs.get(incident_id)
+            if doc is not None:
+                fields = {
+                    "incident_id": doc.incident_id,
+                    "title": doc.title,
+                    "cluster": doc.cluster,
+                    "root_cause": doc.root_cause,
+                    "resolution_steps": doc.resolution_steps,
+                    "timestamp": doc.timestamp,
+                }
+                kw = keyword.get(incident_id)
+                if kw is None:
+                    kw = self.index.score(
+                        symptoms, doc.title, doc.alertnames, doc.symptoms, doc.root_cause
+                    )
+            elif incident_id in rows:
+                row = rows[incident_id]
+                fields = {
+                    "incident_id": row["incident_id"],
+                    "title": row["title"],
+                    "cluster": row["cluster"],
+                    "root_cause": row.get("root_cause") or None,
+                    "resolution_steps": row.get("resolution_steps", []),
+                    "timestamp": row["timestamp"],
+                }
+                kw = self.index.score(
+                    symptoms,
+                    row["title"],
+                    row.get("alertnames", []),
+                    row.get("symptoms", []),
+                    row.get("root_cause"),
+                )
+            else:
+                # Embedded but no longer in ClickHouse
+                continue
+            if cluster and fields["cluster"] != cluster:
+                continue
+            score = (
+                self.vector_weight * max(0.0, vector.get(incident_id, 0.0))
+                + (1 - self.vector_weight) * kw
+            )
+            if score > 0:
+                candidates.append(
+                    (score, IncidentSearchResult(similarity_score=min(1.0, score), **fields))
+                )
+
+        candidates.sort(key=lambda candidate: candidate[0], reverse=True)
+        return [result for _, result in candidates[:limit]]
+
+    async def _fetch_incidents(self, incident_ids: list[str]) -> list[dict[str, Any]]:
+        """Rows of the given incidents from ClickHouse, in one query."""
+        if not incident_ids:
+            return []
+        id_list = ", ".join(f"'{self._escape(incident_id)}'" for incident_id in incident_ids)
+        sql = (
+            f"SELECT incident_id, title, cluster, root_cause, "
+            f"resolution_steps, alertnames, symptoms, timestamp "
+            f"FROM {CH_DATABASE}.incidents_current "
+            f"WHERE incident_id IN ({id_list}) FORMAT JSON"
+        )
+        try:
+            client = http_clients.get("clickhouse")
+            resp = await client.post(self.ch_url, content=sql)
+            resp.raise_for_status()
+            return resp.json().get("data", [])
+        except Exception as e:
+            logger.error("Failed to fetch incidents: %s", e)
+            return []
+
+    async def _search_clickhouse(
+        self,
+        symptoms: list[str],
+        cluster: Optional[str],
+        limit: int,
+        before: Optional[datetime] = None,
+    ) -> list[IncidentSearchResult]:
+        """Keyword search in ClickHouse, re-ranked with the index's BM25 statistics."""
         conditions = []
         for symptom in symptoms:
             escaped = self._escape(symptom)
@@ -83,20 +421,24 @@ class IncidentStore:
         where_clause = " OR ".join(conditions) if conditions else "1=1"
         if cluster:
             where_clause = f"({where_clause}) AND cluster = '{self._escape(cluster)}'"
+        if before is not None:
+            where_clause = (
+                f"({where_clause}) AND timestamp < '{before.strftime('%Y-%m-%d %H:%M:%S')}'"
+            )
 
         sql = (
             f"SELECT incident_id, title, cluster, root_cause, "
-            f"resolution_steps, timestamp "
-            f"FROM {CH_DATABASE}.incidents "
+            f"resolution_steps, alertnames, symptoms, timestamp "
+            f"FROM {CH_DATABASE}.incidents_current "
             f"WHERE {where_clause} "
             f"ORDER BY timestamp DESC LIMIT {limit} FORMAT JSON"
         )
 
         try:
-            async with httpx.AsyncClient(timeout=10) as client:
-                resp = await client.post(self.ch_url, content=sql)
-                resp.raise_for_status()
-                data = resp.json()
+            client = http_clients.get("clickhouse")
+            resp = await client.post(self.ch_url, content=sql)
+            resp.raise_for_status()
+            data = resp.json()
 
             results = []
             for row in data.get("data", []):
@@ -106,9 +448,16 @@ class IncidentStore:
                     cluster=row["cluster"],
                     root_cause=row.get("root_cause"),
                     resolution_steps=row.get("resolution_steps", []),
-                    similarity_score=1.0,  # Placeholder — real scoring from embeddings
+                    similarity_score=self.index.score(
+                        symptoms,
+                        row["title"],
+                        row.get("alertnames", []),
+                        row.get("symptoms", []),
+                        row.get("root_cause"),
+                    ),
                     timestamp=row["timestamp"],
                 ))
+            results.sort(key=lambda r: r.similarity_score, reverse=True)
             return results
         except Exception as e:
             logger.error("Failed to search incidents: %s", e)
@@ -126,29 +475,132 @@ class IncidentStore:
         This enables auto-learning: agents can reference how
         similar incidents were resolved by humans.
         """
-        sql = (
-            f"ALTER TABLE {CH_DATABASE}.incidents "
-            f"UPDATE resolution_source = '{resolved_by}', "
-            f"resolution_steps = {self._array_str(resolution_steps)}, "
-            f"root_cause = '{self._escape(resolution)}' "
-            f"WHERE incident_id = '{incident_id}'"
-        )
+        pending = self._incidents.get(incident_id)
+        if pending is not None:
+            # Not written yet: the insert carries the resolution
+            pending.update(
+                root_cause=resolution,
+                resolution_steps=resolution_steps,
+                resolution_source=resolved_by,
+            )
+        else:
+            self._resolutions[incident_id] = {
+                "incident_id": incident_id,
+                "resolved_at": _format_timestamp(datetime.now(timezone.utc)),
+                "root_cause": resolution,
+                "resolution_steps": resolution_steps,
+                "resolution_source": resolved_by,
+            }
+
+        updated = self.index.update_resolution(incident_id, resolution, resolution_steps)
+        if updated and self.vector_index is not None:
+            doc = self.index.docs[incident_id]
+            self._embed([(incident_id, _incident_text(
+                doc.title, doc.alertnames, doc.symptoms, doc.root_cause
+            ))])
+        logger.info("Captured resolution for incident %s", incident_id)
+        await self._written()
+
+    async def _written(self) -> None:
+        """Flush now without a flush loop, or wake the loop once a batch is full.
+
+        Without a flush loop a failed write raises to the caller (the row
+        stays buffered for the next flush).
+        """
+        if self._task is None:
+            await self.flush()
+        elif self.buffered >= self.batch_size and self._wakeup is not None:
+            self._wakeup.set()
+
+    async def flush(self) -> None:
+        """Write buffered incidents, then buffered resolutions.
+
+        A batch ClickHouse rejects goes back into the buffer (behind newer
+        writes of the same incidents) for the next flush. Unless the flush
+        loop is running (and will retry), the write error is then raised.
+        """
+        errors = []
+        if self._incidents:
+            batch, self._incidents = self._incidents, {}
+            error = await self._insert("incidents", INCIDENT_COLUMNS, batch)
+            if error is not None:
+                self._incidents = self._requeue(batch, self._incidents, "incidents")
+                errors.append(error)
+        if self._resolutions:
+            batch, self._resolutions = self._resolutions, {}
+            error = await self._insert("incident_resolutions", RESOLUTION_COLUMNS, batch)
+            if error is not None:
+                self._resolutions = self._requeue(batch, self._resolutions, "resolutions")
+                errors.append(error)
+        if errors and self._task is None:
+            raise errors[0]
+
+    async def _flush_loop(self) -> None:
+        assert self._wakeup is not None
+        while True:
+            with contextlib.suppress(TimeoutError):
+                await asyncio.wait_for(self._wakeup.wait(), timeout=self.flush_interval)
+            self._wakeup.clear()
+            try:
+                await self.flush()
+            except Exception:
+                logger.exception("Incident store flush failed")
+            if self._stopping:
+                return
 
+    async def _insert(
+        self, table: str, columns: tuple[str, ...], rows: dict[str, dict[str, Any]]
+    ) -> Optional[Exception]:
+        """Insert one batch. Returns the error if ClickHouse rejected it."""
+        query = (
+            f"INSERT INTO {CH_DATABASE}.{table} ({', '.join(columns)}) "
+            f"FORMAT JSONCompactColumns"
+        )
+        payload = json.dumps([[row[name] for row in rows.values()] for name in columns])
         try:
-            async with httpx.AsyncClient(timeout=10) as client:
-                resp = await client.post(self.ch_url, content=sql)
-                resp.raise_for_status()
-            logger.info("Captured resolution for incident %s", incident_id)
+            client = http_clients.get("clickhouse")
+            resp = await client.post(self.ch_url, params={"query": query}, content=payload)
+            resp.raise_for_status()
         except Exception as e:
-            logger.error("Failed to capture resolution: %s", e)
+            logger.warning("Failed to write %d rows to %s: %s", len(rows), table, e)
+            return e
+        return None
+
+    def _requeue(
+        self, failed: dict[str, dict[str, Any]], newer: dict[str, dict[str, Any]], kind: str
+    ) -> dict[str, dict[str, Any]]:
+        """Put a failed batch back ahead of newer rows, dropping the oldest over the cap."""
+        merged = {**failed, **newer}
+        excess = len(merged) - self.max_buffered_rows
+        if excess > 0:
+            logger.error("Incident store buffer full, dropping %d %s", excess, kind)
+            for incident_id in list(merged)[:excess]:
+                del merged[incident_id]
+        return merged
 
     @staticmethod
     def _escape(value: str) -> str:
         """Escape single quotes for ClickHouse SQL."""
         return value.replace("'", "\\'")
 
-    @staticmethod
-    def _array_str(items: list[str]) -> str:
-        """Convert Python list to ClickHouse array literal."""
-        escaped = [f"'{item.replace(chr(39), chr(92) + chr(39))}'" for item in items]
-        return f"[{', '.join(escaped)}]"
+
+def _incident_text(
+    title: str,
+    alertnames: list[str],
+    symptoms: list[str],
+    root_cause: Optional[str],
+) -> str:
+    """The text of an incident that is embedded for semantic search."""
+    return ". ".join([title, *alertnames, *symptoms, root_cause or ""])
+
+
+def _format_timestamp(value: datetime) -> str:
+    """Format a timestamp for a DateTime64(3) column (UTC)."""
+    if value.tzinfo is not None:
+        value = value.astimezone(timezone.utc).replace(tzinfo=None)
+    return value.strftime("%Y-%m-%d %H:%M:%S.%f")[:-3]
+
+
+def _parse_timestamp(value: str) -> datetime:
+    """Parse a ClickHouse DateTime64 value (naive UTC, like IncidentRecord.timestamp)."""
+    return datetime.fromisoformat(value)
@@ -0,0 +1,52 @@
+-- Record incident resolutions as versioned rows instead of ALTER TABLE ... UPDATE mutations
+-- Run against ClickHouse: clickhouse-client --multiquery < 002_create_incident_resolutions_table.sql
+--
+-- Each captured resolution is an INSERT; ReplacingMergeTree keeps the
+-- latest row per incident (by resolved_at) as parts merge. Readers use
+-- ai_sre.incidents_current, which takes the latest resolution with
+-- argMax, so results are correct before merges have run too.
+
+CREATE TABLE IF NOT EXISTS ai_sre.incident_resolutions
+(
+    incident_id UUID,
+    resolved_at DateTime64(3),
+    root_cause String,
+    resolution_steps Array(String),
+    resolution_source LowCardinality(String)
+)
+ENGINE = ReplacingMergeTree(resolved_at)
+ORDER BY incident_id;
+
+-- Incidents with their latest resolution applied. Resolutions written
+-- by mutations before this migration are already in ai_sre.incidents.
+CREATE VIEW IF NOT EXISTS ai_sre.incidents_current AS
+SELECT
+    i.incident_id AS incident_id,
+    i.timestamp AS timestamp,
+    i.title AS title,
+    i.cluster AS cluster,
+    i.namespace AS namespace,
+    i.severity AS severity,
+    i.alertnames AS alertnames,
+    i.symptoms AS symptoms,
+    if(r.resolved, r.root_cause, i.root_cause) AS root_cause,
+    i.root_cause_category AS root_cause_category,
+    if(r.resolved, r.resolution_steps, i.resolution_steps) AS resolution_steps,
+    if(r.resolved, r.resolution_source, i.resolution_source) AS resolution_source,
+    i.affected_services AS affected_services,
+    i.time_to_detect_seconds AS time_to_detect_seconds,
+    i.time_to_mitigate_seconds AS time_to_mitigate_seconds,
+    i.time_to_resolve_seconds AS time_to_resolve_seconds,
+    i.tags AS tags
+FROM ai_sre.incidents AS i
+LEFT JOIN
+(
+    SELECT
+        incident_id,
+        1 AS resolved,
+        argMax(root_cause, resolved_at) AS root_cause,
+        argMax(resolution_steps, resolved_at) AS resolution_steps,
+        argMax(resolution_source, resolved_at) AS resolution_source
+    FROM ai_sre.incident_resolutions
+    GROUP BY incident_id
+) AS r ON i.incident_id = r.incident_id;
@@ -37,6 +37,10 @@ class ErrorBudgetStatus(BaseModel):
     current_value: float
     budget_remaining_percent: float
     window_days: int = 30
+    burn_rate_5m: float = 0.0
     burn_rate_1h: float = 0.0
     burn_rate_6h: float = 0.0
+    burn_rate_3d: float = 0.0
+    # "page" or "ticket" when a multi-window burn-rate condition holds
+    burn_alert: str = ""
     is_budget_exhausted: bool = False
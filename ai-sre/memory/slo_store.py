@@ -1,65 +1,135 @@
 """SLO store — loads SLO definitions and calculates error budgets."""
 
+import asyncio
 import logging
+import math
 from typing import Optional
 
-import httpx
 import yaml
 
+from common.http_clients import http_clients
+
 from .models.slo import ErrorBudgetStatus, ServiceSLO, SLOObjective
 
 logger = logging.getLogger(__name__)
 
 VM_URL = "http://vmselect.monitoring.svc.cluster.local:8481"
 
+# Label tagging each objective's series in a combined query
+SLO_LABEL = "ai_sre_slo"
+# Objectives per combined query (bounds the query length)
+BULK_QUERY_OBJECTIVES = 50
+# Burn-rate windows and the subquery resolution they are averaged at
+BURN_RATE_WINDOWS = ("1h", "6h")
+BURN_RATE_STEP = "1m"
+
 
 class SLOStore:
     """Manages SLO definitions and error budget calculations.
 
     Loads SLO definitions from YAML. Queries VictoriaMetrics
     for current SLI values and calculates error budget status.
+
+    SLOs are indexed by (service, cluster) and by cluster. Error budgets
+    for many objectives are computed from a few combined queries (one per
+    window, tagging each objective's series with ``SLO_LABEL``) issued
+    concurrently, rather than one round trip per objective.
+
+    Loading replaces the definitions; ``reload_from_file`` parses and
+    indexes in a worker thread and publishes everything at once.
     """
 
     def __init__(self, slo_path: Optional[str] = None) -> None:
         self.slos: list[ServiceSLO] = []
+        self._by_key: dict[tuple[str, str], ServiceSLO] = {}
+        self._by_cluster: dict[str, list[ServiceSLO]] = {}
         if slo_path:
             self.load_from_file(slo_path)
 
+    @staticmethod
+    def parse_file(path: str) -> list[ServiceSLO]:
+        """Parse an SLO YAML file. Raises on unreadable or invalid files."""
+        with open(path) as f:
+            data = yaml.safe_load(f)
+
+        slos = []
+        for slo_data in data.get("slos", []):
+            objectives = [
+                SLOObjective(**obj)
+                for obj in slo_data.get("objectives", [])
+            ]
+            slos.append(ServiceSLO(
+                service=slo_data["service"],
+                cluster=slo_data["cluster"],
+                namespace=slo_data.get("namespace", ""),
+                objectives=objectives,
+                owner_team=slo_data.get("owner_team", ""),
+                escalation_channel=slo_data.get("escalation_channel", ""),
+            ))
+        return slos
+
     def load_from_file(self, path: str) -> None:
-        """Load SLO definitions from a YAML file."""
+        """Load SLO definitions from a YAML file, replacing any loaded before."""
         try:
-            with open(path) as f:
-                data = yaml.safe_load(f)
-
-            for slo_data in data.get("slos", []):
-                objectives = [
-                    SLOObjective(**obj)
-                    for obj in slo_data.get("objectives", [])
-                ]
-                self.slos.append(ServiceSLO(
-                    service=slo_data["service"],
-                    cluster=slo_data["cluster"],
-                    namespace=slo_data.get("namespace", ""),
-                    objectives=objectives,
-                    owner_team=slo_data.get("owner_team", ""),
-                    escalation_channel=slo_data.get("escalation_channel", ""),
-                ))
+            self._publish(*self._build_index(self.parse_file(path)))
             logger.info("Loaded %d SLO definitions", len(self.slos))
 
         except Exception as e:
             logger.error("Failed to load SLOs from %s: %s", path, e)
 
+    async def reload_from_file(self, path: str) -> Optional[dict[str, list[str]]]:
+        """Reload SLO definitions without blocking readers, and log what changed.
+
+        Returns the structural diff (see ``diff_slos``), or None if the
+        file could not be loaded, in which case the current SLOs stay.
+        """
+        try:
+            slos, by_key, by_cluster = await asyncio.to_thread(
+                lambda: self._build_index(self.parse_file(path))
+            )
+        except Exception as e:
+            logger.error("Failed to reload SLOs from %s: %s", path, e)
+            return None
+
+        diff = diff_slos(self.slos, slos)
+        self._publish(slos, by_key, by_cluster)
+        if diff:
+            logger.info("Reloaded SLOs from %s: %s", path, diff)
+        else:
+            logger.info("Reloaded SLOs from %s: no structural changes", path)
+        return diff
+
+    @staticmethod
+    def _build_index(slos: list[ServiceSLO]) -> tuple[
+        list[ServiceSLO], dict[tuple[str, str], ServiceSLO], dict[str, list[ServiceSLO]]
+    ]:
+        """The (service, cluster) and cluster indexes of ``slos``."""
+        by_key: dict[tuple[str, str], ServiceSLO] = {}
+        by_cluster: dict[str, list[ServiceSLO]] = {}
+        for slo in slos:
+            # First definition wins, as with a linear scan
+            by_key.setdefault((slo.service, slo.cluster), slo)
+            by_cluster.setdefault(slo.cluster, []).append(slo)
+        return slos, by_key, by_cluster
+
+    def _publish(
+        self,
+        slos: list[ServiceSLO],
+        by_key: dict[tuple[str, str], ServiceSLO],
+        by_cluster: dict[str, list[ServiceSLO]],
+    ) -> None:
+        # No await between the assignments: readers on the event loop see
+        # either the old definitions or the new ones, never a mix
+        self.slos, self._by_key, self._by_cluster = slos, by_key, by_cluster
+
     def get_slo(self, service: str, cluster: str) -> Optional[ServiceSLO]:
         """Get SLO definition for a service."""
-        for slo in self.slos:
-            if slo.service == service and slo.cluster == cluster:
-                return slo
-        return None
+        return self._by_key.get((service, cluster))
 
     def list_slos(self, cluster: Optional[str] = None) -> list[ServiceSLO]:
         """List all SLO definitions, optionally filtered by cluster."""
         if cluster:
-            return [s for s in self.slos if s.cluster == cluster]
+            return self._by_cluster.get(cluster, [])
         return self.slos
 
     async def get_error_budget(
@@ -73,52 +143,99 @@ class SLOStore:
         slo = self.get_slo(service, cluster)
         if not slo:
             return []
+        return await self._error_budgets([slo])
 
-        results = []
-        for objective in slo.objectives:
-            try:
-                current_value = await self._query_sli(objective.metric)
-                budget_remaining = self._calculate_budget(
-                    target=objective.target,
-                    current=current_value,
-                )
-                results.append(ErrorBudgetStatus(
-                    service=service,
-                    cluster=cluster,
-                    objective_name=objective.name,
-                    target=objective.target,
-                    current_value=current_value,
-                    budget_remaining_percent=budget_remaining,
-                    window_days=objective.window_days,
-                    is_budget_exhausted=budget_remaining <= 0,
-                ))
-            except Exception as e:
-                logger.warning(
-                    "Failed to calculate error budget for %s/%s/%s: %s",
-                    service,
-                    cluster,
-                    objective.name,
-                    e,
-                )
+    async def get_error_budgets(self, cluster: Optional[str] = None) -> list[ErrorBudgetStatus]:
+        """Calculate error budgets of every objective, optionally for one cluster."""
+        return await self._error_budgets(self.list_slos(cluster))
+
+    async def _error_budgets(self, slos: list[ServiceSLO]) -> list[ErrorBudgetStatus]:
+        """Current value, remaining budget and 1h/6h burn rates of all objectives.
+
+        Each objective's SLI is evaluated now and averaged over each burn
+        rate window; every (window, chunk of objectives) is one query,
+        and all of them run concurrently.
+        """
+        objectives = [(slo, objective) for slo in slos for objective in slo.objectives]
+        if not objectives:
+            return []
+        expressions = [sli_expression(objective) for _, objective in objectives]
 
+        windows: list[Optional[str]] = [None, *BURN_RATE_WINDOWS]
+        chunks = range(0, len(expressions), BULK_QUERY_OBJECTIVES)
+        responses = await asyncio.gather(*(
+            self._query_slis(expressions[start:start + BULK_QUERY_OBJECTIVES], start, window)
+            for window in windows
+            for start in chunks
+        ))
+        # Per window, SLI value by objective position
+        values: list[dict[int, float]] = []
+        for w in range(len(windows)):
+            merged: dict[int, float] = {}
+            for response in responses[w * len(chunks):(w + 1) * len(chunks)]:
+                merged.update(response)
+            values.append(merged)
+
+        current, hourly, six_hourly = values
+        results = []
+        for position, (slo, objective) in enumerate(objectives):
+            # Objectives without data count as 0, like a failed query always has
+            current_value = current.get(position, 0.0)
+            budget_remaining = self._calculate_budget(objective.target, current_value)
+            results.append(ErrorBudgetStatus(
+                service=slo.service,
+                cluster=slo.cluster,
+                objective_name=objective.name,
+                target=objective.target,
+                current_value=current_value,
+                budget_remaining_percent=budget_remaining,
+                window_days=objective.window_days,
+                burn_rate_1h=self._burn_rate(objective.target, hourly.get(position)),
+                burn_rate_6h=self._burn_rate(objective.target, six_hourly.get(position)),
+                is_budget_exhausted=budget_remaining <= 0,
+            ))
         return results
 
-    async def _query_sli(self, metric: str) -> float:
-        """Query VictoriaMetrics for a current SLI value."""
+    async def _query_slis(
+        self, expressions: list[str], offset: int, window: Optional[str]
+    ) -> dict[int, float]:
+        """Evaluate SLI expressions in one combined query.
+
+        With a ``window``, each SLI is averaged over it. Returns the value
+        by objective position (``offset`` + index in ``expressions``);
+        objectives without a finite value are left out.
+        """
+        parts = []
+        for index, expression in enumerate(expressions):
+            if window:
+                expression = f"avg_over_time(({expression})[{window}:{BURN_RATE_STEP}])"
+            # Worst series, if the SLI is not aggregated to one
+            parts.append(f'label_set(min({expression}), "{SLO_LABEL}", "{offset + index}")')
+        query = f"union({', '.join(parts)})"
+
         try:
-            async with httpx.AsyncClient(timeout=10) as client:
-                resp = await client.get(
-                    f"{VM_URL}/select/0/prometheus/api/v1/query",
-                    params={"query": metric},
-                )
-                resp.raise_for_status()
-                data = resp.json()
-                results = data.get("data", {}).get("result", [])
-                if results:
-                    return float(results[0]["value"][1])
+            client = http_clients.get("victoriametrics")
+            resp = await client.post(
+                f"{VM_URL}/select/0/prometheus/api/v1/query",
+                data={"query": query},
+            )
+            resp.raise_for_status()
+            results = resp.json().get("data", {}).get("result", [])
         except Exception as e:
-            logger.warning("Failed to query SLI metric: %s", e)
-        return 0.0
+            logger.warning(
+                "Failed to query %d SLIs (window=%s): %s", len(expressions), window or "now", e
+            )
+            return {}
+
+        values: dict[int, float] = {}
+        for series in results:
+            position = series.get("metric", {}).get(SLO_LABEL)
+            if position is None:
+                continue
+            value = float(series["value"][1])
+            if math.isfinite(value):
+                values[int(position)] = value
+        return values
 
     @staticmethod
     def _calculate_budget(target: float, current: float) -> float:
@@ -138,3 +255,67 @@ class SLOStore:
 
         remaining = ((allowed_error - actual_error) / allowed_error) * 100
         return max(0.0, min(100.0, remaining))
+
+    @staticmethod
+    def _burn_rate(target: float, sli: Optional[float]) -> float:
+        """Rate the error budget is spent at, given the SLI over a window.
+
+        1.0 spends exactly the budget over the SLO window; 0.0 when there
+        is no data or no budget to burn (a 100% target).
+        """
+        if sli is None or target >= 100:
+            return 0.0
+        return max(0.0, (1 - sli / 100) / (1 - target / 100))
+
+
+def sli_expression(objective: SLOObjective) -> str:
+    """The objective's SLI as a percentage of good events or time.
+
+    Latency objectives (``target_ms``) query a latency; their SLI is the
+    share of time it was within ``target_ms``.
+    """
+    if objective.target_ms is not None:
+        return f"100 * (({objective.metric}) <= bool {objective.target_ms:g})"
+    return objective.metric
+
+
+def diff_slos(old: list[ServiceSLO], new: list[ServiceSLO]) -> dict[str, list[str]]:
+    """Structural differences between two sets of SLOs; empty if they match.
+
+    SLOs are named ``service/cluster`` and objectives
+    ``service/cluster/objective``. Keys (only present when non-empty):
+    ``slos_added``, ``slos_removed``, ``slos_changed`` (ownership or
+    routing), ``objectives_added``, ``objectives_removed`` and
+    ``objectives_changed``.
+    """
+    def by_name(slos: list[ServiceSLO]) -> dict[str, ServiceSLO]:
+        named: dict[str, ServiceSLO] = {}
+        for slo in slos:
+            named.setdefault(f"{slo.service}/{slo.cluster}", slo)
+        return named
+
+    def objectives(slos: dict[str, ServiceSLO]) -> dict[str, SLOObjective]:
+        return {
+            f"{name}/{objective.name}": objective
+            for name, slo in slos.items()
+            for objective in slo.objectives
+        }
+
+    old_slos, new_slos = by_name(old), by_name(new)
+    old_objectives, new_objectives = objectives(old_slos), objectives(new_slos)
+    diff = {
+        "slos_added": sorted(new_slos.keys() - old_slos.keys()),
+        "slos_removed": sorted(old_slos.keys() - new_slos.keys()),
+        "slos_changed": sorted(
+            name for name in old_slos.keys() & new_slos.keys()
+            if old_slos[name].model_dump(exclude={"objectives"})
+            != new_slos[name].model_dump(exclude={"objectives"})
+        ),
+        "objectives_added": sorted(new_objectives.keys() - old_objectives.keys()),
+        "objectives_removed": sorted(old_objectives.keys() - new_objectives.keys()),
+        "objectives_changed": sorted(
+            name for name in old_objectives.keys() & new_objectives.keys()
+            if old_objectives[name] != new_objectives[name]
+        ),
+    }
+    return {key: value for key, value in diff.items() if value}
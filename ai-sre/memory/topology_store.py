@@ -1,11 +1,16 @@
 """Cluster topology store — loads static topology and provides lookup."""
 
+import asyncio
 import logging
+from collections import deque
+from dataclasses import dataclass
 from pathlib import Path
-from typing import Optional
+from typing import Hashable, Optional
 
 import yaml
 
+from common.omniscience import OmniscienceClient, omniscience_client
+
 from .models.topology import (
     ClusterTopology,
     CriticalService,
@@ -15,11 +20,204 @@ from .models.topology import (
 
 logger = logging.getLogger(__name__)
 
+# Memoized traversals kept per graph before the memo is dropped
+MEMO_MAX_ENTRIES = 100_000
+
+# A service node: (cluster, service name)
+ServiceNode = tuple[str, str]
+
+
+class DependencyGraph:
+    """Directed dependency graph with forward and reverse adjacency lists.
+
+    Nodes are interned to integer ids; an edge ``a -> b`` means ``a``
+    depends on ``b``. Transitive traversals (BFS, optionally depth
+    limited) are memoized until the graph changes.
+    """
+
+    def __init__(self) -> None:
+        self._ids: dict[Hashable, int] = {}
+        self._nodes: list[Hashable] = []
+        self._forward: list[list[int]] = []
+        self._reverse: list[list[int]] = []
+        self._memo: dict[tuple[int, bool, Optional[int]], tuple[tuple[Hashable, int], ...]] = {}
+
+    def __contains__(self, node: Hashable) -> bool:
+        return node in self._ids
+
+    def _id(self, node: Hashable) -> int:
+        node_id = self._ids.get(node)
+        if node_id is None:
+            node_id = self._ids[node] = len(self._nodes)
+            self._nodes.append(node)
+            self._forward.append([])
+            self._reverse.append([])
+        return node_id
+
+    def add_node(self, node: Hashable) -> None:
+        self._id(node)
+
+    def add_edge(self, source: Hashable, target: Hashable) -> None:
+        """Record that ``source`` depends on ``target``."""
+        source_id, target_id = self._id(source), self._id(target)
+        if target_id not in self._forward[source_id]:
+            self._forward[source_id].append(target_id)
+            self._reverse[target_id].append(source_id)
+            self._memo.clear()
+
+    def dependencies(self, node: Hashable) -> list[Hashable]:
+        """Direct dependencies of ``node``."""
+        node_id = self._ids.get(node)
+        return [] if node_id is None else [self._nodes[i] for i in self._forward[node_id]]
+
+    def dependents(self, node: Hashable) -> list[Hashable]:
+        """Nodes that depend directly on ``node``."""
+        node_id = self._ids.get(node)
+        return [] if node_id is None else [self._nodes[i] for i in self._reverse[node_id]]
+
+    def reachable(
+        self, node: Hashable, reverse: bool = False, max_depth: Optional[int] = None
+    ) -> tuple[tuple[Hashable, int], ...]:
+        """Nodes reachable from ``node`` with their hop count, nearest first.
+
+        Follows dependencies, or dependents with ``reverse``; ``node``
+        itself is excluded.
+        """
+        node_id = self._ids.get(node)
+        if node_id is None:
+            return ()
+        key = (node_id, reverse, max_depth)
+        cached = self._memo.get(key)
+        if cached is not None:
+            return cached
+
+        adjacency = self._reverse if reverse else self._forward
+        depths = {node_id: 0}
+        order: list[tuple[Hashable, int]] = []
+        queue = deque([node_id])
+        while queue:
+            current = queue.popleft()
+            depth = depths[current] + 1
+            if max_depth is not None and depth > max_depth:
+                continue
+            for neighbour in adjacency[current]:
+                if neighbour not in depths:
+                    depths[neighbour] = depth
+                    order.append((self._nodes[neighbour], depth))
+                    queue.append(neighbour)
+
+        if len(self._memo) >= MEMO_MAX_ENTRIES:
+            self._memo.clear()
+        result = self._memo[key] = tuple(order)
+        return result
+
+
+@dataclass(frozen=True)
+class TopologyIndex:
+    """A topology together with the lookups built from it.
+
+    Built in full before it is published, so a reload can construct it
+    off the event loop and swap it in with one assignment.
+    """
+
+    topology: PlatformTopology
+    clusters: dict[str, ClusterTopology]
+    cluster_graph: DependencyGraph
+    service_graph: DependencyGraph
+
+    @classmethod
+    def build(cls, topology: PlatformTopology) -> "TopologyIndex":
+        """Index clusters by name and build the cluster and service graphs."""
+        clusters: dict[str, ClusterTopology] = {}
+        cluster_graph = DependencyGraph()
+        for cluster in topology.clusters:
+            # First definition wins, as with a linear scan
+            clusters.setdefault(cluster.name, cluster)
+            cluster_graph.add_node(cluster.name)
+            for dep in cluster.dependencies:
+                cluster_graph.add_edge(cluster.name, dep)
+
+        # A dependency's source cluster is the one running the source service
+        service_clusters: dict[tuple[str, str], str] = {}
+        service_graph = DependencyGraph()
+        for cluster in topology.clusters:
+            for service in cluster.critical_services:
+                service_clusters.setdefault((service.name, service.namespace), cluster.name)
+                service_graph.add_node((cluster.name, service.name))
+        for dep in topology.cross_cluster_dependencies:
+            source_cluster = service_clusters.get((dep.source_service, dep.source_namespace))
+            if source_cluster is None:
+                continue
+            service_graph.add_edge(
+                (source_cluster, dep.source_service),
+                (dep.target_cluster or source_cluster, dep.target_service),
+            )
+
+        return cls(topology, clusters, cluster_graph, service_graph)
+
+
+def diff_topologies(old: PlatformTopology, new: PlatformTopology) -> dict[str, list[str]]:
+    """Structural differences between two topologies; empty if they match.
+
+    Keys (only present when non-empty): ``clusters_added``,
+    ``clusters_removed``, ``clusters_changed``, ``dependencies_added``,
+    ``dependencies_removed``, ``services_added``, ``services_removed``,
+    ``cross_cluster_added`` and ``cross_cluster_removed``.
+    """
+    old_clusters = {c.name: c for c in old.clusters}
+    new_clusters = {c.name: c for c in new.clusters}
+
+    def edges(clusters: dict[str, ClusterTopology]) -> set[str]:
+        return {f"{name} -> {dep}" for name, c in clusters.items() for dep in c.dependencies}
+
+    def services(clusters: dict[str, ClusterTopology]) -> set[str]:
+        return {f"{name}/{s.name}" for name, c in clusters.items() for s in c.critical_services}
+
+    def cross(topology: PlatformTopology) -> set[str]:
+        return {
+            f"{d.source_namespace}/{d.source_service} -> "
+            f"{d.target_cluster or '-'}/{d.target_namespace}/{d.target_service}"
+            for d in topology.cross_cluster_dependencies
+        }
+
+    diff = {
+        "clusters_added": sorted(new_clusters.keys() - old_clusters.keys()),
+        "clusters_removed": sorted(old_clusters.keys() - new_clusters.keys()),
+        "clusters_changed": sorted(
+            name for name in old_clusters.keys() & new_clusters.keys()
+            if old_clusters[name] != new_clusters[name]
+        ),
+        "dependencies_added": sorted(edges(new_clusters) - edges(old_clusters)),
+        "dependencies_removed": sorted(edges(old_clusters) - edges(new_clusters)),
+        "services_added": sorted(services(new_clusters) - services(old_clusters)),
+        "services_removed": sorted(services(old_clusters) - services(new_clusters)),
+        "cross_cluster_added": sorted(cross(new) - cross(old)),
+        "cross_cluster_removed": sorted(cross(old) - cross(new)),
+    }
+    return {key: value for key, value in diff.items() if value}
+
 
 class TopologyStore:
     """Manages cluster topology knowledge.
 
     Loads static topology from YAML files (Git-managed) or queries Omniscience Graph database.
+
+    The topology is indexed on assignment: clusters by name, plus two
+    DependencyGraphs, one between clusters (``dependencies``) and one
+    between services (``cross_cluster_dependencies``). Transitive
+    blast-radius and dependency-closure queries walk these graphs and are
+    memoized until the topology is reloaded or a dynamic refresh changes
+    a cluster's dependencies.
+
+    ``reload_from_file`` parses and indexes the file in a worker thread
+    and publishes the result as one ``TopologyIndex`` swap, so readers
+    never block on a reload or see a half-built index.
+
+    Dependencies learned from Omniscience are kept apart from the loaded
+    topology and applied on top of it whenever an index is built, so they
+    survive reloads (and do not show up as removed in a reload's diff).
+    A published index is never modified: a dynamic refresh builds and
+    swaps in a new one too.
     """
 
     def __init__(
@@ -28,70 +226,152 @@ class TopologyStore:
         omniscience_url: Optional[str] = None,
         omniscience_token: Optional[str] = None,
     ) -> None:
-        self.topology = PlatformTopology()
+        self._index = TopologyIndex.build(PlatformTopology())
+        # cluster name -> dependencies from the latest dynamic refresh
+        self._dynamic_dependencies: dict[str, list[str]] = {}
         self.omniscience_url = omniscience_url
         self.omniscience_token = omniscience_token
+        self.omniscience: Optional[OmniscienceClient] = (
+            omniscience_client(omniscience_url, omniscience_token)
+            if omniscience_url and omniscience_token else None
+        )
         if topology_path:
             self.load_from_file(topology_path)
 
+    @property
+    def topology(self) -> PlatformTopology:
+        return self._index.topology
+
+    @topology.setter
+    def topology(self, topology: PlatformTopology) -> None:
+        self._index = self._build(topology, self._dynamic_dependencies)
+
+    @staticmethod
+    def _build(
+        topology: PlatformTopology, dynamic: dict[str, list[str]]
+    ) -> TopologyIndex:
+        """Index ``topology`` with dynamically learned dependencies applied."""
+        if any(cluster.name in dynamic for cluster in topology.clusters):
+            topology = topology.model_copy(update={"clusters": [
+                cluster.model_copy(update={"dependencies": list(dynamic[cluster.name])})
+                if cluster.name in dynamic else cluster
+                for cluster in topology.clusters
+            ]})
+        return TopologyIndex.build(topology)
+
+    @property
+    def cluster_graph(self) -> DependencyGraph:
+        return self._index.cluster_graph
+
+    @property
+    def service_graph(self) -> DependencyGraph:
+        return self._index.service_graph
+
     async def fetch_dynamic_dependencies(self, cluster_name: str) -> list[str]:
-        """Fetch upstream dependencies dynamically from Omniscience Graph."""
-        if not self.omniscience_url or not self.omniscience_token:
+        """Fetch upstream dependencies dynamically from Omniscience Graph.
+
+        Answers come from the shared, cached Omniscience client; the static
+        topology is the fallback when Omniscience is unset, unreachable or
+        does not know the cluster.
+        """
+        if self.omniscience is None:
             return self.get_dependencies(cluster_name)
 
-        import httpx
         try:
-            async with httpx.AsyncClient(timeout=5.0) as client:
-                headers = {"Authorization": f"Bearer {self.omniscience_token}"}
-                response = await client.get(
-                    f"{self.omniscience_url}/api/v1/graph/dependencies?cluster={cluster_name}",
-                    headers=headers,
-                )
-                if response.status_code == 200:
-                    data = response.json()
-                    return data.get("dependencies", [])
+            dependencies = await self.omniscience.get_dependencies(cluster_name)
+            if dependencies is not None:
+                self.update_dependencies(cluster_name, dependencies)
+                return dependencies
         except Exception as e:
             logger.error("Failed to fetch dynamic dependencies from Omniscience: %s", e)
 
         return self.get_dependencies(cluster_name)
 
+    @staticmethod
+    def parse_file(path: str) -> PlatformTopology:
+        """Parse a topology YAML file. Raises on unreadable or invalid files."""
+        with open(path) as f:
+            data = yaml.safe_load(f)
+
+        clusters = []
+        for c in data.get("clusters", {}).values() if isinstance(
+            data.get("clusters"), dict
+        ) else data.get("clusters", []):
+            if isinstance(c, dict):
+                critical = [
+                    CriticalService(name=s) if isinstance(s, str)
+                    else CriticalService(**s)
+                    for s in c.get("critical_services", [])
+                ]
+                clusters.append(ClusterTopology(
+                    name=c.get("name", ""),
+                    type=c.get("type", "spoke"),
+                    region=c.get("region", ""),
+                    k8s_version=c.get("k8s_version", ""),
+                    critical_services=critical,
+                    dependencies=c.get("dependencies", []),
+                ))
+
+        cross_cluster = [
+            ServiceDependency(**d)
+            for d in data.get("cross_cluster_dependencies", []) or []
+            if isinstance(d, dict)
+        ]
+
+        return PlatformTopology(
+            clusters=clusters,
+            cross_cluster_dependencies=cross_cluster,
+        )
+
     def load_from_file(self, path: str) -> None:
         """Load topology from a YAML file."""
         try:
-            with open(path) as f:
-                data = yaml.safe_load(f)
-
-            clusters = []
-            for c in data.get("clusters", {}).values() if isinstance(
-                data.get("clusters"), dict
-            ) else data.get("clusters", []):
-                if isinstance(c, dict):
-                    critical = [
-                        CriticalService(name=s) if isinstance(s, str)
-                        else CriticalService(**s)
-                        for s in c.get("critical_services", [])
-                    ]
-                    clusters.append(ClusterTopology(
-                        name=c.get("name", ""),
-                        type=c.get("type", "spoke"),
-                        region=c.get("region", ""),
-                        k8s_version=c.get("k8s_version", ""),
-                        critical_services=critical,
-                        dependencies=c.get("dependencies", []),
-                    ))
-
-            self.topology = PlatformTopology(clusters=clusters)
-            logger.info("Loaded topology: %d clusters", len(clusters))
+            self.topology = self.parse_file(path)
+            logger.info("Loaded topology: %d clusters", len(self.topology.clusters))
 
         except Exception as e:
             logger.error("Failed to load topology from %s: %s", path, e)
 
+    async def reload_from_file(self, path: str) -> Optional[dict[str, list[str]]]:
+        """Reload the topology without blocking readers, and log what changed.
+
+        Returns the structural diff (see ``diff_topologies``), or None if
+        the file could not be loaded, in which case the current topology
+        stays in place.
+        """
+        dynamic = dict(self._dynamic_dependencies)
+        try:
+            index = await asyncio.to_thread(
+                lambda: self._build(self.parse_file(path), dynamic)
+            )
+        except Exception as e:
+            logger.error("Failed to reload topology from %s: %s", path, e)
+            return None
+
+        diff = diff_topologies(self._index.topology, index.topology)
+        self._index = index
+        if diff:
+            logger.info("Reloaded topology from %s: %s", path, diff)
+        else:
+            logger.info("Reloaded topology from %s: no structural changes", path)
+        return diff
+
+    def update_dependencies(self, cluster_name: str, dependencies: list[str]) -> None:
+        """Replace a known cluster's dependencies (e.g. from a dynamic refresh).
+
+        Publishes a new index; readers holding the previous one keep a
+        consistent view.
+        """
+        cluster = self._index.clusters.get(cluster_name)
+        if cluster is None or cluster.dependencies == dependencies:
+            return
+        self._dynamic_dependencies[cluster_name] = list(dependencies)
+        self._index = self._build(self._index.topology, self._dynamic_dependencies)
+        logger.info("Updated dependencies of %s: %s", cluster_name, dependencies)
+
     def get_cluster(self, name: str) -> Optional[ClusterTopology]:
         """Get topology for a specific cluster."""
-        for c in self.topology.clusters:
-            if c.name == name:
-                return c
-        return None
+        return self._index.clusters.get(name)
 
     def get_dependencies(self, cluster_name: str) -> list[str]:
         """Get upstream dependencies for a cluster."""
@@ -100,32 +380,46 @@ class TopologyStore:
 
     def get_dependents(self, cluster_name: str) -> list[str]:
         """Get clusters that depend on the given cluster."""
-        return [
-            c.name
-            for c in self.topology.clusters
-            if cluster_name in c.dependencies
-        ]
+        return self.cluster_graph.dependents(cluster_name)
+
+    def get_dependency_closure(
+        self, cluster_name: str, max_depth: Optional[int] = None
+    ) -> list[str]:
+        """Clusters the given cluster depends on, directly or transitively, nearest first."""
+        return [name for name, _ in self.cluster_graph.reachable(cluster_name, False, max_depth)]
 
     def get_critical_services(self, cluster_name: str) -> list[CriticalService]:
         """Get critical services for a cluster."""
         cluster = self.get_cluster(cluster_name)
         return cluster.critical_services if cluster else []
 
-    def get_blast_radius(self, cluster_name: str) -> dict:
+    def get_blast_radius(self, cluster_name: str, max_depth: Optional[int] = None) -> dict:
         """Calculate blast radius if a cluster goes down.
 
-        Returns affected clusters and their critical services.
+        Returns affected clusters (transitive dependents, up to
+        ``max_depth`` hops away, nearest first) and their critical services.
         """
-        affected = self.get_dependents(cluster_name)
         result = {
             "source_cluster": cluster_name,
             "affected_clusters": [],
         }
-        for dep in affected:
+        for dep, depth in self.cluster_graph.reachable(cluster_name, True, max_depth):
             cluster = self.get_cluster(dep)
             if cluster:
                 result["affected_clusters"].append({
                     "name": dep,
+                    "depth": depth,
                     "critical_services": [s.name for s in cluster.critical_services],
                 })
         return result
+
+    def get_service_blast_radius(
+        self, cluster_name: str, service: str, max_depth: Optional[int] = None
+    ) -> list[dict]:
+        """Services that depend on a service, directly or transitively, nearest first."""
+        return [
+            {"cluster": cluster, "service": name, "depth": depth}
+            for (cluster, name), depth in self.service_graph.reachable(
+                (cluster_name, service), True, max_depth
+            )
+        ]
@@ -0,0 +1,306 @@
+"""On-disk approximate nearest-neighbour index for incident embeddings.
+
+An IVF-flat index (inverted file over k-means centroids, exact scoring
+inside the probed lists) over a memory-mapped float32 matrix, so the
+working set is the centroids plus whichever rows a query touches, not
+the whole history. Vectors are unit length (see memory.embeddings), so
+scores are cosine similarities.
+
+Layout of the index directory:
+
+- ``vectors.f32``: row-major (capacity, dim) float32 matrix (memmap)
+- ``lists.i32``: IVF list of each row, -1 before the index is trained
+- ``centroids.npy``: (nlist, dim) float32 centroids
+- ``ids.txt``: external id of each row, one per line; the row count
+- ``meta.json``: dimension
+
+Rows are append-only: re-adding an id writes a new row and retires the
+old one. Until ``TRAIN_POINTS_PER_LIST`` rows per list exist, search is
+exact (flat); from then on ``needs_training`` asks the owner to train the
+index, and again once it has grown ``RETRAIN_GROWTH`` times since.
+Writes never train inline: ``retrain()`` runs k-means in a worker thread
+and swaps the new centroids and list assignment in when it is done.
+
+Requires numpy (the ``vector`` extra).
+"""
+
+import asyncio
+import json
+import logging
+import math
+from pathlib import Path
+from typing import Optional
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+TRAIN_POINTS_PER_LIST = 32
+RETRAIN_GROWTH = 4
+KMEANS_ITERATIONS = 10
+# Rows scored per matrix multiply when assigning or brute-forcing
+CHUNK_ROWS = 65536
+
+
+class VectorIndex:
+    """Append-only IVF-flat index of unit vectors, persisted in a directory."""
+
+    def __init__(
+        self,
+        path: str,
+        dim: int,
+        nlist: Optional[int] = None,
+        nprobe: int = 16,
+        initial_capacity: int = 1024,
+    ) -> None:
+        self.path = Path(path)
+        self.path.mkdir(parents=True, exist_ok=True)
+        self.dim = dim
+        self.fixed_nlist = nlist
+        self.nprobe = nprobe
+
+        meta_path = self.path / "meta.json"
+        if meta_path.exists():
+            meta = json.loads(meta_path.read_text())
+            if meta["dim"] != dim:
+                raise ValueError(f"Index at {path} has dim {meta['dim']}, expected {dim}")
+        else:
+            meta_path.write_text(json.dumps({"dim": dim}))
+
+        self._ids_path = self.path / "ids.txt"
+        self._ids: list[str] = (
+            self._ids_path.read_text().splitlines() if self._ids_path.exists() else []
+        )
+        self.count = len(self._ids)
+
+        self._capacity = 0
+        self._vectors = np.zeros((0, dim), dtype=np.float32)
+        self._assign = np.zeros(0, dtype=np.int32)
+        self._dead = np.zeros(0, dtype=bool)
+        self._grow(max(initial_capacity, self.count))
+
+        # Latest row of each id; earlier rows of the same id are dead
+        self._rows: dict[str, int] = {}
+        for row, incident_id in enumerate(self._ids):
+            previous = self._rows.get(incident_id)
+            if previous is not None:
+                self._dead[previous] = True
+            self._rows[incident_id] = row
+
+        self.centroids: Optional[np.ndarray] = None
+        self.trained_count = 0
+        self._lists: list[np.ndarray] = []
+        self._tails: list[list[int]] = []
+        centroids_path = self.path / "centroids.npy"
+        if centroids_path.exists():
+            self.centroids = np.load(centroids_path)
+            self._build_lists()
+            self.trained_count = self.count
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+    def __contains__(self, incident_id: str) -> bool:
+        return incident_id in self._rows
+
+    def _memmap(self, name: str, dtype: type, shape: tuple[int, ...]) -> np.ndarray:
+        file = self.path / name
+        size = int(np.prod(shape)) * np.dtype(dtype).itemsize
+        with open(file, "ab") as f:
+            if f.tell() < size:
+                f.truncate(size)
+        return np.memmap(file, dtype=dtype, mode="r+", shape=shape)
+
+    def _grow(self, capacity: int) -> None:
+        """Resize the backing files to hold at least ``capacity`` rows."""
+        if capacity <= self._capacity:
+            return
+        capacity = max(capacity, self._capacity * 2)
+        if self._capacity:
+            self._vectors.flush()
+            self._assign.flush()
+        self._vectors = self._memmap("vectors.f32", np.float32, (capacity, self.dim))
+        assign = self._memmap("lists.i32", np.int32, (capacity,))
+        if not self._capacity:
+            assign[self.count:] = -1
+        else:
+            assign[self._capacity:] = -1
+        self._assign = assign
+        dead = np.zeros(capacity, dtype=bool)
+        dead[: len(self._dead)] = self._dead
+        self._dead = dead
+        self._capacity = capacity
+
+    def add(self, incident_id: str, vector: np.ndarray) -> None:
+        """Insert (or replace) one vector."""
+        self.add_batch([incident_id], vector.reshape(1, -1))
+
+    def add_batch(self, ids: list[str], vectors: np.ndarray) -> None:
+        """Insert (or replace) vectors, one row of ``vectors`` per id."""
+        if vectors.shape != (len(ids), self.dim):
+            raise ValueError(f"Expected ({len(ids)}, {self.dim}) vectors, got {vectors.shape}")
+        start = self.count
+        end = start + len(ids)
+        self._grow(end)
+        self._vectors[start:end] = vectors
+        if self.centroids is not None:
+            assign = self._nearest_centroids(vectors)
+            self._assign[start:end] = assign
+            for offset, list_id in enumerate(assign.tolist()):
+                self._tails[list_id].append(start + offset)
+        for offset, incident_id in enumerate(ids):
+            previous = self._rows.get(incident_id)
+            if previous is not None:
+                self._dead[previous] = True
+            self._rows[incident_id] = start + offset
+        # Vectors first, then ids: the ids file defines how many rows are valid
+        self._ids.extend(ids)
+        with open(self._ids_path, "a") as f:
+            f.write("".join(f"{incident_id}\n" for incident_id in ids))
+        self.count = end
+
+    @property
+    def needs_training(self) -> bool:
+        """Whether the index has grown enough to be (re)trained."""
+        if self.centroids is None:
+            return self.count >= self._target_nlist() * TRAIN_POINTS_PER_LIST and self.count > 1
+        return self.count >= self.trained_count * RETRAIN_GROWTH
+
+    def _target_nlist(self) -> int:
+        return self.fixed_nlist or max(1, int(math.sqrt(max(self.count, 1))))
+
+    def _nearest_centroids(self, vectors: np.ndarray) -> np.ndarray:
+        assert self.centroids is not None
+        return np.argmax(vectors @ self.centroids.T, axis=1).astype(np.int32)
+
+    def train(self, seed: int = 0) -> None:
+        """(Re)build the centroids with spherical k-means and reassign every row."""
+        self._install(*self._fit(self.count, seed), self.count)
+        self._persist()
+
+    async def retrain(self, seed: int = 0) -> None:
+        """Train on the rows present now in a worker thread, then swap the result in.
+
+        Searches and writes go on against the current lists meanwhile;
+        rows added during training are assigned when the result is installed.
+        """
+        count = self.count
+        centroids, assign = await asyncio.to_thread(self._fit, count, seed)
+        self._install(centroids, assign, count)
+        await asyncio.to_thread(self._persist)
+
+    def _fit(self, count: int, seed: int) -> tuple[np.ndarray, np.ndarray]:
+        """Spherical k-means over the first ``count`` rows.
+
+        Returns (centroids, list of each row). Only reads rows below
+        ``count``, which are never written again, so it can run off the
+        event loop while rows are appended.
+        """
+        nlist = min(self._target_nlist(), count)
+        rng = np.random.default_rng(seed)
+        sample_size = min(count, nlist * 64)
+        vectors = self._vectors
+        sample = np.asarray(vectors[np.sort(rng.choice(count, sample_size, replace=False))])
+        centroids = sample[rng.choice(sample_size, nlist, replace=False)].copy()
+        for _ in range(KMEANS_ITERATIONS):
+            assign = np.argmax(sample @ centroids.T, axis=1)
+            sums = np.zeros_like(centroids)
+            np.add.at(sums, assign, sample)
+            norms = np.linalg.norm(sums, axis=1, keepdims=True)
+            # Empty clusters keep their previous centroid
+            centroids = np.where(norms > 0, sums / np.maximum(norms, 1e-12), centroids)
+        centroids = centroids.astype(np.float32)
+
+        rows = np.empty(count, dtype=np.int32)
+        for start in range(0, count, CHUNK_ROWS):
+            end = min(start + CHUNK_ROWS, count)
+            rows[start:end] = np.argmax(np.asarray(vectors[start:end]) @ centroids.T, axis=1)
+        return centroids, rows
+
+    def _install(self, centroids: np.ndarray, assign: np.ndarray, count: int) -> None:
+        """Switch to new centroids fitted on the first ``count`` rows."""
+        self.centroids = centroids
+        self._assign[:count] = assign
+        if self.count > count:
+            self._assign[count:self.count] = self._nearest_centroids(
+                np.asarray(self._vectors[count:self.count])
+            )
+        self._build_lists()
+        self.trained_count = self.count
+        logger.info("Trained vector index: %d rows in %d lists", self.count, len(centroids))
+
+    def _persist(self) -> None:
+        """Write the assignment and centroids to disk."""
+        assert self.centroids is not None
+        self._assign.flush()
+        self._vectors.flush()
+        np.save(self.path / "centroids.npy", self.centroids)
+
+    def _build_lists(self) -> None:
+        assert self.centroids is not None
+        assign = np.asarray(self._assign[: self.count])
+        order = np.argsort(assign, kind="stable").astype(np.int64)
+        bounds = np.searchsorted(assign[order], np.arange(len(self.centroids) + 1))
+        self._lists = [order[bounds[i]:bounds[i + 1]] for i in range(len(self.centroids))]
+        self._tails = [[] for _ in self.centroids]
+
+    def _candidates(self, query: np.ndarray, nprobe: int) -> np.ndarray:
+        if self.centroids is None:
+            return np.arange(self.count)
+        probes = np.argpartition(
+            -(self.centroids @ query), min(nprobe, len(self.centroids)) - 1
+        )[:nprobe]
+        parts = []
+        for list_id in probes.tolist():
+            if self._tails[list_id]:
+                self._lists[list_id] = np.concatenate(
+                    [self._lists[list_id], np.asarray(self._tails[list_id], dtype=np.int64)]
+                )
+                self._tails[list_id] = []
+            parts.append(self._lists[list_id])
+        return np.concatenate(parts) if parts else np.zeros(0, dtype=np.int64)
+
+    def _top(self, rows: np.ndarray, scores: np.ndarray, k: int) -> list[tuple[str, float]]:
+        scores = np.where(self._dead[rows], -np.inf, scores)
+        top = np.argpartition(-scores, k - 1)[:k] if len(scores) > k else np.arange(len(scores))
+        top = top[np.argsort(-scores[top])]
+        return [
+            (self._ids[int(rows[i])], float(scores[i])) for i in top if scores[i] != -np.inf
+        ]
+
+    def search(
+        self, query: np.ndarray, k: int = 5, nprobe: Optional[int] = None
+    ) -> list[tuple[str, float]]:
+        """Approximate top ``k`` (id, cosine similarity), best first."""
+        if not self.count or k <= 0:
+            return []
+        rows = self._candidates(query, nprobe or self.nprobe)
+        return self._top(rows, self._vectors[rows] @ query, k)
+
+    def similarity(self, ids: list[str], query: np.ndarray) -> dict[str, float]:
+        """Cosine similarity of the query to each given id that is indexed."""
+        known = [incident_id for incident_id in ids if incident_id in self._rows]
+        if not known:
+            return {}
+        rows = np.fromiter((self._rows[i] for i in known), dtype=np.int64, count=len(known))
+        return dict(zip(known, (self._vectors[rows] @ query).tolist(), strict=True))
+
+    def exact_search(self, query: np.ndarray, k: int = 5) -> list[tuple[str, float]]:
+        """Exact top ``k`` by scanning every row (for recall measurement)."""
+        if not self.count or k <= 0:
+            return []
+        best: list[tuple[str, float]] = []
+        for start in range(0, self.count, CHUNK_ROWS):
+            end = min(start + CHUNK_ROWS, self.count)
+            rows = np.arange(start, end)
+            best = sorted(
+                best + self._top(rows, np.asarray(self._vectors[start:end]) @ query, k),
+                key=lambda hit: hit[1],
+                reverse=True,
+            )[:k]
+        return best
+
+    def close(self) -> None:
+        """Flush the matrix to disk."""
+        self._vectors.flush()
+        self._assign.flush()
@@ -109,6 +109,27 @@ ai_sre_accuracy_ratio = Gauge(
     labelnames=["agent_role"],
 )
 
+# --- Platform State Collector Metrics ---
+
+ai_sre_collector_source_duration_seconds = Histogram(
+    "ai_sre_collector_source_duration_seconds",
+    "Duration of one topology collection per source (k8s/<cluster>, aws, cloudflare)",
+    labelnames=["source", "status"],
+    buckets=[0.5, 1, 5, 10, 30, 60, 120, 300],
+)
+
+ai_sre_collector_source_last_success_timestamp_seconds = Gauge(
+    "ai_sre_collector_source_last_success_timestamp_seconds",
+    "Unix time of the last successful topology collection per source",
+    labelnames=["source"],
+)
+
+ai_sre_collector_source_failures_total = Counter(
+    "ai_sre_collector_source_failures_total",
+    "Topology collections that failed or timed out per source",
+    labelnames=["source", "status"],
+)
+
 # --- System Info ---
 
 ai_sre_system_info = Info(
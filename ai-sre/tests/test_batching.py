@@ -0,0 +1,30 @@
+import asyncio
+import sys
+from pathlib import Path
+
+import pytest
+
+# Ensure the root of the project is in PYTHONPATH
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from common.batching import AsyncBatcher
+
+
+@pytest.mark.asyncio
+async def test_batcher_splits_at_max_size_and_propagates_errors():
+    """Verify batches close at max size and a failed batch fails every caller in it."""
+    batches = []
+
+    async def load_batch(keys):
+        batches.append(keys)
+        if "bad" in keys:
+            raise RuntimeError("upstream down")
+        return {key: key.upper() for key in keys}
+
+    batcher = AsyncBatcher("test", load_batch, max_batch_size=2, max_wait=0.01)
+
+    assert await asyncio.gather(*(batcher.load(k) for k in ("a", "b", "c"))) == ["A", "B", "C"]
+    assert batches == [["a", "b"], ["c"]]
+
+    results = await asyncio.gather(batcher.load("bad"), batcher.load("d"), return_exceptions=True)
+    assert all(isinstance(r, RuntimeError) for r in results)
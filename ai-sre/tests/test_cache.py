@@ -0,0 +1,95 @@
+import asyncio
+import sys
+from pathlib import Path
+
+import pytest
+
+# Ensure the root of the project is in PYTHONPATH
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from common.cache import AsyncTTLCache
+
+
+@pytest.mark.asyncio
+async def test_concurrent_loads_collapse_into_one_call():
+    """Verify identical concurrent lookups share a single upstream load."""
+    cache = AsyncTTLCache("test", maxsize=8, ttl=60)
+    calls = 0
+
+    async def loader():
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.01)
+        return {"value": 42}
+
+    results = await asyncio.gather(*(cache.get_or_load("cpu", loader) for _ in range(20)))
+
+    assert calls == 1
+    assert all(r == {"value": 42} for r in results)
+    assert await cache.get_or_load("cpu", loader) == {"value": 42}
+    assert calls == 1
+
+
+@pytest.mark.asyncio
+async def test_ttl_expiry_and_failures_are_not_cached():
+    """Verify expired entries reload and failed loads are retried."""
+    cache = AsyncTTLCache("test", maxsize=8, ttl=60)
+    attempts = 0
+
+    async def flaky():
+        nonlocal attempts
+        attempts += 1
+        if attempts == 1:
+            raise RuntimeError("vmselect unavailable")
+        return attempts
+
+    with pytest.raises(RuntimeError):
+        await cache.get_or_load("mem", flaky)
+    assert await cache.get_or_load("mem", flaky, ttl=0) == 2
+    # ttl=0 expires immediately
+    assert await cache.get_or_load("mem", flaky) == 3
+    assert await cache.get_or_load("mem", flaky) == 3
+
+
+def test_lru_eviction_keeps_recently_used():
+    """Verify the least recently used entry is evicted at the size bound."""
+    cache = AsyncTTLCache("test", maxsize=2, ttl=60)
+    cache.put("a", 1)
+    cache.put("b", 2)
+    assert cache.get("a") == (True, 1)
+
+    cache.put("c", 3)
+
+    assert len(cache) == 2
+    assert cache.get("b") == (False, None)
+    assert cache.get("a") == (True, 1)
+
+
+@pytest.mark.asyncio
+async def test_stale_entries_are_served_while_revalidating():
+    """Verify expired entries within stale_ttl are returned while a reload runs or fails."""
+    cache = AsyncTTLCache("test", maxsize=8, ttl=0.01, stale_ttl=60)
+    cache.put("deps", ["platform"])
+    await asyncio.sleep(0.02)
+    assert cache.get("deps") == (False, None)
+
+    async def down():
+        raise RuntimeError("upstream down")
+
+    # The upstream is failing: keep serving the last good value
+    assert await cache.get_or_load("deps", down) == ["platform"]
+    await asyncio.sleep(0.001)
+
+    async def recovered():
+        return ["platform", "mesh"]
+
+    assert await cache.get_or_load("deps", recovered) == ["platform"]
+    await asyncio.sleep(0.001)
+    assert cache.get("deps") == (True, ["platform", "mesh"])
+
+    # Without stale_ttl, expired entries are gone
+    strict = AsyncTTLCache("test", maxsize=8, ttl=0.01)
+    strict.put("deps", ["platform"])
+    await asyncio.sleep(0.02)
+    with pytest.raises(RuntimeError):
+        await strict.get_or_load("deps", down)
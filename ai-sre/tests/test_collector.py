@@ -0,0 +1,134 @@
+import asyncio
+import json
+import sys
+from pathlib import Path
+from types import SimpleNamespace
+
+import httpx
+import pytest
+from prometheus_client import REGISTRY
+
+# Ensure the root of the project is in PYTHONPATH
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from agents.cloud.collector import PlatformStateCollector
+
+
+@pytest.mark.asyncio
+async def test_sources_are_collected_concurrently_and_partial_results_are_pushed():
+    """Verify a slow cluster times out alone and the push carries per-source freshness."""
+    collector = PlatformStateCollector(mock_sync=True, source_timeout_seconds=0.2)
+    pushes = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        pushes.append(json.loads(request.content))
+        return httpx.Response(200, json={"status": "success"})
+
+    await collector.client.aclose()
+    collector.client = httpx.AsyncClient(
+        transport=httpx.MockTransport(handler), base_url="http://omniscience"
+    )
+
+    async def collect_k8s(cluster):
+        await asyncio.sleep(10 if cluster == "blockchain" else 0.1)
+        return [{"id": f"cluster:{cluster}", "type": "Cluster"}], []
+
+    async def collect_cloud(name):
+        await asyncio.sleep(0.1)
+        return [{"id": f"{name}:account", "type": "Account"}], []
+
+    async def collect_failing():
+        raise RuntimeError("Cloudflare API unavailable")
+
+    collector.collect_k8s_topology = collect_k8s
+    collector.collect_aws_topology = lambda: collect_cloud("aws")
+    collector.collect_cloudflare_topology = collect_failing
+
+    loop = asyncio.get_running_loop()
+    started = loop.time()
+    await collector.sync_once()
+    # Five sources of 0.1-10s each finish within one timeout, not in sequence
+    assert loop.time() - started < 1
+
+    [payload] = pushes
+    assert {n["id"] for n in payload["nodes"]} == {
+        "cluster:platform", "cluster:gpu-inference", "aws:account",
+    }
+    sources = payload["sources"]
+    assert sources["k8s/platform"]["status"] == "ok"
+    assert sources["k8s/platform"]["last_success"] is not None
+    assert sources["k8s/blockchain"] == {
+        "status": "timeout", "duration_seconds": pytest.approx(0.2, abs=0.1), "last_success": None,
+    }
+    assert sources["cloudflare"]["status"] == "error"
+
+    assert REGISTRY.get_sample_value(
+        "ai_sre_collector_source_last_success_timestamp_seconds", {"source": "aws"}
+    ) == collector.last_success["aws"]
+    assert REGISTRY.get_sample_value(
+        "ai_sre_collector_source_failures_total", {"source": "k8s/blockchain", "status": "timeout"}
+    ) >= 1
+    await collector.client.aclose()
+
+
+@pytest.mark.asyncio
+async def test_selector_and_claim_matching_use_the_pod_index():
+    """Verify services route to pods matching every selector term and PVCs to their mounters."""
+    def pod(name, namespace, labels, claims=()):
+        return SimpleNamespace(
+            metadata=SimpleNamespace(name=name, namespace=namespace, labels=labels),
+            spec=SimpleNamespace(node_name="", volumes=[
+                SimpleNamespace(persistent_volume_claim=SimpleNamespace(claim_name=c))
+                for c in claims
+            ] or None),
+            status=SimpleNamespace(pod_ip=None, phase="Running"),
+        )
+
+    def service(name, namespace, selector):
+        return SimpleNamespace(
+            metadata=SimpleNamespace(name=name, namespace=namespace),
+            spec=SimpleNamespace(type="ClusterIP", cluster_ip="", selector=selector),
+        )
+
+    pods = [
+        pod("web-1", "shop", {"app": "web", "tier": "front"}, ["data-web-1"]),
+        pod("web-2", "shop", {"app": "web", "tier": "back"}),
+        pod("web-3", "other", {"app": "web", "tier": "front"}, ["data-web-1"]),
+        pod("web-4", "shop", {"app": "web", "tier": "front"}),
+        pod("bare", "shop", None),
+    ]
+    services = [
+        service("web", "shop", {"app": "web"}),
+        service("web-front", "shop", {"tier": "front", "app": "web"}),
+        service("none", "shop", {"app": "missing"}),
+        service("headless", "shop", None),
+    ]
+    pvc = SimpleNamespace(
+        metadata=SimpleNamespace(name="data-web-1", namespace="shop"),
+        spec=SimpleNamespace(volume_name="", storage_class_name="gp3"),
+    )
+    v1 = SimpleNamespace(
+        list_node=lambda: SimpleNamespace(items=[]),
+        list_namespace=lambda: SimpleNamespace(items=[]),
+        list_pod_for_all_namespaces=lambda: SimpleNamespace(items=pods),
+        list_service_for_all_namespaces=lambda: SimpleNamespace(items=services),
+        list_persistent_volume_claim_for_all_namespaces=lambda: SimpleNamespace(items=[pvc]),
+    )
+    collector = PlatformStateCollector(mock_sync=True)
+    _, edges = await collector._collect_k8s_real("c", v1)
+    await collector.client.aclose()
+
+    prefix = "k8s/cluster/c/namespace/"
+    routes = [
+        (e["from"].removeprefix(prefix), e["to"].removeprefix(prefix))
+        for e in edges if e["type"] == "ROUTES_TO"
+    ]
+    assert routes == [
+        ("shop/service/web", "shop/pod/web-1"),
+        ("shop/service/web", "shop/pod/web-2"),
+        ("shop/service/web", "shop/pod/web-4"),
+        ("shop/service/web-front", "shop/pod/web-1"),
+        ("shop/service/web-front", "shop/pod/web-4"),
+    ]
+    mounts = [(e["from"], e["to"]) for e in edges if e["type"] == "MOUNTS"]
+    assert mounts == [(f"{prefix}shop/pod/web-1", f"{prefix}shop/pvc/data-web-1")]
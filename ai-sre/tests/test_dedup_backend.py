@@ -0,0 +1,226 @@
+import asyncio
+import sys
+import time
+from pathlib import Path
+from typing import Any
+
+import pytest
+
+# Ensure the root of the project is in PYTHONPATH
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from ingestion.dedup import AlertDeduplicator
+from ingestion.dedup_backend import InMemoryDedupBackend, RedisDedupBackend
+
+
+class _FakeRedis:
+    """Local Redis-protocol stand-in for the commands the dedup backend sends.
+
+    Supports SET NX PX, GET, PTTL, DEL, SADD, SREM, SCARD, PEXPIRE and
+    MULTI/EXEC.
+    """
+
+    def __init__(self) -> None:
+        self.data: dict[str, tuple[Any, float]] = {}
+        self.commands: list[list[str]] = []
+        self.batches = 0
+        self.server: asyncio.AbstractServer | None = None
+
+    async def start(self) -> str:
+        self.server = await asyncio.start_server(self._handle, "127.0.0.1", 0)
+        port = self.server.sockets[0].getsockname()[1]
+        return f"redis://127.0.0.1:{port}/0"
+
+    async def stop(self) -> None:
+        assert self.server is not None
+        self.server.close()
+        await self.server.wait_closed()
+
+    def _live(self, key: str) -> bool:
+        entry = self.data.get(key)
+        if entry and entry[1] <= time.monotonic():
+            del self.data[key]
+            return False
+        return entry is not None
+
+    def _execute(self, cmd: list[str]) -> bytes:
+        self.commands.append(cmd)
+        name = cmd[0].upper()
+        if name == "SET":
+            key, value = cmd[1], cmd[2]
+            if "NX" in cmd and self._live(key):
+                return b"$-1\r\n"
+            ttl_ms = int(cmd[cmd.index("PX") + 1])
+            self.data[key] = (value, time.monotonic() + ttl_ms / 1000)
+            return b"+OK\r\n"
+        if name == "GET":
+            if not self._live(cmd[1]):
+                return b"$-1\r\n"
+            value = self.data[cmd[1]][0].encode()
+            return b"$%d\r\n%s\r\n" % (len(value), value)
+        if name == "PTTL":
+            if not self._live(cmd[1]):
+                return b":-2\r\n"
+            return b":%d\r\n" % int((self.data[cmd[1]][1] - time.monotonic()) * 1000)
+        if name == "DEL":
+            removed = sum(1 for key in cmd[1:] if self.data.pop(key, None))
+            return b":%d\r\n" % removed
+        if name == "SADD":
+            if not self._live(cmd[1]):
+                self.data[cmd[1]] = (set(), float("inf"))
+            members = self.data[cmd[1]][0]
+            added = len(set(cmd[2:]) - members)
+            members.update(cmd[2:])
+            return b":%d\r\n" % added
+        if name == "SREM":
+            if not self._live(cmd[1]):
+                return b":0\r\n"
+            members = self.data[cmd[1]][0]
+            removed = len(members & set(cmd[2:]))
+            members.difference_update(cmd[2:])
+            if not members:
+                del self.data[cmd[1]]
+            return b":%d\r\n" % removed
+        if name == "SCARD":
+            return b":%d\r\n" % (len(self.data[cmd[1]][0]) if self._live(cmd[1]) else 0)
+        if name == "PEXPIRE":
+            if not self._live(cmd[1]):
+                return b":0\r\n"
+            self.data[cmd[1]] = (self.data[cmd[1]][0], time.monotonic() + int(cmd[2]) / 1000)
+            return b":1\r\n"
+        return b"-ERR unknown command\r\n"
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        queued: list[list[str]] | None = None
+        while True:
+            header = await reader.readline()
+            if not header:
+                break
+            args = []
+            for _ in range(int(header[1:-2])):
+                length = int((await reader.readline())[1:-2])
+                args.append((await reader.readexactly(length + 2))[:-2].decode())
+            if args[0].upper() == "MULTI":
+                queued = []
+                writer.write(b"+OK\r\n")
+            elif args[0].upper() == "EXEC":
+                replies = [self._execute(cmd) for cmd in queued or []]
+                queued = None
+                writer.write(b"*%d\r\n" % len(replies) + b"".join(replies))
+            elif queued is not None:
+                queued.append(args)
+                writer.write(b"+QUEUED\r\n")
+            else:
+                writer.write(self._execute(args))
+            # Count one batch per burst of pipelined commands
+            if not reader._buffer:  # type: ignore[attr-defined]
+                self.batches += 1
+                await writer.drain()
+        writer.close()
+
+
+@pytest.mark.asyncio
+async def test_shared_backend_dedups_across_replicas():
+    """Verify two replicas sharing the backend start one investigation per group."""
+    fake = _FakeRedis()
+    url = await fake.start()
+    replica_a = RedisDedupBackend(url, AlertDeduplicator(), replica_id="a")
+    replica_b = RedisDedupBackend(url, AlertDeduplicator(), replica_id="b")
+
+    batch = [
+        ("kube_pod_crash", "platform", "default"),
+        ("node_disk", "platform", None),
+        ("kube_pod_crash", "platform", "default"),
+    ]
+    a = await replica_a.claim_batch(batch)
+    b = await replica_b.claim_batch(batch)
+
+    assert [claimed for claimed, _ in a] == [True, True, False]
+    assert [claimed for claimed, _ in b] == [False, False, False]
+    # One pipelined round trip per batch per replica
+    assert fake.batches == 2
+
+    # Near-cache answers repeats without another round trip
+    again = await replica_b.claim_batch(batch[:1])
+    assert again == [(False, "kube_pod_crash:platform:default")]
+    assert fake.batches == 2
+
+    # A released claim can be taken again
+    await replica_a.release_batch(["node_disk:platform:_all_"])
+    assert await replica_a.claim_batch([batch[1]]) == [(True, "node_disk:platform:_all_")]
+
+    await replica_a.close()
+    await replica_b.close()
+    await fake.stop()
+
+
+@pytest.mark.asyncio
+async def test_resolving_a_group_frees_the_shared_claim():
+    """Verify resolution deletes the shared claim and stamps TTFR from its first-seen time."""
+    fake = _FakeRedis()
+    url = await fake.start()
+    replica_a = RedisDedupBackend(url, AlertDeduplicator(), replica_id="a")
+    replica_b = RedisDedupBackend(url, AlertDeduplicator(), replica_id="b")
+
+    ref = ("kube_pod_crash", "platform", "default")
+    key = "kube_pod_crash:platform:default"
+    assert await replica_a.claim_batch([ref, ref], ["fp-1", "fp-2"]) == [(True, key), (False, key)]
+
+    # One of two firing alerts resolved: the group stays claimed
+    [(_, closed, ttfr)] = await replica_a.resolve_batch([(*ref, "fp-1")])
+    assert (closed, ttfr) == (False, None)
+    assert "ai-sre:dedup:" + key in fake.data
+
+    # The resolution reaches a replica that never saw the group fire
+    [(_, closed, ttfr)] = await replica_b.resolve_batch([(*ref, "fp-2")])
+    assert closed and ttfr is not None and ttfr >= 0
+    assert "ai-sre:dedup:" + key not in fake.data
+    assert await replica_b.claim_batch([ref], ["fp-1"]) == [(True, key)]
+
+    await replica_a.close()
+    await replica_b.close()
+    await fake.stop()
+
+
+@pytest.mark.asyncio
+async def test_group_stays_claimed_while_another_replica_sees_it_firing():
+    """Verify a replica cannot close a group whose alerts still fire on another replica."""
+    fake = _FakeRedis()
+    url = await fake.start()
+    replica_a = RedisDedupBackend(url, AlertDeduplicator(), replica_id="a")
+    replica_b = RedisDedupBackend(url, AlertDeduplicator(), replica_id="b")
+    replica_c = RedisDedupBackend(url, AlertDeduplicator(), replica_id="c")
+
+    ref = ("kube_pod_crash", "platform", "default")
+    key = "kube_pod_crash:platform:default"
+    assert await replica_a.claim_batch([ref, ref], ["fp-1", "fp-2"]) == [(True, key), (False, key)]
+    assert await replica_b.claim_batch([ref], ["fp-3"]) == [(False, key)]
+
+    # Everything replica A saw resolves, but fp-3 is still firing
+    results = await replica_a.resolve_batch([(*ref, "fp-1"), (*ref, "fp-2")])
+    assert [closed for _, closed, _ in results] == [False, False]
+    # A replica that never saw the group fire cannot close it either
+    [(_, closed, _)] = await replica_c.resolve_batch([(*ref, "fp-9")])
+    assert not closed
+    assert "ai-sre:dedup:" + key in fake.data
+    assert await replica_c.claim_batch([ref], ["fp-4"]) == [(False, key)]
+
+    results = await replica_b.resolve_batch([(*ref, "fp-3"), (*ref, "fp-4")])
+    assert [closed for _, closed, _ in results] == [False, True]
+    assert "ai-sre:dedup:" + key not in fake.data
+
+    for replica in (replica_a, replica_b, replica_c):
+        await replica.close()
+    await fake.stop()
+
+
+@pytest.mark.asyncio
+async def test_shared_backend_falls_back_to_local_state():
+    """Verify an unreachable server degrades to in-memory dedup instead of dropping alerts."""
+    backend = RedisDedupBackend("redis://127.0.0.1:1/0", AlertDeduplicator(), timeout=0.5)
+    local = InMemoryDedupBackend(AlertDeduplicator())
+
+    batch = [("gpu_xid", "gpu-inference", None), ("gpu_xid", "gpu-inference", None)]
+    assert await backend.claim_batch(batch) == await local.claim_batch(batch)
+    assert [claimed for claimed, _ in await backend.claim_batch(batch)] == [False, False]
+    await backend.close()
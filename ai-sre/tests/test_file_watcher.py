@@ -0,0 +1,46 @@
+import asyncio
+import os
+import sys
+from pathlib import Path
+
+import pytest
+
+# Ensure the root of the project is in PYTHONPATH
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from common.file_watcher import FileWatcher
+
+
+@pytest.mark.asyncio
+async def test_watcher_fires_on_content_changes_across_symlink_swaps(tmp_path):
+    """Verify ConfigMap-style ..data swaps trigger a reload and touching the file does not."""
+    # kubelet layout: file -> ..data/file, ..data -> timestamped directory
+    first, second = tmp_path / "..2026_01_01", tmp_path / "..2026_01_02"
+    first.mkdir()
+    second.mkdir()
+    (first / "topology.yaml").write_text("clusters: []\n")
+    (second / "topology.yaml").write_text("clusters: [{name: platform}]\n")
+    (tmp_path / "..data").symlink_to(first.name)
+    path = tmp_path / "topology.yaml"
+    path.symlink_to("..data/topology.yaml")
+
+    reloads = []
+
+    async def on_change() -> None:
+        reloads.append(path.read_text())
+
+    watcher = FileWatcher(str(path), on_change, interval=0.01)
+    await watcher.start()
+    assert await watcher.check() is False
+
+    os.utime(first / "topology.yaml", ns=(1, 1))
+    assert await watcher.check() is False
+
+    (tmp_path / "..data_tmp").symlink_to(second.name)
+    os.replace(tmp_path / "..data_tmp", tmp_path / "..data")
+    for _ in range(100):
+        if reloads:
+            break
+        await asyncio.sleep(0.01)
+    await watcher.stop()
+    assert reloads == ["clusters: [{name: platform}]\n"]
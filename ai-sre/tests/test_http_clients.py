@@ -0,0 +1,60 @@
+import asyncio
+import sys
+from pathlib import Path
+
+import pytest
+
+# Ensure the root of the project is in PYTHONPATH
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from common.http_clients import HTTPClientRegistry, UpstreamConfig
+
+
+@pytest.mark.asyncio
+async def test_registry_reuses_client_per_upstream():
+    """Verify callers share one pooled client per upstream until the registry closes."""
+    registry = HTTPClientRegistry([UpstreamConfig(name="victoriametrics", timeout=3.0)])
+    await registry.start()
+
+    client = registry.get("victoriametrics")
+    assert registry.get("victoriametrics") is client
+    assert registry.get("clickhouse") is not client
+    assert client.timeout.read == 3.0
+    assert registry.pool_stats()["victoriametrics"] == {"in_use": 0, "idle": 0}
+
+    await registry.aclose()
+    assert client.is_closed
+    assert registry.get("victoriametrics") is not client
+    await registry.aclose()
+
+
+def test_upstream_config_env_overrides(monkeypatch):
+    """Verify HTTP_POOL_<NAME>_* variables override per-upstream defaults."""
+    monkeypatch.setenv("HTTP_POOL_CLICKHOUSE_MAX_CONNECTIONS", "7")
+    monkeypatch.setenv("HTTP_POOL_CLICKHOUSE_TIMEOUT_SECONDS", "2.5")
+
+    config = UpstreamConfig.from_env("clickhouse", max_connections=20)
+    assert config.max_connections == 7
+    assert config.timeout == 2.5
+    assert config.max_keepalive_connections == 10
+
+
+def test_client_replaced_for_a_new_loop_is_closed():
+    """Verify a client built on a finished event loop is closed when a new loop replaces it."""
+    registry = HTTPClientRegistry([UpstreamConfig(name="victoriametrics")])
+
+    async def get_client():
+        return registry.get("victoriametrics")
+
+    first = asyncio.run(get_client())
+
+    async def replace():
+        client = registry.get("victoriametrics")
+        await asyncio.sleep(0)
+        return client
+
+    second = asyncio.run(replace())
+    assert second is not first
+    assert first.is_closed
+    assert not second.is_closed
+    asyncio.run(registry.aclose())
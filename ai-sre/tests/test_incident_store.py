@@ -0,0 +1,203 @@
+import json
+import sys
+from datetime import datetime
+from pathlib import Path
+
+import httpx
+import pytest
+
+# Ensure the root of the project is in PYTHONPATH
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from memory import incident_store
+from memory.incident_index import IncidentIndex
+from memory.incident_store import INCIDENT_COLUMNS, RESOLUTION_COLUMNS, IncidentStore
+from memory.models.incident import IncidentRecord
+
+NOW = datetime(2026, 1, 1)
+
+
+def _index() -> IncidentIndex:
+    index = IncidentIndex()
+    index.add("1", "Pods crashlooping after OOM", "platform", NOW,
+              ["kube_pod_crashlooping"], ["OOMKilled containers"], "memory limit too low")
+    index.add("2", "Disk pressure on nodes", "platform", NOW,
+              ["node_disk_pressure"], ["evictions"], "log volume filled the disk")
+    index.add("3", "GPU XID errors", "gpu-inference", NOW,
+              ["gpu_xid_error"], ["XID 79"], "faulty GPU")
+    index.add("4", "Crashlooping ingress controller", "gpu-inference", NOW,
+              ["kube_pod_crashlooping"], ["readiness probe failed"], None)
+    return index
+
+
+def test_index_ranks_by_bm25_and_updates_incrementally():
+    """Verify BM25 ranking, cluster filtering and incremental updates of the index."""
+    index = _index()
+
+    ranked = index.search(["kube_pod_crashlooping", "OOMKilled"])
+    assert [doc.incident_id for _, doc in ranked] == ["1", "4"]
+    assert 0 < ranked[1][0] < ranked[0][0] <= 1
+
+    assert [d.incident_id for _, d in index.search(["crashlooping"], cluster="gpu-inference")] == [
+        "4"
+    ]
+
+    # A captured resolution becomes searchable
+    assert index.search(["certificate"]) == []
+    index.update_resolution("4", "expired TLS certificate", ["rotate certificate"])
+    [(_, doc)] = index.search(["certificate"])
+    assert (doc.incident_id, doc.resolution_steps) == ("4", ["rotate certificate"])
+
+    index.remove("1")
+    assert [doc.incident_id for _, doc in index.search(["OOMKilled"])] == []
+    assert len(index) == 3
+
+
+def test_index_handles_incidents_without_a_cluster():
+    """Verify an incident with an empty cluster can be re-indexed and removed."""
+    index = _index()
+    index.add("5", "Webhook backlog", "", NOW, ["alert_queue_full"], ["429 responses"])
+
+    assert index.update_resolution("5", "queue too small", ["raise ALERT_QUEUE_SIZE"])
+    [(_, doc)] = index.search(["backlog"])
+    assert (doc.incident_id, doc.root_cause) == ("5", "queue too small")
+
+    index.remove("5")
+    assert index.search(["backlog"]) == []
+    assert len(index) == 4
+
+
+@pytest.mark.asyncio
+async def test_store_searches_index_and_falls_back_for_cold_history(monkeypatch):
+    """Verify a warmed store answers from the index and only asks ClickHouse for older history."""
+    queries = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        sql = request.content.decode()
+        queries.append(sql)
+        if sql.startswith("SELECT incident_id, timestamp"):
+            return httpx.Response(200, json={"data": [{
+                "incident_id": "00000000-0000-0000-0000-000000000001",
+                "timestamp": "2026-01-01 00:00:00.000",
+                "title": "Pods crashlooping after OOM",
+                "cluster": "platform",
+                "alertnames": ["kube_pod_crashlooping"],
+                "symptoms": ["OOMKilled"],
+                "root_cause": "memory limit too low",
+                "resolution_steps": ["raise memory limit"],
+            }]})
+        if sql.startswith("SELECT"):
+            return httpx.Response(200, json={"data": [{
+                "incident_id": "00000000-0000-0000-0000-000000000009",
+                "timestamp": "2025-06-01 00:00:00.000",
+                "title": "Old crashloop",
+                "cluster": "platform",
+                "alertnames": ["kube_pod_crashlooping"],
+                "symptoms": [],
+                "root_cause": "",
+                "resolution_steps": [],
+            }]})
+        return httpx.Response(200)
+
+    client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    monkeypatch.setattr(incident_store.http_clients, "get", lambda name: client)
+    store = IncidentStore("http://clickhouse")
+
+    assert await store.warm() == 1
+    [hit] = await store.search_similar(["OOMKilled"], limit=1)
+    assert hit.title == "Pods crashlooping after OOM" and hit.similarity_score > 0
+    assert len(queries) == 1
+
+    # Not enough indexed matches: the remainder comes from before the index horizon
+    results = await store.search_similar(["kube_pod_crashlooping"], limit=3)
+    assert [r.title for r in results] == ["Pods crashlooping after OOM", "Old crashloop"]
+    assert "timestamp < '" in queries[-1] and "LIMIT 2" in queries[-1]
+
+    # Writes through the store are searchable immediately
+    await store.record_incident(IncidentRecord(
+        title="Ingress 502s", cluster="platform", symptoms=["upstream connect error"],
+    ))
+    [new] = await store.search_similar(["upstream"], limit=1)
+    assert new.title == "Ingress 502s"
+    await store.capture_resolution(str(new.incident_id), "bad deploy", ["roll back"])
+    [resolved] = await store.search_similar(["deploy"], limit=1)
+    assert resolved.resolution_steps == ["roll back"]
+    await client.aclose()
+
+
+@pytest.mark.asyncio
+async def test_store_batches_writes_and_coalesces_resolutions(monkeypatch):
+    """Verify incidents and resolutions are written as columnar batches without mutations."""
+    inserts = []
+    fail = True
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        query = request.url.params.get("query", "")
+        assert not request.content.decode().startswith("ALTER")
+        if fail:
+            return httpx.Response(503)
+        inserts.append((query.split()[2], json.loads(request.content)))
+        return httpx.Response(200)
+
+    client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    monkeypatch.setattr(incident_store.http_clients, "get", lambda name: client)
+    store = IncidentStore("http://clickhouse", batch_size=100, flush_interval=60)
+    await store.start()
+
+    first = IncidentRecord(title="Disk pressure", cluster="platform", symptoms=["evictions"])
+    await store.record_incident(first)
+    # Resolving an incident that is still buffered rewrites its pending row
+    await store.capture_resolution(str(first.incident_id), "log volume", ["rotate logs"])
+    await store.record_incident(IncidentRecord(title="GPU XID", cluster="gpu"))
+    assert store.buffered == 2 and not inserts
+
+    # A failed flush keeps the batch for the next one
+    await store.flush()
+    assert store.buffered == 2
+    fail = False
+    await store.flush()
+    [(table, columns)] = inserts
+    assert table == "ai_sre.incidents"
+    assert columns[INCIDENT_COLUMNS.index("title")] == ["Disk pressure", "GPU XID"]
+    assert columns[INCIDENT_COLUMNS.index("root_cause")] == ["log volume", ""]
+    assert columns[INCIDENT_COLUMNS.index("resolution_source")] == ["human", "agent"]
+
+    # Repeated resolutions of a written incident coalesce into one versioned row
+    await store.capture_resolution(str(first.incident_id), "first guess", [])
+    await store.capture_resolution(str(first.incident_id), "log volume filled disk", ["rotate"])
+    await store.stop()
+    table, columns = inserts[-1]
+    assert table == "ai_sre.incident_resolutions"
+    assert columns[RESOLUTION_COLUMNS.index("root_cause")] == ["log volume filled disk"]
+    assert store.buffered == 0
+    await client.aclose()
+
+
+@pytest.mark.asyncio
+async def test_store_without_flush_loop_raises_failed_writes(monkeypatch):
+    """Verify unbatched writes surface ClickHouse errors and keep the rows for a retry."""
+    inserts = []
+    fail = True
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        if fail:
+            return httpx.Response(503)
+        inserts.append(request.url.params.get("query", "").split()[2])
+        return httpx.Response(200)
+
+    client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    monkeypatch.setattr(incident_store.http_clients, "get", lambda name: client)
+    store = IncidentStore("http://clickhouse")
+
+    incident = IncidentRecord(title="Disk pressure", cluster="platform")
+    with pytest.raises(httpx.HTTPStatusError):
+        await store.record_incident(incident)
+    with pytest.raises(httpx.HTTPStatusError):
+        await store.capture_resolution(str(incident.incident_id), "log volume", [])
+    assert store.buffered == 1
+    assert store.index.search(["log"])
+
+    fail = False
+    await store.flush()
+    assert inserts == ["ai_sre.incidents"] and store.buffered == 0
+    await client.aclose()
@@ -0,0 +1,752 @@
+import asyncio
+import json
+import sys
+import time
+from dataclasses import asdict
+from pathlib import Path
+
+import httpx
+import pytest
+from fastapi.testclient import TestClient
+
+# Ensure the root of the project is in PYTHONPATH
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from common.batching import AsyncBatcher
+from common.cache import AsyncTTLCache
+from ingestion import api, enrichment, history
+from ingestion.correlation import AlertCorrelator
+from ingestion.dedup import AlertDeduplicator
+from ingestion.models import AlertmanagerWebhook, AlertSeverity
+from ingestion.queue import AlertQueue, PendingAlert
+from ingestion.ratelimit import AlertRateLimiter
+from ingestion.webhook_parser import WebhookAlert, WebhookParseError, WebhookStreamParser
+from memory.burn_rate import BurnRateEngine
+from memory.models.topology import ClusterTopology, PlatformTopology
+from memory.slo_store import SLOStore
+from memory.topology_store import TopologyStore
+
+
+def _alert(alertname: str, cluster: str = "platform", namespace: str = "default") -> dict:
+    return {
+        "status": "firing",
+        "labels": {
+            "alertname": alertname,
+            "cluster": cluster,
+            "namespace": namespace,
+            "severity": "warning",
+        },
+        "annotations": {},
+        # Alertmanager fingerprints hash the full label set
+        "fingerprint": f"fp-{alertname}-{cluster}-{namespace}",
+    }
+
+
+@pytest.fixture(autouse=True)
+def enrichment_state(monkeypatch):
+    """Fresh enrichment cache and batcher, whose futures belong to one test's event loop."""
+    monkeypatch.setattr(enrichment, "enrichment_cache", AsyncTTLCache("enrichment", maxsize=64))
+    monkeypatch.setattr(
+        enrichment,
+        "recent_alerts_batcher",
+        AsyncBatcher(
+            "recent_alerts",
+            enrichment._query_recent_alerts_batch,
+            max_batch_size=enrichment.RECENT_ALERTS_BATCH_SIZE,
+            max_wait=enrichment.RECENT_ALERTS_BATCH_WINDOW_SECONDS,
+            default_factory=list,
+        ),
+    )
+
+
+@pytest.fixture
+def client(monkeypatch):
+    """A TestClient with fresh dedup/correlation state and no rate limit history."""
+    monkeypatch.setattr(api, "deduplicator", AlertDeduplicator())
+    monkeypatch.setattr(api, "correlator", AlertCorrelator())
+    monkeypatch.setattr(api, "ALERT_HISTORY_ENABLED", False)
+    monkeypatch.setattr(api, "rate_limiter", AlertRateLimiter())
+    with TestClient(api.app) as test_client:
+        yield test_client
+
+
+def test_batch_enriched_concurrently_in_webhook_order(client, monkeypatch):
+    """Verify surviving alerts are enriched concurrently and returned in webhook order."""
+    in_flight = 0
+    peak = 0
+
+    async def slow_enrich(alertname, cluster, namespace, labels):
+        nonlocal in_flight, peak
+        in_flight += 1
+        peak = max(peak, in_flight)
+        # Later alerts finish first to catch ordering bugs
+        await asyncio.sleep(0.01 * (10 - int(alertname.split("_")[-1])))
+        in_flight -= 1
+        return {"cluster": cluster, "namespace": namespace}
+
+    monkeypatch.setattr(api, "enrich_alert", slow_enrich)
+    monkeypatch.setattr(api, "ENRICHMENT_CONCURRENCY", 4)
+
+    alerts = [_alert(f"kube_pod_crash_{i}") for i in range(8)]
+    # Duplicate of the first group inside the same batch
+    alerts.insert(3, _alert("kube_pod_crash_0"))
+
+    resp = client.post("/api/v1/alerts", json={"alerts": alerts})
+    assert resp.status_code == 200
+    body = resp.json()
+
+    assert body["processed"] == 8
+    assert body["deduplicated"] == 1
+    assert [a["alertname"] for a in body["alerts"]] == [
+        f"kube_pod_crash_{i}" for i in range(8)
+    ]
+    assert all(a["target_agent"] == "incident-response" for a in body["alerts"])
+    assert 1 < peak <= 4
+
+
+def test_repeat_batch_is_fully_deduplicated(client, monkeypatch):
+    """Verify a re-sent batch within the dedup window triggers no new investigations."""
+
+    async def fake_enrich(alertname, cluster, namespace, labels):
+        return {}
+
+    monkeypatch.setattr(api, "enrich_alert", fake_enrich)
+
+    payload = {"alerts": [_alert("gpu_xid_error"), _alert("node_disk_pressure")]}
+    first = client.post("/api/v1/alerts", json=payload).json()
+    second = client.post("/api/v1/alerts", json=payload).json()
+
+    assert first["processed"] == 2
+    assert second["processed"] == 0
+    assert second["deduplicated"] == 2
+
+
+def test_queue_mode_acknowledges_and_drains(monkeypatch):
+    """Verify queue mode returns 202, hands off every alert and drains on shutdown."""
+    handed_off = []
+
+    async def fake_enrich(alertname, cluster, namespace, labels):
+        await asyncio.sleep(0.01)
+        return {}
+
+    async def fake_hand_off(enriched, target):
+        handed_off.append((enriched.alertname, target.value))
+        return True
+
+    monkeypatch.setattr(api, "deduplicator", AlertDeduplicator())
+    monkeypatch.setattr(api, "correlator", AlertCorrelator())
+    monkeypatch.setattr(api, "ALERT_HISTORY_ENABLED", False)
+    monkeypatch.setattr(api, "enrich_alert", fake_enrich)
+    monkeypatch.setattr(api, "hand_off_to_orchestrator", fake_hand_off)
+    monkeypatch.setattr(api, "INGESTION_MODE", "queue")
+    monkeypatch.setattr(api, "ALERT_QUEUE_SIZE", 3)
+    monkeypatch.setattr(api, "ALERT_QUEUE_WORKERS", 2)
+    # Queue capacity, not the per-minute budget, bounds queue mode
+    monkeypatch.setattr(api, "rate_limiter", AlertRateLimiter(alerts_per_minute=1))
+
+    with TestClient(api.app) as client:
+        resp = client.post(
+            "/api/v1/alerts",
+            json={
+                "alerts": [_alert("gpu_xid_error"), _alert("gpu_xid_error"), _alert("vllm_queue")]
+            },
+        )
+        assert resp.status_code == 202
+        assert resp.json()["queued"] == 2
+        assert resp.json()["deduplicated"] == 1
+        assert resp.json()["rate_limited"] == 0
+
+        # Rejected as a whole when it cannot fit, without touching dedup state
+        too_big = client.post(
+            "/api/v1/alerts",
+            json={"alerts": [_alert(f"node_disk_{i}") for i in range(4)]},
+        )
+        assert too_big.status_code == 429
+        assert "node_disk_0:platform:default" not in api.deduplicator.groups
+
+    assert api.alert_queue is None
+    assert sorted(handed_off) == [
+        ("gpu_xid_error", "gpu-health"),
+        ("vllm_queue", "predictive-scaling"),
+    ]
+
+
+def test_resolved_alerts_close_their_group_without_enrichment(client, monkeypatch):
+    """Verify resolved alerts skip enrichment and close the group once none are firing."""
+    enriched = []
+
+    async def fake_enrich(alertname, cluster, namespace, labels):
+        enriched.append(labels["pod"])
+        return {}
+
+    monkeypatch.setattr(api, "enrich_alert", fake_enrich)
+
+    def pod_alert(pod: str, status: str = "firing") -> dict:
+        alert = _alert("kube_pod_crash")
+        alert["labels"]["pod"] = pod
+        return {**alert, "status": status, "fingerprint": f"fp-{pod}"}
+
+    fired = client.post("/api/v1/alerts", json={"alerts": [pod_alert("a"), pod_alert("b")]})
+    assert (fired.json()["processed"], fired.json()["deduplicated"]) == (1, 1)
+
+    # One pod recovers; the other is still firing
+    partial = client.post("/api/v1/alerts", json={"alerts": [pod_alert("a", "resolved")]})
+    assert (partial.json()["processed"], partial.json()["resolved"]) == (0, 1)
+    group = client.get("/api/v1/alerts/groups").json()["kube_pod_crash:platform:default"]
+    assert (group["status"], group["firing"]) == ("investigating", 1)
+
+    client.post("/api/v1/alerts", json={"alerts": [pod_alert("b", "resolved")]})
+    group = client.get("/api/v1/alerts/groups").json()["kube_pod_crash:platform:default"]
+    assert group["status"] == "resolved"
+    assert group["ttfr_seconds"] is not None and group["ttfr_seconds"] >= 0
+    assert enriched == ["a"]
+
+    # Firing again after resolution is a new incident
+    refired = client.post("/api/v1/alerts", json={"alerts": [pod_alert("a")]})
+    assert refired.json()["processed"] == 1
+
+
+@pytest.mark.asyncio
+async def test_queue_cancels_work_of_resolved_group():
+    """Verify resolving a group cancels its in-flight handler and skips its queued alerts."""
+    started = asyncio.Event()
+    finished = []
+
+    async def handler(item):
+        started.set()
+        await asyncio.sleep(0.05)
+        finished.append(item.alertname)
+
+    queue = AlertQueue(handler, workers=1)
+    await queue.start()
+    for alertname, group_key in [("a", "g1"), ("b", "g1"), ("c", "g2")]:
+        queue.enqueue(PendingAlert(
+            alert=WebhookAlert("firing"),
+            alertname=alertname,
+            cluster="platform",
+            namespace=None,
+            severity=AlertSeverity.WARNING,
+            group_key=group_key,
+        ))
+
+    await started.wait()
+    assert queue.cancel_group("g1") == 2
+    assert queue.cancel_group("g3") == 0
+    await queue.drain(timeout=1)
+
+    assert finished == ["c"]
+
+
+@pytest.mark.asyncio
+async def test_queue_reservations_are_held_until_released():
+    """Verify batches admitted concurrently cannot reserve more room than the queue has."""
+    queue = AlertQueue(lambda item: asyncio.sleep(0), maxsize=3, workers=1)
+    await queue.start()
+
+    assert queue.reserve(2)
+    # A second batch arriving while the first is still being admitted
+    assert not queue.reserve(2)
+    assert queue.reserve(1)
+    queue.release(2)
+    assert queue.has_capacity(2)
+    assert not queue.has_capacity(3)
+    await queue.drain(timeout=1)
+
+
+@pytest.mark.asyncio
+async def test_enrichment_sources_fan_out_with_deadlines(monkeypatch):
+    """Verify a slow source times out without delaying the others."""
+    async def fake_query_vm(promql):
+        if "memory" in promql:
+            await asyncio.sleep(1)
+        return {"data": {"result": [{"value": [0, "0.5"]}]}}
+
+    async def fake_recent(alertname, cluster):
+        await asyncio.sleep(0.05)
+        return [{"alert_id": "a1"}]
+
+    monkeypatch.setattr(enrichment, "_query_vm", fake_query_vm)
+    monkeypatch.setattr(enrichment, "_query_recent_alerts", fake_recent)
+    monkeypatch.setitem(enrichment.SOURCE_DEADLINES, "memory_usage", 0.1)
+
+    start = asyncio.get_running_loop().time()
+    result = await enrichment.enrich_alert("kube_pod_crash", "platform", "default", {})
+    elapsed = asyncio.get_running_loop().time() - start
+
+    assert elapsed < 0.5
+    assert result["source_status"] == {
+        "cpu_usage": "ok",
+        "memory_usage": "timeout",
+        "recent_alerts": "ok",
+    }
+    assert set(result["resource_utilization"]) == {"cpu_usage"}
+    assert result["recent_similar_count"] == 1
+
+    no_namespace = await enrichment.enrich_alert("kube_pod_crash", "platform", None, {})
+    assert no_namespace["source_status"]["cpu_usage"] == "skipped"
+
+
+@pytest.mark.asyncio
+async def test_upstream_error_responses_are_failed_sources_and_not_cached(monkeypatch):
+    """Verify 5xx answers report the source as an error and the next alert retries it."""
+    calls = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        calls.append(request.url.host)
+        return httpx.Response(503, text="overloaded")
+
+    client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    monkeypatch.setattr(enrichment.http_clients, "get", lambda name: client)
+
+    for _ in range(2):
+        result = await enrichment.enrich_alert("kube_pod_crash", "platform", "default", {})
+        assert result["source_status"] == {
+            "cpu_usage": "error",
+            "memory_usage": "error",
+            "recent_alerts": "error",
+        }
+    await client.aclose()
+    # Three sources, loaded again for the second alert
+    assert len(calls) == 6
+
+
+def _slo_yaml(*services: str) -> str:
+    return "slos:\n" + "".join(
+        f"  - service: {service}\n"
+        "    cluster: platform\n"
+        "    objectives:\n"
+        "      - name: availability\n"
+        "        target: 99.0\n"
+        "        window_days: 1\n"
+        "        metric: up\n"
+        for service in services
+    )
+
+
+def _wait_for_budgets(test_client: TestClient, count: int) -> list[dict]:
+    for _ in range(200):
+        budgets = test_client.get("/api/v1/slo/budgets").json()
+        if len(budgets) >= count:
+            break
+        time.sleep(0.01)
+    return budgets
+
+
+def test_slo_budgets_are_refreshed_and_reloaded_in_the_background(client, monkeypatch, tmp_path):
+    """Verify the service refreshes the burn-rate engine, serves it and hot-reloads SLO_PATH."""
+    assert client.get("/api/v1/slo/budgets").status_code == 404
+
+    slos = tmp_path / "slos.yaml"
+    slos.write_text(_slo_yaml("api"))
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        return httpx.Response(200, json={"data": {"result": [
+            {"metric": {"ai_sre_slo": "0"}, "values": [[time.time(), "100"]]},
+        ]}})
+
+    vm = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    monkeypatch.setattr(api.http_clients, "get", lambda name: vm)
+    monkeypatch.setattr(api, "SLO_PATH", str(slos))
+    monkeypatch.setattr(api, "SLO_RELOAD_SECONDS", 0.01)
+    monkeypatch.setattr(api, "SLO_REFRESH_SECONDS", 0.01)
+    monkeypatch.setattr(api, "burn_rate_engine", BurnRateEngine(SLOStore(str(slos))))
+    with TestClient(api.app) as test_client:
+        budgets = _wait_for_budgets(test_client, 1)
+        assert [(b["service"], b["current_value"]) for b in budgets] == [("api", 100.0)]
+        assert test_client.get("/api/v1/slo/budgets", params={"cluster": "edge"}).json() == []
+
+        # An edited SLO file is picked up without a restart
+        slos.write_text(_slo_yaml("api", "web"))
+        budgets = _wait_for_budgets(test_client, 2)
+        assert sorted(b["service"] for b in budgets) == ["api", "web"]
+    assert api.slo_watcher is None
+
+
+def test_rate_limit_counts_alerts_per_key_with_critical_reserve(client, monkeypatch):
+    """Verify budgets are per cluster and severity, and critical alerts keep their own."""
+
+    async def fake_enrich(alertname, cluster, namespace, labels):
+        return {}
+
+    monkeypatch.setattr(api, "enrich_alert", fake_enrich)
+    monkeypatch.setattr(
+        api, "rate_limiter", AlertRateLimiter(alerts_per_minute=2, critical_per_minute=1)
+    )
+
+    storm = client.post(
+        "/api/v1/alerts",
+        json={"receiver": "ai-sre", "alerts": [_alert(f"node_load_{i}") for i in range(4)]},
+    ).json()
+    assert storm["processed"] == 2
+    assert storm["rate_limited"] == 2
+
+    # Same cluster/severity budget is exhausted: the whole batch is rejected
+    exhausted = client.post(
+        "/api/v1/alerts", json={"receiver": "ai-sre", "alerts": [_alert("node_load_9")]}
+    )
+    assert exhausted.status_code == 429
+
+    # Other clusters and critical alerts are unaffected
+    critical = _alert("node_down")
+    critical["labels"]["severity"] = "critical"
+    other = client.post(
+        "/api/v1/alerts",
+        json={
+            "receiver": "ai-sre",
+            "alerts": [critical, _alert("node_load_0", cluster="gpu-inference")],
+        },
+    ).json()
+    assert other["processed"] == 2
+
+    # A rate-limited group is not marked investigated and gets another chance
+    assert api.deduplicator.groups["node_load_2:platform:default"].investigated is False
+
+    state = client.get("/api/v1/ratelimit").json()
+    assert state["alerts_per_minute"] == 2
+    assert {b["severity"] for b in state["buckets"]} == {"warning", "critical"}
+
+
+def test_token_bucket_refills_over_time():
+    """Verify a drained budget refills at the per-minute rate."""
+    limiter = AlertRateLimiter(alerts_per_minute=60)
+    assert all(limiter.allow("r", "c", AlertSeverity.WARNING, now=0.0) for _ in range(60))
+    assert not limiter.allow("r", "c", AlertSeverity.WARNING, now=0.0)
+    assert limiter.allow("r", "c", AlertSeverity.WARNING, now=1.0)
+    assert not limiter.allow("r", "c", AlertSeverity.WARNING, now=1.0)
+
+
+def test_dedup_expiry_index_evicts_only_idle_groups():
+    """Verify groups expire after 2x window idle, while active groups survive."""
+    now = 1000.0
+    dedup = AlertDeduplicator(window_seconds=60, clock=lambda: now)
+
+    dedup.should_investigate("idle_alert", "platform", "default")
+    dedup.should_investigate("busy_alert", "platform", "default")
+
+    # Keep one group active past its original expiry
+    for _ in range(3):
+        now += 50
+        dedup.should_investigate("busy_alert", "platform", "default")
+
+    assert set(dedup.groups) == {"busy_alert:platform:default"}
+
+    now += 121
+    dedup.should_investigate("new_alert", "platform", None)
+    assert set(dedup.groups) == {"new_alert:platform:_all_"}
+    assert dedup.get_group_stats()["new_alert:platform:_all_"]["count"] == 1
+
+
+def test_alerts_sharing_a_node_start_one_investigation(client, monkeypatch):
+    """Verify differently named alerts on the same node are correlated into one group."""
+
+    async def fake_enrich(alertname, cluster, namespace, labels):
+        return {}
+
+    monkeypatch.setattr(api, "enrich_alert", fake_enrich)
+
+    crash = _alert("kube_pod_crashlooping", namespace="payments")
+    oom = _alert("container_oom_killed", namespace="payments")
+    other = _alert("container_oom_killed", namespace="search")
+    crash["labels"]["node"] = oom["labels"]["node"] = "ip-10-0-1-5"
+    other["labels"]["node"] = "ip-10-0-9-9"
+
+    resp = client.post("/api/v1/alerts", json={"alerts": [crash, oom, other]})
+    body = resp.json()
+
+    assert body["processed"] == 2
+    assert body["correlated"] == 1
+    assert [a["alertname"] for a in body["alerts"]] == [
+        "kube_pod_crashlooping",
+        "container_oom_killed",
+    ]
+    groups = client.get("/api/v1/alerts/correlations").json()
+    root = groups[body["alerts"][0]["correlation_group"]]
+    assert root["members"] == [
+        "container_oom_killed:platform:payments",
+        "kube_pod_crashlooping:platform:payments",
+    ]
+
+
+def test_correlation_follows_topology_and_window():
+    """Verify service alerts correlate across dependent clusters until the group goes idle."""
+    now = 1000.0
+    topology = TopologyStore()
+    topology.topology = PlatformTopology(clusters=[
+        ClusterTopology(name="platform", type="hub", region="us-east-1"),
+        ClusterTopology(
+            name="gpu-inference", type="spoke", region="us-east-1", dependencies=["platform"]
+        ),
+        ClusterTopology(name="blockchain", type="spoke", region="us-east-1"),
+    ])
+    correlator = AlertCorrelator(window_seconds=300, topology=topology, clock=lambda: now)
+
+    root = correlator.open_group(
+        "argocd_sync_failed:platform:argocd", "platform", "argocd", {"service": "argocd"}
+    )
+    joined = correlator.correlate(
+        "argocd_app_degraded:gpu-inference:apps", "gpu-inference", "apps", {"service": "argocd"}
+    )
+    assert joined is root
+    # No dependency between blockchain and platform
+    assert correlator.correlate(
+        "argocd_app_degraded:blockchain:apps", "blockchain", "apps", {"service": "argocd"}
+    ) is None
+    # Same fingerprint always correlates, regardless of labels
+    correlator.open_group("a:blockchain:_all_", "blockchain", None, {}, fingerprint="abc")
+    assert correlator.correlate("b:platform:_all_", "platform", None, {}, "abc") is not None
+
+    now += 301
+    assert correlator.correlate(
+        "argocd_app_degraded:gpu-inference:apps", "gpu-inference", "apps", {"service": "argocd"}
+    ) is None
+
+
+def test_webhook_parser_streams_alerts_across_chunks():
+    """Verify the streaming parser matches the Pydantic model for any chunking, interning labels."""
+    payload = {
+        "receiver": "ai-sre",
+        "alerts": [_alert(f"kube_pod_crash_{i}") for i in range(20)],
+        "groupLabels": {"cluster": "platform"},
+    }
+    payload["alerts"][3]["annotations"] = {"description": "é" * 500}
+    body = json.dumps(payload, indent=2).encode()
+    expected = AlertmanagerWebhook.model_validate_json(body)
+
+    for size in (1, 7, 4096):
+        parser = WebhookStreamParser()
+        alerts = []
+        for start in range(0, len(body), size):
+            alerts.extend(parser.feed(body[start:start + size]))
+        alerts.extend(parser.close())
+
+        assert [asdict(a) for a in alerts] == [a.model_dump() for a in expected.alerts]
+        assert parser.envelope["receiver"] == "ai-sre"
+        assert alerts[0].labels["cluster"] is alerts[-1].labels["cluster"]
+
+
+def test_webhook_parser_rejects_bad_input_before_the_body_ends():
+    """Verify malformed JSON and oversized alerts fail on the chunk that reveals them."""
+    parser = WebhookStreamParser()
+    assert parser.feed(b'{"truncatedAlerts": 1.') == []
+    assert parser.feed(b'5, "alerts": [{"status": "fir') == []
+    with pytest.raises(WebhookParseError):
+        parser.feed(b'ing",, "labels": {}}')
+    assert parser.envelope == {"truncatedAlerts": 1.5}
+
+    parser = WebhookStreamParser(max_element_size=100)
+    parser.feed(b'{"alerts": [{"status": "firing", "annotations": {"description": "')
+    with pytest.raises(WebhookParseError, match="exceeds 100 characters"):
+        parser.feed(b"x" * 100)
+
+
+def test_malformed_webhook_is_rejected(client):
+    """Verify truncated or invalid webhook bodies get 422 without touching dedup state."""
+    body = json.dumps({"alerts": [_alert("kube_pod_crash")]})
+    for bad in (body[:-5], '{"alerts": [{"labels": {}}]}', "[]"):
+        resp = client.post(
+            "/api/v1/alerts", content=bad, headers={"content-type": "application/json"}
+        )
+        assert resp.status_code == 422
+    assert api.deduplicator.groups == {}
+
+
+@pytest.mark.asyncio
+async def test_recent_alert_lookups_share_one_parameterized_query(monkeypatch):
+    """Verify concurrent history lookups become one bound query, demultiplexed per alert."""
+    requests = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        requests.append(request)
+        return httpx.Response(200, json={"data": [
+            {"alert_id": "a1", "alertname": "kube_pod_crash", "cluster": "platform"},
+            {"alert_id": "a2", "alertname": "kube_pod_crash", "cluster": "platform"},
+            {"alert_id": "b1", "alertname": "node_disk", "cluster": "o'brien"},
+        ]})
+
+    client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    monkeypatch.setattr(enrichment.http_clients, "get", lambda name: client)
+
+    results = await asyncio.gather(
+        enrichment._query_recent_alerts("kube_pod_crash", "platform"),
+        enrichment._query_recent_alerts("node_disk", "o'brien"),
+        enrichment._query_recent_alerts("kube_pod_crash", "platform"),
+        enrichment._query_recent_alerts("gpu_xid", "platform"),
+        enrichment._query_recent_alerts("gpu_ecc", "platform"),
+    )
+    await client.aclose()
+
+    assert len(requests) == 1
+    sql = requests[0].content.decode()
+    assert "LIMIT 5 BY alertname, cluster" in sql and "o'brien" not in sql
+    assert requests[0].url.params["param_pairs"] == (
+        "[('kube_pod_crash','platform'),('node_disk','o\\'brien'),('gpu_xid','platform'),"
+        "('gpu_ecc','platform')]"
+    )
+    assert [[row["alert_id"] for row in rows] for rows in results] == [
+        ["a1", "a2"], ["b1"], ["a1", "a2"], [], []
+    ]
+    # Pairs without history must not share one mutable default
+    assert results[3] is not results[4]
+
+
+@pytest.mark.asyncio
+async def test_history_writer_spills_and_replays(monkeypatch, tmp_path):
+    """Verify failed batches spill to disk and are replayed in order once ClickHouse recovers."""
+    inserts = []
+    attempts = []
+    healthy = False
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        attempts.append(request)
+        if not healthy:
+            return httpx.Response(503)
+        inserts.append(json.loads(request.content))
+        return httpx.Response(200)
+
+    client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    monkeypatch.setattr(history.http_clients, "get", lambda name: client)
+    writer = history.AlertHistoryWriter("http://clickhouse", spill_dir=str(tmp_path), batch_size=2)
+
+    def record(alertname, outcome="deduplicated"):
+        writer.record(
+            alert_id=alertname,
+            alertname=alertname,
+            cluster="platform",
+            namespace=None,
+            severity="warning",
+            status="firing",
+            labels={"alertname": alertname},
+            outcome=outcome,
+        )
+
+    record("a")
+    record("b")
+    await writer.flush()
+    assert writer.spill_path.exists() and not inserts
+    # Idle flushes during the outage wait for the replay backoff
+    await writer.flush()
+    assert len(attempts) == 1
+
+    healthy = True
+    record("c", outcome="investigated")
+    await writer.flush()
+    await client.aclose()
+
+    # Columnar batches: the live one first, then the replayed spill
+    alertnames = history.COLUMNS.index("alertname")
+    assert [batch[alertnames] for batch in inserts] == [["c"], ["a", "b"]]
+    assert inserts[0][history.COLUMNS.index("outcome")] == ["investigated"]
+    assert not writer.spill_path.exists()
+    assert not writer.spill_path.with_suffix(".replaying").exists()
+
+
+@pytest.mark.asyncio
+async def test_history_replay_keeps_the_unsent_remainder_in_order(monkeypatch, tmp_path):
+    """Verify a replay interrupted by a failure puts the unsent batches back, oldest first."""
+    answers = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        return httpx.Response(answers.pop(0) if answers else 503)
+
+    client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    monkeypatch.setattr(history.http_clients, "get", lambda name: client)
+    writer = history.AlertHistoryWriter(
+        "http://clickhouse", spill_dir=str(tmp_path), batch_size=1, flush_interval=0
+    )
+
+    for alertname in ("a", "b", "c"):
+        writer.record(
+            alert_id=alertname,
+            alertname=alertname,
+            cluster="platform",
+            namespace=None,
+            severity="warning",
+            status="firing",
+            labels={},
+            outcome="deduplicated",
+        )
+        await writer.flush()
+
+    # ClickHouse takes the first spilled batch, then fails again
+    answers.extend([200, 503])
+    await writer.flush()
+    await client.aclose()
+
+    alertnames = history.COLUMNS.index("alertname")
+    remaining = [
+        json.loads(json.loads(line)["data"])[alertnames]
+        for line in writer.spill_path.read_text().splitlines()
+    ]
+    assert remaining == [["b"], ["c"]]
+
+
+
+@pytest.mark.asyncio
+async def test_history_replay_survives_crashes_and_failed_requeues(monkeypatch, tmp_path):
+    """Verify batches being replayed are never dropped, even if the process dies mid-replay."""
+    answers: list[int] = []
+    sent = []
+    alertnames = history.COLUMNS.index("alertname")
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        status = answers.pop(0) if answers else 503
+        if status == 200:
+            sent.append(json.loads(request.content)[alertnames])
+        return httpx.Response(status)
+
+    client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    monkeypatch.setattr(history.http_clients, "get", lambda name: client)
+
+    def spilled(writer: history.AlertHistoryWriter) -> list[list[str]]:
+        return [
+            json.loads(json.loads(line)["data"])[alertnames]
+            for line in writer.spill_path.read_text().splitlines()
+        ]
+
+    writer = history.AlertHistoryWriter(
+        "http://clickhouse", spill_dir=str(tmp_path), batch_size=1, flush_interval=0
+    )
+    for alertname in ("a", "b", "c"):
+        writer.record(
+            alert_id=alertname,
+            alertname=alertname,
+            cluster="platform",
+            namespace=None,
+            severity="warning",
+            status="firing",
+            labels={},
+            outcome="deduplicated",
+        )
+        await writer.flush()
+
+    # The process dies mid-replay: "a" and "b" are in the file being
+    # replayed, "c" was spilled since, and a requeue was half written
+    lines = writer.spill_path.read_text().splitlines(keepends=True)
+    writer.spill_path.with_suffix(".replaying").write_text("".join(lines[:2]))
+    writer.spill_path.write_text(lines[2])
+    writer.spill_path.with_suffix(".pending").write_text(lines[0][:10])
+
+    restarted = history.AlertHistoryWriter(
+        "http://clickhouse", spill_dir=str(tmp_path), batch_size=1, flush_interval=0
+    )
+    assert spilled(restarted) == [["a"], ["b"], ["c"]]
+    assert sorted(f.name for f in tmp_path.iterdir()) == [history.SPILL_FILE]
+
+    # Requeueing the unsent remainder fails (e.g. disk full): nothing is deleted
+    def disk_full(spill, offset):
+        raise OSError(28, "No space left on device")
+
+    monkeypatch.setattr(restarted, "_requeue", disk_full)
+    answers.extend([200, 503])
+    await restarted.flush()
+    assert sent == [["a"]]
+    assert restarted.spill_path.with_suffix(".replaying").exists()
+
+    # The next replay merges the leftovers back and sends them (at least once)
+    monkeypatch.undo()
+    monkeypatch.setattr(history.http_clients, "get", lambda name: client)
+    answers.extend([200, 200, 200])
+    await restarted.flush()
+    await client.aclose()
+    assert sent == [["a"], ["a"], ["b"], ["c"]]
+    assert list(tmp_path.iterdir()) == []
\ No newline at end of file
@@ -0,0 +1,104 @@
+import json
+import sys
+from pathlib import Path
+
+import httpx
+import pytest
+
+# Ensure the root of the project is in PYTHONPATH
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from agents.cloud.correlation import CrossLayerCorrelator
+from common import omniscience
+from memory.models.topology import ClusterTopology, PlatformTopology
+from memory.topology_store import TopologyStore
+
+
+def _mock(monkeypatch, handler) -> httpx.AsyncClient:
+    client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    monkeypatch.setattr(omniscience.http_clients, "get", lambda name: client)
+    return client
+
+
+@pytest.mark.asyncio
+async def test_node_and_pvc_lookups_are_batched_and_cached(monkeypatch):
+    """Verify a multi-node enrichment issues one batch request per kind and is cached."""
+    requests = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        requests.append((request.method, request.url.path))
+        keys = json.loads(request.content)["keys"]
+        if request.url.path.endswith("/node-context/batch"):
+            return httpx.Response(200, json={"results": [
+                {"instance_id": f"i-{k['node_name']}", "instance_check": "impaired"}
+                if k["node_name"] != "unknown" else None
+                for k in keys
+            ]})
+        return httpx.Response(200, json={"results": [
+            {"volume_id": f"vol-{k['pvc_name']}", "volume_status": "impaired"} for k in keys
+        ]})
+
+    client = _mock(monkeypatch, handler)
+    correlator = CrossLayerCorrelator("http://omniscience-batch", "token")
+    nodes = ["node-a", "node-b", "node-c", "unknown"]
+
+    enrichment = await correlator.full_enrichment(
+        "gpu-inference", node_names=nodes, pvc_names=[("data-0", "db"), ("data-1", "db")]
+    )
+    assert requests == [
+        ("POST", "/api/v1/graph/node-context/batch"),
+        ("POST", "/api/v1/graph/pvc-context/batch"),
+    ]
+    assert [c.instance_id for c in enrichment.node_contexts] == [
+        "i-node-a", "i-node-b", "i-node-c"
+    ]
+    assert [c.volume_id for c in enrichment.volume_contexts] == ["vol-data-0", "vol-data-1"]
+    assert len(enrichment.correlation_notes) == 5
+
+    # Served from the shared cache, including the negative answer
+    again = CrossLayerCorrelator("http://omniscience-batch", "token")
+    assert await again.enrich_for_node("unknown", "gpu-inference") is None
+    assert (await again.enrich_for_node("node-b", "gpu-inference")).instance_id == "i-node-b"
+    assert len(requests) == 2
+    await client.aclose()
+
+
+@pytest.mark.asyncio
+async def test_falls_back_to_single_lookups_without_a_batch_endpoint(monkeypatch):
+    """Verify a missing batch endpoint falls back to per-key GETs and dependencies are cached."""
+    requests = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        requests.append((request.method, request.url.path))
+        if request.method == "POST":
+            return httpx.Response(404)
+        if request.url.path.endswith("/dependencies"):
+            if request.url.params["cluster"] == "gpu-inference":
+                return httpx.Response(200, json={"dependencies": ["platform", "mesh"]})
+            return httpx.Response(404)
+        return httpx.Response(200, json={"instance_id": f"i-{request.url.params['node_name']}"})
+
+    client = _mock(monkeypatch, handler)
+    correlator = CrossLayerCorrelator("http://omniscience-single", "token")
+    enrichment = await correlator.full_enrichment("gpu-inference", node_names=["a", "b"])
+    assert [c.instance_id for c in enrichment.node_contexts] == ["i-a", "i-b"]
+    assert requests.count(("POST", "/api/v1/graph/node-context/batch")) == 1
+    assert requests.count(("GET", "/api/v1/graph/node-context")) == 2
+
+    store = TopologyStore(
+        omniscience_url="http://omniscience-single", omniscience_token="token"
+    )
+    store.topology = PlatformTopology(clusters=[
+        ClusterTopology(name="gpu-inference", type="spoke", region="us-east-1",
+                        dependencies=["platform"]),
+        ClusterTopology(name="blockchain", type="spoke", region="us-east-1",
+                        dependencies=["platform"]),
+    ])
+    for _ in range(3):
+        assert await store.fetch_dynamic_dependencies("gpu-inference") == ["platform", "mesh"]
+    assert requests.count(("GET", "/api/v1/graph/dependencies")) == 1
+    # The refresh rewired the graph
+    assert store.get_dependency_closure("gpu-inference") == ["platform", "mesh"]
+    # Unknown to Omniscience: the static topology answers
+    assert await store.fetch_dynamic_dependencies("blockchain") == ["platform"]
+    await client.aclose()
@@ -0,0 +1,52 @@
+import sys
+from pathlib import Path
+
+import pytest
+
+# Ensure the root of the project is in PYTHONPATH
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from agents.orchestrator.agent import SREOrchestrator
+from common.routing import AlertRouter
+from ingestion.models import AlertRouteTarget
+from ingestion.router import route_alert
+
+
+@pytest.mark.parametrize(
+    "alertname, expected",
+    [
+        ("DCGM_XID_Error", "gpu-health"),
+        ("kube_pod_crash_looping", "incident-response"),
+        ("node_disk_pressure", "capacity-planning"),
+        ("vllm_queue_depth", "predictive-scaling"),
+        ("ec2_instance_degraded", "aws-cloud"),
+        ("guardduty_finding", "aws-cloud"),
+        ("something_else", "oncall-copilot"),
+    ],
+)
+def test_ingestion_and_orchestrator_share_the_routing_table(alertname, expected):
+    """Verify both routers agree, including the AWS routes ingestion used to lack."""
+    assert route_alert(alertname) == AlertRouteTarget(expected)
+    role = SREOrchestrator().route_alert({"labels": {"alertname": alertname}})
+    assert role.value == expected
+
+
+def test_router_rule_order_regex_labels_and_severity():
+    """Verify first match wins across prefixes, regexes and label matchers."""
+    router = AlertRouter.from_dict({
+        "default": "oncall-copilot",
+        "severity_overrides": {"critical": "incident-response"},
+        "rules": [
+            {"prefixes": ["kube_"], "labels": {"team": "ml"}, "target": "gpu-health"},
+            {"regex": [r"kube_(pod|deployment)_"], "target": "incident-response"},
+            {"prefixes": ["kube_"], "target": "capacity-planning"},
+            {"labels": {"namespace": "billing"}, "target": "cost-optimization"},
+        ],
+    })
+
+    assert router.route("kube_pod_oom", {"team": "ml"}) == "gpu-health"
+    assert router.route("KUBE_POD_OOM") == "incident-response"
+    assert router.route("kube_node_not_ready") == "capacity-planning"
+    assert router.route("budget_exceeded", {"namespace": "billing"}) == "cost-optimization"
+    assert router.route("unknown_alert", {"severity": "critical"}) == "incident-response"
+    assert router.route("unknown_alert", {"severity": "warning"}) == "oncall-copilot"
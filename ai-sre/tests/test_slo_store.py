@@ -0,0 +1,153 @@
+import re
+import sys
+from pathlib import Path
+from urllib.parse import parse_qs
+
+import httpx
+import pytest
+import yaml
+
+# Ensure the root of the project is in PYTHONPATH
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from memory import slo_store
+from memory.burn_rate import BurnRateEngine
+from memory.slo_store import SLOStore
+
+SLOS_PATH = Path(__file__).resolve().parent.parent / "memory" / "slos.yaml"
+
+
+def test_slos_are_indexed_by_service_and_cluster():
+    """Verify lookups by (service, cluster) and by cluster use the indexes."""
+    store = SLOStore(str(SLOS_PATH))
+
+    slo = store.get_slo("argocd", "platform")
+    assert slo is not None and slo.owner_team == "platform-team"
+    assert store.get_slo("argocd", "gpu-inference") is None
+    assert all(s.cluster == "platform" for s in store.list_slos("platform"))
+    assert store.list_slos("nowhere") == []
+    assert len(store.list_slos()) == len(store.slos)
+
+
+@pytest.mark.asyncio
+async def test_error_budgets_use_one_combined_query_per_window(monkeypatch):
+    """Verify bulk error budgets batch every objective per window and fill in burn rates."""
+    store = SLOStore(str(SLOS_PATH))
+    queries = []
+    # SLI by objective position: now, 1h average, 6h average
+    values = {"now": 99.95, "1h": 99.0, "6h": 99.8}
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        query = parse_qs(request.content.decode())["query"][0]
+        queries.append(query)
+        window = re.search(r"\[(\d+h):1m\]", query)
+        value = values[window.group(1) if window else "now"]
+        positions = re.findall(r'"ai_sre_slo", "(\d+)"', query)
+        return httpx.Response(200, json={"data": {"result": [
+            {"metric": {"ai_sre_slo": position}, "value": [0, str(value)]}
+            # The first objective has no data
+            for position in positions if position != "0"
+        ]}})
+
+    client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    monkeypatch.setattr(slo_store.http_clients, "get", lambda name: client)
+
+    budgets = await store.get_error_budgets()
+    assert len(queries) == 3
+    assert len(budgets) == sum(len(slo.objectives) for slo in store.slos)
+
+    missing, availability = budgets[0], budgets[2]
+    assert (missing.current_value, missing.burn_rate_1h) == (0.0, 0.0)
+    assert (availability.service, availability.objective_name) == (
+        "argocd", "sync_success_rate"
+    )
+    assert availability.budget_remaining_percent == pytest.approx(90.0)
+    # 1% errors against a 0.5% budget burns at 2x; 0.2% at 0.4x
+    assert availability.burn_rate_1h == pytest.approx(2.0)
+    assert availability.burn_rate_6h == pytest.approx(0.4)
+
+    # Latency objectives are evaluated as the share of time within target_ms
+    assert "<= bool 500" in queries[0]
+
+    queries.clear()
+    [_, api] = await store.get_error_budget("argocd", "platform")
+    assert len(queries) == 3
+    assert (api.objective_name, api.burn_rate_1h) == ("api_availability", pytest.approx(10.0))
+    await client.aclose()
+
+
+@pytest.mark.asyncio
+async def test_burn_rate_engine_fetches_only_new_points(monkeypatch, tmp_path):
+    """Verify the engine keeps a rolling window, computes multi-window burn rates and pages."""
+    slos = tmp_path / "slos.yaml"
+    slos.write_text(
+        "slos:\n"
+        "  - service: api\n"
+        "    cluster: platform\n"
+        "    objectives:\n"
+        "      - name: availability\n"
+        "        target: 99.0\n"
+        "        window_days: 1\n"
+        "        metric: up\n"
+    )
+    now = 1_800_000_000
+    requests = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        form = {k: v[0] for k, v in parse_qs(request.content.decode()).items()}
+        requests.append(form)
+        start, end = int(form["start"]), int(form["end"])
+        # Healthy, then 20% errors during the last hour
+        values = [[ts, "80" if ts > now - 3600 else "100"] for ts in range(start, end + 1, 300)]
+        return httpx.Response(200, json={"data": {"result": [
+            {"metric": {"ai_sre_slo": "0"}, "values": values},
+        ]}})
+
+    client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    monkeypatch.setattr(slo_store.http_clients, "get", lambda name: client)
+    engine = BurnRateEngine(SLOStore(str(slos)))
+
+    # The first refresh loads the whole SLO window
+    assert await engine.refresh(now) == 288
+    [status] = engine.get_error_budgets()
+    assert status.current_value == 80.0
+    assert status.burn_rate_5m == pytest.approx(20.0)
+    assert status.burn_rate_1h == pytest.approx(20.0)
+    assert status.burn_rate_6h == pytest.approx(20.0 * 12 / 72)
+    assert status.budget_remaining_percent == pytest.approx(100 - 100 * 20.0 * 12 / 288)
+    assert status.burn_alert == "page"
+
+    # Later refreshes only ask for the points since the last one
+    assert await engine.refresh(now + 600) == 2
+    assert (int(requests[-1]["start"]), int(requests[-1]["end"])) == (now + 300, now + 600)
+    assert await engine.refresh(now + 600) == 0
+    await client.aclose()
+
+
+@pytest.mark.asyncio
+async def test_reloading_replaces_definitions_and_reports_the_diff(tmp_path):
+    """Verify reloads do not duplicate SLOs, report changes and keep state on bad files."""
+    path = tmp_path / "slos.yaml"
+    path.write_text(SLOS_PATH.read_text())
+    store = SLOStore(str(path))
+    count = len(store.slos)
+    store.load_from_file(str(path))
+    assert len(store.slos) == count
+    assert await store.reload_from_file(str(path)) == {}
+
+    data = yaml.safe_load(path.read_text())
+    removed = data["slos"].pop()
+    data["slos"][0]["objectives"][0]["target"] = 42.0
+    path.write_text(yaml.safe_dump(data))
+    diff = await store.reload_from_file(str(path))
+    assert diff["slos_removed"] == [f"{removed['service']}/{removed['cluster']}"]
+    first = data["slos"][0]
+    assert diff["objectives_changed"] == [
+        f"{first['service']}/{first['cluster']}/{first['objectives'][0]['name']}"
+    ]
+    assert len(store.slos) == count - 1
+    assert store.get_slo(removed["service"], removed["cluster"]) is None
+
+    path.write_text("slos: [{service: broken}]")
+    assert await store.reload_from_file(str(path)) is None
+    assert len(store.slos) == count - 1
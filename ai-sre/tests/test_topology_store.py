@@ -0,0 +1,131 @@
+import sys
+from pathlib import Path
+
+import pytest
+import yaml
+
+# Ensure the root of the project is in PYTHONPATH
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from memory.models.topology import (
+    ClusterTopology,
+    CriticalService,
+    PlatformTopology,
+    ServiceDependency,
+)
+from memory.topology_store import TopologyStore
+
+TOPOLOGY_PATH = Path(__file__).resolve().parent.parent / "memory" / "topology.yaml"
+
+
+def _cluster(name: str, dependencies: list[str], services: tuple[str, ...] = ()) -> ClusterTopology:
+    return ClusterTopology(
+        name=name,
+        type="spoke",
+        region="us-east-1",
+        dependencies=dependencies,
+        critical_services=[CriticalService(name=s, namespace=s) for s in services],
+    )
+
+
+def test_blast_radius_is_transitive_and_memoized_until_the_graph_changes():
+    """Verify transitive blast radius, depth limits and invalidation on topology changes."""
+    store = TopologyStore()
+    store.topology = PlatformTopology(clusters=[
+        _cluster("platform", [], ("argocd",)),
+        _cluster("mesh", ["platform"]),
+        _cluster("gpu-inference", ["mesh"], ("vllm",)),
+        _cluster("blockchain", ["platform", "mesh"]),
+    ])
+
+    radius = store.get_blast_radius("platform")
+    assert [(c["name"], c["depth"]) for c in radius["affected_clusters"]] == [
+        ("mesh", 1), ("blockchain", 1), ("gpu-inference", 2)
+    ]
+    assert radius["affected_clusters"][2]["critical_services"] == ["vllm"]
+    assert [c["name"] for c in store.get_blast_radius("platform", 1)["affected_clusters"]] == [
+        "mesh", "blockchain"
+    ]
+    assert store.get_dependency_closure("gpu-inference") == ["mesh", "platform"]
+    assert store.get_dependents("mesh") == ["gpu-inference", "blockchain"]
+    assert store.cluster_graph.reachable("platform", True) is store.cluster_graph.reachable(
+        "platform", True
+    )
+
+    # A dynamic refresh rewires gpu-inference straight to platform,
+    # publishing a new index rather than editing the one readers hold
+    published = store.cluster_graph
+    store.update_dependencies("gpu-inference", ["platform"])
+    assert published.dependencies("gpu-inference") == ["mesh"]
+    assert store.get_dependency_closure("gpu-inference") == ["platform"]
+    assert store.get_dependents("mesh") == ["blockchain"]
+    assert ("gpu-inference", 1) in [
+        (c["name"], c["depth"]) for c in store.get_blast_radius("platform")["affected_clusters"]
+    ]
+
+    # Reassigning the topology rebuilds the index
+    store.topology = PlatformTopology(clusters=[_cluster("platform", [])])
+    assert store.get_blast_radius("platform")["affected_clusters"] == []
+    assert store.get_cluster("mesh") is None
+
+
+def test_service_blast_radius_follows_cross_cluster_dependencies():
+    """Verify service-level blast radius walks cross-cluster dependencies in reverse."""
+    store = TopologyStore()
+    store.topology = PlatformTopology(
+        clusters=[
+            _cluster("platform", [], ("vault",)),
+            _cluster("apps", ["platform"], ("api", "web")),
+        ],
+        cross_cluster_dependencies=[
+            ServiceDependency(source_service="api", source_namespace="api",
+                              target_service="vault", target_namespace="vault",
+                              target_cluster="platform"),
+            ServiceDependency(source_service="web", source_namespace="web",
+                              target_service="api", target_namespace="api"),
+        ],
+    )
+    assert store.get_service_blast_radius("platform", "vault") == [
+        {"cluster": "apps", "service": "api", "depth": 1},
+        {"cluster": "apps", "service": "web", "depth": 2},
+    ]
+    assert store.get_service_blast_radius("platform", "vault", max_depth=1) == [
+        {"cluster": "apps", "service": "api", "depth": 1},
+    ]
+
+
+@pytest.mark.asyncio
+async def test_reload_swaps_the_index_and_reports_a_structural_diff(tmp_path):
+    """Verify reloads publish a new index with a diff and keep the old one on bad files."""
+    path = tmp_path / "topology.yaml"
+    path.write_text(TOPOLOGY_PATH.read_text())
+    store = TopologyStore(str(path))
+    graph = store.cluster_graph
+    assert await store.reload_from_file(str(path)) == {}
+
+    data = yaml.safe_load(path.read_text())
+    data["clusters"].append({
+        "name": "edge",
+        "type": "spoke",
+        "region": "eu-west-1",
+        "dependencies": ["platform"],
+        "critical_services": [{"name": "envoy", "namespace": "edge"}],
+    })
+    path.write_text(yaml.safe_dump(data))
+    diff = await store.reload_from_file(str(path))
+    assert diff == {
+        "clusters_added": ["edge"],
+        "dependencies_added": ["edge -> platform"],
+        "services_added": ["edge/envoy"],
+    }
+    assert store.cluster_graph is not graph
+    assert "edge" in store.get_dependents("platform")
+
+    # Dynamically learned dependencies survive a reload and are not in its diff
+    store.update_dependencies("gpu-analysis", ["platform", "gpu-inference"])
+    assert await store.reload_from_file(str(path)) == {}
+    assert store.get_dependencies("gpu-analysis") == ["platform", "gpu-inference"]
+
+    path.write_text("clusters: [{name: broken, critical_services: [{}]}]")
+    assert await store.reload_from_file(str(path)) is None
+    assert store.get_cluster("edge") is not None
@@ -0,0 +1,122 @@
+import asyncio
+import sys
+from pathlib import Path
+
+import httpx
+import pytest
+
+np = pytest.importorskip("numpy")
+
+# Ensure the root of the project is in PYTHONPATH
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from memory import incident_store  # noqa: E402
+from memory.embeddings import HashingEmbedder  # noqa: E402
+from memory.incident_store import IncidentStore  # noqa: E402
+from memory.models.incident import IncidentRecord  # noqa: E402
+from memory.vector_index import VectorIndex  # noqa: E402
+
+
+def _unit(rng, n: int, dim: int):
+    vectors = rng.standard_normal((n, dim)).astype(np.float32)
+    return vectors / np.linalg.norm(vectors, axis=1, keepdims=True)
+
+
+def test_vector_index_trains_upserts_and_reopens(tmp_path):
+    """Verify the IVF index matches exact search, replaces re-added ids and survives reopening."""
+    rng = np.random.default_rng(0)
+    vectors = _unit(rng, 2000, 16)
+    index = VectorIndex(str(tmp_path), dim=16, nprobe=64, initial_capacity=64)
+    index.add_batch([str(i) for i in range(2000)], vectors)
+    # Writes never train inline; the owner trains when asked to
+    assert index.centroids is None and index.needs_training
+    index.train()
+    assert index.centroids is not None and len(index) == 2000
+    assert not index.needs_training
+
+    query = vectors[7]
+    assert index.search(query, k=1)[0][0] == "7"
+    approx = {i for i, _ in index.search(query, k=5)}
+    exact = {i for i, _ in index.exact_search(query, k=5)}
+    assert len(approx & exact) >= 4
+
+    # Re-adding an id retires its old vector
+    index.add("7", -query)
+    assert "7" not in {i for i, _ in index.search(query, k=5)}
+    assert index.similarity(["7", "missing"], query) == {"7": pytest.approx(-1.0, abs=1e-5)}
+    index.close()
+
+    reopened = VectorIndex(str(tmp_path), dim=16, nprobe=64)
+    assert len(reopened) == 2000 and reopened.count == 2001
+    assert reopened.search(vectors[8], k=1)[0][0] == "8"
+    with pytest.raises(ValueError):
+        VectorIndex(str(tmp_path), dim=32)
+    reopened.close()
+
+
+@pytest.mark.asyncio
+async def test_vector_index_retrains_off_the_write_path(tmp_path):
+    """Verify background training swaps in new lists that include rows added meanwhile."""
+    rng = np.random.default_rng(1)
+    vectors = _unit(rng, 1500, 16)
+    index = VectorIndex(str(tmp_path), dim=16, nprobe=64)
+    index.add_batch([str(i) for i in range(1000)], vectors[:1000])
+
+    training = asyncio.create_task(index.retrain())
+    await asyncio.sleep(0)
+    # Written while k-means runs in its worker thread
+    index.add_batch([str(i) for i in range(1000, 1500)], vectors[1000:])
+    assert index.centroids is None
+    await training
+
+    assert index.centroids is not None and index.trained_count == 1500
+    assert index.search(vectors[1234], k=1)[0][0] == "1234"
+    index.close()
+    assert (tmp_path / "centroids.npy").exists()
+
+
+@pytest.mark.asyncio
+async def test_hybrid_search_finds_incidents_worded_differently(tmp_path, monkeypatch):
+    """Verify hybrid search blends embedding and keyword scores and embeds new incidents."""
+    def handler(request: httpx.Request) -> httpx.Response:
+        if request.content.decode().startswith("SELECT incident_id, timestamp"):
+            return httpx.Response(200, json={"data": [{
+                "incident_id": "00000000-0000-0000-0000-000000000001",
+                "timestamp": "2026-01-01 00:00:00.000",
+                "title": "Pods crashlooping after OOM",
+                "cluster": "platform",
+                "alertnames": ["kube_pod_crashlooping"],
+                "symptoms": ["container memory exhausted"],
+                "root_cause": "memory limit too low",
+                "resolution_steps": ["raise memory limit"],
+            }]})
+        return httpx.Response(200, json={"data": []})
+
+    client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    monkeypatch.setattr(incident_store.http_clients, "get", lambda name: client)
+    embedder = HashingEmbedder(dim=64)
+    vectors = VectorIndex(str(tmp_path), dim=64)
+    store = IncidentStore("http://clickhouse", vector_index=vectors, embedder=embedder)
+
+    assert await store.warm() == 1
+    assert "00000000-0000-0000-0000-000000000001" in vectors
+
+    await store.record_incident(IncidentRecord(
+        title="Ingress 502s", cluster="edge", symptoms=["upstream connect error"],
+    ))
+    assert len(vectors) == 2
+
+    [hit] = await store.search_similar(["pod crashlooping memory"], limit=2)
+    assert hit.title == "Pods crashlooping after OOM"
+    keyword_only = store.index.search(["pod crashlooping memory"], limit=1)[0][0]
+    assert hit.similarity_score != pytest.approx(keyword_only)
+
+    # The cluster filter also applies to embedding candidates
+    assert await store.search_similar(["pod crashlooping memory"], cluster="edge") == []
+    [edge] = await store.search_similar(["upstream error"], cluster="edge")
+    assert edge.title == "Ingress 502s"
+
+    with pytest.raises(ValueError):
+        IncidentStore("http://clickhouse", vector_index=vectors)
+    vectors.close()
+    await client.aclose()